@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Assemble every level_*/corpus.corpus from the per-level source files.
+
+This is the Python version of what make_corpus.sh used to do with cat/shuf:
+
+    level 0   corpus.txt
+    level 1   120 lines sampled with replacement from corpus.txt
+    level 2   500 lines sampled with replacement from corpus.txt
+    level 3   3x level 2 + corpus.txt + auto_corpus.py + llm_expanded_corpus.txt,
+              shuffled three times
+    level 4   level 3 + every corpus/**/*.corpus document followed by <stop>
+    level 5   level 4 + every corpus/**/*.corpus document followed by <stop>
+
+Levels 0-3 also take level_N/grammar_corpus.txt (bulk sentences from
+grammar.py) when present: each line once, shuffled in after the sampling above.
+
+Documents listed in an exclusion file (one repo-relative path per line; by
+default neardup_exclude.txt from neardup.py and level_5/quarantine.txt from
+level_5/validate.py) are left out of levels 4-5.
+
+With --dedup, exact duplicate records are dropped while assembling. Records are
+lines for levels 0-3 and whole documents for levels 4-5. By default the
+intentional upsampling above collapses too (every record appears once); with
+--keep-upsampling only duplicates inside and across the source files are
+removed and the sampling/repetition is applied afterwards.
+
+Each level also gets a record offset index (corpus.index.bin/.json) that
+dataset.CorpusDataset uses for random access.
+
+With --split VAL TEST, each record is assigned to train/val/test from a stable
+hash of its text (or of its source path for level 4-5 documents), so the
+assignment doesn't depend on the shuffles and doesn't move when files are
+added. Held-out records go to corpus.val.corpus / corpus.test.corpus, each
+with its own index (and token stream/packing when requested).
+
+With --tokens, each rebuilt level also gets a memory-mappable token stream
+(corpus.tokens.bin/.idx/.json, see tokens.py; requires NumPy), char-level by
+default or using a BPE tokenizer trained with bpe.py via --tokenizer. Adding
+--pack N also packs that stream into N-token training windows (see pack.py).
+
+With --records, level 5 is rendered from the per-example store built by
+level_5/records.py (optionally only some kinds; --dedup then also drops
+repeated examples) instead of being read file by file. --synthetic N adds N
+tool_use examples generated from the tool schemas and N json_qa examples
+generated from templates, without any LLM calls.
+
+Usage:
+    python assemble.py                          # rebuild every level
+    python assemble.py --levels 3 4             # rebuild levels 3 and 4 only
+    python assemble.py --dedup                  # drop all exact duplicates
+    python assemble.py --dedup --keep-upsampling
+    python assemble.py --tokens                 # also write corpus.tokens.*
+    python assemble.py --tokens --tokenizer bpe.json
+    python assemble.py --tokens --pack 1024     # also write corpus.packed.*
+    python assemble.py --split 0.01 0.01        # hold out 1% val + 1% test
+    python assemble.py --records json_qa        # level 5 from the example store, json_qa only
+    python assemble.py --synthetic 100000       # plus 100k local tool_use + 100k json_qa examples
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import os
+import random
+import sys
+from array import array
+
+from dataset import SPLITS, CorpusDataset, corpus_prefix, write_index
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+LEVELS = [0, 1, 2, 3, 4, 5]
+STOP = "<stop>"
+
+# Levels whose records are whole generated documents rather than lines
+DOCUMENT_LEVELS = {4, 5}
+
+# Exclusion lists honoured by default when present
+EXCLUDE_FILES = [
+    os.path.join(SCRIPT_DIR, "neardup_exclude.txt"),
+    os.path.join(SCRIPT_DIR, "level_5", "quarantine.txt"),
+]
+
+
+class HashSet:
+    """Fixed-size open-addressing set of 64-bit record fingerprints.
+
+    Uses 8 bytes per slot, so a million records fit in 16 MB regardless of
+    how long the records are.
+    """
+
+    def __init__(self, expected: int):
+        capacity = 1024
+        while capacity < 2 * expected:
+            capacity *= 2
+        self._slots = array("Q", bytes(8 * capacity))
+        self._mask = capacity - 1
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, fingerprint: int) -> bool:
+        """Insert a fingerprint. Return False if it was already present."""
+        if self._size > self._mask:
+            raise RuntimeError("HashSet is full")
+        fingerprint = fingerprint or 1  # 0 marks an empty slot
+        slots, mask = self._slots, self._mask
+        i = fingerprint & mask
+        while True:
+            current = slots[i]
+            if current == 0:
+                slots[i] = fingerprint
+                self._size += 1
+                return True
+            if current == fingerprint:
+                return False
+            i = (i + 1) & mask
+
+
+def split_of(record: tuple[int, str, str], fractions: tuple[float, float]) -> str:
+    """train/val/test for a record, from a hash of its content (or path for documents)."""
+    level, source, text = record
+    # Generated documents share one source (the generator), so key those by text
+    key = source if level in DOCUMENT_LEVELS and source.endswith(".corpus") else text.rstrip("\n")
+    digest = hashlib.blake2b(key.encode(), digest_size=8, person=b"split").digest()
+    u = int.from_bytes(digest, "little") / 2**64
+    val, test = fractions
+    if u < test:
+        return "test"
+    if u < test + val:
+        return "val"
+    return "train"
+
+
+def fingerprint(text: str) -> int:
+    """64-bit hash of a record, ignoring its trailing newline."""
+    digest = hashlib.blake2b(text.rstrip("\n").encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+# ---------------------------------------------------------------------------
+# Sources — each is (name, [records]); a record keeps its trailing newline
+# ---------------------------------------------------------------------------
+
+def level_dir(level: int) -> str:
+    return os.path.join(SCRIPT_DIR, f"level_{level}")
+
+
+def read_lines(path: str) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    if lines and not lines[-1].endswith("\n"):
+        lines[-1] += "\n"
+    return lines
+
+
+def line_source(path: str) -> tuple[str, list[str]]:
+    return os.path.relpath(path, SCRIPT_DIR), read_lines(path)
+
+
+def auto_corpus_source() -> tuple[str, list[str]]:
+    """Templated level 3 lines, generated in-process by level_3/auto_corpus.py."""
+    script = os.path.join(level_dir(3), "auto_corpus.py")
+    spec = importlib.util.spec_from_file_location("auto_corpus", script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return os.path.relpath(script, SCRIPT_DIR), list(module.generate())
+
+
+def document_paths(level: int) -> list[str]:
+    """Every generated .corpus document under level_N/corpus/, in sorted order."""
+    paths = []
+    for root, _dirs, files in os.walk(os.path.join(level_dir(level), "corpus")):
+        for fname in files:
+            if fname.endswith(".corpus"):
+                paths.append(os.path.join(root, fname))
+    return sorted(paths)
+
+
+def load_excluded(paths: list[str]) -> set[str]:
+    """Repo-relative document paths listed in the given exclusion files."""
+    excluded = set()
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    excluded.add(line)
+    return excluded
+
+
+def document_sources(level: int, excluded: set[str]) -> list[tuple[str, list[str]]]:
+    """One source per document, so the report shows which files repeat."""
+    sources = []
+    for path in document_paths(level):
+        rel = os.path.relpath(path, SCRIPT_DIR)
+        if rel in excluded:
+            continue
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        sources.append((rel, [text + STOP + "\n"]))
+    return sources
+
+
+def record_sources(kinds: list[str], excluded: set[str], dedup: bool) -> list[tuple[str, list[str]]]:
+    """Level 5 documents rendered from the example store (level_5/records.py),
+    optionally limited to some kinds and deduplicated per example."""
+    sys.path.insert(0, level_dir(5))
+    from records import ExampleStore, render_documents
+    store = ExampleStore()
+    if kinds:
+        store = store.filter(kinds=kinds)
+    if dedup:
+        store = store.dedup()
+    return [(path, [text + STOP + "\n"]) for path, text in render_documents(store) if path not in excluded]
+
+
+def synthetic_sources(count: int, seed: int, workers: int) -> list[tuple[str, list[str]]]:
+    """count locally generated examples of each level 5 kind
+    (level_5/synth_tool_use.py, level_5/synth_json_qa.py), as documents of a
+    dozen examples each."""
+    sys.path.insert(0, level_dir(5))
+    import synth_json_qa
+    import synth_tool_use
+    return [(synth.SOURCE, [doc + STOP + "\n" for doc in synth.documents(count, seed, workers)])
+            for synth in (synth_tool_use, synth_json_qa)]
+
+
+def load_sources(level: int, excluded: set[str], record_kinds: list[str] | None = None,
+                 dedup: bool = False) -> list[tuple[str, list[str]]]:
+    if level == 5 and record_kinds is not None:
+        return record_sources(record_kinds, excluded, dedup)
+    if level in DOCUMENT_LEVELS:
+        return document_sources(level, excluded)
+    if level in (0, 1, 2):
+        sources = [line_source(os.path.join(level_dir(level), "corpus.txt"))]
+    else:
+        sources = [
+            line_source(os.path.join(level_dir(2), "corpus.txt")),
+            line_source(os.path.join(level_dir(3), "corpus.txt")),
+            auto_corpus_source(),
+        ]
+        for name in ("llm_expanded_corpus.txt", "rule_expanded_corpus.txt"):
+            expanded = os.path.join(level_dir(3), name)
+            if os.path.exists(expanded):
+                sources.append(line_source(expanded))
+    # Optional bulk sentences from grammar.py
+    generated = os.path.join(level_dir(level), "grammar_corpus.txt")
+    if os.path.exists(generated):
+        sources.append(line_source(generated))
+    return sources
+
+
+# ---------------------------------------------------------------------------
+# Dedup and composition
+# ---------------------------------------------------------------------------
+
+def dedup_sources(sources: list[tuple[str, list[str]]]) -> tuple[list[tuple[str, list[str]]], list[tuple[str, int, int]]]:
+    """Drop records already seen in this or an earlier source.
+
+    Returns the filtered sources and (name, records_in, records_kept) stats.
+    """
+    seen = HashSet(sum(len(records) for _name, records in sources))
+    kept_sources = []
+    stats = []
+    for name, records in sources:
+        kept = [r for r in records if seen.add(fingerprint(r))]
+        kept_sources.append((name, kept))
+        stats.append((name, len(records), len(kept)))
+    return kept_sources, stats
+
+
+def dedup_stream(records: list[tuple[int, str, str]]) -> list[tuple[int, str, str]]:
+    seen = HashSet(len(records))
+    return [r for r in records if seen.add(fingerprint(r[2]))]
+
+
+def shuffled(records: list, rng: random.Random) -> list:
+    records = list(records)
+    rng.shuffle(records)
+    return records
+
+
+def compose(level: int, sources: list[tuple[str, list[str]]],
+            previous: list[tuple[int, str, str]], rng: random.Random) -> list[tuple[int, str, str]]:
+    """Apply each level's sampling/repetition to its (possibly deduped) sources.
+
+    Returns (level, source, text) records so the index can say where each came
+    from; the level is that of the source's level_N directory.
+    """
+    by_name = {
+        name: [(int(name.split("/")[0].removeprefix("level_")), name, text) for text in texts]
+        for name, texts in sources
+    }
+    if level in DOCUMENT_LEVELS:
+        # Documents keep their sorted order after the previous level's records
+        return previous + [r for records in by_name.values() for r in records]
+    generated = by_name.pop(f"level_{level}/grammar_corpus.txt", [])
+    if level == 0:
+        records = [r for records in by_name.values() for r in records]
+    elif level == 1:
+        records = rng.choices(by_name["level_1/corpus.txt"], k=120)
+    elif level == 2:
+        records = rng.choices(by_name["level_2/corpus.txt"], k=500)
+    else:
+        level_2 = by_name["level_2/corpus.txt"]
+        mixed = shuffled(level_2, rng) + shuffled(level_2, rng) + shuffled(level_2, rng)
+        mixed += shuffled(by_name["level_3/corpus.txt"], rng)
+        mixed += by_name["level_3/auto_corpus.py"]
+        mixed += by_name.get("level_3/llm_expanded_corpus.txt", [])
+        mixed += by_name.get("level_3/rule_expanded_corpus.txt", [])
+        records = shuffled(mixed, rng) + shuffled(mixed, rng) + shuffled(mixed, rng)
+    if generated:
+        records = shuffled(records + generated, rng)
+    return records
+
+
+def print_dedup_report(level: int, stats: list[tuple[str, int, int]]) -> None:
+    if level in DOCUMENT_LEVELS:
+        # One source per document — summarise, then list only the duplicates
+        total_in = sum(n for _name, n, _kept in stats)
+        total_kept = sum(kept for _name, _n, kept in stats)
+        dropped = [name for name, n, kept in stats if kept < n]
+        ratio = (total_in - total_kept) / total_in if total_in else 0.0
+        print(f"  dedup: {total_in} documents, {total_kept} kept, {ratio:.1%} duplicate")
+        for name in dropped:
+            print(f"    duplicate: {name}")
+        return
+    for name, n, kept in stats:
+        ratio = (n - kept) / n if n else 0.0
+        print(f"  dedup: {name:40s} {n:7d} in {kept:7d} kept  {ratio:6.1%} duplicate")
+
+
+def write_records(level: int, records: list[tuple[int, str, str]],
+                  fractions: tuple[float, float]) -> dict[str, list[str]]:
+    """Write each split's corpus file and record offset index in one pass.
+
+    Returns the texts that went to each split written. Held-out files left
+    over from an earlier --split run are removed when that split is now empty.
+    """
+    active = [split for split, fraction in zip(SPLITS, (1.0, *fractions)) if fraction > 0]
+    prefixes = {split: corpus_prefix(level_dir(level), split) for split in active}
+    files = {split: open(prefixes[split] + ".corpus", "wb") for split in active}
+    entries: dict[str, list] = {split: [] for split in active}
+    texts: dict[str, list[str]] = {split: [] for split in active}
+    offsets = dict.fromkeys(active, 0)
+    try:
+        for record in records:
+            split = split_of(record, fractions) if len(active) > 1 else "train"
+            record_level, source, text = record
+            data = text.encode("utf-8")
+            files[split].write(data)
+            entries[split].append((offsets[split], offsets[split] + len(data), record_level, source))
+            offsets[split] += len(data)
+            texts[split].append(text)
+    finally:
+        for f in files.values():
+            f.close()
+    for split in active:
+        write_index(prefixes[split], entries[split])
+
+    for split in SPLITS:
+        if split not in active:
+            prefix = corpus_prefix(level_dir(level), split)
+            for suffix in (".corpus", ".index.bin", ".index.json", ".tokens.bin", ".tokens.idx",
+                           ".tokens.json", ".packed.bin", ".packed.segments", ".packed.idx", ".packed.json"):
+                if os.path.exists(prefix + suffix):
+                    os.remove(prefix + suffix)
+    return texts
+
+
+def read_records(level: int) -> list[tuple[int, str, str]]:
+    """Records of an already assembled level (all splits), via its index when there is one."""
+    records = []
+    for split in SPLITS:
+        prefix = corpus_prefix(level_dir(level), split)
+        if os.path.exists(prefix + ".index.json"):
+            ds = CorpusDataset(level_dir(level), split)
+            records += [(r["level"], r["source"], ds[i]) for i, r in enumerate(map(ds.record, range(len(ds))))]
+        elif split == "train" and os.path.exists(prefix + ".corpus"):
+            records += [(level, f"level_{level}/corpus.corpus", line) for line in read_lines(prefix + ".corpus")]
+    return records
+
+
+def assemble(levels: list[int], dedup: bool, keep_upsampling: bool, seed: int,
+             exclude_files: list[str], tokenize: bool, tokenizer_path: str | None,
+             workers: int, pack_context: int, fractions: tuple[float, float],
+             record_kinds: list[str] | None = None, synthetic: int = 0) -> None:
+    excluded = load_excluded(exclude_files)
+    if excluded:
+        print(f"Excluding {len(excluded)} documents listed in exclusion files")
+    previous: list[tuple[int, str, str]] = []
+    for level in LEVELS:
+        if level not in levels:
+            # Later levels build on this one, so load what is already on disk
+            if level in DOCUMENT_LEVELS or level == 3:
+                previous = read_records(level)
+            continue
+
+        print(f"Assembling level_{level}")
+        rng = random.Random(f"{seed}:{level}")
+        sources = load_sources(level, excluded, record_kinds, dedup)
+        if level == 5 and synthetic:
+            sources += synthetic_sources(synthetic, seed, workers)
+        if dedup:
+            sources, stats = dedup_sources(sources)
+            print_dedup_report(level, stats)
+        records = compose(level, sources, previous, rng)
+        if dedup and not keep_upsampling:
+            records = dedup_stream(records)
+
+        split_texts = write_records(level, records, fractions)
+        vocab = None
+        if tokenize and not tokenizer_path:
+            # One char vocabulary for all splits so their token ids agree
+            from tokens import char_vocab
+            vocab = char_vocab([text for _level, _source, text in records])
+        for split, texts in split_texts.items():
+            prefix = corpus_prefix(level_dir(level), split)
+            size_mb = os.path.getsize(prefix + ".corpus") / 1e6
+            print(f"  {os.path.relpath(prefix, SCRIPT_DIR)}.corpus: {len(texts)} records, {size_mb:.1f} MB")
+            if tokenize:
+                from tokens import write_tokens
+                header = write_tokens(prefix, texts, workers, tokenizer_path, vocab)
+                print(f"    {header['tokens']} tokens ({header['dtype']}, vocab {header['vocab_size']})")
+                if pack_context:
+                    from pack import pack
+                    packed = pack(level_dir(level), pack_context, split=split)
+                    print(f"    {packed['windows']} windows of {pack_context} tokens, "
+                          f"{packed['efficiency']:.1%} packing efficiency")
+        previous = records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assemble level_*/corpus.corpus training files")
+    parser.add_argument(
+        "--levels", type=int, nargs="+", default=LEVELS, choices=LEVELS,
+        help="Levels to rebuild (default: all)",
+    )
+    parser.add_argument(
+        "--dedup", action="store_true",
+        help="Drop exact duplicate records (lines for levels 0-3, documents for 4-5)",
+    )
+    parser.add_argument(
+        "--keep-upsampling", action="store_true",
+        help="With --dedup, only drop duplicates in the sources and keep the "
+             "intentional sampling/repetition of levels 1-3",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="Seed for the sampling and shuffles (default: 0)",
+    )
+    parser.add_argument(
+        "--exclude", nargs="*", default=EXCLUDE_FILES, metavar="FILE",
+        help="Files listing documents to leave out (default: neardup_exclude.txt and "
+             "level_5/quarantine.txt if present; pass no FILE to disable)",
+    )
+    parser.add_argument(
+        "--tokens", action="store_true",
+        help="Also write a pre-tokenized corpus.tokens.bin stream per level",
+    )
+    parser.add_argument(
+        "--tokenizer", metavar="FILE",
+        help="With --tokens, encode with this BPE tokenizer (from bpe.py) instead of characters",
+    )
+    parser.add_argument(
+        "--pack", type=int, default=0, metavar="CONTEXT",
+        help="With --tokens, also pack each level into CONTEXT-token windows",
+    )
+    parser.add_argument(
+        "-p", "--workers", type=int, default=os.cpu_count() or 1,
+        help="Processes used for tokenizing (default: all cores)",
+    )
+    parser.add_argument(
+        "--split", type=float, nargs=2, default=(0.0, 0.0), metavar=("VAL", "TEST"),
+        help="Fractions of records held out for validation and test (default: 0 0)",
+    )
+    parser.add_argument(
+        "--synthetic", type=int, default=0, metavar="N",
+        help="Add N locally generated examples of each kind to level 5 "
+             "(see level_5/synth_tool_use.py, level_5/synth_json_qa.py)",
+    )
+    parser.add_argument(
+        "--records", nargs="*", default=None, metavar="KIND",
+        help="Render level 5 from the example store (level_5/records.py build) instead of "
+             "the raw files, optionally only these kinds (tool_use, json_qa)",
+    )
+    args = parser.parse_args()
+
+    if args.pack and not args.tokens:
+        parser.error("--pack requires --tokens")
+    if min(args.split) < 0 or sum(args.split) >= 1:
+        parser.error("--split fractions must be >= 0 and sum to less than 1")
+    if args.records is not None and 5 in args.levels and \
+            not os.path.exists(os.path.join(level_dir(5), "records", "index.json")):
+        print("ERROR: no level 5 record store — run `python level_5/records.py build` first", file=sys.stderr)
+        sys.exit(1)
+
+    assemble(sorted(args.levels), args.dedup, args.keep_upsampling, args.seed, args.exclude,
+             args.tokens, args.tokenizer, args.workers, args.pack, tuple(args.split), args.records, args.synthetic)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Benchmark the local hot paths on synthetic corpus fixtures.
+
+A fixture is a copy of the repo's data layout at some multiple of today's
+size: level 0-3 text files repeated, the level 4 corpus tree (prompts.txt and
+documents, hard-linked) replicated under renamed directories, and the level 5
+prompts replicated with a locally generated document (synth_tool_use.py /
+synth_json_qa.py) for every other prompt, so half of them are pending.
+
+Each case runs in a fresh interpreter so its peak RSS is its own; the best of
+--repeat runs is reported with its throughput. The cases:
+
+    find_pending_l4 / _l5   level_4|5/generate.py find_pending      prompts/s
+    word_frequencies        level_4/generate_dictionary.py          MB/s
+    next_words              level_4/generate_dictionary.py          MB/s
+    assemble                assemble.py, every level                MB/s written
+    parse_l5                level_5/records.py parse_file           examples/s
+    auto_corpus             level_3/auto_corpus.py output           lines/s
+    scaffold_l4 / _l5       level_4|5/scaffold.py prompt builds     prompts/s
+
+The last three don't depend on corpus size and only run at the first scale.
+
+--save-baseline writes the results to a JSON file; --baseline compares
+against one (bench_baseline.json by default, when present) and exits 1 if a
+case got slower or bigger by more than --tolerance (slowdowns under
+--min-delta seconds and RSS growth under --min-rss-delta MB are noise and
+don't count).
+
+Usage:
+    python bench.py                             # scales 1 10 100, compare to bench_baseline.json
+    python bench.py --scales 1 10 --repeat 5
+    python bench.py --cases assemble parse_l5 --scales 10
+    python bench.py --save-baseline bench_baseline.json
+    python bench.py --fixtures /tmp/fixtures    # keep and reuse the fixtures
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from fal_client import load_script
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(SCRIPT_DIR, "bench_baseline.json")
+LINE_FILES = ["level_0/corpus.txt", "level_1/corpus.txt", "level_2/corpus.txt", "level_3/corpus.txt",
+              "level_3/llm_expanded_corpus.txt", "level_3/rule_expanded_corpus.txt"]
+SCALES = [1, 10, 100]
+
+
+def peak_rss_mb() -> float:
+    """This process's peak RSS. VmHWM rather than ru_maxrss where available:
+    ru_maxrss survives exec, so a child would report the parent's peak."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def _scaled(rel: str, k: int) -> str:
+    """The k-th copy of a corpus path: the second directory (or the file) gets a suffix."""
+    if k == 0:
+        return rel
+    parts = rel.split(os.sep)
+    if len(parts) >= 3:
+        parts[1] += f"_{k}"
+    else:
+        stem, ext = os.path.splitext(parts[-1])
+        parts[-1] = f"{stem}_{k}{ext}"
+    return os.path.join(*parts)
+
+
+def _link(src: str, dst: str) -> None:
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def build_fixture(root: str, scale: int) -> dict:
+    """Write a fixture at root and return its manifest (also saved as manifest.json)."""
+    manifest_path = os.path.join(root, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            return json.load(f)
+
+    manifest = {"scale": scale, "lines": 0}
+    for rel in LINE_FILES:
+        src = os.path.join(SCRIPT_DIR, rel)
+        if not os.path.exists(src):
+            continue
+        with open(src, encoding="utf-8") as f:
+            text = f.read()
+        os.makedirs(os.path.join(root, os.path.dirname(rel)), exist_ok=True)
+        with open(os.path.join(root, rel), "w", encoding="utf-8") as f:
+            f.write(text * scale)
+        manifest["lines"] += text.count("\n") * scale
+    shutil.copyfile(os.path.join(SCRIPT_DIR, "level_3", "auto_corpus.py"),
+                    os.path.join(root, "level_3", "auto_corpus.py"))
+
+    # Level 4: the whole tree, scale times
+    src_root = os.path.join(SCRIPT_DIR, "level_4", "corpus")
+    level_4 = {"prompts": 0, "docs": 0, "bytes": 0}
+    for dirpath, _dirs, files in os.walk(src_root):
+        for fname in files:
+            src = os.path.join(dirpath, fname)
+            rel = os.path.relpath(src, src_root)
+            for k in range(scale):
+                _link(src, os.path.join(root, "level_4", "corpus", _scaled(rel, k)))
+            if fname == "prompts.txt":
+                with open(src) as f:
+                    level_4["prompts"] += sum(1 for line in f if line.strip()) * scale
+            elif fname.endswith(".corpus") and not rel.startswith("dictionary" + os.sep):
+                level_4["docs"] += scale
+                level_4["bytes"] += os.path.getsize(src) * scale
+    manifest["level_4"] = level_4
+
+    # Level 5: prompts scale times, a synthetic document for every other one
+    sys.path.insert(0, os.path.join(SCRIPT_DIR, "level_5"))
+    import synth_json_qa
+    import synth_tool_use
+    from synth import EXAMPLES_PER_DOC
+    src_root = os.path.join(SCRIPT_DIR, "level_5", "corpus")
+    wanted: list[tuple[str, str]] = []  # (kind, path of the document to write)
+    level_5 = {"prompts": 0, "docs": 0, "bytes": 0}
+    for dirpath, _dirs, files in os.walk(src_root):
+        if "prompts.txt" not in files:
+            continue
+        src = os.path.join(dirpath, "prompts.txt")
+        rel = os.path.relpath(src, src_root)
+        with open(src) as f:
+            names = [line.split(" ", 1)[0] for line in f if line.strip()]
+        for k in range(scale):
+            dst_dir = os.path.join(root, "level_5", "corpus", os.path.dirname(_scaled(rel, k)))
+            _link(src, os.path.join(dst_dir, "prompts.txt"))
+            wanted += [(rel.split(os.sep)[0], os.path.join(dst_dir, name)) for name in names[::2]]
+        level_5["prompts"] += len(names) * scale
+    for kind, synth in (("tool_use", synth_tool_use), ("json_qa", synth_json_qa)):
+        paths = [path for doc_kind, path in wanted if doc_kind == kind]
+        docs = synth.documents(len(paths) * EXAMPLES_PER_DOC, seed=0, workers=os.cpu_count() or 1)
+        for path, doc in zip(paths, docs):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(doc)
+            level_5["docs"] += 1
+            level_5["bytes"] += len(doc.encode("utf-8"))
+    manifest["level_5"] = level_5
+
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+# ---------------------------------------------------------------------------
+# Cases — setup(fixture, manifest) returns (run, units); only run() is timed,
+# and when units is None run() returns the count itself
+# ---------------------------------------------------------------------------
+
+def _find_pending(level: int):
+    def setup(fixture: str, manifest: dict):
+        module = load_script(f"level{level}_generate", os.path.join(SCRIPT_DIR, f"level_{level}", "generate.py"))
+        corpus = os.path.join(fixture, f"level_{level}", "corpus")
+        return (lambda: module.find_pending(corpus)), manifest[f"level_{level}"]["prompts"]
+    return setup
+
+
+def _dictionary(fixture: str):
+    module = load_script("generate_dictionary", os.path.join(SCRIPT_DIR, "level_4", "generate_dictionary.py"))
+    module.CORPUS_ROOT = os.path.join(fixture, "level_4", "corpus")
+    module.DICT_DIR = os.path.join(module.CORPUS_ROOT, "dictionary")
+    return module
+
+
+def setup_word_frequencies(fixture: str, manifest: dict):
+    module = _dictionary(fixture)
+    return (lambda: module.word_frequencies(module.CORPUS_ROOT)), manifest["level_4"]["bytes"]
+
+
+def setup_next_words(fixture: str, manifest: dict):
+    module = _dictionary(fixture)
+    return (lambda: module.next_words(1000)), manifest["level_4"]["bytes"]
+
+
+def setup_assemble(fixture: str, manifest: dict):
+    import assemble
+    assemble.SCRIPT_DIR = fixture
+
+    def run():
+        assemble.assemble(assemble.LEVELS, dedup=False, keep_upsampling=False, seed=0, exclude_files=[],
+                          tokenize=False, tokenizer_path=None, workers=1, pack_context=0, fractions=(0.0, 0.0))
+    # Output size is the same on every run, so measure it once up front
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        run()
+    written = sum(os.path.getsize(os.path.join(fixture, f"level_{level}", "corpus.corpus"))
+                  for level in assemble.LEVELS)
+    return run, written
+
+
+def setup_parse_l5(fixture: str, manifest: dict):
+    sys.path.insert(0, os.path.join(SCRIPT_DIR, "level_5"))
+    import records
+    records.CORPUS_DIR = os.path.join(fixture, "level_5", "corpus")
+    records.REPO_DIR = fixture
+    paths = records.corpus_files()
+    return (lambda: sum(len(records.parse_file(path)) for path in paths)), None
+
+
+def setup_auto_corpus(fixture: str, manifest: dict):
+    import itertools
+    module = load_script("auto_corpus", os.path.join(SCRIPT_DIR, "level_3", "auto_corpus.py"))
+
+    def run():
+        lines = 0
+        with open(os.devnull, "w") as out:
+            it = module.generate()
+            while batch := list(itertools.islice(it, module.BATCH_LINES)):
+                out.writelines(batch)
+                lines += len(batch)
+        return lines
+    return run, None
+
+
+def _scaffold(level: int):
+    def setup(fixture: str, manifest: dict):
+        module = load_script(f"level{level}_scaffold", os.path.join(SCRIPT_DIR, f"level_{level}", "scaffold.py"))
+        out = os.path.join(fixture, "scaffold", f"level_{level}")
+        module.BASE = os.path.join(out, "tool_use") if level == 5 else out
+        if level == 5:
+            module.JSON_QA_BASE = os.path.join(out, "json_qa")
+
+        def run():
+            module.main()
+            prompts = 0
+            for root, _dirs, files in os.walk(out):
+                if "prompts.txt" in files:
+                    with open(os.path.join(root, "prompts.txt")) as f:
+                        prompts += sum(1 for line in f if line.strip())
+            return prompts
+        return run, None
+    return setup
+
+
+# name -> (setup, unit, scales with the fixture)
+CASES = {
+    "find_pending_l4": (_find_pending(4), "prompts", True),
+    "find_pending_l5": (_find_pending(5), "prompts", True),
+    "word_frequencies": (setup_word_frequencies, "bytes", True),
+    "next_words": (setup_next_words, "bytes", True),
+    "assemble": (setup_assemble, "bytes", True),
+    "parse_l5": (setup_parse_l5, "examples", True),
+    "auto_corpus": (setup_auto_corpus, "lines", False),
+    "scaffold_l4": (_scaffold(4), "prompts", False),
+    "scaffold_l5": (_scaffold(5), "prompts", False),
+}
+
+
+def run_case(name: str, fixture: str) -> dict:
+    """Set up and time one case in this process (called in a child interpreter)."""
+    with open(os.path.join(fixture, "manifest.json")) as f:
+        manifest = json.load(f)
+    setup, unit, _scaled_case = CASES[name]
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        run, units = setup(fixture, manifest)
+        start = time.perf_counter()
+        result = run()
+        seconds = time.perf_counter() - start
+    if units is None:
+        units = result  # the case counts what it processed
+    return {"seconds": seconds, "units": units, "unit": unit,
+            "peak_rss_mb": peak_rss_mb()}
+
+
+def measure(name: str, fixture: str, repeat: int) -> dict:
+    """Best of repeat runs, each in a fresh interpreter."""
+    best = None
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--run-case", name, fixture],
+                             check=True, capture_output=True, text=True)
+        result = json.loads(out.stdout)
+        if best is None or result["seconds"] < best["seconds"]:
+            peak = max(result["peak_rss_mb"], best["peak_rss_mb"]) if best else result["peak_rss_mb"]
+            best = {**result, "peak_rss_mb": peak}
+        else:
+            best["peak_rss_mb"] = max(best["peak_rss_mb"], result["peak_rss_mb"])
+    best["throughput"] = best["units"] / best["seconds"] if best["seconds"] else 0.0
+    return best
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def format_rate(result: dict) -> str:
+    if result["unit"] == "bytes":
+        return f"{result['throughput'] / 1e6:10.1f} MB/s"
+    return f"{result['throughput']:10.0f} {result['unit']}/s"
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta: float, min_rss_delta: float) -> list[str]:
+    """Print each case against the baseline; return the names that regressed."""
+    regressed = []
+    print(f"\nAgainst baseline ({baseline.get('machine', '?')}, tolerance {tolerance:.0%}):")
+    for key, result in results.items():
+        base = baseline["results"].get(key)
+        if base is None:
+            print(f"  {key:24s} (not in baseline)")
+            continue
+        time_ratio = result["seconds"] / base["seconds"] if base["seconds"] else 1.0
+        rss_ratio = result["peak_rss_mb"] / base["peak_rss_mb"] if base["peak_rss_mb"] else 1.0
+        flag = ""
+        slower = time_ratio > 1 + tolerance and result["seconds"] - base["seconds"] > min_delta
+        bigger = rss_ratio > 1 + tolerance and result["peak_rss_mb"] - base["peak_rss_mb"] > min_rss_delta
+        if slower or bigger:
+            flag = "  REGRESSION"
+            regressed.append(key)
+        print(f"  {key:24s} time {time_ratio:6.2f}x  rss {rss_ratio:6.2f}x{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the local hot paths on synthetic fixtures")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES,
+                        help="Fixture sizes as multiples of the current corpus (default: 1 10 100)")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES),
+                        help="Cases to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case, best kept (default: 3)")
+    parser.add_argument("--fixtures", type=str, default=None,
+                        help="Directory to build fixtures in and reuse (default: a temporary one)")
+    parser.add_argument("--baseline", type=str, default=BASELINE_FILE,
+                        help="Baseline JSON to compare against (default: bench_baseline.json)")
+    parser.add_argument("--save-baseline", type=str, metavar="FILE", help="Write the results as a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Allowed slowdown / RSS growth before a case counts as a regression (default: 0.10)")
+    parser.add_argument("--min-delta", type=float, default=0.05,
+                        help="Ignore slowdowns smaller than this many seconds (default: 0.05)")
+    parser.add_argument("--min-rss-delta", type=float, default=5.0,
+                        help="Ignore RSS growth smaller than this many MB (default: 5)")
+    parser.add_argument("--run-case", nargs=2, metavar=("NAME", "FIXTURE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(*args.run_case)))
+        return
+
+    fixtures = args.fixtures or tempfile.mkdtemp(prefix="bench-")
+    results = {}
+    try:
+        for i, scale in enumerate(args.scales):
+            fixture = os.path.join(fixtures, f"x{scale}")
+            start = time.perf_counter()
+            manifest = build_fixture(fixture, scale)
+            print(f"Fixture x{scale}: {manifest['lines']} lines, {manifest['level_4']['docs']} level 4 and "
+                  f"{manifest['level_5']['docs']} level 5 documents "
+                  f"({time.perf_counter() - start:.1f}s to build)")
+            for name in args.cases:
+                if not CASES[name][2] and i > 0:
+                    continue
+                result = measure(name, fixture, args.repeat)
+                key = f"{name}@x{scale}" if CASES[name][2] else name
+                results[key] = result
+                print(f"  {key:24s} {result['seconds']:8.3f}s {format_rate(result)}  "
+                      f"peak {result['peak_rss_mb']:7.1f} MB")
+    finally:
+        if not args.fixtures:
+            shutil.rmtree(fixtures, ignore_errors=True)
+
+    regressed = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            regressed = compare(results, json.load(f), args.tolerance, args.min_delta,
+                                args.min_rss_delta)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({"machine": f"{platform.system()} {platform.machine()} {os.cpu_count()} cpu",
+                       "python": platform.python_version(), "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if regressed:
+        print(f"\n{len(regressed)} regressions: {', '.join(regressed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput benchmark of the generators against a simulated queue.
+
+Each run starts an in-process mock_fal.py server on a free port, points one
+of the real pipelines at it and calls its main() with the swept settings,
+writing into a scratch copy of its inputs:
+
+    level_4      level_4/generate.py            prompts.txt tree, all pending
+    level_5      level_5/generate.py            prompts.txt tree, all pending
+    dictionary   level_4/generate_dictionary.py a few level 4 stories to rank words
+    expand       level_3/expand.py              corpus.txt, --no-rules
+
+For every (pipeline, --concurrency, --poll-intervals) combination it reports
+completed items/sec, provider calls per item (every fal_client.request, counted
+client-side), the peak number of generator threads (the mock's own threads
+excluded) and p50/p95/p99 time-to-file, measured from the start of the run
+until each output lands. dictionary and expand are sequential, so they only
+sweep the poll interval.
+
+Times are in provider seconds: the mock runs --time-scale times faster and
+measured wall times are divided by it, poll intervals multiplied by it, so the
+numbers read as production numbers. -o writes one CSV row per run for plotting.
+
+Usage:
+    python bench_generate.py                                  # full sweep, table on stdout
+    python bench_generate.py --pipelines level_5 --concurrency 1 5 10 20 -o sweep.csv
+    python bench_generate.py --poll-intervals 0.5 2 --capacity 20 --rate-limit 0.02
+"""
+
+import argparse
+import asyncio
+import contextlib
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import fal_client
+from fal_client import load_script
+from fal_events import percentile
+from mock_fal import DEFAULT_LATENCY, DEFAULT_QUEUE, MockQueue, make_server
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_INTERVAL = 0.002  # seconds between checks for new outputs and threads
+COLUMNS = ["pipeline", "concurrency", "poll_interval", "items", "completed", "failed", "seconds",
+           "items_per_sec", "calls_per_item", "peak_threads", "p50", "p95", "p99"]
+
+
+def _copy_prompts(src_root: str, dst_root: str) -> None:
+    for dirpath, _dirs, files in os.walk(src_root):
+        if "prompts.txt" in files:
+            dst = os.path.join(dst_root, os.path.relpath(dirpath, src_root))
+            os.makedirs(dst, exist_ok=True)
+            shutil.copyfile(os.path.join(dirpath, "prompts.txt"), os.path.join(dst, "prompts.txt"))
+
+
+# ---------------------------------------------------------------------------
+# Pipelines — setup(workdir, n) returns (module, argv, outputs, run). outputs
+# is the list of files the run should write, or the path of the one file it
+# appends to once per item (expand).
+# ---------------------------------------------------------------------------
+
+def _level(level: int):
+    def setup(workdir: str, n: int):
+        corpus = os.path.join(workdir, "corpus")
+        _copy_prompts(os.path.join(SCRIPT_DIR, f"level_{level}", "corpus"), corpus)
+        module = load_script(f"level{level}_generate", os.path.join(SCRIPT_DIR, f"level_{level}", "generate.py"))
+        module.CORPUS_DIR = corpus
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            pending = module.find_pending(corpus)[:n]
+        outputs = [os.path.join(dirpath, filename) for dirpath, filename, _prompt in pending]
+        return module, ["generate.py", "-n", str(n)], outputs, lambda: asyncio.run(module.main())
+    return setup
+
+
+def setup_dictionary(workdir: str, n: int):
+    stories = os.path.join(SCRIPT_DIR, "level_4", "corpus", "stories")
+    corpus = os.path.join(workdir, "corpus")
+    os.makedirs(corpus)
+    for dirpath, _dirs, files in os.walk(stories):
+        for fname in sorted(files)[:4]:
+            if fname.endswith(".corpus"):
+                shutil.copyfile(os.path.join(dirpath, fname), os.path.join(corpus, fname))
+    module = load_script("generate_dictionary", os.path.join(SCRIPT_DIR, "level_4", "generate_dictionary.py"))
+    module.CORPUS_ROOT = corpus
+    module.DICT_DIR = os.path.join(corpus, "dictionary")
+    outputs = [os.path.join(module.DICT_DIR, f"{word}.corpus") for word in module.next_words(n)]
+    return module, ["generate_dictionary.py", "-n", str(n)], outputs, module.main
+
+
+def setup_expand(workdir: str, n: int):
+    module = load_script("expand", os.path.join(SCRIPT_DIR, "level_3", "expand.py"))
+    module.CORPUS_FILE = os.path.join(workdir, "corpus.txt")
+    module.OUTPUT_FILE = os.path.join(workdir, "llm_expanded_corpus.txt")
+    module.PROGRESS_FILE = os.path.join(workdir, "expand_progress.json")
+    shutil.copyfile(os.path.join(SCRIPT_DIR, "level_3", "corpus.txt"), module.CORPUS_FILE)
+    return module, ["expand.py", "-n", str(n), "--no-rules"], module.OUTPUT_FILE, module.main
+
+
+# name -> (setup, takes --concurrency)
+PIPELINES = {
+    "level_4": (_level(4), True),
+    "level_5": (_level(5), True),
+    "dictionary": (setup_dictionary, False),
+    "expand": (setup_expand, False),
+}
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+class Sampler(threading.Thread):
+    """Notes when each output appears (or, for one appended file, each time it
+    grows) and the peak number of threads other than the mock's."""
+
+    def __init__(self, outputs: list[str] | str, start: float):
+        super().__init__(name="bench-sampler", daemon=True)
+        self.outputs = outputs
+        self.start_time = start
+        self.times: list[float] = []
+        self.peak_threads = 0
+        self.stopped = threading.Event()
+
+    def _threads(self) -> int:
+        return sum(1 for t in threading.enumerate()
+                   if t is not self and t.name != "mock-fal" and "process_request_thread" not in t.name)
+
+    def run(self) -> None:
+        appended = self.outputs if isinstance(self.outputs, str) else None
+        waiting = set() if appended else set(self.outputs)
+        size = 0
+        while True:
+            stopping = self.stopped.is_set()  # one last look after the run ends
+            now = time.perf_counter() - self.start_time
+            if appended:
+                new_size = os.path.getsize(appended) if os.path.exists(appended) else 0
+                if new_size != size:
+                    size = new_size
+                    self.times.append(now)
+            else:
+                for path in [p for p in waiting if os.path.exists(p)]:
+                    waiting.discard(path)
+                    self.times.append(now)
+            self.peak_threads = max(self.peak_threads, self._threads())
+            if stopping:
+                break
+            time.sleep(SAMPLE_INTERVAL)
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+
+
+def run_once(pipeline: str, concurrency: int, poll_interval: float, n: int, args) -> dict:
+    setup, concurrent = PIPELINES[pipeline]
+    queue = MockQueue(latency=args.latency or DEFAULT_LATENCY, queue=args.queue, capacity=args.capacity,
+                      rate_limit=args.rate_limit, server_errors=args.server_errors, fail=args.fail,
+                      time_scale=args.time_scale, seed=args.seed)
+    server = make_server(queue, port=0)
+    host, port = server.server_address
+    threading.Thread(target=server.serve_forever, name="mock-fal", daemon=True).start()
+
+    workdir = tempfile.mkdtemp(prefix=f"bench-{pipeline}-")
+    argv = sys.argv
+    fal_request = fal_client.request
+    try:
+        module, script_argv, outputs, run = setup(workdir, n)
+        calls = [0]
+        lock = threading.Lock()
+
+        def counted(*a, **kw):
+            with lock:
+                calls[0] += 1
+            return fal_request(*a, **kw)
+        fal_client.request = counted
+
+        sys.argv = script_argv + ["--base-url", f"http://{host}:{port}/openrouter/router",
+                                  "--poll-interval", str(poll_interval * args.time_scale),
+                                  "--events", os.path.join(workdir, "events.jsonl")]
+        if concurrent:
+            sys.argv += ["--concurrency", str(concurrency)]
+        start = time.perf_counter()
+        sampler = Sampler(outputs, start)
+        sampler.start()
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            run()
+        seconds = time.perf_counter() - start
+        sampler.stop()
+    finally:
+        sys.argv = argv
+        fal_client.request = fal_request
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    scale = args.time_scale
+    times = [t / scale for t in sampler.times]
+    completed = len(times)
+    return {
+        "pipeline": pipeline, "concurrency": concurrency if concurrent else 1, "poll_interval": poll_interval,
+        "items": n, "completed": completed, "failed": n - completed, "seconds": round(seconds / scale, 2),
+        "items_per_sec": round(completed / (seconds / scale), 4) if seconds else 0.0,
+        "calls_per_item": round(calls[0] / n, 2), "peak_threads": sampler.peak_threads,
+        "p50": round(percentile(times, 50), 2), "p95": round(percentile(times, 95), 2),
+        "p99": round(percentile(times, 99), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep generator settings against an in-process mock fal queue")
+    parser.add_argument("--pipelines", nargs="+", choices=list(PIPELINES), default=list(PIPELINES),
+                        help="Pipelines to run (default: all)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 5, 10, 20],
+                        help="-p values for level_4/level_5 (default: 1 2 5 10 20)")
+    parser.add_argument("--poll-intervals", type=float, nargs="+", default=[0.5, 1, 2, 4],
+                        help="Poll intervals in provider seconds (default: 0.5 1 2 4)")
+    parser.add_argument("-n", type=int, default=20, help="Items per run (default: 20)")
+    parser.add_argument("-o", "--output", type=str, help="Also write the results as CSV")
+    # Simulated provider, as in mock_fal.py
+    parser.add_argument("--latency", action="append",
+                        help="MAX_TOKENS:DIST run time bucket, repeatable (default: mock_fal.py's)")
+    parser.add_argument("--queue", type=str, default=DEFAULT_QUEUE, help=f"Queue delay (default: {DEFAULT_QUEUE})")
+    parser.add_argument("--capacity", type=int, default=10, help="Requests served at once (default: 10)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="P(429) per call (default: 0)")
+    parser.add_argument("--server-errors", type=float, default=0.0, help="P(5xx) per call (default: 0)")
+    parser.add_argument("--fail", type=float, default=0.0, help="P(request ends FAILED) (default: 0)")
+    parser.add_argument("--time-scale", type=float, default=0.01,
+                        help="Simulated seconds per provider second (default: 0.01)")
+    parser.add_argument("--seed", type=int, default=0, help="Mock seed (default: 0)")
+    args = parser.parse_args()
+
+    os.environ["FAL_KEY"] = "bench"
+    results = []
+    widths = [max(10, len(c)) for c in COLUMNS]
+    print("  ".join(f"{c:>{w}}" for c, w in zip(COLUMNS, widths)))
+    for pipeline in args.pipelines:
+        concurrencies = args.concurrency if PIPELINES[pipeline][1] else [1]
+        for concurrency in concurrencies:
+            for poll_interval in args.poll_intervals:
+                row = run_once(pipeline, concurrency, poll_interval, args.n, args)
+                results.append(row)
+                print("  ".join(f"{row[c]:>{w}}" for c, w in zip(COLUMNS, widths)), flush=True)
+
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"\nWrote {len(results)} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
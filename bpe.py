@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Train a byte-level BPE tokenizer on the assembled corpora.
+
+Text is split on <stop> (which becomes its own special token) and then into
+words with a GPT-2 style pattern. Word frequencies and the initial pair counts
+are computed in worker processes; the merge loop then only revisits the words
+that contain the merged pair and updates pair counts incrementally, so each
+merge costs time proportional to the words it touches rather than the corpus.
+
+Token ids: 0-255 are raw bytes, 256 is <stop>, merge i produces id 257 + i.
+
+Usage:
+    python bpe.py                                   # 16k vocab from level_5/corpus.corpus
+    python bpe.py --vocab-size 4096 level_3/corpus.corpus
+    python bpe.py level_4/corpus level_5/corpus     # per-file sources (*.corpus, *.txt)
+
+Writes bpe.json (merges + readable vocab). Encoding:
+    tok = BPETokenizer.load("bpe.json")
+    ids = tok.encode("The cat sat on the mat.<stop>")
+    batches = tok.encode_batch(texts, workers=8)
+"""
+
+import argparse
+import heapq
+import json
+import os
+import re
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_INPUT = os.path.join(SCRIPT_DIR, "level_5", "corpus.corpus")
+DEFAULT_OUTPUT = os.path.join(SCRIPT_DIR, "bpe.json")
+
+STOP = "<stop>"
+STOP_ID = 256
+FIRST_MERGE_ID = 257
+CHUNK_CHARS = 1 << 20
+
+WORD_PATTERN = re.compile(r"'(?:[sdmt]|ll|ve|re)| ?[^\W\d_]+| ?\d+| ?[^\s\w]+|\s+(?!\S)|\s+|_+")
+
+
+class BPETokenizer:
+    def __init__(self, merges: list[tuple[int, int]]):
+        self.merges = merges
+        self.ranks = {pair: i for i, pair in enumerate(merges)}
+        self.stop_id = STOP_ID
+        self.vocab_size = FIRST_MERGE_ID + len(merges)
+        self._cache: dict[str, list[int]] = {}
+        self._bytes = [bytes([i]) for i in range(256)] + [STOP.encode()]
+        for a, b in merges:
+            self._bytes.append(self._bytes[a] + self._bytes[b])
+
+    @classmethod
+    def load(cls, path: str) -> "BPETokenizer":
+        with open(path) as f:
+            data = json.load(f)
+        return cls([tuple(pair) for pair in data["merges"]])
+
+    def save(self, path: str) -> None:
+        vocab = [b.decode("utf-8", errors="backslashreplace") for b in self._bytes]
+        with open(path, "w") as f:
+            json.dump({
+                "type": "byte-bpe",
+                "special": {STOP: STOP_ID},
+                "merges": self.merges,
+                "vocab": vocab,
+            }, f, ensure_ascii=False)
+
+    def _encode_word(self, word: str) -> list[int]:
+        ids = list(word.encode("utf-8"))
+        ranks = self.ranks
+        while len(ids) > 1:
+            rank = min((ranks.get(pair, len(ranks)) for pair in zip(ids, ids[1:])))
+            if rank == len(ranks):
+                break
+            a, b = self.merges[rank]
+            merged = FIRST_MERGE_ID + rank
+            out = []
+            i = 0
+            while i < len(ids):
+                if i + 1 < len(ids) and ids[i] == a and ids[i + 1] == b:
+                    out.append(merged)
+                    i += 2
+                else:
+                    out.append(ids[i])
+                    i += 1
+            ids = out
+        return ids
+
+    def encode(self, text: str) -> list[int]:
+        ids: list[int] = []
+        cache = self._cache
+        for n, piece in enumerate(text.split(STOP)):
+            if n:
+                ids.append(STOP_ID)
+            for word in WORD_PATTERN.findall(piece):
+                word_ids = cache.get(word)
+                if word_ids is None:
+                    word_ids = cache[word] = self._encode_word(word)
+                ids.extend(word_ids)
+        return ids
+
+    def encode_batch(self, texts: list[str], workers: int = 0) -> list[list[int]]:
+        """Encode many texts, spreading chunks over worker processes."""
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(texts) < 2 * workers:
+            return [self.encode(t) for t in texts]
+        size = -(-len(texts) // (workers * 4))
+        chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+        with Pool(workers, initializer=_init_encoder, initargs=(self.merges,)) as pool:
+            return [ids for part in pool.map(_encode_texts, chunks) for ids in part]
+
+    def decode(self, ids: list[int]) -> str:
+        return b"".join(self._bytes[i] for i in ids).decode("utf-8", errors="replace")
+
+
+# Set in each encoder worker by _init_encoder
+_ENCODER = None
+
+
+def _init_encoder(merges: list[tuple[int, int]]) -> None:
+    global _ENCODER
+    _ENCODER = BPETokenizer(merges)
+
+
+def _encode_texts(texts: list[str]) -> list[list[int]]:
+    return [_ENCODER.encode(t) for t in texts]
+
+
+# ---------------------------------------------------------------------------
+# Training
+# ---------------------------------------------------------------------------
+
+def _count_words(text: str) -> Counter:
+    counts: Counter = Counter()
+    for piece in text.split(STOP):
+        counts.update(WORD_PATTERN.findall(piece))
+    return counts
+
+
+def _count_pairs(shard: list[tuple[int, tuple[int, ...], int]]) -> tuple[Counter, dict]:
+    """Pair counts and pair -> word indices for a shard of (index, ids, freq)."""
+    counts: Counter = Counter()
+    where: dict[tuple[int, int], list[int]] = {}
+    for idx, ids, freq in shard:
+        for pair in set(zip(ids, ids[1:])):
+            where.setdefault(pair, []).append(idx)
+        for pair in zip(ids, ids[1:]):
+            counts[pair] += freq
+    return counts, where
+
+
+def read_chunks(paths: list[str]) -> list[str]:
+    """Text of every input file (directories are walked for .corpus/.txt files), ~1 MB per chunk."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _dirs, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in names
+                             if n.endswith((".corpus", ".txt")) and n != "prompts.txt")
+        else:
+            files.append(path)
+
+    chunks, current, size = [], [], 0
+    for path in sorted(files):
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            text = f.read()
+        # Cut large files at line boundaries so every worker gets a share
+        while len(text) > CHUNK_CHARS:
+            cut = text.find("\n", CHUNK_CHARS) + 1 or len(text)
+            current.append(text[:cut])
+            chunks.append("".join(current))
+            current, size, text = [], 0, text[cut:]
+        current.append(text)
+        size += len(text)
+        if size >= CHUNK_CHARS:
+            chunks.append("".join(current))
+            current, size = [], 0
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+def train(chunks: list[str], vocab_size: int, workers: int, verbose: bool = True) -> BPETokenizer:
+    workers = workers or os.cpu_count() or 1
+    with Pool(workers) as pool:
+        word_counts: Counter = Counter()
+        for counts in pool.imap_unordered(_count_words, chunks):
+            word_counts.update(counts)
+
+        words = [list(w.encode("utf-8")) for w in word_counts]
+        freqs = list(word_counts.values())
+        if verbose:
+            print(f"  {len(words)} unique words from {sum(freqs)} occurrences", flush=True)
+
+        shard_size = -(-len(words) // workers) or 1
+        shards = [
+            [(i, tuple(words[i]), freqs[i]) for i in range(start, min(start + shard_size, len(words)))]
+            for start in range(0, len(words), shard_size)
+        ]
+        pair_counts: Counter = Counter()
+        where: dict[tuple[int, int], set[int]] = {}
+        for counts, shard_where in pool.imap_unordered(_count_pairs, shards):
+            pair_counts.update(counts)
+            for pair, indices in shard_where.items():
+                where.setdefault(pair, set()).update(indices)
+
+    heap = [(-count, pair) for pair, count in pair_counts.items()]
+    heapq.heapify(heap)
+    merges: list[tuple[int, int]] = []
+    start = time.time()
+
+    while len(merges) < vocab_size - FIRST_MERGE_ID and heap:
+        neg_count, pair = heapq.heappop(heap)
+        if pair_counts.get(pair, 0) != -neg_count:
+            continue  # stale heap entry
+        if -neg_count < 2:
+            break
+        merged = FIRST_MERGE_ID + len(merges)
+        merges.append(pair)
+        a, b = pair
+        changed: set[tuple[int, int]] = set()
+
+        for idx in where.pop(pair, ()):
+            ids = words[idx]
+            freq = freqs[idx]
+            new = []
+            i = 0
+            while i < len(ids):
+                if i + 1 < len(ids) and ids[i] == a and ids[i + 1] == b:
+                    new.append(merged)
+                    i += 2
+                else:
+                    new.append(ids[i])
+                    i += 1
+            if len(new) == len(ids):
+                continue
+            # Incremental update: retract this word's old pairs, add its new ones
+            for p in zip(ids, ids[1:]):
+                pair_counts[p] -= freq
+                changed.add(p)
+            for p in zip(new, new[1:]):
+                pair_counts[p] += freq
+                changed.add(p)
+                where.setdefault(p, set()).add(idx)
+            words[idx] = new
+
+        pair_counts.pop(pair, None)
+        for p in changed:
+            count = pair_counts.get(p, 0)
+            if count > 0:
+                heapq.heappush(heap, (-count, p))
+            elif p in pair_counts:
+                del pair_counts[p]
+
+        if verbose and len(merges) % 1000 == 0:
+            print(f"  {len(merges)} merges ({time.time() - start:.1f}s)", flush=True)
+
+    return BPETokenizer(merges)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a byte-level BPE tokenizer on the corpora")
+    parser.add_argument(
+        "inputs", nargs="*", default=[DEFAULT_INPUT],
+        help="corpus.corpus files or source directories (default: level_5/corpus.corpus)",
+    )
+    parser.add_argument(
+        "--vocab-size", type=int, default=16384,
+        help="Target vocabulary size including bytes and <stop> (default: 16384)",
+    )
+    parser.add_argument(
+        "-o", "--output", default=DEFAULT_OUTPUT,
+        help="Where to write the tokenizer (default: bpe.json)",
+    )
+    parser.add_argument(
+        "-p", "--workers", type=int, default=os.cpu_count() or 1,
+        help="Counting processes (default: all cores)",
+    )
+    args = parser.parse_args()
+
+    if args.vocab_size > 65536:
+        parser.error("--vocab-size must be <= 65536 so token ids fit in uint16")
+
+    start = time.time()
+    chunks = read_chunks(args.inputs)
+    print(f"Read {sum(len(c) for c in chunks) / 1e6:.1f}M characters in {len(chunks)} chunks", flush=True)
+    tokenizer = train(chunks, args.vocab_size, args.workers)
+    tokenizer.save(args.output)
+    print(f"Wrote {os.path.relpath(args.output)} (vocab {tokenizer.vocab_size}) "
+          f"in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Random access to an assembled level_N/corpus.corpus through its offset index.
+
+assemble.py writes, next to every corpus.corpus:
+
+    corpus.index.bin    one fixed-size entry per record: byte start, byte end,
+                        source id, level (struct RECORD_FORMAT)
+    corpus.index.json   the source table (path, level, category) and counts
+
+Held-out splits (see `assemble.py --split`) live beside it as
+corpus.val.corpus / corpus.test.corpus with their own indexes.
+
+A record is one line for levels 0-3 and one <stop>-terminated document for
+levels 4-5. CorpusDataset memory-maps both files, so len(), indexing and
+random sampling cost O(1) per record and never read the whole corpus.
+
+Usage:
+    ds = CorpusDataset("level_5")            # or CorpusDataset("level_5", split="val")
+    len(ds), ds[0], ds[10:20]
+    stories = ds.filter(categories=["stories"])
+    for text in ds.shard(num_shards=4, shard_id=worker_id, seed=0, epoch=epoch):
+        ...
+
+    python dataset.py level_5                 # summary of the index
+    python dataset.py level_5 --sample 3      # print three random records
+"""
+
+import argparse
+import json
+import mmap
+import os
+import random
+import struct
+from array import array
+
+RECORD_FORMAT = "<QQIHH"  # start, end, source id, level, reserved
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+SPLITS = ("train", "val", "test")
+
+
+def corpus_prefix(level_dir: str, split: str = "train") -> str:
+    """Path prefix of a split's files: train is corpus.*, the others corpus.<split>.*"""
+    if split not in SPLITS:
+        raise ValueError(f"unknown split {split!r}")
+    return os.path.join(level_dir, "corpus" if split == "train" else f"corpus.{split}")
+
+
+def source_category(source: str) -> str:
+    """Category of a source path: the directories under corpus/ for generated
+    documents ("encyclopedia/science/physics"), else the file's stem ("auto_corpus")."""
+    parts = source.split("/")
+    if "corpus" in parts[1:-1]:
+        return "/".join(parts[parts.index("corpus", 1) + 1:-1])
+    return os.path.splitext(parts[-1])[0]
+
+
+def write_index(prefix: str, entries: list[tuple[int, int, int, str]]) -> None:
+    """Write <prefix>.index.{bin,json} from (start, end, level, source) entries."""
+    source_ids: dict[tuple[int, str], int] = {}
+    with open(prefix + ".index.bin", "wb") as f:
+        for start, end, level, source in entries:
+            sid = source_ids.setdefault((level, source), len(source_ids))
+            f.write(struct.pack(RECORD_FORMAT, start, end, sid, level, 0))
+    with open(prefix + ".index.json", "w") as f:
+        json.dump({
+            "format": 1,
+            "record_format": RECORD_FORMAT,
+            "records": len(entries),
+            "sources": [
+                {"path": source, "level": level, "category": source_category(source)}
+                for level, source in source_ids
+            ],
+        }, f, indent=1)
+
+
+class IndexedView:
+    """Indexable view over the records of a fixed-size entry index.
+
+    Subclasses open their files in __init__(*REOPEN attributes, ids), set
+    ENTRY to the index's struct and decode one entry in _load(). Slices and
+    filters share the open maps; pickling reopens them (mmaps don't pickle).
+    """
+
+    ENTRY: struct.Struct
+    REOPEN: tuple[str, ...] = ()
+
+    def _view(self, ids: range | array) -> "IndexedView":
+        view = object.__new__(type(self))
+        view.__dict__.update(self.__dict__)
+        view._ids = ids
+        return view
+
+    def _entry(self, i: int) -> tuple:
+        return self.ENTRY.unpack_from(self._index, i * self.ENTRY.size)
+
+    def _load(self, entry: tuple):
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, i: int | slice):
+        if isinstance(i, slice):
+            return self._view(self._ids[i])
+        return self._load(self._entry(self._ids[i]))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    # mmaps don't pickle; reopen them in the data-loader worker instead
+    def __getstate__(self) -> dict:
+        return {**{name: getattr(self, name) for name in self.REOPEN}, "ids": self._ids}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
+
+
+class CorpusDataset(IndexedView):
+    """Indexable, filterable view over the records of one assembled level."""
+
+    ENTRY = struct.Struct(RECORD_FORMAT)
+    REOPEN = ("level_dir", "split")
+
+    def __init__(self, level_dir: str, split: str = "train", ids: range | array | None = None):
+        self.level_dir = level_dir
+        self.split = split
+        prefix = corpus_prefix(level_dir, split)
+        with open(prefix + ".index.json") as f:
+            meta = json.load(f)
+        self.sources = meta["sources"]
+        self._data = map_file(prefix + ".corpus")
+        self._index = map_file(prefix + ".index.bin")
+        self._ids = range(meta["records"]) if ids is None else ids
+
+    def _load(self, entry: tuple) -> str:
+        start, end, _sid, _level, _ = entry
+        return self._data[start:end].decode("utf-8")
+
+    def record(self, i: int) -> dict:
+        """Index entry of the i-th record: level, source, category and byte range."""
+        start, end, sid, level, _ = self._entry(self._ids[i])
+        source = self.sources[sid]
+        return {"level": level, "source": source["path"], "category": source["category"],
+                "start": start, "end": end}
+
+    def filter(self, levels: list[int] | None = None,
+               categories: list[str] | None = None) -> "CorpusDataset":
+        """Records introduced by one of `levels` and/or under one of `categories`
+        (a category matches itself and anything nested below it)."""
+        wanted = set()
+        for sid, source in enumerate(self.sources):
+            if levels is not None and source["level"] not in levels:
+                continue
+            if categories is not None and not any(
+                source["category"] == c or source["category"].startswith(c + "/") for c in categories
+            ):
+                continue
+            wanted.add(sid)
+        ids = array("Q")
+        for i in self._ids:
+            if self._entry(i)[2] in wanted:
+                ids.append(i)
+        return self._view(ids)
+
+    def shard(self, num_shards: int, shard_id: int, seed: int | None = None,
+              epoch: int = 0) -> "CorpusDataset":
+        """Deterministic 1/num_shards of the records for one data-loader worker.
+
+        With a seed the records are first permuted (differently per epoch);
+        every worker computes the same permutation, so shards never overlap.
+        """
+        if not 0 <= shard_id < num_shards:
+            raise ValueError(f"shard_id must be in [0, {num_shards})")
+        ids = self._ids
+        if seed is not None:
+            ids = array("Q", ids)
+            random.Random(f"{seed}:{epoch}").shuffle(ids)
+        return self._view(ids[shard_id::num_shards])
+
+    def sample(self, rng: random.Random | None = None) -> str:
+        """One uniformly random record."""
+        return self[(rng or random).randrange(len(self))]
+
+
+def map_file(path: str) -> mmap.mmap | bytes:
+    """Read-only memory map of a file (b"" for an empty one)."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""  # mmap refuses empty files
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect an assembled level's record index")
+    parser.add_argument("level_dir", help="Level directory, e.g. level_5")
+    parser.add_argument("--split", choices=SPLITS, default="train", help="Split to inspect (default: train)")
+    parser.add_argument("--sample", type=int, default=0, help="Print N random records")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for --sample")
+    args = parser.parse_args()
+
+    ds = CorpusDataset(args.level_dir, args.split)
+    print(f"{len(ds)} records from {len(ds.sources)} sources")
+    by_level: dict[int, int] = {}
+    for source in ds.sources:
+        by_level[source["level"]] = by_level.get(source["level"], 0) + 1
+    for level, count in sorted(by_level.items()):
+        print(f"  level {level}: {len(ds.filter(levels=[level]))} records, {count} sources")
+
+    rng = random.Random(args.seed)
+    for _ in range(args.sample):
+        i = rng.randrange(len(ds))
+        print(f"\n--- {ds.record(i)['source']} ---\n{ds[i]}", end="")
+
+
+if __name__ == "__main__":
+    main()
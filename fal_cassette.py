@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Record fal queue traffic to a cassette file and replay it later.
+
+The generators route every fal call through fal_client.request(api_key,
+method, url, body). With --record FILE that function is wrapped so each
+request's life is written down as one JSON line:
+
+    {"key": <hash of the submit body>, "body": {...submitted body...},
+     "submit": {...submit response...},
+     "events": [[0.41, "status", {"status": "IN_QUEUE", ...}],
+                [2.43, "status", {"status": "IN_PROGRESS"}],
+                [3.10, "http", 429],
+                [18.9, "status", {"status": "COMPLETED"}],
+                [18.95, "result", {"output": "...", ...}]]}
+
+Times are seconds since the submit; polls only record a status when it
+changes, so a cassette stays small (gzip it by naming it *.gz). A submit
+rejected with an HTTP error is a line with "submit": null; requests still in
+flight when the run ends are written out as they stand.
+
+With --replay FILE the same calls are answered from the cassette without
+any network: a submit takes the next unused recording of an identical body
+and fails when there is none, so a request the cassette never saw is
+reported failed rather than answered with another prompt's output (which
+would be written into the wrong file). Status polls see the recorded states
+at the recorded times, scaled by --replay-speed (2 = twice as fast).
+--replay-speed 0 ignores time and steps through each recording's states one
+poll at a time, which is fully deterministic.
+
+Usage:
+    python level_5/generate.py -n 50 --record run.jsonl.gz
+    python level_5/generate.py -n 50 --replay run.jsonl.gz --replay-speed 10
+    python fal_cassette.py run.jsonl.gz        # summarize a cassette
+"""
+
+import argparse
+import atexit
+import email.message
+import gzip
+import hashlib
+import json
+import re
+import statistics
+import threading
+import time
+import urllib.error
+
+_REQUEST_ID = re.compile(r"/requests/([^/]+)(/status)?$")
+TERMINAL = ("COMPLETED", "FAILED", "CANCELLED")
+
+
+def body_key(body: dict | None) -> str:
+    return hashlib.blake2b(json.dumps(body, sort_keys=True).encode(), digest_size=8).hexdigest()
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def load(path: str) -> list[dict]:
+    with _open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _http_error(url: str, code: int) -> urllib.error.HTTPError:
+    # Retry-After 0: the recording's own timeline already holds the wait that followed
+    headers = email.message.Message()
+    headers["Retry-After"] = "0"
+    return urllib.error.HTTPError(url, code, f"HTTP Error {code} (replayed)", headers, None)
+
+
+class Cassette:
+    """Wraps fal_client.request to record to, or replay from, path."""
+
+    def __init__(self, path: str, mode: str, speed: float = 1.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"mode must be record or replay, not {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.speed = speed
+        self.lock = threading.Lock()
+        self.active: dict[str, dict] = {}  # request id -> in-flight recording / replay state
+        if mode == "record":
+            self._out = _open(path, "w")
+            atexit.register(self.close)
+        else:
+            self.recordings = load(path)
+            self._unused = list(range(len(self.recordings)))
+
+    def wrap(self, fal_request):
+        """A drop-in replacement for fal_request(api_key, method, url, body)."""
+        if self.mode == "record":
+            return lambda api_key, method, url, body=None: self._record(fal_request, api_key, method, url, body)
+        return lambda api_key, method, url, body=None: self._replay(method, url, body)
+
+    def close(self) -> None:
+        """Write out requests that never finished (e.g. a poll failed) and close the file."""
+        if self.mode == "record" and not self._out.closed:
+            for entry in list(self.active.values()):
+                self._write({k: entry[k] for k in ("key", "body", "submit", "events")})
+            self.active.clear()
+            self._out.close()
+
+    # -- recording -----------------------------------------------------------
+
+    def _write(self, entry: dict) -> None:
+        with self.lock:
+            self._out.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self._out.flush()
+
+    def _record(self, fal_request, api_key: str, method: str, url: str, body: dict | None) -> dict:
+        match = _REQUEST_ID.search(url)
+        if method == "POST":
+            start = time.monotonic()
+            try:
+                response = fal_request(api_key, method, url, body)
+            except urllib.error.HTTPError as e:
+                self._write({"key": body_key(body), "body": body, "submit": None, "events": [[0.0, "http", e.code]]})
+                raise
+            with self.lock:
+                self.active[response["request_id"]] = {
+                    "start": start, "key": body_key(body), "body": body, "submit": response, "events": []}
+            return response
+
+        entry = self.active.get(match.group(1)) if match else None
+        if entry is None:
+            return fal_request(api_key, method, url, body)
+        events = entry["events"]
+        try:
+            response = fal_request(api_key, method, url, body)
+        except urllib.error.HTTPError as e:
+            events.append([round(time.monotonic() - entry["start"], 3), "http", e.code])
+            raise
+        t = round(time.monotonic() - entry["start"], 3)
+        if match.group(2):
+            last = next((e[2] for e in reversed(events) if e[1] == "status"), None)
+            if last is None or last.get("status") != response.get("status"):
+                events.append([t, "status", response])
+            if response.get("status") not in ("FAILED", "CANCELLED"):
+                return response
+        else:
+            events.append([t, "result", response])
+        with self.lock:
+            self.active.pop(match.group(1), None)
+        self._write({k: entry[k] for k in ("key", "body", "submit", "events")})
+        return response
+
+    # -- replay ----------------------------------------------------------------
+
+    def _take(self, body: dict | None) -> dict:
+        key = body_key(body)
+        with self.lock:
+            pick = next((i for i in self._unused if self.recordings[i]["key"] == key), None)
+            if pick is None:
+                raise RuntimeError(f"cassette {self.path} has no unused recording of this request (body {key})")
+            self._unused.remove(pick)
+        return self.recordings[pick]
+
+    def _replay(self, method: str, url: str, body: dict | None) -> dict:
+        if method == "POST":
+            recording = self._take(body)
+            if recording["submit"] is None:
+                raise _http_error(url, recording["events"][0][2])
+            with self.lock:
+                self.active[recording["submit"]["request_id"]] = {
+                    "start": time.monotonic(), "events": recording["events"], "next": 0, "status": None}
+            return recording["submit"]
+
+        match = _REQUEST_ID.search(url)
+        state = self.active.get(match.group(1)) if match else None
+        if state is None:
+            raise _http_error(url, 404)
+        events = state["events"]
+        if not match.group(2):
+            # A result fetch sees any error recorded for it, then the result
+            while state["next"] < len(events):
+                t, kind, value = events[state["next"]]
+                state["next"] += 1
+                if kind == "http":
+                    raise _http_error(url, value)
+                if kind == "result":
+                    return value
+            raise RuntimeError(f"recording of {match.group(1)} has no result")
+
+        # Consume the events that are due: all up to now, or one per poll at speed 0
+        elapsed = (time.monotonic() - state["start"]) * self.speed
+        while state["next"] < len(events):
+            t, kind, value = events[state["next"]]
+            if self.speed and t > elapsed and state["status"] is not None:
+                break
+            if kind == "result":
+                break
+            state["next"] += 1
+            if kind == "http":
+                raise _http_error(url, value)
+            state["status"] = value
+            if not self.speed or value.get("status") in TERMINAL:
+                break
+        else:
+            if (state["status"] or {}).get("status") not in TERMINAL:
+                raise RuntimeError(f"recording of {match.group(1)} ends before the request finished")
+        return state["status"]
+
+
+def summarize(recordings: list[dict]) -> None:
+    submitted = [r for r in recordings if r["submit"] is not None]
+    first_seen: dict[str, list[float]] = {}
+    errors: dict[int, int] = {}
+    for r in recordings:
+        for t, kind, value in r["events"]:
+            if kind == "status":
+                first_seen.setdefault(value.get("status"), []).append(t)
+            elif kind == "http":
+                errors[value] = errors.get(value, 0) + 1
+    print(f"{len(recordings)} recordings, {len(submitted)} submitted, "
+          f"{len(recordings) - len(submitted)} rejected at submit")
+    for status, times in first_seen.items():
+        print(f"  {status:12s} first seen after {statistics.median(times):7.2f}s median, "
+              f"{max(times):7.2f}s max ({len(times)} requests)")
+    for code, n in sorted(errors.items()):
+        print(f"  HTTP {code}: {n}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a fal cassette recorded with --record")
+    parser.add_argument("cassette")
+    args = parser.parse_args()
+    summarize(load(args.cassette))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+fal.ai queue client shared by the generators (level_3/expand.py,
+level_4/generate.py, level_4/generate_dictionary.py, level_5/generate.py)
+and orchestrate.py.
+
+Every fal call goes through request(api_key, method, url, body), one
+urllib request per call. Callers swap it for something else by rebinding
+fal_client.request: orchestrate.py installs a pooled, rate-limited
+FalClient, --record/--replay a fal_cassette.Cassette around it, and
+bench_generate.py a call counter. complete() submits a body to the queue,
+polls it to completion and fetches the output, retrying calls answered
+429/500/502/503 (after Retry-After, or with exponential backoff), and
+reports each step to an on_event(event, **fields) hook: one of
+open_events()'s log, which also drives the progress display and the
+--budget ledger. add_arguments() gives each generator the options for all of
+this, and setup() loads the key and installs the cassette they ask for.
+
+    api_key = load_key("FAL_KEY")
+    output = complete(api_key, {"model": ..., "system_prompt": ..., "prompt": ...,
+                                "temperature": 0.8, "max_tokens": 4096})
+"""
+
+import argparse
+import importlib.util
+import io
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+
+from fal_costs import Ledger
+from fal_events import EVENTS_FILE, EventLog
+from fal_progress import Progress
+
+# Override with $FAL_QUEUE_URL or --base-url, e.g. to point at a mock_fal.py server
+FAL_QUEUE_URL = os.environ.get("FAL_QUEUE_URL", "https://queue.fal.run/openrouter/router")
+
+# Seconds between status polls; --poll-interval overrides
+POLL_INTERVAL = 2
+
+# HTTP statuses complete() retries, how often, and the longest it waits in between
+RETRY_CODES = (429, 500, 502, 503)
+MAX_RETRIES = 5
+MAX_BACKOFF = 60
+
+
+def load_key(name: str) -> str | None:
+    """Read a key from the environment, else ~/.env (KEY=VALUE format)."""
+    if os.environ.get(name):
+        return os.environ[name]
+    env_path = os.path.expanduser("~/.env")
+    if not os.path.exists(env_path):
+        return None
+    with open(env_path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if "=" in line:
+                k, v = line.split("=", 1)
+                if k.strip() == name:
+                    return v.strip()
+    return None
+
+
+def load_script(name: str, path: str):
+    """Import a script by path as a fresh module (level_4 and level_5 both have a
+    generate.py); its directory goes on sys.path for its sibling imports."""
+    sys.path.insert(0, os.path.dirname(path))
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """The queue, cassette, event log and budget options every generator takes;
+    --no-events sets args.events to None."""
+    parser.add_argument(
+        "--base-url", type=str, default=FAL_QUEUE_URL,
+        help="Queue endpoint (default: $FAL_QUEUE_URL or fal.ai)",
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=POLL_INTERVAL,
+        help=f"Seconds between status polls (default: {POLL_INTERVAL})",
+    )
+    parser.add_argument(
+        "--record", type=str, metavar="FILE",
+        help="Record all fal traffic to a cassette file (*.gz to compress)",
+    )
+    parser.add_argument(
+        "--replay", type=str, metavar="FILE",
+        help="Answer fal calls from a recorded cassette instead of the network",
+    )
+    parser.add_argument(
+        "--replay-speed", type=float, default=1.0,
+        help="Replay time compression (default: 1 = recorded timing, 0 = no waiting)",
+    )
+    parser.add_argument(
+        "--events", type=str, default=EVENTS_FILE, metavar="FILE",
+        help="Append request lifecycle events to FILE (default: fal_events.jsonl in the repo root)",
+    )
+    parser.add_argument(
+        "--no-events", dest="events", action="store_const", const=None,
+        help="Don't write the event log",
+    )
+    parser.add_argument(
+        "--budget", type=float, metavar="USD",
+        help="Stop submitting once the projected spend of this run would pass USD",
+    )
+
+
+def setup(args: argparse.Namespace) -> str:
+    """The API key for a run with add_arguments()'s options ("replay" stands in
+    for it when replaying), after installing its cassette; exits without one."""
+    api_key = load_key("FAL_KEY") or ("replay" if args.replay else None)
+    if not api_key:
+        print("ERROR: FAL_KEY not found in the environment or ~/.env", file=sys.stderr)
+        sys.exit(1)
+    if args.record or args.replay:
+        use_cassette(args.record, args.replay, args.replay_speed)
+    return api_key
+
+
+def request(api_key: str, method: str, url: str, body: dict | None = None) -> dict:
+    """Make an authenticated request to fal.ai and return parsed JSON."""
+    import urllib.request  # with http.client and ssl, ~10 MB that load_script() users don't need
+    data = json.dumps(body).encode() if body else None
+    req = urllib.request.Request(
+        url,
+        data=data,
+        method=method,
+        headers={
+            "Authorization": f"Key {api_key}",
+            "Content-Type": "application/json",
+        },
+    )
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read().decode())
+
+
+def use_cassette(record: str | None, replay: str | None, speed: float) -> None:
+    """Record request() traffic to, or replay it from, a cassette (see fal_cassette.py)."""
+    global request
+    from fal_cassette import Cassette
+    request = Cassette(record or replay, "record" if record else "replay", speed).wrap(request)
+
+
+def open_events(path: str | None, level: str, total: int, concurrency: int = 1, budget: float | None = None):
+    """A fal_events.EventLog appending to path (None: no file) that also drives
+    the run's fal_progress.Progress display, and the fal_costs.Ledger pricing
+    its requests against budget; close() the log when done."""
+    events = EventLog(path, level)
+    ledger = Ledger(events, budget)
+    events.listeners += [ledger, Progress(level, total, concurrency)]
+    return events, ledger
+
+
+def no_event(event: str, **fields) -> None:
+    """on_event for runs without an event log."""
+
+
+def retry_wait(error: urllib.error.HTTPError, retry: int) -> float:
+    """Seconds to wait before retry number retry (1-based): the response's
+    Retry-After when it gives seconds, else exponential backoff."""
+    after = error.headers.get("Retry-After") if error.headers else None
+    if after and after.strip().isdigit():
+        return min(float(after), MAX_BACKOFF)
+    return min(2.0 ** (retry - 1), MAX_BACKOFF)
+
+
+def call(api_key: str, method: str, url: str, body: dict | None = None, on_event=no_event) -> dict:
+    """request(), retried up to MAX_RETRIES times on a 429 or 5xx; each retry is
+    reported as a retry event (code, wait) of the same attempt."""
+    for retry in range(1, MAX_RETRIES + 2):
+        try:
+            return request(api_key, method, url, body)
+        except urllib.error.HTTPError as e:
+            if e.code not in RETRY_CODES or retry > MAX_RETRIES:
+                raise
+            wait = retry_wait(e, retry)
+            on_event("retry", code=e.code, wait=wait)
+            time.sleep(wait)
+
+
+def complete(api_key: str, body: dict, base_url: str = FAL_QUEUE_URL, poll_interval: float = POLL_INTERVAL,
+             on_event=no_event) -> str:
+    """Submit body to the queue, poll until it completes and return its stripped output."""
+    # 1. Submit to queue
+    submit = call(api_key, "POST", base_url, body, on_event)
+    request_id = submit["request_id"]
+    on_event("submit", request_id=request_id)
+    status_url = f"{base_url}/requests/{request_id}/status"
+    result_url = f"{base_url}/requests/{request_id}"
+
+    # 2. Poll for completion
+    last_state = None
+    while True:
+        status = call(api_key, "GET", status_url, on_event=on_event)
+        state = status.get("status")
+        if state != last_state:
+            last_state = state
+            on_event("status", status=state)
+        if state == "COMPLETED":
+            on_event("completed")
+            break
+        if state in ("FAILED", "CANCELLED"):
+            raise RuntimeError(f"Request {state}: {status}")
+        time.sleep(poll_interval)
+
+    # 3. Fetch result
+    result = call(api_key, "GET", result_url, on_event=on_event)
+    on_event("fetched", input_chars=len(body["system_prompt"]) + len(body["prompt"]),
+             output_chars=len(result.get("output") or ""),
+             **({"usage": result["usage"]} if result.get("usage") else {}))
+    if result.get("error"):
+        raise RuntimeError(result["error"])
+    return result["output"].strip()
+
+
+class FalClient:
+    """A request() for many threads: keep-alive connections pooled per host,
+    and one token bucket pacing all calls (rate None: unlimited)."""
+
+    def __init__(self, rate: float | None = None, burst: int = 10, timeout: float = 30):
+        self.rate = rate
+        self.burst = burst
+        self.timeout = timeout
+        self.tokens = float(burst)
+        self.stamp = time.monotonic()
+        self.idle: dict[tuple[str, str], list] = {}
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.connections = 0
+        self.throttled = 0.0  # seconds callers spent waiting for the limiter
+
+    def _throttle(self) -> None:
+        if not self.rate:
+            return
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate) - 1
+            self.stamp = now
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.throttled += wait
+        time.sleep(wait)
+
+    def _connect(self, scheme: str, netloc: str):
+        import http.client
+        with self.lock:
+            self.connections += 1
+        connection = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return connection(netloc, timeout=self.timeout)
+
+    def __call__(self, api_key: str, method: str, url: str, body: dict | None = None) -> dict:
+        self._throttle()
+        parts = urllib.parse.urlsplit(url)
+        host = (parts.scheme, parts.netloc)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        data = json.dumps(body).encode() if body else None
+        headers = {"Authorization": f"Key {api_key}", "Content-Type": "application/json"}
+        with self.lock:
+            self.calls += 1
+            pooled = self.idle.get(host)
+            conn = pooled.pop() if pooled else None
+        reused = conn is not None
+        conn = conn or self._connect(*host)
+        while True:
+            try:
+                conn.request(method, path, body=data, headers=headers)
+                resp = conn.getresponse()
+                payload = resp.read()
+                break
+            except (ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if not reused:
+                    raise
+                # The server dropped the idle connection; retry once on a new one
+                reused = False
+                conn = self._connect(*host)
+            except Exception:
+                conn.close()
+                raise
+        if resp.will_close:
+            conn.close()
+        else:
+            with self.lock:
+                self.idle.setdefault(host, []).append(conn)
+        if resp.status >= 400:
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, io.BytesIO(payload))
+        return json.loads(payload.decode())
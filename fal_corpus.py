@@ -0,0 +1,152 @@
+"""
+The prompts.txt-driven generator behind level_4/generate.py and
+level_5/generate.py.
+
+Each prompts.txt under a level's corpus/ lists "<file>.corpus <prompt>" lines;
+the files that don't exist yet are pending. A run forecasts them (-n 0, see
+fal_estimate.py) or generates the first -n in fal_schedule.py's dispatch
+order, --concurrency at a time. The scripts only supply their level, corpus
+directory, system prompt, output cap and generate_one(), and pass them in at
+call time, so a caller that repoints a script's CORPUS_DIR (bench_generate.py)
+is honored.
+"""
+
+import argparse
+import asyncio
+import functools
+import os
+
+from fal_client import add_arguments, open_events, setup
+from fal_events import EVENTS_FILE
+
+
+def find_pending(corpus_dir: str) -> list[tuple[str, str, str]]:
+    """Return list of (directory, filename, prompt) for missing .corpus files."""
+    pending = []
+    for root, _dirs, files in os.walk(corpus_dir):
+        if "prompts.txt" not in files:
+            continue
+        prompts_path = os.path.join(root, "prompts.txt")
+        with open(prompts_path) as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                parts = line.split(" ", 1)
+                if len(parts) != 2:
+                    print(f"WARNING: bad format at {prompts_path}:{line_no}, skipping")
+                    continue
+                filename, prompt = parts
+                if not filename.endswith(".corpus"):
+                    print(f"WARNING: filename doesn't end with .corpus at {prompts_path}:{line_no}, skipping")
+                    continue
+                filepath = os.path.join(root, filename)
+                if not os.path.exists(filepath):
+                    pending.append((root, filename, prompt))
+    return pending
+
+
+def write_file(path: str, content: str) -> int:
+    """Write a generated .corpus file; returns its output chars."""
+    with open(path, "w") as f:
+        f.write(content + "\n")
+    return len(content)
+
+
+def jobs(corpus_dir: str, system_prompt: str, max_tokens: int, n: int, model: str,
+         log: str | None = EVENTS_FILE) -> list[tuple]:
+    """Work for orchestrate.py: (prompt id, generate_one's prompt, input chars,
+    write(content) -> output chars) for the n files a run would generate first."""
+    from fal_schedule import schedule
+    pending = find_pending(corpus_dir)
+    return [(os.path.relpath(os.path.join(dirpath, filename), corpus_dir), prompt, len(system_prompt) + len(prompt),
+             functools.partial(write_file, os.path.join(dirpath, filename)))
+            for dirpath, filename, prompt in schedule(pending, n, corpus_dir, max_tokens, model, [], True, log)]
+
+
+async def generate_task(sem: asyncio.Semaphore, api_key: str, corpus_dir: str, system_prompt: str, max_tokens: int,
+                        generate_one, dirpath: str, filename: str, prompt: str, args: argparse.Namespace, events,
+                        ledger) -> None:
+    rel = os.path.relpath(os.path.join(dirpath, filename), corpus_dir)
+    async with sem:
+        on_event = events.request(rel, args.model)
+        while (fits := ledger.reserve(args.model, len(system_prompt) + len(prompt), max_tokens)) is None:
+            await asyncio.sleep(args.poll_interval)
+        if not fits:
+            on_event("skipped", reason="budget")
+            return
+        try:
+            content = await asyncio.to_thread(generate_one, api_key, prompt, args.model, args.base_url,
+                                              args.poll_interval, on_event)
+            on_event("written", output_chars=write_file(os.path.join(dirpath, filename), content))
+        except Exception as e:
+            on_event("failed", error=str(e))
+
+
+async def main(level: str, corpus_dir: str, system_prompt: str, max_tokens: int, generate_one) -> None:
+    parser = argparse.ArgumentParser(description="Generate missing .corpus files from prompts.txt")
+    parser.add_argument(
+        "-n", type=int, default=10,
+        help="Max number of files to generate (0 = dry-run, default: 10)",
+    )
+    parser.add_argument(
+        "--model", type=str, default="qwen/qwen3.5-plus-02-15",
+        help="Model to use (default: qwen/qwen3.5-plus-02-15)",
+    )
+    parser.add_argument(
+        "--schedule", choices=["longest", "walk"], default="longest",
+        help="Dispatch order: longest expected first (default) or prompts.txt walk order",
+    )
+    parser.add_argument(
+        "--priority", action="append", default=[], metavar="GLOB",
+        help="Generate files matching GLOB (path under corpus/) first; repeatable, highest first",
+    )
+    parser.add_argument(
+        "-p", "--concurrency", type=int, default=5,
+        help="Number of concurrent requests (default: 5)",
+    )
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    pending = find_pending(corpus_dir)
+
+    if not pending:
+        print("Nothing to generate — all .corpus files already exist.")
+        return
+
+    print(f"Found {len(pending)} missing .corpus files.")
+
+    if args.n == 0:
+        print("\nDry-run — files that would be generated:")
+        for dirpath, filename, prompt in pending:
+            rel = os.path.relpath(os.path.join(dirpath, filename), corpus_dir)
+            print(f"  {rel}")
+        print()
+        from fal_estimate import estimate
+        estimate(level, corpus_dir, pending, system_prompt, max_tokens, args.model, args.concurrency, log=args.events)
+        return
+
+    api_key = setup(args)
+
+    from fal_schedule import schedule
+    to_generate = schedule(pending, args.n, corpus_dir, max_tokens, args.model, args.priority,
+                           args.schedule == "longest", args.events)
+    print(f"Generating {len(to_generate)} of {len(pending)} missing files "
+          f"(model: {args.model}, concurrency: {args.concurrency})...\n")
+    events, ledger = open_events(args.events, level, len(to_generate), args.concurrency, args.budget)
+
+    sem = asyncio.Semaphore(args.concurrency)
+    tasks = [
+        generate_task(sem, api_key, corpus_dir, system_prompt, max_tokens, generate_one, dirpath, filename, prompt,
+                      args, events, ledger)
+        for dirpath, filename, prompt in to_generate
+    ]
+    await asyncio.gather(*tasks)
+    events.close()
+    print(ledger.summary())
+
+    remaining = len(pending) - len(to_generate)
+    if remaining > 0:
+        print(f"\n{remaining} files still remaining. Run again to continue.")
+    else:
+        print("\nAll files generated!")
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Token and cost accounting for the generators, and a report over it.
+
+Every generator run prices each request as its result is fetched and appends
+a cost event to the event log (see fal_events.py):
+
+    {"ts": ..., "event": "cost", "level": "level_5", "model": "qwen/...", "prompt": "...",
+     "attempt": 1, "input_tokens": 812, "output_tokens": 3120, "usd": 0.007813, "estimated": false}
+
+Token counts come from the provider's usage (prompt_tokens/completion_tokens or
+input_tokens/output_tokens) and are estimated from the request and output
+sizes at CHARS_PER_TOKEN when it sends none; estimated is true then. usd is
+the provider's own cost figure when usage has one, else the tokens at PRICES.
+
+--budget USD on a generator caps a run: before each submit the ledger adds
+the request's expected cost (the run's mean so far, or max_tokens of output
+before anything has been priced) for it and every request still in flight to
+what has been spent. Past the cap the request waits for the ones in flight to
+be priced, and is skipped once it would not fit even without them.
+
+The report groups the cost events by model and level with $/1k output tokens,
+and divides by the usable examples the written files hold: level 5 files count
+their valid examples from level_5/validation_report.json (tool_use) and
+level_5/verbatim_report.json (json_qa), level 4 files count once if they are
+still on disk. Failed and repeated attempts stay in the cost, so $/usable
+example is what a kept example really cost.
+
+Usage:
+    python level_5/generate.py -n 100 --budget 2.50
+    python fal_costs.py                         # report over fal_events.jsonl
+    python fal_costs.py run.jsonl --level level_5
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+from fal_events import EVENTS_FILE, read_events
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORTS = [  # (report, files whose examples it checked)
+    (os.path.join(SCRIPT_DIR, "level_5", "validation_report.json"), "tool_use"),
+    (os.path.join(SCRIPT_DIR, "level_5", "verbatim_report.json"), "json_qa"),
+]
+
+# USD per million (input, output) tokens; approximate list prices, adjust to your account
+PRICES = {
+    "qwen/qwen3.5-plus-02-15": (0.40, 2.40),
+    "qwen/qwen-2.5-72b-instruct": (0.12, 0.39),
+    "qwen/qwen3-235b-a22b": (0.13, 0.60),
+}
+DEFAULT_PRICE = (1.00, 4.00)  # for models not listed above
+CHARS_PER_TOKEN = 4
+
+
+def price(model: str, input_tokens: int, output_tokens: int) -> float:
+    per_input, per_output = PRICES.get(model, DEFAULT_PRICE)
+    return (input_tokens * per_input + output_tokens * per_output) / 1e6
+
+
+def account(model: str, usage: dict | None, input_chars: int, output_chars: int) -> dict:
+    """The cost event fields for one fetched result."""
+    usage = usage or {}
+    input_tokens = usage.get("prompt_tokens", usage.get("input_tokens"))
+    output_tokens = usage.get("completion_tokens", usage.get("output_tokens"))
+    estimated = input_tokens is None or output_tokens is None
+    if input_tokens is None:
+        input_tokens = -(-input_chars // CHARS_PER_TOKEN)
+    if output_tokens is None:
+        output_tokens = -(-output_chars // CHARS_PER_TOKEN)
+    usd = usage.get("cost")
+    if usd is None:
+        usd = price(model, input_tokens, output_tokens)
+    return {"input_tokens": input_tokens, "output_tokens": output_tokens, "usd": round(usd, 6),
+            "estimated": estimated}
+
+
+class Ledger:
+    """Event listener that prices each fetched request, logging it as a cost
+    event, and keeps the run's totals; reserve() enforces the budget."""
+
+    def __init__(self, log, budget: float | None = None):
+        self.log = log
+        self.budget = budget
+        self.lock = threading.Lock()
+        self.spent = 0.0
+        self.priced = 0
+        self.estimated = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.in_flight = 0
+        self.skipped = 0
+
+    def reserve(self, model: str, input_chars: int, max_tokens: int) -> bool | None:
+        """True if one more request fits the budget, and it then counts as in
+        flight until its written or failed event; False if it never will; None
+        if it might once the requests in flight are priced (ask again later)."""
+        with self.lock:
+            if self.budget is not None:
+                if self.priced:
+                    expected = self.spent / self.priced
+                else:
+                    expected = price(model, -(-input_chars // CHARS_PER_TOKEN), max_tokens)
+                if self.spent + expected > self.budget:
+                    self.skipped += 1
+                    return False
+                if self.spent + (self.in_flight + 1) * expected > self.budget:
+                    return None
+            self.in_flight += 1
+            return True
+
+    def admit(self, model: str, input_chars: int, max_tokens: int, on_event, poll_interval: float) -> bool:
+        """reserve(), asking again every poll_interval seconds while it can't
+        tell yet; a request that won't fit is reported as skipped."""
+        while (fits := self.reserve(model, input_chars, max_tokens)) is None:
+            time.sleep(poll_interval)
+        if not fits:
+            on_event("skipped", reason="budget")
+        return fits
+
+    def __call__(self, record: dict) -> None:
+        event = record["event"]
+        if event == "fetched":
+            cost = account(record["model"], record.get("usage"), record.get("input_chars", 0),
+                           record.get("output_chars", 0))
+            with self.lock:
+                self.spent += cost["usd"]
+                self.priced += 1
+                self.estimated += cost["estimated"]
+                self.input_tokens += cost["input_tokens"]
+                self.output_tokens += cost["output_tokens"]
+            self.log.emit("cost", record["prompt"], record["model"], record["attempt"], record["level"], **cost)
+        elif event in ("written", "failed"):
+            with self.lock:
+                self.in_flight -= 1
+
+    def summary(self) -> str:
+        line = (f"Spent ${self.spent:.4f} on {self.priced} requests ({self.input_tokens:,} input / "
+                f"{self.output_tokens:,} output tokens")
+        line += f", {self.estimated} estimated)" if self.estimated else ")"
+        if self.skipped:
+            line += f"; budget of ${self.budget:g} reached, {self.skipped} not submitted"
+        return line
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+def load_usable() -> dict[str, int]:
+    """Valid examples per repo-relative level 5 path, from the validation reports."""
+    usable = {}
+    for path, kind in REPORTS:
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            files = json.load(f)["files"]
+        if kind == "tool_use":
+            usable.update((entry["path"], entry["valid"]) for entry in files)
+        else:
+            usable.update((rel, entry["examples"] - entry["violations"]) for rel, entry in files.items())
+    return usable
+
+
+def usable_examples(level: str, prompt: str, validated: dict[str, int]) -> int | None:
+    """Usable examples in a written output, or None where there is no measure."""
+    path = f"{level}/corpus/{prompt}"
+    if level == "level_5":
+        return validated.get(path)
+    if level == "level_4":
+        return int(os.path.exists(os.path.join(SCRIPT_DIR, path)))
+    return None
+
+
+def print_costs(events: list[dict], key, validated: dict[str, int]) -> None:
+    groups: dict[str, dict] = defaultdict(lambda: {"requests": 0, "estimated": 0, "input": 0, "output": 0,
+                                                   "usd": 0.0, "written": set(), "usable": 0, "measured": 0})
+    for e in events:
+        group = groups[key(e)]
+        if e["event"] == "cost":
+            group["requests"] += 1
+            group["estimated"] += e["estimated"]
+            group["input"] += e["input_tokens"]
+            group["output"] += e["output_tokens"]
+            group["usd"] += e["usd"]
+        elif e["event"] == "written":
+            group["written"].add((e["level"], e["prompt"]))
+    for group in groups.values():
+        for level, prompt in group["written"]:
+            usable = usable_examples(level, prompt, validated)
+            if usable is not None:
+                group["usable"] += usable
+                group["measured"] += 1
+
+    print(f"  {'':32s} {'reqs':>6s} {'est':>5s} {'in tok':>11s} {'out tok':>11s} {'USD':>10s} "
+          f"{'$/1k out':>9s} {'usable':>7s} {'$/usable':>9s}")
+    for name in sorted(groups):
+        g = groups[name]
+        if not g["requests"]:
+            continue
+        per_1k = g["usd"] / g["output"] * 1000 if g["output"] else 0.0
+        per_usable = f"{g['usd'] / g['usable']:9.5f}" if g["usable"] else f"{'-':>9s}"
+        usable = f"{g['usable']:7d}" if g["measured"] else f"{'-':>7s}"
+        print(f"  {name[:32]:32s} {g['requests']:6d} {g['estimated']:5d} {g['input']:11,d} {g['output']:11,d} "
+              f"{g['usd']:10.4f} {per_1k:9.5f} {usable} {per_usable}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report generator token usage and cost from an event log")
+    parser.add_argument("log", nargs="?", default=EVENTS_FILE, help="Event log (default: fal_events.jsonl)")
+    parser.add_argument("--level", type=str, help="Only this level, e.g. level_5")
+    parser.add_argument("--since", type=float, default=0, help="Only events after this Unix time")
+    args = parser.parse_args()
+
+    events = [e for e in read_events(args.log)
+              if e["ts"] >= args.since and (args.level is None or e["level"] == args.level)]
+    costs = [e for e in events if e["event"] == "cost"]
+    total = sum(e["usd"] for e in costs)
+    print(f"{len(costs)} priced requests, ${total:.4f} total "
+          f"({sum(e['estimated'] for e in costs)} with estimated tokens)")
+    validated = load_usable()
+    for by, key in (("model", lambda e: e["model"]), ("level", lambda e: e["level"])):
+        print(f"\nBy {by}:")
+        print_costs(events, key, validated)
+
+
+if __name__ == "__main__":
+    main()
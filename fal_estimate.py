@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Forecast the tokens, cost and wall time of generating the pending files.
+
+For each level the pending .corpus files (prompts.txt lines without a file,
+in the order generate.py's find_pending walks them) are matched with history:
+
+  * output length: the files already written under the same prompt group and
+    word target ("Aim for 800-1200 words"). A pending file takes the most
+    specific of its directory, its parents, then the whole level that holds at
+    least MIN_SAMPLES files with the same target, and drops the target last.
+    With no such group the length is drawn evenly from the word target at
+    WORD_CHARS chars per word, or from PRIOR_FILL of max_tokens, and the
+    interval is only as good as that prior.
+  * latency of --model: queue time (submit to IN_PROGRESS) and run time per
+    output char of its requests in the event log (see fal_events.py), or
+    PRIOR_QUEUE and PRIOR_TOKENS_PER_SEC when it has fewer than MIN_SAMPLES.
+  * chars per token: the provider-reported output tokens in the log's cost
+    events, or fal_costs.CHARS_PER_TOKEN.
+
+Each of --samples simulated runs draws an output length and a latency for
+every file from those observations and schedules the files in order on
+--concurrency workers. The p5/p50/p95 of the runs give the estimate and its
+90% interval. Provider-side queueing under more load than the history saw is
+not modelled, so wide runs may take longer than forecast.
+
+Usage:
+    python fal_estimate.py                              # levels 4 and 5, everything pending
+    python fal_estimate.py --levels level_5 -n 100 -p 10
+    python fal_estimate.py --model qwen/qwen3.5-plus-02-15 --log run.jsonl
+    python level_5/generate.py -n 0                     # dry run, ends with this estimate
+"""
+
+import argparse
+import heapq
+import os
+import random
+import re
+from collections import defaultdict
+
+from fal_client import load_script
+from fal_costs import CHARS_PER_TOKEN, price
+from fal_events import EVENTS_FILE, lifecycles, percentile, read_events
+from fal_progress import format_duration
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MIN_SAMPLES = 5  # observations a group needs before it is used
+PRIOR_QUEUE = 5.0  # seconds, without latency history
+PRIOR_TOKENS_PER_SEC = 50.0
+PRIOR_FILL = (0.25, 1.0)  # share of max_tokens used, without length history
+WORD_CHARS = 6  # chars per word of English prose, spaces included
+WORD_TARGET = re.compile(r"Aim for (\d+)-(\d+) words")
+
+
+def read_prompts(corpus_dir: str) -> list[tuple[str, str, bool]]:
+    """(rel path, prompt, written) for every prompts.txt line under corpus_dir."""
+    entries = []
+    for root, _dirs, files in os.walk(corpus_dir):
+        if "prompts.txt" not in files:
+            continue
+        with open(os.path.join(root, "prompts.txt")) as f:
+            for line in f:
+                parts = line.strip().split(" ", 1)
+                if len(parts) != 2 or not parts[0].endswith(".corpus"):
+                    continue
+                path = os.path.join(root, parts[0])
+                entries.append((os.path.relpath(path, corpus_dir), parts[1], os.path.exists(path)))
+    return entries
+
+
+def history_keys(rel: str, prompt: str) -> list[tuple[str, str | None]]:
+    """(group, word target) keys of a file, most specific first."""
+    match = WORD_TARGET.search(prompt)
+    target = f"{match[1]}-{match[2]}" if match else None
+    dirs = rel.split("/")[:-1]
+    groups = ["/".join(dirs[:depth]) for depth in range(len(dirs), -1, -1)]
+    keys = [(group, target) for group in groups]
+    if target is not None:
+        keys += [(group, None) for group in groups]
+    return keys
+
+
+def output_history(corpus_dir: str) -> dict[tuple, list[int]]:
+    """Output chars of the written files under every key they fall under."""
+    history: dict[tuple, list[int]] = defaultdict(list)
+    for rel, prompt, written in read_prompts(corpus_dir):
+        if written:
+            size = os.path.getsize(os.path.join(corpus_dir, rel))
+            for key in history_keys(rel, prompt):
+                history[key].append(size)
+    return history
+
+
+def latency_history(events: list[dict], model: str) -> list[tuple[float, float]]:
+    """(queue seconds, run seconds per output char) of model's written requests."""
+    samples = []
+    for life in lifecycles(events):
+        if life["model"] != model or None in (life["submit"], life["completed"]) or not life["output_chars"]:
+            continue
+        running = life["running"] if life["running"] is not None else life["submit"]
+        samples.append((running - life["submit"], (life["completed"] - running) / life["output_chars"]))
+    return samples
+
+
+def chars_per_token(events: list[dict]) -> float:
+    fetched = {(e["level"], e["prompt"], e["attempt"]): e.get("output_chars", 0)
+               for e in events if e["event"] == "fetched"}
+    chars = tokens = 0
+    for e in events:
+        if e["event"] == "cost" and not e["estimated"] and e["output_tokens"]:
+            chars += fetched.get((e["level"], e["prompt"], e["attempt"]), 0)
+            tokens += e["output_tokens"]
+    return chars / tokens if chars and tokens else CHARS_PER_TOKEN
+
+
+def simulate(items: list[tuple[list[int], int]], latency: list[tuple[float, float]], cpt: float, model: str,
+             concurrency: int, rng: random.Random) -> tuple[int, int, float, float]:
+    """One simulated run: (input tokens, output tokens, USD, wall seconds)."""
+    workers = [0.0] * concurrency
+    input_tokens = output_tokens = 0
+    for lengths, prompt_tokens in items:
+        chars = rng.choice(lengths)
+        queue, per_char = rng.choice(latency)
+        input_tokens += prompt_tokens
+        output_tokens += round(chars / cpt)
+        heapq.heapreplace(workers, workers[0] + queue + per_char * chars)
+    return input_tokens, output_tokens, price(model, input_tokens, output_tokens), max(workers)
+
+
+def prior_lengths(prompt: str, max_tokens: int, cpt: float) -> tuple[str, list[int]]:
+    """(description, evenly spaced output lengths) for a file without history."""
+    match = WORD_TARGET.search(prompt)
+    if match:
+        low, high = int(match[1]) * WORD_CHARS, int(match[2]) * WORD_CHARS
+        name = f"prior: {match[1]}-{match[2]} words"
+    else:
+        low, high = (round(share * max_tokens * cpt) for share in PRIOR_FILL)
+        name = f"prior: {PRIOR_FILL[0]:.0%}-{PRIOR_FILL[1]:.0%} of {max_tokens} max_tokens"
+    return name, [low + (high - low) * i // 20 for i in range(21)]
+
+
+def lengths_for(rel: str, prompt: str, history: dict[tuple, list[int]], max_tokens: int, cpt: float,
+                level: str) -> tuple[str, list[int]]:
+    """(where they come from, observed or prior output lengths) for one pending file."""
+    key = next((k for k in history_keys(rel, prompt) if len(history[k]) >= MIN_SAMPLES), None)
+    if key is None:
+        return prior_lengths(prompt, max_tokens, cpt)
+    target = f" @ {key[1]} words" if key[1] else ""
+    return f"like {key[0] or level}{target} ({len(history[key])} written)", history[key]
+
+
+def model_latency(events: list[dict], model: str) -> list[tuple[float, float]] | None:
+    """latency_history() of model, or None when it is too short to use."""
+    latency = latency_history(events, model)
+    return latency if len(latency) >= MIN_SAMPLES else None
+
+
+def prior_latency(cpt: float) -> list[tuple[float, float]]:
+    return [(PRIOR_QUEUE, 1 / (PRIOR_TOKENS_PER_SEC * cpt))]
+
+
+def estimate(level: str, corpus_dir: str, pending: list[tuple[str, str, str]], system_prompt: str,
+             max_tokens: int, model: str, concurrency: int, n: int | None = None, log: str | None = EVENTS_FILE,
+             samples: int = 500, seed: int = 0) -> None:
+    """Print the forecast for the first n (default: all) of a level's pending (dirpath, filename, prompt)."""
+    events = read_events(log) if log and os.path.exists(log) else []
+    history = output_history(corpus_dir)
+    pending = [(os.path.relpath(os.path.join(dirpath, filename), corpus_dir), prompt)
+               for dirpath, filename, prompt in pending[:n]]
+    print(f"{level}: {len(pending)} files (model {model}, concurrency {concurrency})")
+    if not pending:
+        return
+
+    cpt = chars_per_token(events)
+    items = []
+    matched: dict[str, int] = defaultdict(int)
+    for rel, prompt in pending:
+        name, lengths = lengths_for(rel, prompt, history, max_tokens, cpt, level)
+        matched[name] += 1
+        items.append((lengths, -(-(len(system_prompt) + len(prompt)) // CHARS_PER_TOKEN)))
+    for name, count in sorted(matched.items(), key=lambda item: -item[1]):
+        print(f"  {count:5d} sized {name}")
+
+    latency = model_latency(events, model)
+    if latency:
+        print(f"  latency from {len(latency)} requests in the event log, {cpt:.2f} chars/token")
+    else:
+        latency = prior_latency(cpt)
+        print(f"  no latency history for {model}: assuming {PRIOR_QUEUE:g}s queue + "
+              f"{PRIOR_TOKENS_PER_SEC:g} tokens/s (the interval covers output length only)")
+
+    rng = random.Random(seed)
+    runs = [simulate(items, latency, cpt, model, concurrency, rng) for _ in range(samples)]
+    print(f"  {'':14s} {'p5':>10s} {'p50':>10s} {'p95':>10s}")
+    for name, column, fmt in (("input tokens", 0, "{:,.0f}"), ("output tokens", 1, "{:,.0f}"),
+                              ("cost USD", 2, "{:.2f}"), ("wall time", 3, None)):
+        values = [run[column] for run in runs]
+        cells = [percentile(values, q) for q in (5, 50, 95)]
+        cells = [format_duration(v) if fmt is None else fmt.format(v) for v in cells]
+        print(f"  {name:14s} " + " ".join(f"{c:>10s}" for c in cells))
+
+
+def load_generator(level: str):
+    return load_script(f"{level}_generate", os.path.join(SCRIPT_DIR, level, "generate.py"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forecast tokens, cost and time of the pending files")
+    parser.add_argument("--levels", nargs="+", choices=["level_4", "level_5"], default=["level_4", "level_5"],
+                        help="Levels to estimate (default: both)")
+    parser.add_argument("-n", type=int, help="Only the first N pending files per level, as generate.py -n N")
+    parser.add_argument("-p", "--concurrency", type=int, default=5, help="Concurrent requests (default: 5)")
+    parser.add_argument("--model", type=str, default="qwen/qwen3.5-plus-02-15",
+                        help="Model to price and time (default: qwen/qwen3.5-plus-02-15)")
+    parser.add_argument("--log", type=str, default=EVENTS_FILE, help="Event log with latency history")
+    parser.add_argument("--samples", type=int, default=500, help="Simulated runs (default: 500)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for level in args.levels:
+        module = load_generator(level)
+        pending = module.find_pending(module.CORPUS_DIR)
+        estimate(level, module.CORPUS_DIR, pending, module.SYSTEM_PROMPT, module.MAX_TOKENS, args.model,
+                 args.concurrency, args.n, args.log, args.samples, args.seed)
+
+
+if __name__ == "__main__":
+    main()
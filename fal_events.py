@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Request lifecycle event log for the generators, and an analyzer for it.
+
+Every generator appends one JSON line per transition of each request to an
+event log (--events FILE, fal_events.jsonl in the repo root by default;
+--no-events turns it off):
+
+    {"ts": 1760870000.123, "event": "submit", "level": "level_5", "model": "qwen/...",
+     "prompt": "tool_use/weather_api/current_weather/basic.corpus", "attempt": 1,
+     "request_id": "..."}
+
+The events are submit (request_id), status (each change of status), completed,
+fetched (input_chars, output_chars, and usage when the provider sends it), cost
+(tokens and USD, see fal_costs.py), retry (code, wait: a call answered 429 or
+5xx that is repeated within the same attempt), written (output_chars), failed
+(error) and skipped (reason; not submitted, e.g. over --budget). prompt names the work item: the .corpus
+path under level_N/corpus for levels 4-5 and the dictionary, the first
+sentence of the batch for level 3. attempt counts the submits of that prompt
+across every run in the log.
+
+The analyzer splits each request into queue time (submit to the first
+IN_PROGRESS) and run time (from there to completed), with percentiles per
+model, level and prompt group (the first --depth directories of prompt), and
+buckets written items and output chars over time. Times are only as precise as
+the poll interval; a request first seen COMPLETED only counts towards the
+total time.
+
+Usage:
+    python level_5/generate.py -n 50 --events run.jsonl
+    python fal_events.py                            # analyze fal_events.jsonl
+    python fal_events.py run.jsonl --by group --depth 1 --bucket 300
+"""
+
+import argparse
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+EVENTS_FILE = os.path.join(SCRIPT_DIR, "fal_events.jsonl")
+
+
+def read_events(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class EventLog:
+    """Appends events to path (None: no file) and hands each record to every
+    listener; thread-safe, one per generator run. level is the default for
+    requests that don't name their own (orchestrate.py runs several)."""
+
+    def __init__(self, path: str | None, level: str, listeners: list | None = None):
+        self.path = path
+        self.level = level
+        self.listeners = listeners or []
+        self.lock = threading.Lock()
+        self.attempts: Counter = Counter()
+        self._out = None
+        if path is not None:
+            if os.path.exists(path):
+                for event in read_events(path):
+                    if event["event"] == "submit":
+                        self.attempts[event["level"], event["prompt"]] += 1
+            self._out = open(path, "a", encoding="utf-8")
+            atexit.register(self._out.close)
+
+    def emit(self, event: str, prompt: str, model: str, attempt: int, level: str | None = None, **fields) -> None:
+        record = {"ts": round(time.time(), 3), "event": event, "level": level or self.level, "model": model,
+                  "prompt": prompt, "attempt": attempt, **fields}
+        if self._out is not None:
+            line = json.dumps(record, ensure_ascii=False) + "\n"
+            with self.lock:
+                self._out.write(line)
+                self._out.flush()
+        for listener in self.listeners:
+            listener(record)
+
+    def close(self) -> None:
+        """Close every listener that has a close()."""
+        for listener in self.listeners:
+            if hasattr(listener, "close"):
+                listener.close()
+
+    def request(self, prompt: str, model: str, level: str | None = None):
+        """An on_event(event, **fields) callback for the next attempt at prompt."""
+        level = level or self.level
+        with self.lock:
+            self.attempts[level, prompt] += 1
+            attempt = self.attempts[level, prompt]
+        return functools.partial(self.emit, prompt=prompt, model=model, attempt=attempt, level=level)
+
+
+# ---------------------------------------------------------------------------
+# Analysis
+# ---------------------------------------------------------------------------
+
+def lifecycles(events: list[dict]) -> list[dict]:
+    """One summary per (level, prompt, attempt) with the time of each stage."""
+    by_attempt: dict[tuple, dict] = {}
+    for e in events:
+        life = by_attempt.setdefault((e["level"], e["prompt"], e["attempt"]), {
+            "level": e["level"], "prompt": e["prompt"], "model": e["model"], "submit": None,
+            "running": None, "completed": None, "written": None, "failed": None, "output_chars": 0})
+        kind = e["event"]
+        if kind == "status" and e.get("status") == "IN_PROGRESS" and life["running"] is None:
+            life["running"] = e["ts"]
+        elif kind in ("submit", "completed", "written"):
+            life[kind] = e["ts"]
+            if kind == "written":
+                life["output_chars"] = e.get("output_chars", 0)
+        elif kind == "failed":
+            life["failed"] = e.get("error", "")
+    return list(by_attempt.values())
+
+
+def group_of(life: dict, depth: int) -> str:
+    parts = life["prompt"].split("/")
+    if len(parts) == 1:
+        return life["level"]
+    return "/".join(parts[:min(depth, len(parts) - 1)])
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of values (0.0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+def print_latency(lives: list[dict], key) -> None:
+    groups: dict[str, list[dict]] = {}
+    for life in lives:
+        groups.setdefault(key(life), []).append(life)
+    print(f"  {'':32s} {'done':>5s} {'fail':>5s}   {'queue p50/p95/p99 (s)':>22s}   "
+          f"{'run p50/p95/p99 (s)':>22s}   {'total p50/p95':>15s}")
+    for name in sorted(groups):
+        members = groups[name]
+        done = [m for m in members if m["completed"] is not None and m["submit"] is not None]
+        failed = sum(1 for m in members if m["failed"] is not None)
+        running = [m for m in done if m["running"] is not None]
+        queue = [m["running"] - m["submit"] for m in running]
+        run = [m["completed"] - m["running"] for m in running]
+        total = [m["completed"] - m["submit"] for m in done]
+        print(f"  {name[:32]:32s} {len(done):5d} {failed:5d}   "
+              f"{percentile(queue, 50):6.1f} {percentile(queue, 95):7.1f} {percentile(queue, 99):7.1f}   "
+              f"{percentile(run, 50):6.1f} {percentile(run, 95):7.1f} {percentile(run, 99):7.1f}   "
+              f"{percentile(total, 50):7.1f} {percentile(total, 95):7.1f}")
+
+
+def print_throughput(lives: list[dict], bucket: float) -> None:
+    written = sorted((m["written"], m["output_chars"]) for m in lives if m["written"] is not None)
+    if not written:
+        print("  nothing written")
+        return
+    start = min(m["submit"] for m in lives if m["submit"] is not None)
+    buckets: dict[int, list[int]] = {}
+    for ts, chars in written:
+        buckets.setdefault(int((ts - start) // bucket), []).append(chars)
+    for b in range(max(buckets) + 1):
+        chars = buckets.get(b, [])
+        start_label = "+" + format(b * bucket / 60, ".1f")
+        print(f"  {start_label:>8s} min  {len(chars):5d} written  {len(chars) / bucket * 60:7.1f} items/min  "
+              f"{sum(chars) / bucket:8.0f} chars/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze a generator event log")
+    parser.add_argument("log", nargs="?", default=EVENTS_FILE, help="Event log (default: fal_events.jsonl)")
+    parser.add_argument("--by", nargs="+", choices=["model", "level", "group"], default=["model", "level", "group"],
+                        help="Breakdowns to print (default: all)")
+    parser.add_argument("--depth", type=int, default=2, help="Directories of the prompt path per group (default: 2)")
+    parser.add_argument("--bucket", type=float, default=60, help="Throughput bucket in seconds (default: 60)")
+    parser.add_argument("--level", type=str, help="Only this level, e.g. level_5")
+    parser.add_argument("--since", type=float, default=0, help="Only events after this Unix time")
+    args = parser.parse_args()
+
+    events = [e for e in read_events(args.log)
+              if e["ts"] >= args.since and (args.level is None or e["level"] == args.level)]
+    lives = lifecycles(events)
+    print(f"{len(events)} events, {len(lives)} requests")
+    keys = {"model": lambda m: m["model"], "level": lambda m: m["level"],
+            "group": lambda m: group_of(m, args.depth)}
+    for by in args.by:
+        print(f"\nBy {by}:")
+        print_latency(lives, keys[by])
+    print(f"\nThroughput ({args.bucket:g}s buckets):")
+    print_throughput(lives, args.bucket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Live progress display for a generator run, fed by its lifecycle events.
+
+The generators hand every event (see fal_events.py) to Progress, which only
+puts it on a queue; a single renderer thread owns stdout. On a terminal it
+redraws a block in place with ANSI codes, e.g.
+
+    level_5  412/1000 done  3 failed  5/5 in flight
+    38.2 items/min  9,870 chars/s  ETA 15m22s
+      IN_PROGRESS   41.2s  tool_use/weather_api/forecast/multi_day.corpus
+      IN_QUEUE       3.0s  json_qa/extraction/people/names.corpus
+      ...
+
+and when stdout is not a terminal it prints one plain line per finished item
+with the same counters instead.
+"""
+
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+
+REFRESH = 0.25  # seconds between redraws
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class Progress:
+    """Call with each event record; close() once the run is over."""
+
+    def __init__(self, label: str, total: int, concurrency: int = 1, out=None, live: bool | None = None):
+        self.label = label
+        self.total = total
+        self.concurrency = concurrency
+        self.out = out or sys.stdout
+        self.live = self.out.isatty() and os.environ.get("TERM") != "dumb" if live is None else live
+        self.events: queue.SimpleQueue = queue.SimpleQueue()
+        self.jobs: dict[tuple, list] = {}  # (prompt, attempt) -> [state, started]
+        self.done = 0
+        self.failed = 0
+        self.chars = 0
+        self.usd = 0.0
+        self.start = time.time()
+        self._drawn = 0  # lines of the last live frame
+        self._thread = threading.Thread(target=self._run, name="progress", daemon=True)
+        self._thread.start()
+
+    def __call__(self, record: dict) -> None:
+        self.events.put(record)
+
+    def close(self) -> None:
+        self.events.put(None)
+        self._thread.join()
+
+    # -- renderer thread -----------------------------------------------------
+
+    def _run(self) -> None:
+        next_draw = 0.0
+        while True:
+            try:
+                record = self.events.get(timeout=REFRESH)
+            except queue.Empty:
+                record = False
+            if record is None:
+                break
+            if record:
+                self._apply(record)
+            if self.live and time.monotonic() >= next_draw:
+                self._draw()
+                next_draw = time.monotonic() + REFRESH
+        if self.live:
+            self._draw(final=True)
+        else:
+            self.out.write(f"{self._counts()}  {self._rates()}\n")
+            self.out.flush()
+
+    def _apply(self, record: dict) -> None:
+        key = (record["prompt"], record["attempt"])
+        event = record["event"]
+        if event == "submit":
+            self.jobs[key] = ["SUBMITTED", record["ts"]]
+        elif event == "status" and key in self.jobs:
+            self.jobs[key][0] = record["status"]
+        elif event == "fetched" and key in self.jobs:
+            self.jobs[key][0] = "FETCHED"
+        elif event == "cost":
+            self.usd += record["usd"]
+        elif event == "skipped":
+            self.total -= 1
+        elif event in ("written", "failed"):
+            self.jobs.pop(key, None)
+            if event == "written":
+                self.done += 1
+                self.chars += record.get("output_chars", 0)
+                detail = f"OK ({record.get('output_chars', 0)} chars)"
+            else:
+                self.failed += 1
+                detail = f"FAILED: {record.get('error', '')}"
+            if not self.live:
+                self.out.write(f"[{self.done + self.failed}/{self.total}] {record['prompt']} {detail}  "
+                               f"({self._rates()})\n")
+                self.out.flush()
+
+    def _rates(self) -> str:
+        elapsed = max(time.time() - self.start, 1e-9)
+        finished = self.done + self.failed
+        per_min = finished / elapsed * 60
+        remaining = self.total - finished
+        eta = format_duration(remaining / per_min * 60) if per_min and remaining > 0 else "-"
+        spent = f"  ${self.usd:.4f}" if self.usd else ""
+        return f"{per_min:.1f} items/min  {self.chars / elapsed:,.0f} chars/s  ETA {eta}{spent}"
+
+    def _counts(self) -> str:
+        return (f"{self.label}  {self.done}/{self.total} done  {self.failed} failed  "
+                f"{len(self.jobs)}/{self.concurrency} in flight")
+
+    def _draw(self, final: bool = False) -> None:
+        width, height = shutil.get_terminal_size()
+        lines = [self._counts(), self._rates()]
+        if not final:
+            now = time.time()
+            jobs = sorted(self.jobs.items(), key=lambda item: item[1][1])
+            for (prompt, _attempt), (state, started) in jobs[:max(1, height - 4)]:
+                lines.append(f"  {state:12s} {now - started:6.1f}s  {prompt}")
+            if len(jobs) > height - 4:
+                lines.append(f"  ... {len(jobs) - (height - 4)} more")
+        frame = "".join(f"{line[:width - 1]}\x1b[K\n" for line in lines)
+        up = f"\x1b[{self._drawn}F" if self._drawn else ""
+        self.out.write(f"{up}{frame}\x1b[J")
+        self.out.flush()
+        self._drawn = len(lines)
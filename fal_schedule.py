@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Dispatch order for the pending files of levels 4 and 5: longest expected first.
+
+find_pending() yields prompts in os.walk order, so a batch could end with a
+few 1800-2500 word stories running alone while the other slots sit idle.
+The generators instead hand their batch to schedule():
+
+  * --priority GLOB (repeatable) sorts pending files into classes by their
+    path under corpus/, in the order given, with everything else last. -n
+    takes files class by class, in walk order within a class.
+  * within each class the batch is dispatched longest predicted duration
+    first (LPT). With exact durations that bounds the makespan at 4/3 of the
+    optimum for a fixed concurrency; any fixed order only guarantees 2x.
+
+The duration of a file is the model's median queue time plus its median run
+time per output char times the mean output length fal_estimate.py expects for
+the file. That is the written files of its prompt group and word target, or
+the "Aim for 800-1200 words" target or max_tokens prior without them, with
+the latency from the event log or fal_estimate.py's prior.
+
+Usage:
+    python level_4/generate.py -n 50 --priority "stories/*"
+    python level_5/generate.py -n 100 --schedule walk          # old order
+    python fal_schedule.py --level level_4 -n 50 -p 5          # compare makespans
+"""
+
+import argparse
+import fnmatch
+import heapq
+import os
+import statistics
+
+from fal_estimate import (chars_per_token, lengths_for, load_generator, model_latency, output_history,
+                          prior_latency)
+from fal_events import EVENTS_FILE, read_events
+from fal_progress import format_duration
+
+
+def predict(items: list[tuple[str, str]], corpus_dir: str, max_tokens: int, model: str,
+            log: str | None = EVENTS_FILE) -> list[float]:
+    """Expected seconds for each (rel path, prompt)."""
+    events = read_events(log) if log and os.path.exists(log) else []
+    cpt = chars_per_token(events)
+    latency = model_latency(events, model) or prior_latency(cpt)
+    queue = statistics.median(q for q, _ in latency)
+    per_char = statistics.median(r for _, r in latency)
+    history = output_history(corpus_dir)
+    return [queue + per_char * statistics.fmean(lengths_for(rel, prompt, history, max_tokens, cpt, "")[1])
+            for rel, prompt in items]
+
+
+def priority_class(rel: str, priorities: list[str]) -> int:
+    return next((i for i, pattern in enumerate(priorities) if fnmatch.fnmatch(rel, pattern)), len(priorities))
+
+
+def schedule(pending: list[tuple[str, str, str]], n: int, corpus_dir: str, max_tokens: int, model: str,
+             priorities: list[str] | None = None, longest_first: bool = True,
+             log: str | None = EVENTS_FILE) -> list[tuple[str, str, str]]:
+    """The first n (dirpath, filename, prompt) of pending by priority class, in dispatch order."""
+    priorities = priorities or []
+    rels = [os.path.relpath(os.path.join(dirpath, filename), corpus_dir) for dirpath, filename, _prompt in pending]
+    ranked = sorted(range(len(pending)), key=lambda i: priority_class(rels[i], priorities))[:n]
+    if longest_first:
+        seconds = dict(zip(ranked, predict([(rels[i], pending[i][2]) for i in ranked], corpus_dir, max_tokens,
+                                           model, log)))
+        ranked.sort(key=lambda i: (priority_class(rels[i], priorities), -seconds[i]))
+    return [pending[i] for i in ranked]
+
+
+def makespan(durations: list[float], concurrency: int) -> float:
+    """Finish time of durations dispatched in order onto concurrency workers."""
+    workers = [0.0] * concurrency
+    for seconds in durations:
+        heapq.heapreplace(workers, workers[0] + seconds)
+    return max(workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare walk-order and longest-first dispatch of pending files")
+    parser.add_argument("--level", choices=["level_4", "level_5"], default="level_4")
+    parser.add_argument("-n", type=int, default=10, help="Batch size, as generate.py -n (default: 10)")
+    parser.add_argument("-p", "--concurrency", type=int, default=5, help="Concurrent requests (default: 5)")
+    parser.add_argument("--priority", action="append", default=[], metavar="GLOB",
+                        help="Priority class by path under corpus/, highest first (repeatable)")
+    parser.add_argument("--model", type=str, default="qwen/qwen3.5-plus-02-15",
+                        help="Model to time (default: qwen/qwen3.5-plus-02-15)")
+    parser.add_argument("--log", type=str, default=EVENTS_FILE, help="Event log with latency history")
+    args = parser.parse_args()
+
+    module = load_generator(args.level)
+    pending = module.find_pending(module.CORPUS_DIR)
+    for name, longest_first in (("walk order", False), ("longest first", True)):
+        batch = schedule(pending, args.n, module.CORPUS_DIR, module.MAX_TOKENS, args.model, args.priority,
+                         longest_first, args.log)
+        items = [(os.path.relpath(os.path.join(d, f), module.CORPUS_DIR), p) for d, f, p in batch]
+        seconds = predict(items, module.CORPUS_DIR, module.MAX_TOKENS, args.model, args.log)
+        print(f"{name}: predicted makespan {format_duration(makespan(seconds, args.concurrency))} "
+              f"for {len(batch)} files at concurrency {args.concurrency}")
+        for (rel, _prompt), s in list(zip(items, seconds))[:5]:
+            print(f"  {s:7.1f}s  {rel}")
+        if len(items) > 5:
+            print(f"  ... {len(items) - 5} more")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Generate simple level 0-3 sentences from a seeded, weighted context-free grammar.
+
+The hand-written level 0-2 corpora only have a few dozen lines each, and
+assemble.py can only resample them. These grammars are built from the same
+sentence patterns ("A <swimmer> is swimming in the <water>.", adjective slots
+for level 2, clause openers for level 3), so a level can get as many distinct
+sentences as it needs without any LLM calls.
+
+A grammar maps each nonterminal to its alternatives: plain strings (equal
+weight) or (weight, string) pairs. "<name>" inside an alternative expands the
+nonterminal of that name; the start symbol is "sentence". Sampling is seeded
+per level, and a 64-bit fingerprint set rejects repeats, so the same
+--seed/--count always yields the same unique lines.
+
+Usage:
+    python grammar.py --levels 2 --count 100000     # write level_2/grammar_corpus.txt
+    python grammar.py --count 20000 --seed 1        # levels 0-3
+    python grammar.py --levels 3 --size             # how many distinct sentences a grammar has
+    python grammar.py --levels 1 --count 5 --stdout
+
+assemble.py adds level_N/grammar_corpus.txt to level N when it exists.
+"""
+
+import argparse
+import bisect
+import itertools
+import os
+import random
+import re
+import sys
+import time
+
+from assemble import STOP, HashSet, fingerprint, level_dir
+
+GRAMMAR_FILE = "grammar_corpus.txt"
+START = "sentence"
+
+# Give up sampling once this many samples in a row were all repeats
+MAX_MISSES = 100_000
+
+# ---------------------------------------------------------------------------
+# Shared vocabulary
+# ---------------------------------------------------------------------------
+
+WORDS = {
+    "pet": ["cat", "dog", "puppy", "kitten"],
+    "fur": ["brown", "black", "white", "gray", "spotted", "fluffy", "striped"],
+    "furniture": ["mat", "couch", "rug", "chair", "bed", "blanket", "pillow", "step"],
+    "swimmer": ["fish", "dolphin", "whale", "turtle", "seal", "duck", "shark", "otter", "goldfish"],
+    "water": ["sea", "ocean", "lake", "pond", "river"],
+    "boat": ["sailboat", "boat", "canoe", "ship", "raft"],
+    "plant": ["carrot", "pumpkin", "tomato", "flower", "potato", "sunflower", "bean"],
+    "garden": ["garden", "field", "yard", "pot"],
+    "birds": ["birds", "ducks", "geese", "seagulls", "owls", "crows"],
+    "number": ["Two", "Three", "Four", "Five", "Many", "Some"],
+    "barker": ["dog", "puppy"],
+    "chased": ["cat", "squirrel", "ball", "mailman", "bird", "car"],
+    "hopper": ["rabbit", "frog", "bunny", "toad", "grasshopper"],
+    "climber": ["squirrel", "monkey", "cat", "boy", "girl"],
+    "tree": ["tree", "oak tree", "pine tree", "fence", "wall"],
+    "trees": ["trees", "oak trees", "pine trees", "bushes", "hedges", "woods"],
+    "grazer": ["cow", "horse", "sheep", "goat", "deer", "donkey", "pony"],
+    "open_place": ["field", "meadow", "hill", "farm", "valley", "pasture"],
+    "insect": ["butterfly", "bee", "ladybug", "moth", "dragonfly", "beetle", "ant"],
+    "flower": ["flower", "leaf", "rose", "daisy", "branch"],
+    "size": ["big", "small", "tiny", "tall", "little", "huge"],
+    "color": ["red", "blue", "green", "yellow", "white", "black", "brown", "purple", "golden"],
+    "mood": ["sleepy", "happy", "hungry", "playful", "tired", "curious", "friendly", "excited"],
+    "texture": ["soft", "warm", "old", "clean", "cozy", "wooden"],
+    "water_adj": ["calm", "deep", "cool", "clear", "quiet", "peaceful"],
+    "speed": ["quickly", "slowly", "happily", "quietly", "lazily", "gently"],
+    "weather": ["raining", "snowing", "windy", "cold", "dark", "late"],
+    "shelter": ["branches", "bushes", "barn", "trees", "tall grass", "old shed"],
+    "animals": ["birds", "rabbits", "ducks", "squirrels", "mice", "chickens"],
+    "cat": ["cat", "kitten"],
+    "small_pet": ["mouse", "hamster", "guinea pig"],
+    "dog_sound": ["barked", "howled", "growled", "whined"],
+    "cat_sound": ["meowed", "hissed", "purred"],
+    "toy": ["ball", "stick", "mouse", "string", "leaf", "bone"],
+    "time": ["Before the sun rose", "After the rain stopped", "When the morning came",
+             "As the sun was setting", "Late at night"],
+}
+
+# ---------------------------------------------------------------------------
+# Grammars per level
+# ---------------------------------------------------------------------------
+
+# Level 0 only knows a cat, a dog and a fish
+LEVEL_0 = {
+    "pet": ["cat", "dog"],
+    "seat": ["mat", "couch", "rug", "bed"],
+    "water": ["sea", "pond", "lake"],
+    "animal": ["cat", "dog", "fish"],
+    START: [
+        (3, "The <pet> sat on the <seat>."),
+        (2, "A fish is swimming in the <water>."),
+        (2, "The dog is barking at the cat."),
+        (1, "The cat is looking at the fish."),
+        (1, "The <animal> is sleeping."),
+    ],
+}
+
+LEVEL_1 = {
+    **WORDS,
+    START: [
+        (3, "A <swimmer> is swimming in the <water>."),
+        (3, "The <pet> sat on the <furniture>."),
+        (2, "<number> <birds> are flying."),
+        (2, "The <barker> is barking at the <chased>."),
+        (2, "A <boat> is sailing in the <water>."),
+        (2, "A <plant> is growing in the <garden>."),
+        (1, "A <hopper> is hopping in the <open_place>."),
+        (1, "A <climber> is climbing the <tree>."),
+        (1, "The <grazer> is grazing in the <open_place>."),
+        (1, "A <insect> is resting on the <flower>."),
+    ],
+}
+
+LEVEL_2 = {
+    **WORDS,
+    "pet_np": ["<pet>", "<mood> <pet>", "<size> <pet>", "<fur> <pet>", "<mood>, <fur> <pet>"],
+    "furniture_np": ["<furniture>", "<texture> <furniture>", "<texture>, <color> <furniture>"],
+    "swimmer_np": ["<swimmer>", "<size> <swimmer>", "<color> <swimmer>"],
+    "water_np": ["<water>", "<water_adj> <water>", "<water_adj>, <water_adj> <water>"],
+    "boat_np": ["<boat>", "<color> <boat>", "<size> <color> <boat>"],
+    "plant_np": ["<plant>", "<size> <plant>", "<color> <plant>"],
+    START: [
+        (3, "The <pet_np> is sleeping on the <furniture_np>."),
+        (3, "A <swimmer_np> is swimming <speed> in the <water_np>."),
+        (2, "The <pet_np> sat on the <furniture_np>."),
+        (2, "A <boat_np> is floating on the <water_np>."),
+        (2, "A <plant_np> is growing in the <garden>."),
+        (2, "The <mood> <barker> is chasing a <color> <toy>."),
+        (1, "<number> <color> <birds> are flying over the <water_np>."),
+        (1, "A <mood> <hopper> is hiding under the <color> bush."),
+        (1, "The <size> <grazer> is grazing in the <open_place>."),
+        (1, "A <color> <insect> is resting on the <color> <flower>."),
+    ],
+}
+
+LEVEL_3 = {
+    **LEVEL_2,
+    "barker_np": ["<barker>", "<mood> <barker>", "<size> <barker>", "<fur> <barker>"],
+    "cat_np": ["<cat>", "<mood> <cat>", "<size> <cat>", "<fur> <cat>"],
+    # Each animal with a sound it makes (no "The puppy meowed.")
+    "noisy_animal": ["<barker_np> <dog_sound>", "<cat_np> <cat_sound>", "<small_pet> squeaked"],
+    "swimmer_np": ["<swimmer>", "<size> <swimmer>", "<color> <swimmer>", "<mood> <swimmer>"],
+    START: [
+        (3, "The <noisy_animal> loudly, and the <pet_np> darted under the <furniture_np>."),
+        (3, "After resting on the <furniture_np>, the <pet_np> stretched and yawned <speed>."),
+        (3, "Because it was <weather>, the <animals> hid in the <shelter>."),
+        (2, "Although it was tired, the <pet_np> still chased the <color> <toy>."),
+        (2, "<time>, the <birds> were already singing in the <trees>."),
+        (2, "The <swimmer_np> swam <speed> through the <water_np>, past the <color> rocks."),
+        (2, "While the <pet_np> slept on the <furniture_np>, the <hopper> hopped <speed> away."),
+        (1, "If the rain stops, the <barker_np> will go outside and play with the <toy>."),
+        (1, "The <pet_np> saw the <swimmer_np> in the <water>, but it didn't make a sound."),
+    ],
+}
+
+GRAMMARS = {0: LEVEL_0, 1: LEVEL_1, 2: LEVEL_2, 3: LEVEL_3}
+
+# Levels whose hand-written lines end in <stop>
+STOP_LEVELS = {2, 3}
+
+_SYMBOL = re.compile(r"<(\w+)>")
+_ARTICLE = re.compile(r"\b([Aa]) (?=[aeiou])")
+
+
+# ---------------------------------------------------------------------------
+# Compilation and sampling
+# ---------------------------------------------------------------------------
+
+class Grammar:
+    """A compiled weighted CFG: per nonterminal, cumulative weights and
+    alternatives pre-split into literal strings and nonterminal names."""
+
+    def __init__(self, rules: dict):
+        self.rules: dict[str, tuple[list[float], list[list[tuple[bool, str]]]]] = {}
+        for name, alternatives in rules.items():
+            cum_weights, compiled = [], []
+            total = 0.0
+            for alt in alternatives:
+                weight, text = (1, alt) if isinstance(alt, str) else alt
+                total += weight
+                cum_weights.append(total)
+                compiled.append(self._compile(text, rules))
+            self.rules[name] = (cum_weights, compiled)
+        if START not in self.rules:
+            raise ValueError(f"grammar has no {START!r} rule")
+
+    @staticmethod
+    def _compile(text: str, rules: dict) -> list[tuple[bool, str]]:
+        """[(is_symbol, text)]; unknown <names> such as <stop> stay literal."""
+        parts = []
+        pos = 0
+        for match in _SYMBOL.finditer(text):
+            if match.group(1) not in rules:
+                continue
+            if match.start() > pos:
+                parts.append((False, text[pos:match.start()]))
+            parts.append((True, match.group(1)))
+            pos = match.end()
+        if pos < len(text):
+            parts.append((False, text[pos:]))
+        return parts
+
+    def sample(self, rng: random.Random, symbol: str = START) -> str:
+        out: list[str] = []
+        self._expand(symbol, rng, out)
+        return _ARTICLE.sub(r"\1n ", "".join(out))
+
+    def _expand(self, symbol: str, rng: random.Random, out: list[str]) -> None:
+        cum_weights, alternatives = self.rules[symbol]
+        alt = alternatives[bisect.bisect(cum_weights, rng.random() * cum_weights[-1])]
+        for is_symbol, text in alt:
+            if is_symbol:
+                self._expand(text, rng, out)
+            else:
+                out.append(text)
+
+    def derivations(self, symbol: str = START):
+        """Every sentence derivable from symbol, in grammar order."""
+        for alt in self.rules[symbol][1]:
+            choices = [self.derivations(text) if is_symbol else (text,) for is_symbol, text in alt]
+            for parts in itertools.product(*(list(c) for c in choices)):
+                yield "".join(parts)
+
+    def size(self, symbol: str = START, _memo: dict | None = None, _active: frozenset = frozenset()) -> int:
+        """Number of distinct derivations from symbol (an upper bound on distinct sentences)."""
+        memo = {} if _memo is None else _memo
+        if symbol in memo:
+            return memo[symbol]
+        if symbol in _active:
+            raise ValueError(f"grammar is recursive through {symbol!r}")
+        total = 0
+        for alt in self.rules[symbol][1]:
+            n = 1
+            for is_symbol, text in alt:
+                if is_symbol:
+                    n *= self.size(text, memo, _active | {symbol})
+            total += n
+        memo[symbol] = total
+        return total
+
+
+def generate(level: int, count: int, seed: int = 0) -> list[str]:
+    """Up to count distinct sentences for a level, newline-terminated.
+
+    Sentences are sampled and repeats rejected; when count is a large share of
+    everything the grammar can say, the grammar is enumerated and shuffled
+    instead, since rejection sampling slows to a crawl near exhaustion.
+    """
+    grammar = Grammar(GRAMMARS[level])
+    suffix = STOP if level in STOP_LEVELS else ""
+    rng = random.Random(f"{seed}:grammar:{level}")
+    size = grammar.size()
+
+    if count >= size // 2:
+        seen = HashSet(size)
+        sentences = [s for s in (_ARTICLE.sub(r"\1n ", d) for d in grammar.derivations())
+                     if seen.add(fingerprint(s))]
+        rng.shuffle(sentences)
+        return [s + suffix + "\n" for s in sentences[:count]]
+
+    seen = HashSet(count)
+    lines = []
+    misses = 0
+    while len(lines) < count and misses < MAX_MISSES:
+        sentence = grammar.sample(rng)
+        if seen.add(fingerprint(sentence)):
+            lines.append(sentence + suffix + "\n")
+            misses = 0
+        else:
+            misses += 1
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate level 0-3 sentences from weighted grammars")
+    parser.add_argument(
+        "--levels", type=int, nargs="+", default=sorted(GRAMMARS), choices=sorted(GRAMMARS),
+        help="Levels to generate (default: 0-3)",
+    )
+    parser.add_argument("--count", type=int, default=10000, help="Distinct sentences per level (default: 10000)")
+    parser.add_argument("--seed", type=int, default=0, help="Sampling seed (default: 0)")
+    parser.add_argument("--stdout", action="store_true", help="Print instead of writing grammar_corpus.txt")
+    parser.add_argument("--size", action="store_true", help="Only print how many sentences each grammar can make")
+    args = parser.parse_args()
+
+    for level in args.levels:
+        if args.size:
+            print(f"level_{level}: {Grammar(GRAMMARS[level]).size()} derivations")
+            continue
+        start = time.time()
+        lines = generate(level, args.count, args.seed)
+        if args.stdout:
+            sys.stdout.writelines(lines)
+            continue
+        path = os.path.join(level_dir(level), GRAMMAR_FILE)
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        note = "" if len(lines) == args.count else " (grammar exhausted)"
+        print(f"level_{level}/{GRAMMAR_FILE}: {len(lines)} sentences{note} in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Generate templated sentence + Q&A lines for the level 3 corpus:
+
+    <sentence> Q: <question> A: <answer><stop>
+
+Each block declares its slot vocabularies, the sentence and question/answer
+templates, and its constraints: which values a slot may take given another
+slot's value (e.g. only cookies/cake/bread can be "baked") and which slots
+must differ (subject != object). Valid combinations are enumerated lazily in
+slot order with itertools.product and checked against precomputed sets, and
+lines are streamed in batches.
+
+Usage:
+    python auto_corpus.py                  # write all lines to stdout
+    python auto_corpus.py --count          # just print how many lines there are
+"""
+
+import argparse
+import itertools
+import operator
+import re
+import sys
+
+# ---------------------------------------------------------------------------
+# Block 1: action sentences, "Who" and "What did X verb?" questions
+# ---------------------------------------------------------------------------
+
+ACTIONS = {
+    "slots": {
+        "subject": ["boy", "dog", "chef", "lion", "squirrel", "bird", "cat", "rabbit", "bear", "girl",
+                    "man", "woman", "horse", "fox", "wolf"],
+        "verb": ["kicked", "baked", "chased", "bit", "caught", "ate", "carried", "dropped", "found",
+                 "grabbed", "lifted", "opened", "pulled", "pushed", "threw"],
+        "object": ["ball", "cookies", "cat", "man", "dog", "squirrel", "bird", "lion", "fish", "carrot",
+                   "pizza", "cake", "cheese", "egg", "apple", "banana", "bone", "stick", "leaf", "rock"],
+    },
+    # Skip weird combos: these verbs only take the listed objects
+    "allowed": {
+        ("verb", "object"): {
+            "baked": ["cookies", "cake", "bread"],
+            "kicked": ["ball", "rock", "stick"],
+            "bit": ["man", "bone", "apple"],
+            "chased": ["cat", "man", "dog", "bird", "squirrel"],
+        },
+    },
+    "distinct": [("subject", "object")],
+    "sentence": "The {subject} {verb} the {object}.",
+    "qa": [
+        ("Who {verb} the {object}?", "the {subject}."),
+        ("What did the {subject} {verb}?", "the {object}."),
+    ],
+}
+
+# ---------------------------------------------------------------------------
+# Block 2: attribute sentences, "What was X?" and "What was the subject?"
+# ---------------------------------------------------------------------------
+
+ATTRIBUTES = {
+    "slots": {
+        "subject": ["cat", "dog", "car", "sky", "ball", "tree", "house", "box", "fish", "bird", "chair",
+                    "leaf", "stone", "flower", "boat", "sun", "cloud", "lake", "road", "horse", "rabbit",
+                    "lion", "wolf", "bear", "door", "wall", "roof", "floor", "lamp", "cup", "bag", "hat",
+                    "coat", "shoe", "book", "key", "bell", "ring", "rope", "flag"],
+        "adj": ["red", "blue", "green", "yellow", "white", "black", "big", "small", "old", "new", "fast",
+                "slow", "loud", "quiet", "bright", "dark", "cold", "warm", "heavy", "light", "tall", "short",
+                "soft", "hard", "clean", "dirty", "wet", "dry", "sharp", "round", "flat", "thin", "thick",
+                "long", "wide", "narrow", "deep", "broken", "lost", "empty"],
+    },
+    "sentence": "The {subject} was {adj}.",
+    "qa": [
+        ("What was {adj}?", "the {subject}."),
+        ("What was the {subject}?", "{adj}."),
+    ],
+}
+
+BLOCKS = [ACTIONS, ATTRIBUTES]
+
+BATCH_LINES = 8192
+
+
+def _checks(block: dict) -> list:
+    """Precompute (index_a, index_b, allowed-set lookup or None for "must differ") checks."""
+    names = list(block["slots"])
+    checks = []
+    for (a, b), table in block.get("allowed", {}).items():
+        checks.append((names.index(a), names.index(b), {k: frozenset(v) for k, v in table.items()}))
+    for a, b in block.get("distinct", []):
+        checks.append((names.index(a), names.index(b), None))
+    return checks
+
+
+def combinations(block: dict):
+    """Lazily yield every valid slot-value tuple, in nested-loop order."""
+    checks = _checks(block)
+    for combo in itertools.product(*block["slots"].values()):
+        for a, b, table in checks:
+            if table is None:
+                if combo[a] == combo[b]:
+                    break
+            else:
+                allowed = table.get(combo[a])
+                if allowed is not None and combo[b] not in allowed:
+                    break
+        else:
+            yield combo
+
+
+def compile_template(template: str, names: list[str]) -> tuple:
+    """Turn "{slot}" placeholders into a %-format string plus a getter that picks
+    the matching values out of a combination tuple, in placeholder order."""
+    order = []
+
+    def placeholder(match: re.Match) -> str:
+        order.append(names.index(match.group(1)))
+        return "%s"
+
+    fmt = re.sub(r"\{(\w+)\}", placeholder, template.replace("%", "%%"))
+    # itemgetter with a single index returns a bare value, not a tuple
+    getter = operator.itemgetter(*order) if len(order) > 1 else (lambda combo: (combo[order[0]],))
+    return fmt, getter
+
+
+def lines(block: dict):
+    """Yield the output lines of one block."""
+    names = list(block["slots"])
+    compiled = [
+        compile_template(f"{block['sentence']} Q: {question} A: {answer}<stop>\n", names)
+        for question, answer in block["qa"]
+    ]
+    for combo in combinations(block):
+        for fmt, getter in compiled:
+            yield fmt % getter(combo)
+
+
+def generate():
+    """Yield every line of every block."""
+    for block in BLOCKS:
+        yield from lines(block)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate templated level 3 sentence + Q&A lines")
+    parser.add_argument("--count", action="store_true", help="Only print the number of lines")
+    args = parser.parse_args()
+
+    if args.count:
+        print(sum(1 for _ in generate()))
+        return
+
+    out = sys.stdout
+    it = generate()
+    while batch := list(itertools.islice(it, BATCH_LINES)):
+        out.writelines(batch)
+
+
+if __name__ == "__main__":
+    main()
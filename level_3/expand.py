@@ -8,26 +8,36 @@ self-contained:
 Results are appended to llm_expanded_corpus.txt.
 Progress is tracked in expand_progress.json so the script is safely resumable.
 
+Simple sentences that rule_qa.py can handle locally are skipped; run
+`python rule_qa.py` for those (or pass --no-rules to send everything).
+
 Usage:
     python expand.py            # process up to 10 batches
     python expand.py -n 50      # process up to 50 batches
     python expand.py -n 0       # dry-run: list pending batches
     python expand.py --batch-size 15 --model qwen/qwen-2.5-72b-instruct
+    python expand.py --no-rules # also send sentences rule_qa.py covers
+    python expand.py -n 500 --budget 1.00  # stop once $1 would be spent
 """
 
 import argparse
 import json
 import os
 import sys
-import time
-import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fal_client import FAL_QUEUE_URL, POLL_INTERVAL, add_arguments, complete, no_event, open_events, setup
+from fal_events import EVENTS_FILE
+from rule_qa import qa_pairs
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 CORPUS_FILE = os.path.join(SCRIPT_DIR, "corpus.txt")
 OUTPUT_FILE = os.path.join(SCRIPT_DIR, "llm_expanded_corpus.txt")
 PROGRESS_FILE = os.path.join(SCRIPT_DIR, "expand_progress.json")
 
-FAL_QUEUE_URL = "https://queue.fal.run/openrouter/router"
+# Output cap per request; --budget assumes it is all used until a cost is known
+MAX_TOKENS = 4096
 
 SYSTEM_PROMPT = """\
 You generate question-and-answer training data. For each sentence you receive,
@@ -50,91 +60,79 @@ Sentences:
 """
 
 
-def load_key(name: str) -> str | None:
-    env_path = os.path.expanduser("~/.env")
-    if not os.path.exists(env_path):
-        return None
-    with open(env_path) as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "=" in line:
-                k, v = line.split("=", 1)
-                if k.strip() == name:
-                    return v.strip()
-    return None
-
-
 def load_sentences() -> list[str]:
     with open(CORPUS_FILE) as f:
         sentences = [line.strip().removesuffix("<stop>").strip() for line in f]
     return [s for s in sentences if s]
 
 
-def load_progress() -> set[int]:
+def load_progress(sentences: list[str], batch_size: int) -> set[str]:
+    """Sentences already expanded."""
     if not os.path.exists(PROGRESS_FILE):
         return set()
     with open(PROGRESS_FILE) as f:
         data = json.load(f)
-    # Old format was list of [chunk, style] pairs — discard it and start fresh
-    if not data or not isinstance(data[0], int):
+    if not data:
+        return set()
+    # Previous format was the done batch indices over all of corpus.txt
+    if isinstance(data[0], int):
+        return {s for i in data for s in sentences[i * batch_size : (i + 1) * batch_size]}
+    # Older format was list of [chunk, style] pairs — discard it and start fresh
+    if not isinstance(data[0], str):
         return set()
     return set(data)
 
 
-def save_progress(done: set[int]) -> None:
+def save_progress(done: set[str]) -> None:
     with open(PROGRESS_FILE, "w") as f:
-        json.dump(sorted(done), f)
-
-
-def _fal_request(api_key: str, method: str, url: str, body: dict | None = None) -> dict:
-    data = json.dumps(body).encode() if body else None
-    req = urllib.request.Request(
-        url,
-        data=data,
-        method=method,
-        headers={
-            "Authorization": f"Key {api_key}",
-            "Content-Type": "application/json",
-        },
-    )
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        return json.loads(resp.read().decode())
-
-
-def generate_one(api_key: str, prompt: str, model: str) -> str:
-    submit = _fal_request(api_key, "POST", FAL_QUEUE_URL, {
+        json.dump(sorted(done), f, indent=0)
+
+
+def pending_batches(sentences: list[str], done: set[str], batch_size: int,
+                    rules: bool = True) -> tuple[list[list[str]], set[str]]:
+    """(batches still to send to the LLM, sentences rule_qa.py covers)."""
+    covered = {s for s in sentences if qa_pairs(s.split(" Q: ")[0])} if rules else set()
+    remaining = [s for s in sentences if s not in done and s not in covered]
+    return [remaining[i : i + batch_size] for i in range(0, len(remaining), batch_size)], covered
+
+
+def batch_prompt(batch: list[str]) -> str:
+    return PROMPT_TEMPLATE.format(sentences="\n".join(f"- {s}" for s in batch))
+
+
+def save_batch(batch: list[str], raw: str, done: set[str]) -> str:
+    """Append a batch's Q&A lines to OUTPUT_FILE and mark it done; returns them."""
+    formatted = format_output(raw)
+    with open(OUTPUT_FILE, "a") as f:
+        f.write(formatted + "\n")
+    done.update(batch)
+    save_progress(done)
+    return formatted
+
+
+def jobs(n: int, model: str, log: str | None = EVENTS_FILE, batch_size: int = 10) -> list[tuple]:
+    """Work for orchestrate.py: (prompt id, generate_one's prompt, input chars,
+    write(content) -> output chars) for the next n batches."""
+    sentences = load_sentences()
+    done = load_progress(sentences, batch_size)
+    batches, _covered = pending_batches(sentences, done, batch_size)
+    work = []
+    for batch in batches[:n]:
+        prompt = batch_prompt(batch)
+        work.append((batch[0], prompt, len(SYSTEM_PROMPT) + len(prompt),
+                     lambda raw, batch=batch: len(save_batch(batch, raw, done))))
+    return work
+
+
+def generate_one(api_key: str, prompt: str, model: str, base_url: str = FAL_QUEUE_URL,
+                 poll_interval: float = POLL_INTERVAL, on_event=no_event) -> str:
+    return complete(api_key, {
         "model": model,
         "system_prompt": SYSTEM_PROMPT,
         "prompt": prompt,
         "temperature": 0.7,
-        "max_tokens": 4096,
-    })
-    request_id = submit["request_id"]
-    status_url = f"{FAL_QUEUE_URL}/requests/{request_id}/status"
-    result_url = f"{FAL_QUEUE_URL}/requests/{request_id}"
-
-    poll_interval = 2
-    last_state = None
-    while True:
-        status = _fal_request(api_key, "GET", status_url)
-        state = status.get("status")
-        if state != last_state:
-            print(f"[{state}] ", end="", flush=True)
-            last_state = state
-        else:
-            print(".", end="", flush=True)
-        if state == "COMPLETED":
-            break
-        if state in ("FAILED", "CANCELLED"):
-            raise RuntimeError(f"Request {state}: {status}")
-        time.sleep(poll_interval)
-
-    result = _fal_request(api_key, "GET", result_url)
-    if result.get("error"):
-        raise RuntimeError(result["error"])
-    return result["output"].strip()
+        "max_tokens": MAX_TOKENS,
+    }, base_url, poll_interval, on_event)
 
 
 def format_output(raw: str) -> str:
@@ -157,58 +155,49 @@ def main():
                         help="Sentences per batch (default: 10)")
     parser.add_argument("--model", type=str, default="qwen/qwen-2.5-72b-instruct",
                         help="Model to use")
+    parser.add_argument("--no-rules", action="store_true",
+                        help="Also send sentences rule_qa.py can expand locally")
+    add_arguments(parser)
     args = parser.parse_args()
 
     sentences = load_sentences()
-    done = load_progress()
-
-    # Split into batches
-    batches = []
-    for i in range(0, len(sentences), args.batch_size):
-        batches.append(sentences[i : i + args.batch_size])
+    done = load_progress(sentences, args.batch_size)
+    batches, covered = pending_batches(sentences, done, args.batch_size, not args.no_rules)
+    remaining = sum(len(batch) for batch in batches)
 
-    pending = [i for i in range(len(batches)) if i not in done]
-
-    print(f"Sentences: {len(sentences)}  Batches: {len(batches)}  "
-          f"Done: {len(done)}  Remaining: {len(pending)}")
+    print(f"Sentences: {len(sentences)}  Done: {len(done & set(sentences))}  "
+          f"Rule-based: {len(covered - done)}  Remaining: {remaining} in {len(batches)} batches")
 
     if args.n == 0:
         print("\nDry-run — first 10 pending batches:")
-        for idx in pending[:10]:
-            preview = batches[idx][0][:60]
+        for idx, batch in enumerate(batches[:10]):
+            preview = batch[0][:60]
             print(f"  batch {idx:4d}: \"{preview}...\"")
         return
 
-    api_key = load_key("FAL_KEY")
-    if not api_key:
-        print("ERROR: FAL_KEY not found in ~/.env", file=sys.stderr)
-        sys.exit(1)
+    api_key = setup(args)
 
-    to_do = pending[: args.n]
+    to_do = batches[: args.n]
     print(f"Generating {len(to_do)} batches (model: {args.model})...\n")
+    events, ledger = open_events(args.events, "level_3", len(to_do), budget=args.budget)
 
-    for i, batch_idx in enumerate(to_do, 1):
-        batch = batches[batch_idx]
-        sentences_text = "\n".join(f"- {s}" for s in batch)
-        prompt = PROMPT_TEMPLATE.format(sentences=sentences_text)
-
-        print(f"[{i}/{len(to_do)}] batch {batch_idx} ({len(batch)} sentences) ... ",
-              end="", flush=True)
+    for batch in to_do:
+        prompt = batch_prompt(batch)
+        on_event = events.request(batch[0], args.model)
+        if not ledger.admit(args.model, len(SYSTEM_PROMPT) + len(prompt), MAX_TOKENS, on_event, args.poll_interval):
+            continue
         try:
-            raw = generate_one(api_key, prompt, args.model)
-            formatted = format_output(raw)
-            with open(OUTPUT_FILE, "a") as f:
-                f.write(formatted + "\n")
-            done.add(batch_idx)
-            save_progress(done)
-            lines = formatted.count("\n") + 1
-            print(f" OK ({lines} lines)")
+            raw = generate_one(api_key, prompt, args.model, args.base_url, args.poll_interval, on_event)
+            formatted = save_batch(batch, raw, done)
+            on_event("written", output_chars=len(formatted))
         except Exception as e:
-            print(f" FAILED: {e}")
+            on_event("failed", error=str(e))
+    events.close()
+    print(ledger.summary())
 
-    remaining = len(pending) - len(to_do)
-    if remaining > 0:
-        print(f"\n{remaining} batches still remaining. Run again to continue.")
+    left = len(batches) - len(to_do)
+    if left > 0:
+        print(f"\n{left} batches still remaining. Run again to continue.")
     else:
         print("\nAll batches generated!")
 
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Generate who/what/where/when/how Q&A lines for simple sentences locally,
+in the same format expand.py gets from the LLM:
+
+    <sentence> Q: <question> A: <answer><stop>
+
+A sentence is only handled when it parses completely as
+
+    subject  verb  [object]  [adverb | prepositional phrase]...  .
+
+where the subject is a determiner + adjectives + noun (or a name like Dad),
+the verb is a known past tense ("kicked", "swam") or is/are/was/were + -ing,
+and every other word falls into one of the slots. Anything else (commas,
+clauses, unknown verbs) is left for expand.py, which skips the sentences
+this script covers.
+
+From "The old dog ran across the field." it writes
+    Q: What ran across the field? A: the old dog.
+    Q: Where did the old dog run? A: across the field.
+    Q: What was old? A: the dog.
+
+Usage:
+    python rule_qa.py                    # corpus.txt -> rule_expanded_corpus.txt
+    python rule_qa.py --leftovers        # print the sentences left for expand.py
+    python rule_qa.py ../level_2/corpus.txt --output /tmp/level_2_qa.txt
+"""
+
+import argparse
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_FILE = os.path.join(SCRIPT_DIR, "corpus.txt")
+OUTPUT_FILE = os.path.join(SCRIPT_DIR, "rule_expanded_corpus.txt")
+
+# ---------------------------------------------------------------------------
+# Lexicon
+# ---------------------------------------------------------------------------
+
+VERBS = """
+    arrive bake bark bask bloom blow bounce brush buzz chase chirp circle climb close cook cover crackle
+    crawl creak cry curl dance dart drift drop echo fix flash flicker float flutter gallop glow graze growl
+    hoot hop hover howl jump kick land laugh lean lift listen look meow move nibble nod open paint play
+    pounce pull purr push rest ripen roar rock roll rustle sail smile snore soar splash sprout squeak
+    stay stop stretch sway talk tick trot turn twinkle wag waddle wait walk warm wander wash watch wave whisper
+    yawn
+""".split()
+IRREGULAR = {
+    "ate": "eat", "bit": "bite", "blew": "blow", "built": "build", "came": "come", "caught": "catch",
+    "dug": "dig", "drank": "drink", "drew": "draw", "drove": "drive", "fell": "fall", "flew": "fly",
+    "found": "find", "grew": "grow", "hid": "hide", "held": "hold", "lay": "lie", "left": "leave",
+    "made": "make", "ran": "run", "rang": "ring", "read": "read", "rode": "ride", "rose": "rise", "set": "set",
+    "sang": "sing", "sank": "sink", "sat": "sit", "saw": "see", "shook": "shake", "shone": "shine",
+    "slept": "sleep", "spun": "spin", "stood": "stand", "swam": "swim", "swung": "swing", "threw": "throw",
+    "took": "take", "went": "go", "woke": "wake", "wove": "weave", "wrote": "write",
+}
+DOUBLED = {"drop", "hop", "nod", "stop", "wag", "grab", "jog", "hug", "skip", "pat", "rub"}
+LINKING = {"turn", "grow", "look", "stay"}  # "turned orange" is not an object
+
+
+def past_tense(base: str) -> str:
+    if base in DOUBLED:
+        return base + base[-1] + "ed"
+    if base.endswith("e"):
+        return base + "d"
+    if base.endswith("y") and base[-2] not in "aeiou":
+        return base[:-1] + "ied"
+    return base + "ed"
+
+
+PAST = {past_tense(base): base for base in VERBS} | IRREGULAR
+
+ARTICLES = {"the", "a", "an"}
+NUMBERS = {"two", "three", "four", "five", "six", "seven", "eight", "nine", "ten"}
+DETERMINERS = ARTICLES | NUMBERS | {"his", "her", "its", "their", "my", "some"}
+AUX = {"is": "is", "are": "is", "was": "was", "were": "was"}  # wh-subject questions are singular
+PLACE_PREPS = {"in", "on", "under", "over", "across", "into", "through", "near", "above", "below",
+               "beside", "behind", "toward", "towards", "onto", "inside", "beneath", "around", "along",
+               "past", "by", "up", "down"}
+OTHER_PREPS = {"at", "after", "from", "with", "for", "to", "about"}
+PREPS = PLACE_PREPS | OTHER_PREPS
+TIME_NOUNS = {"night", "morning", "evening", "afternoon", "dawn", "dusk", "noon", "midnight", "spring",
+              "summer", "autumn", "fall", "winter", "sunrise", "sunset"}
+ADVERBS = {"fast", "hard", "late", "early", "together", "open", "away", "again", "outside", "home",
+           "back", "off", "well", "still", "too", "there", "here", "now", "overhead", "nearby", "upward",
+           "downward", "ahead", "inside", "indoors", "outdoors", "today", "yesterday"}
+HOW_ADVERBS = {"fast", "hard", "well"}  # besides -ly words
+# Asked with When, not How ("The sun rose early." -> When did the sun rise?)
+TIME_ADVERBS = {"early", "late", "daily", "weekly", "nightly", "hourly", "monthly", "yearly", "today",
+                "yesterday", "now"}
+NOT_MANNER = {"likely", "only", "really", "nearly", "mostly", "lonely", "friendly"}  # -ly, but not how
+PEOPLE = {"man", "woman", "boy", "girl", "child", "children", "kid", "kids", "baby", "chef", "mailman",
+          "teacher", "artist", "farmer", "doctor", "student", "students", "friend", "friends", "mom", "dad",
+          "people", "men", "women", "player", "players", "driver", "grandma", "grandpa", "sailor", "king",
+          "queen", "fisherman", "girls", "boys"}
+# Bare one-word subjects: names ("Dad") keep their capital, the rest are lowercased
+NAMES = {"Dad", "Mom", "Grandma", "Grandpa"}
+MASS_NOUNS = {"rain", "snow", "fog", "wind", "smoke", "thunder", "light", "music", "water", "spring",
+              "summer", "autumn", "winter"}
+IRREGULAR_PLURALS = {"children", "people", "men", "women", "mice", "geese", "sheep", "fish"}
+NOT_WORDS = {"and", "or", "but", "while", "when", "as", "because", "if", "so", "then", "that", "which",
+             "who", "where", "not", "didn't", "it", "he", "she", "they"}
+
+
+LY_NOUNS = {"butterfly", "dragonfly", "family", "belly", "jelly", "lily", "holly", "bully", "rally"}
+
+
+def is_adverb(word: str) -> bool:
+    return word in ADVERBS or (word.endswith("ly") and len(word) > 4 and word not in LY_NOUNS)
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+class Parse:
+    """Slots of one simple sentence."""
+
+    def __init__(self, subject: list[str], aux: str | None, verb: str):
+        self.subject = subject      # ["The", "old", "dog"]
+        self.aux = aux              # "is" for "is running", else None
+        self.verb = verb            # "ran" / "running"
+        self.object: list[str] = []
+        self.tail: list[tuple[str, list[str]]] = []  # ("adverb" | "place" | "time" | "prep", words)
+
+    @property
+    def noun(self) -> str:
+        return self.subject[-1]
+
+    @property
+    def adjectives(self) -> list[str]:
+        return self.subject[1:-1] if len(self.subject) > 1 else []
+
+    @property
+    def plural(self) -> bool:
+        det = self.subject[0].lower()
+        if len(self.subject) == 1 or det in ("a", "an"):
+            return False
+        return det in NUMBERS or self.noun in IRREGULAR_PLURALS or (
+            self.noun.endswith("s") and not self.noun.endswith("ss"))
+
+    def phrase(self, adjectives: bool = True, number: bool = False) -> str:
+        """Subject as it reads mid-sentence: "the old dog", "Dad", "his sister";
+        with number=True "two birds" keeps its number (for answers)."""
+        if len(self.subject) == 1:
+            return self.subject[0] if self.subject[0] in NAMES else self.subject[0].lower()
+        det = self.subject[0].lower()
+        if det in ARTICLES or (det in NUMBERS and not number):
+            det = "the"
+        return " ".join([det] + (self.subject[1:] if adjectives else [self.noun]))
+
+    def who(self, words: list[str]) -> str:
+        return "Who" if words[-1].lower() in PEOPLE else "What"
+
+
+def _noun_phrase(words: list[str], i: int) -> int:
+    """End index of the noun phrase starting at words[i] (words up to the next
+    preposition/adverb), or i when there is none."""
+    j = i
+    if j < len(words) and words[j].lower() in DETERMINERS:
+        j += 1
+    while j < len(words) and words[j] not in PREPS and words[j] not in NOT_WORDS:
+        # "-ly" before another noun phrase word is an adjective ("the friendly dog")
+        if is_adverb(words[j]) and (j + 1 == len(words) or words[j + 1] in PREPS or is_adverb(words[j + 1])):
+            break
+        j += 1
+    if j == i or (words[i].lower() in DETERMINERS and j == i + 1):
+        return i
+    return j
+
+
+def parse(sentence: str) -> Parse | None:
+    """Parse a simple sentence, or None if it doesn't fit the pattern."""
+    if not sentence.endswith(".") or sentence.count(".") != 1:
+        return None
+    words = sentence[:-1].split()
+    if not words or not all(w.replace("-", "").replace("'", "").isalpha() for w in words):
+        return None
+    if any(w.lower() in NOT_WORDS for w in words):
+        return None
+
+    # Subject: everything before the verb
+    for k in range(1, len(words)):
+        w = words[k]
+        if w in PAST:
+            aux, verb, rest = None, w, k + 1
+            break
+        if w in AUX and k + 1 < len(words) and words[k + 1].endswith("ing"):
+            aux, verb, rest = w, words[k + 1], k + 2
+            break
+    else:
+        return None
+    subject = words[:k]
+    first = subject[0]
+    if len(subject) == 1:
+        if first not in NAMES and first.lower() not in MASS_NOUNS:
+            return None
+    elif first.lower() not in DETERMINERS or any(
+            w in PREPS or w in DETERMINERS or w in ADVERBS for w in subject[1:]):
+        return None
+    p = Parse(subject, aux, verb)
+
+    # Object: a determiner phrase, or a bare noun phrase ("baked bread")
+    i = rest
+    base = PAST.get(verb)
+    if i < len(words) and words[i] not in PREPS and not is_adverb(words[i]) and base not in LINKING:
+        j = _noun_phrase(words, i)
+        if j == i:
+            return None
+        p.object, i = words[i:j], j
+
+    # Adverbs and prepositional phrases
+    while i < len(words):
+        w = words[i]
+        if is_adverb(w):
+            p.tail.append(("time" if w in TIME_ADVERBS else "adverb", [w]))
+            i += 1
+        elif w in PREPS:
+            j = _noun_phrase(words, i + 1)
+            if j == i + 1:
+                return None
+            phrase = words[i:j]
+            kind = "time" if phrase[-1] in TIME_NOUNS else "place" if w in PLACE_PREPS else "prep"
+            # "on the bench under the tree" is one place
+            if kind == "place" and p.tail and p.tail[-1][0] == "place":
+                p.tail[-1] = ("place", p.tail[-1][1] + phrase)
+            else:
+                p.tail.append((kind, phrase))
+            i = j
+        else:
+            return None
+    return p
+
+
+# ---------------------------------------------------------------------------
+# Questions
+# ---------------------------------------------------------------------------
+
+def qa_pairs(sentence: str) -> list[tuple[str, str]]:
+    """(question, answer) pairs for a sentence; empty if it can't be parsed."""
+    p = parse(sentence)
+    if p is None:
+        return []
+    subj = p.phrase()
+    after_subject = " ".join(sentence[:-1].split()[len(p.subject):])
+    base = PAST.get(p.verb)
+    obj = " ".join(p.object)
+
+    def asking(*extra: str) -> str:
+        """'did the dog chase' / 'is the dog chasing', plus extra words."""
+        if p.aux:
+            words = [p.aux, subj, p.verb]
+        else:
+            words = ["did", subj, base]
+        return " ".join(words + [e for e in extra if e])
+
+    pairs = []
+    # Who/what did it
+    verb_part = after_subject
+    if p.aux:
+        verb_part = AUX[p.aux] + after_subject[len(p.aux):]
+    pairs.append((f"{p.who(p.subject)} {verb_part}?", p.phrase(number=True)))
+
+    if p.subject[0].lower() in NUMBERS:
+        pairs.append((f"How many {p.noun} {after_subject}?", p.subject[0].lower()))
+
+    if p.object:
+        pairs.append((f"{p.who(p.object)} {asking()}?", obj))
+
+    for kind, words in p.tail:
+        phrase = " ".join(words)
+        if kind == "place":
+            pairs.append((f"Where {asking(obj)}?", phrase))
+        elif kind == "time":
+            pairs.append((f"When {asking(obj)}?", phrase))
+        elif kind == "prep" and words[0] in ("at", "after", "with", "about"):
+            target = words[1:]
+            pairs.append((f"{p.who(target)} {asking(obj, words[0])}?", " ".join(target)))
+        elif kind == "adverb" and words[0] not in NOT_MANNER and (
+                words[0].endswith("ly") or words[0] in HOW_ADVERBS):
+            pairs.append((f"How {asking(obj)}?", phrase))
+
+    if len(p.adjectives) == 1 and len(p.subject) > 2:
+        copula = ("are" if p.plural else "is") if p.aux in ("is", "are") else ("were" if p.plural else "was")
+        pairs.append((f"{p.who(p.subject)} {copula} {p.adjectives[0]}?", p.phrase(adjectives=False)))
+
+    return [(q[0].upper() + q[1:], a) for q, a in pairs]
+
+
+def lines(sentence: str) -> list[str]:
+    """Output lines for a sentence, in expand.py's format."""
+    return [f"{sentence} Q: {q} A: {a}.<stop>" for q, a in qa_pairs(sentence)]
+
+
+def load_sentences(paths: list[str]) -> list[str]:
+    """Distinct sentences of corpus files, without <stop> or existing Q&A."""
+    seen = {}
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                sentence = line.strip().removesuffix("<stop>").split(" Q: ")[0].strip()
+                if sentence:
+                    seen.setdefault(sentence)
+    return list(seen)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rule-based Q&A lines for simple sentences")
+    parser.add_argument("inputs", nargs="*", default=[CORPUS_FILE], help="Corpus files (default: corpus.txt)")
+    parser.add_argument("--output", default=OUTPUT_FILE, help="Output file (default: rule_expanded_corpus.txt)")
+    parser.add_argument("--leftovers", action="store_true", help="Only print the sentences that don't parse")
+    args = parser.parse_args()
+
+    sentences = load_sentences(args.inputs)
+    covered = {s: lines(s) for s in sentences}
+    leftovers = [s for s in sentences if not covered[s]]
+    if args.leftovers:
+        try:
+            print("\n".join(leftovers), flush=True)
+        except BrokenPipeError:  # e.g. piped into head; the exit flush would fail again
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return
+
+    out = [line for s in sentences for line in covered[s]]
+    with open(args.output, "w") as f:
+        f.write("\n".join(out) + "\n" if out else "")
+    print(f"{len(sentences)} sentences: {len(sentences) - len(leftovers)} parsed -> {len(out)} Q&A lines "
+          f"in {os.path.relpath(args.output)}; {len(leftovers)} left for expand.py")
+
+
+if __name__ == "__main__":
+    main()
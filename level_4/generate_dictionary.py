@@ -7,23 +7,28 @@ Usage:
     python generate_dictionary.py            # generate 1 entry (default)
     python generate_dictionary.py -n 10      # generate up to 10 entries
     python generate_dictionary.py -n 0       # dry-run: list next words only
+    python generate_dictionary.py -n 500 --budget 1.00  # stop once $1 would be spent
 
 Output: level_4/corpus/dictionary/<word>.corpus  (flat, one file per word)
 
-Reads FAL_KEY from ~/.env (KEY=VALUE format, one per line).
+Reads FAL_KEY from the environment or ~/.env (KEY=VALUE format, one per line).
 """
 
 import argparse
-import json
+import functools
 import os
 import re
 import sys
-import time
-import urllib.request
-import urllib.error
 from collections import Counter
 
-FAL_QUEUE_URL = "https://queue.fal.run/openrouter/router"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fal_client import FAL_QUEUE_URL, POLL_INTERVAL, add_arguments, complete, no_event, open_events, setup
+from fal_events import EVENTS_FILE
+
+# Output cap per request; --budget assumes it is all used until a cost is known
+MAX_TOKENS = 512
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 CORPUS_ROOT = os.path.join(SCRIPT_DIR, "corpus")
 DICT_DIR = os.path.join(CORPUS_ROOT, "dictionary")
@@ -44,22 +49,6 @@ ENTRY_PROMPT = (
 )
 
 
-def load_key(name: str) -> str | None:
-    env_path = os.path.expanduser("~/.env")
-    if not os.path.exists(env_path):
-        return None
-    with open(env_path) as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "=" in line:
-                k, v = line.split("=", 1)
-                if k.strip() == name:
-                    return v.strip()
-    return None
-
-
 def word_frequencies(corpus_root: str) -> list[str]:
     """Walk all .corpus files and return words sorted by frequency (most common first)."""
     counter: Counter = Counter()
@@ -107,55 +96,31 @@ def next_words(n: int) -> list[str]:
     return result
 
 
-def _fal_request(api_key: str, method: str, url: str, body: dict | None = None) -> dict:
-    data = json.dumps(body).encode() if body else None
-    req = urllib.request.Request(
-        url,
-        data=data,
-        method=method,
-        headers={
-            "Authorization": f"Key {api_key}",
-            "Content-Type": "application/json",
-        },
-    )
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        return json.loads(resp.read().decode())
+def write_entry(word: str, content: str) -> int:
+    """Write a word's entry; returns its output chars."""
+    with open(os.path.join(DICT_DIR, f"{word}.corpus"), "w") as f:
+        f.write(f'Dictionary entry for "{word.capitalize()}".\n{content}\n')
+    return len(content)
+
 
+def jobs(n: int, model: str, log: str | None = EVENTS_FILE) -> list[tuple]:
+    """Work for orchestrate.py: (prompt id, generate_one's word, input chars,
+    write(content) -> output chars) for the next n words."""
+    os.makedirs(DICT_DIR, exist_ok=True)
+    return [(f"dictionary/{word}.corpus", word, len(SYSTEM_PROMPT) + len(ENTRY_PROMPT.format(word=word)),
+             functools.partial(write_entry, word))
+            for word in next_words(n)]
 
-def generate_one(api_key: str, word: str, model: str) -> str:
-    prompt = ENTRY_PROMPT.format(word=word)
 
-    submit = _fal_request(api_key, "POST", FAL_QUEUE_URL, {
+def generate_one(api_key: str, word: str, model: str, base_url: str = FAL_QUEUE_URL,
+                 poll_interval: float = POLL_INTERVAL, on_event=no_event) -> str:
+    return complete(api_key, {
         "model": model,
         "system_prompt": SYSTEM_PROMPT,
-        "prompt": prompt,
+        "prompt": ENTRY_PROMPT.format(word=word),
         "temperature": 0.5,
-        "max_tokens": 512,
-    })
-    request_id = submit["request_id"]
-    status_url = f"{FAL_QUEUE_URL}/requests/{request_id}/status"
-    result_url = f"{FAL_QUEUE_URL}/requests/{request_id}"
-
-    poll_interval = 2
-    last_state = None
-    while True:
-        status = _fal_request(api_key, "GET", status_url)
-        state = status.get("status")
-        if state != last_state:
-            print(f"[{state}] ", end="", flush=True)
-            last_state = state
-        else:
-            print(".", end="", flush=True)
-        if state == "COMPLETED":
-            break
-        if state in ("FAILED", "CANCELLED"):
-            raise RuntimeError(f"Request {state}: {status}")
-        time.sleep(poll_interval)
-
-    result = _fal_request(api_key, "GET", result_url)
-    if result.get("error"):
-        raise RuntimeError(result["error"])
-    return result["output"].strip()
+        "max_tokens": MAX_TOKENS,
+    }, base_url, poll_interval, on_event)
 
 
 def main():
@@ -168,6 +133,7 @@ def main():
         "--model", type=str, default=MODEL,
         help=f"Model to use (default: {MODEL})",
     )
+    add_arguments(parser)
     args = parser.parse_args()
 
     print("Scanning corpus for word frequencies...", flush=True)
@@ -185,24 +151,24 @@ def main():
             print(f"  {w}")
         return
 
-    api_key = load_key("FAL_KEY")
-    if not api_key:
-        print("ERROR: FAL_KEY not found in ~/.env", file=sys.stderr)
-        sys.exit(1)
+    api_key = setup(args)
 
     os.makedirs(DICT_DIR, exist_ok=True)
     print(f"Generating {len(words)} dictionary entr{'y' if len(words) == 1 else 'ies'} (model: {args.model})...\n")
+    events, ledger = open_events(args.events, "level_4", len(words), budget=args.budget)
 
-    for i, word in enumerate(words, 1):
-        out_path = os.path.join(DICT_DIR, f"{word}.corpus")
-        print(f"[{i}/{len(words)}] {word} ... ", end="", flush=True)
+    for word in words:
+        on_event = events.request(f"dictionary/{word}.corpus", args.model)
+        input_chars = len(SYSTEM_PROMPT) + len(ENTRY_PROMPT.format(word=word))
+        if not ledger.admit(args.model, input_chars, MAX_TOKENS, on_event, args.poll_interval):
+            continue
         try:
-            content = generate_one(api_key, word, args.model)
-            with open(out_path, "w") as f:
-                f.write(f'Dictionary entry for "{word.capitalize()}".\n{content}\n')
-            print(f"OK ({len(content)} chars)")
+            content = generate_one(api_key, word, args.model, args.base_url, args.poll_interval, on_event)
+            on_event("written", output_chars=write_entry(word, content))
         except Exception as e:
-            print(f"FAILED: {e}")
+            on_event("failed", error=str(e))
+    events.close()
+    print(ledger.summary())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Example-level record store for the level 5 corpus.
+
+Every level 5 .corpus file holds a dozen or so examples as free text. `build`
+parses them once into one record per example and writes:
+
+    records/examples-NNNNN.jsonl   records as JSON lines, SHARD_RECORDS per shard
+    records/index.bin              one fixed-size entry per record: shard, byte
+                                   start/end, content fingerprint, group id,
+                                   kind (struct RECORD_FORMAT)
+    records/index.json             the group table (kind, domain, subdomain) and counts
+
+A record has kind ("tool_use" / "json_qa"), domain, subdomain, angle (the
+source file name), path, its position in the file, and the raw text of each
+field: question/call/response or context/input/output.
+
+ExampleStore filters, dedups, balances and samples on the index alone, and
+only decodes the records it returns; render_documents() turns any subset back
+into today's text format, one <stop> document per source file.
+
+Usage:
+    python records.py build                   # parse corpus/ into records/
+    python records.py stats                   # records per kind and domain
+    python records.py sample 3 --kind json_qa # print three rendered examples
+
+    store = ExampleStore()
+    subset = store.filter(kinds=["tool_use"], domains=["weather_api"]).dedup().balance(100, seed=0)
+    docs = render_documents(subset)           # [(source path, text)]
+
+`python assemble.py --records` builds level 5 from this store.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import struct
+import sys
+from array import array
+
+from validate import parse_examples
+
+LEVEL_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(LEVEL_DIR)
+sys.path.insert(0, REPO_DIR)
+
+from dataset import IndexedView, map_file
+CORPUS_DIR = os.path.join(LEVEL_DIR, "corpus")
+STORE_DIR = os.path.join(LEVEL_DIR, "records")
+
+RECORD_FORMAT = "<IQQQHH"  # shard, start, end, fingerprint, group id, kind id
+SHARD_RECORDS = 50000
+
+# Field labels per kind, in the order they are written
+KINDS = {
+    "tool_use": ("Question", "Call", "Response"),
+    "json_qa": ("Context", "Input", "Output"),
+}
+KIND_IDS = {kind: i for i, kind in enumerate(KINDS)}
+
+
+# ---------------------------------------------------------------------------
+# Parsing and building
+# ---------------------------------------------------------------------------
+
+def parse_file(path: str) -> list[dict]:
+    """One record per complete example of a level 5 .corpus file."""
+    rel = os.path.relpath(path, CORPUS_DIR)
+    kind, domain, subdomain, angle = rel.split(os.sep)[:4]
+    labels = KINDS[kind]
+    with open(path, encoding="utf-8") as f:
+        examples = parse_examples(f.read(), labels)
+    records = []
+    for n, example in enumerate(examples):
+        if not all(label in example for label in labels):
+            continue
+        record = {"kind": kind, "domain": domain, "subdomain": subdomain, "angle": angle,
+                  "path": os.path.relpath(path, REPO_DIR), "n": n}
+        for label in labels:
+            record[label.lower()] = example[label].strip()
+        records.append(record)
+    return records
+
+
+def fingerprint(record: dict) -> int:
+    """64-bit hash of an example's fields, ignoring where it came from."""
+    text = "\n".join(record[label.lower()] for label in KINDS[record["kind"]])
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+def corpus_files() -> list[str]:
+    paths = []
+    for kind in KINDS:
+        for root, _dirs, files in os.walk(os.path.join(CORPUS_DIR, kind)):
+            paths.extend(os.path.join(root, f) for f in files if f.endswith(".corpus"))
+    return sorted(paths)
+
+
+def build(store_dir: str = STORE_DIR) -> dict:
+    """Parse every .corpus file into store_dir. Returns the index metadata."""
+    os.makedirs(store_dir, exist_ok=True)
+    for name in os.listdir(store_dir):
+        if name.startswith("examples-"):
+            os.remove(os.path.join(store_dir, name))  # stale shards
+
+    groups: dict[tuple[str, str, str], int] = {}
+    files = 0
+    count = 0
+    shard = None
+    with open(os.path.join(store_dir, "index.bin"), "wb") as index:
+        for path in corpus_files():
+            files += 1
+            for record in parse_file(path):
+                if count % SHARD_RECORDS == 0:
+                    if shard:
+                        shard.close()
+                    shard = open(os.path.join(store_dir, f"examples-{count // SHARD_RECORDS:05d}.jsonl"), "wb")
+                line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+                start = shard.tell()
+                shard.write(line)
+                gid = groups.setdefault((record["kind"], record["domain"], record["subdomain"]), len(groups))
+                index.write(struct.pack(RECORD_FORMAT, count // SHARD_RECORDS, start, start + len(line),
+                                        fingerprint(record), gid, KIND_IDS[record["kind"]]))
+                count += 1
+    if shard:
+        shard.close()
+
+    meta = {
+        "format": 1,
+        "record_format": RECORD_FORMAT,
+        "records": count,
+        "files": files,
+        "shards": -(-count // SHARD_RECORDS),
+        "groups": [{"kind": k, "domain": d, "subdomain": s} for k, d, s in groups],
+    }
+    with open(os.path.join(store_dir, "index.json"), "w") as f:
+        json.dump(meta, f, indent=1)
+    return meta
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class ExampleStore(IndexedView):
+    """Indexable view over the level 5 example records."""
+
+    ENTRY = struct.Struct(RECORD_FORMAT)
+    REOPEN = ("store_dir",)
+
+    def __init__(self, store_dir: str = STORE_DIR, ids: range | array | None = None):
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, "index.json")) as f:
+            meta = json.load(f)
+        self.groups = meta["groups"]
+        self._shards = [map_file(os.path.join(store_dir, f"examples-{i:05d}.jsonl")) for i in range(meta["shards"])]
+        self._index = map_file(os.path.join(store_dir, "index.bin"))
+        self._ids = range(meta["records"]) if ids is None else ids
+
+    def _load(self, entry: tuple) -> dict:
+        shard, start, end, _fp, _gid, _kind = entry
+        return json.loads(self._shards[shard][start:end])
+
+    def filter(self, kinds: list[str] | None = None, domains: list[str] | None = None,
+               subdomains: list[str] | None = None) -> "ExampleStore":
+        wanted = {
+            gid for gid, g in enumerate(self.groups)
+            if (kinds is None or g["kind"] in kinds)
+            and (domains is None or g["domain"] in domains)
+            and (subdomains is None or g["subdomain"] in subdomains)
+        }
+        return self._view(array("Q", (i for i in self._ids if self._entry(i)[4] in wanted)))
+
+    def dedup(self) -> "ExampleStore":
+        """Keep the first record of each distinct example text."""
+        seen = set()
+        ids = array("Q")
+        for i in self._ids:
+            fp = self._entry(i)[3]
+            if fp not in seen:
+                seen.add(fp)
+                ids.append(i)
+        return self._view(ids)
+
+    def balance(self, per_group: int, seed: int = 0) -> "ExampleStore":
+        """At most per_group random records from each (kind, domain, subdomain),
+        kept in store order."""
+        by_group: dict[int, list[int]] = {}
+        for i in self._ids:
+            by_group.setdefault(self._entry(i)[4], []).append(i)
+        rng = random.Random(seed)
+        kept = []
+        for gid in sorted(by_group):
+            ids = by_group[gid]
+            kept.extend(ids if len(ids) <= per_group else rng.sample(ids, per_group))
+        return self._view(array("Q", sorted(kept)))
+
+    def sample(self, n: int, seed: int | None = None) -> "ExampleStore":
+        """n random records (without replacement), in random order."""
+        ids = random.Random(seed).sample(list(self._ids), min(n, len(self)))
+        return self._view(array("Q", ids))
+
+    def counts(self) -> dict[tuple[str, str], int]:
+        """Records per (kind, domain)."""
+        counts: dict[tuple[str, str], int] = {}
+        for i in self._ids:
+            g = self.groups[self._entry(i)[4]]
+            counts[(g["kind"], g["domain"])] = counts.get((g["kind"], g["domain"]), 0) + 1
+        return counts
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def render(record: dict) -> str:
+    """One example in the .corpus text format."""
+    return "\n".join(f"{label}: {record[label.lower()]}" for label in KINDS[record["kind"]])
+
+
+def render_documents(records) -> list[tuple[str, str]]:
+    """(source path, text) per source file, examples blank-line separated in
+    their original order; files appear in the order first seen."""
+    by_path: dict[str, list[dict]] = {}
+    for record in records:
+        by_path.setdefault(record["path"], []).append(record)
+    return [
+        (path, "\n\n".join(render(r) for r in sorted(group, key=lambda r: r["n"])) + "\n")
+        for path, group in by_path.items()
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and inspect the level 5 example record store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="Parse corpus/**/*.corpus into records/")
+    sub.add_parser("stats", help="Records per kind and domain")
+    sample = sub.add_parser("sample", help="Print N random rendered examples")
+    sample.add_argument("n", type=int)
+    sample.add_argument("--kind", choices=list(KINDS), help="Only this kind")
+    sample.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        meta = build()
+        print(f"{meta['records']} examples from {meta['files']} files in {meta['shards']} shards "
+              f"-> {os.path.relpath(STORE_DIR, REPO_DIR)}/")
+        return
+
+    if not os.path.exists(os.path.join(STORE_DIR, "index.json")):
+        print("ERROR: no record store — run `python records.py build` first", file=sys.stderr)
+        sys.exit(1)
+    store = ExampleStore()
+    if args.command == "stats":
+        print(f"{len(store)} examples, {len(store.dedup())} distinct")
+        for (kind, domain), n in sorted(store.counts().items()):
+            print(f"  {kind:9s} {domain:25s} {n:7d}")
+        return
+
+    if args.kind:
+        store = store.filter(kinds=[args.kind])
+    for record in store.sample(args.n, args.seed):
+        print(f"--- {record['path']} #{record['n']} ---\n{render(record)}\n")
+
+
+if __name__ == "__main__":
+    main()
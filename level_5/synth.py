@@ -0,0 +1,108 @@
+"""
+Shared driver of the local level 5 generators (synth_tool_use.py,
+synth_json_qa.py).
+
+A generator module provides makers(selection): one fn(rng) -> rendered
+example per template family (a tool subdomain, a json_qa angle). Examples
+come in chunks seeded by (seed, kind, chunk number), so the output only
+depends on the seed and the count, not on the number of worker processes.
+Within a chunk, examples of one maker stay adjacent in groups of
+EXAMPLES_PER_DOC so documents read like one generated .corpus file.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from multiprocessing import Pool
+
+CHUNK_EXAMPLES = 20000
+EXAMPLES_PER_DOC = 12  # like one generated .corpus file
+
+
+def article(word: str) -> str:
+    """"a" or "an" for the word that follows it (an architect, a nurse, an
+    18-year-old, an 8 GB volume)."""
+    digits = re.match(r"\d*", word)[0]
+    if digits:
+        return "an" if digits[0] == "8" or (len(digits) % 3 == 2 and digits[:2] in ("11", "18")) else "a"
+    return "an" if word[:1].lower() in "aeiou" else "a"
+
+
+# Set in each worker by _init_worker
+_MAKERS: list = []
+
+
+def _init_worker(makers, selection) -> None:
+    global _MAKERS
+    _MAKERS = makers(selection)
+
+
+def _chunk(job: tuple[str, int, int, int]) -> list[str]:
+    kind, seed, chunk, count = job
+    rng = random.Random(f"{seed}:{kind}:{chunk}")
+    out = []
+    while len(out) < count:
+        make = rng.choice(_MAKERS)
+        for _ in range(min(EXAMPLES_PER_DOC, count - len(out))):
+            out.append(make(rng))
+    return out
+
+
+def generate(kind: str, makers, count: int, seed: int = 0, workers: int = 1, selection=None):
+    """Yield count rendered examples (without trailing blank line) from makers(selection)."""
+    jobs = [(kind, seed, i, min(CHUNK_EXAMPLES, count - start))
+            for i, start in enumerate(range(0, count, CHUNK_EXAMPLES))]
+    if workers <= 1 or len(jobs) <= 1:
+        _init_worker(makers, selection)
+        for job in jobs:
+            yield from _chunk(job)
+        return
+    with Pool(workers, initializer=_init_worker, initargs=(makers, selection)) as pool:
+        for examples in pool.imap(_chunk, jobs):
+            yield from examples
+
+
+def documents(examples) -> list[str]:
+    """Examples grouped EXAMPLES_PER_DOC at a time into .corpus-style documents."""
+    docs, current = [], []
+    for example in examples:
+        current.append(example)
+        if len(current) == EXAMPLES_PER_DOC:
+            docs.append("\n\n".join(current) + "\n")
+            current = []
+    if current:
+        docs.append("\n\n".join(current) + "\n")
+    return docs
+
+
+def main(generate_examples, description: str, selection_flag: str, choices: list[str], selection_help: str):
+    """Command line of a generator: generate_examples(count, seed, workers, selection)."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--count", type=int, default=24, help="Number of examples (default: 24)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed (default: 0)")
+    parser.add_argument(selection_flag, nargs="+", choices=choices, dest="selection", help=selection_help)
+    parser.add_argument("-o", "--output", help="Write here instead of stdout")
+    parser.add_argument(
+        "-p", "--workers", type=int, default=os.cpu_count() or 1,
+        help="Worker processes (default: all cores)",
+    )
+    args = parser.parse_args()
+
+    start = time.time()
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for example in generate_examples(args.count, args.seed, args.workers, args.selection):
+            out.write(example + "\n\n")
+    except BrokenPipeError:  # e.g. piped into head
+        sys.stderr.close()
+        return
+    finally:
+        if args.output:
+            out.close()
+    if args.output:
+        elapsed = time.time() - start
+        print(f"{args.count} examples -> {args.output} in {elapsed:.1f}s "
+              f"({args.count / elapsed / 1e6 * 60:.1f}M/min)")
@@ -0,0 +1,606 @@
+#!/usr/bin/env python3
+"""
+Generate json_qa examples locally, without any LLM calls.
+
+Every angle of scaffold.JSON_QA (who/what/where/when/how many, the
+multi-field person/event/product/transaction extractions, negation,
+conditions, cause and effect, sequences, comparisons, inference, pronouns)
+has a builder below. A builder slot-fills one of a few 1-3 sentence context
+templates and derives the Input question (or extract list) and the Output
+from the same slot values, so every answer is copied verbatim from its
+context by construction (verify_qa.py finds no violations). The two angles
+verify_qa.py exempts (by_how_much, simple_inference) compute or infer their
+answer, as their prompts ask.
+
+Output is the exact level 5 format:
+
+    Context: On Friday, the coach locked the door at the gym.
+    Input: {"question": "Who locked the door at the gym?"}
+    Output: {"answer": "the coach"}
+
+Chunking, seeding and the command line are shared with synth_tool_use.py
+(synth.py): the output only depends on --seed and --count, not on the
+number of worker processes.
+
+Usage:
+    python synth_json_qa.py --count 24                  # print 24 examples
+    python synth_json_qa.py --count 2000000 -o /tmp/json_qa.corpus
+    python synth_json_qa.py --count 1000 --categories multi_field
+
+`python assemble.py --synthetic N` streams N of these into level 5 directly.
+"""
+
+import json
+import random
+
+import synth
+from scaffold import JSON_QA
+from synth import article
+from synth_tool_use import CITIES, FIRST, LAST
+
+SOURCE = "level_5/synth_json_qa.py"
+
+# ---------------------------------------------------------------------------
+# Value pools
+# ---------------------------------------------------------------------------
+
+WOMEN = ["Alice", "Diana", "Emma", "Grace", "Ines", "Kira", "Maya", "Olga", "Priya", "Rosa"]
+MEN = ["Bob", "Carlos", "Farid", "Hiro", "Jamal", "Liam", "Noah", "Sam", "Tariq"]
+ROLES = ["the teacher", "the coach", "the manager", "the nurse", "the driver", "the new intern",
+         "the janitor", "the captain", "the librarian", "the chef"]
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September",
+          "October", "November", "December"]
+PLACES = ["the office", "the gym", "the school", "the library", "the warehouse", "the clinic",
+          "the community center", "the bakery"]
+DESTINATIONS = ["the public library", "Central Park", "the post office", "the train station",
+                "the farmers market", "the dentist's office", "the city museum", "the hardware store",
+                "the swimming pool", "the old harbor"]
+
+DEEDS = ["fixed the printer", "won the race", "baked the cake", "locked the door", "found the keys",
+         "organized the trip", "painted the fence", "gave the speech", "drove the bus", "graded the exams",
+         "answered the phone", "watered the plants"]
+# (past tense, base form) pairs, so questions can reuse the context's verb
+ITEM_VERBS = [("used", "use"), ("found", "find"), ("bought", "buy"), ("brought", "bring"),
+              ("lost", "lose"), ("borrowed", "borrow")]
+ITEMS = ["a red umbrella", "the stapler", "a flashlight", "a pair of scissors", "the spare key",
+         "a blue notebook", "a measuring tape", "an extension cord", "a water bottle", "a wool scarf",
+         "a phone charger", "a paper map"]
+THINGS = ["key ring", "umbrella", "charger", "letter", "remote", "wallet", "phone", "backpack"]
+POSITIONS = ["under the table", "on the top shelf", "behind the door", "next to the sink",
+             "in the left drawer", "beside the window", "inside the blue box", "on the back seat",
+             "under the bed", "on the kitchen counter"]
+ANIMALS = ["the goat", "a fox", "the old dog", "the cat", "a heron", "the pony", "a squirrel",
+           "the rabbit", "an owl", "the parrot", "a hedgehog", "the donkey"]
+ANIMAL_DEEDS = ["chased the chickens", "slept in the sun", "jumped over the fence", "ate the carrots",
+                "hid in the hay", "knocked over the bucket", "woke everyone up", "dug a hole"]
+SETTINGS = ["the barn", "the garden", "the backyard", "the meadow", "the farmyard", "the park"]
+FOODS = ["a bowl of ramen", "pancakes", "a mushroom risotto", "lemonade", "grilled salmon",
+         "a cheese sandwich", "hot chocolate", "vegetable soup", "a mango smoothie",
+         "spaghetti carbonara", "fish tacos", "a green salad"]
+RESTAURANTS = ["the diner", "a small Thai place", "the hotel restaurant", "the food court", "the cafe"]
+ROUTINE = [("woke up", "wake up"), ("left the office", "leave the office"), ("called the plumber", "call the plumber"),
+           ("caught the bus", "catch the bus"), ("started the meeting", "start the meeting"),
+           ("fed the cat", "feed the cat"), ("went to bed", "go to bed")]
+TIMES = ["7:30 am", "3pm", "noon", "midnight", "half past six", "10:15", "early in the morning",
+         "after midnight", "quarter to nine", "5:45 pm"]
+EVENTS = ["dentist appointment", "team offsite", "school play", "library book sale", "product launch",
+          "parent-teacher meeting", "job interview", "piano recital"]
+PLURALS = ["apples", "notebooks", "tickets", "chairs", "eggs", "candles", "bottles of water", "pencils",
+           "boxes", "plates"]
+CROWDS = [("guests", "the wedding"), ("students", "the lecture"), ("runners", "the race"),
+          ("players", "the tournament"), ("volunteers", "the cleanup")]
+COLORS = ["red", "blue", "green", "yellow", "purple", "orange", "white", "black", "pink", "grey", "turquoise"]
+GARMENTS = ["jacket", "dress", "scarf", "hat", "sweater", "raincoat", "tie"]
+COLORED = [("front door", "is"), ("car", "is"), ("roses", "are"), ("kite", "was"), ("curtains", "were"),
+           ("bicycle", "was")]
+DESCRIPTORS = [  # (attribute question, subject, verb, descriptors)
+    ("How big", "the box on the counter", "was", ["tiny", "huge", "enormous", "small", "medium-sized"]),
+    ("What shape", "the table in the hall", "is", ["round", "square", "oval", "triangular", "hexagonal"]),
+    ("How hot", "the soup", "was", ["freezing", "lukewarm", "boiling", "ice-cold", "warm"]),
+    ("How big", "the new apartment", "is", ["cramped", "spacious", "tiny", "huge"]),
+    ("How cold", "the lake", "was", ["freezing", "icy", "chilly", "mild"]),
+]
+JOBS = ["software engineer", "head chef", "product manager", "nurse", "data analyst", "graphic designer",
+        "accountant", "sales director", "architect", "pharmacist"]
+COMPANIES = ["Northwind Traders", "Acme Corp", "Bluewave Labs", "Greenleaf Foods", "Summit Bank",
+             "Orbit Logistics", "Brightpath Health", "Copperline Studios"]
+NAMED_EVENTS = ["Spring Gala", "Regional Chess Open", "Annual Tech Summit", "Harvest Festival",
+                "Alumni Reunion", "City Marathon", "Jazz Night", "Science Fair"]
+VENUES = ["the Grand Hotel", "Riverside Park", "the convention center", "Town Hall", "the old theater",
+          "the university stadium"]
+PRODUCTS = ["Aero 5 headphones", "TrailMax backpack", "QuickBrew coffee maker", "Nimbus 2 tablet",
+            "StrideLite running shoes", "Glow desk lamp", "PowerCore charger", "ZenBlend blender"]
+BRANDS = ["Sonix", "Everpeak", "Kitchenly", "Lumen", "Northfield", "Vireo", "Altura"]
+CATEGORIES = ["wireless speaker", "running shoe", "desk lamp", "board game", "electric kettle",
+              "office chair", "yoga mat", "smartwatch"]
+METHODS = ["credit card", "bank transfer", "PayPal", "cash", "debit card", "Apple Pay", "check"]
+STATUSES = ["pending", "completed", "declined", "refunded", "on hold"]
+REASONS = ["the concert tickets", "last month's rent", "the shared dinner", "a used bike", "the rental car"]
+TOPICS = ["budget", "merger", "new schedule", "supply contract", "office move"]
+NEGOTIATIONS = ["agreed on a new contract", "postponed the decision", "signed the deal",
+                "failed to reach an agreement", "settled on a compromise"]
+COMPETITIONS = ["chess final", "tennis match", "spelling bee", "debate", "cooking contest"]
+STOCKED = ["flour", "honey", "sugar", "butter", "milk", "salt", "rice", "coffee"]  # mass nouns, for "there was no ..."
+AMENITIES = ["a minibar", "a balcony", "free wifi", "a hair dryer", "a safe", "a desk", "room service"]
+GROUP_ACTS = [("went to the concert", "go to the concert", "stayed home"),
+              ("signed the card", "sign the card", "forgot"),
+              ("voted for the plan", "vote for the plan", "abstained"),
+              ("joined the hike", "join the hike", "stayed behind"),
+              ("ate the cake", "eat the cake", "refused")]
+CONDITIONS = [("it rains tomorrow", "the picnic will be moved indoors"),
+              ("the train is late", "the meeting will start at ten instead"),
+              ("fewer than five people sign up", "the workshop will be cancelled"),
+              ("the temperature drops below zero", "the pipes may freeze"),
+              ("the battery runs out", "the device saves your work automatically"),
+              ("the team wins on Saturday", "they will play in the final"),
+              ("the payment fails", "the order is put on hold")]
+PLANS = ["take a taxi", "call the landlord", "stay an extra night", "order pizza", "work from home",
+         "ask for a refund"]
+TRIGGERS = ["the bus is cancelled", "the shop is closed", "it starts snowing", "the flight is delayed"]
+REQUIREMENTS = [("board the plane", "show a valid passport"), ("rent a car", "have a driver's license"),
+                ("join the club", "pay the annual fee"), ("access the server", "connect to the VPN"),
+                ("enter the lab", "wear safety goggles"), ("submit the form", "sign the consent page"),
+                ("vote in the election", "register by October 1"), ("adopt a dog", "complete a home visit")]
+EFFECTS = [("was late for work", "Why was {} late for work?"),
+           ("missed the concert", "Why did {} miss the concert?"),
+           ("cancelled the trip", "Why did {} cancel the trip?"),
+           ("stayed home on Monday", "Why did {} stay home on Monday?")]
+CAUSES = ["the train broke down", "the roads were flooded", "the alarm did not go off",
+          "the bridge was closed", "a storm knocked out the power", "the car would not start",
+          "the babysitter got sick"]
+CHAINS = [("power outage", "a tree fell on the power line", "the traffic lights stopped working"),
+          ("flood in the basement", "a pipe burst overnight", "the boxes of old photos were ruined"),
+          ("traffic jam", "a truck overturned on the highway", "dozens of commuters missed their trains"),
+          ("kitchen fire", "a pan of oil was left on the stove", "the restaurant closed for a week"),
+          ("server crash", "a faulty update was installed", "the website went offline for hours")]
+STEPS = [("woke up", "waking up"), ("made coffee", "making coffee"), ("read the news", "reading the news"),
+         ("took a shower", "taking a shower"), ("walked the dog", "walking the dog"),
+         ("packed lunch", "packing lunch"), ("answered emails", "answering emails"),
+         ("watered the plants", "watering the plants"), ("locked the door", "locking the door"),
+         ("caught the train", "catching the train")]
+MEASURES = [  # (entities, number range, context, question, whether the answer has the larger number)
+    (FIRST, (150, 200), "{a} is {n} cm tall and {b} is {m} cm tall.", "Who is taller, {a} or {b}?", True),
+    (["cheetah", "horse", "greyhound", "ostrich"], (40, 110),
+     "The {a} can reach {n} km/h, while the {b} tops out at {m} km/h.", "Which is faster, the {a} or the {b}?", True),
+    (["blue kettle", "steel kettle", "glass kettle"], (15, 90),
+     "The {a} costs {n} dollars and the {b} costs {m} dollars.", "Which is cheaper, the {a} or the {b}?", False),
+    (["north trail", "river trail", "ridge trail"], (3, 25),
+     "The {a} is {n} km long; the {b} is {m} km long.", "Which trail is longer, the {a} or the {b}?", True),
+]
+DIFFERENCES = [  # (entities, context, question, unit); {n} > {m}
+    (FIRST, "{a} ran {n} km and {b} ran {m} km.", "How much farther did {a} run than {b}?", "km"),
+    (["red", "green", "black"], "The {a} suitcase weighs {n} kg, while the {b} one weighs {m} kg.",
+     "By how much is the {a} suitcase heavier than the {b} one?", "kg"),
+    (["corner", "downtown", "online"], "The {a} store sells the lamp for {n} dollars; the {b} store charges {m} dollars.",
+     "How much more does the lamp cost at the {a} store?", "dollars"),
+]
+INFERENCES = [  # (context with {name}, question, inferred answer)
+    ("{name} grabbed an umbrella and pulled on rain boots before leaving.", "What was the weather like?", "rainy"),
+    ("{name} yawned all through the meeting and kept rubbing her eyes.", "How did she feel?", "tired"),
+    ("The streets were white and the children were building a snowman.", "What season was it?", "winter"),
+    ("{name} stood at the gate with a boarding pass in hand.", "Where was she?", "at the airport"),
+    ("{name} blew out the candles while everyone sang.", "What was being celebrated?", "a birthday"),
+    ("{name} put on an apron and preheated the oven.", "What was she about to do?", "bake"),
+]
+
+
+def _name(rng: random.Random) -> str:
+    return rng.choice(FIRST)
+
+
+def _full_name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+
+
+def _date(rng: random.Random) -> str:
+    return f"{rng.choice(MONTHS)} {rng.randint(1, 28)}, {rng.randint(2015, 2026)}"
+
+
+def _price(rng: random.Random) -> str:
+    return f"${rng.randint(5, 400)}.{rng.choice(['00', '50', '99', '95'])}"
+
+
+def _question(question: str, answer) -> tuple[dict, dict]:
+    return {"question": question}, {"answer": answer}
+
+
+def _extract(output: dict) -> tuple[dict, dict]:
+    return {"extract": list(output)}, output
+
+
+# ---------------------------------------------------------------------------
+# Builders: rng -> (context, input, output)
+# ---------------------------------------------------------------------------
+
+def who_person(rng):
+    who = rng.choice(ROLES) if rng.random() < 0.4 else _name(rng)
+    deed, place = rng.choice(DEEDS), rng.choice(PLACES)
+    context = rng.choice([
+        f"On {rng.choice(DAYS)}, {who} {deed} at {place}.",
+        f"At {place}, {who} {deed} before lunch.",
+        f"The receptionist was busy with a client, so {who} {deed} at {place}.",
+    ])
+    return (context, *_question(f"Who {deed} at {place}?", who))
+
+
+def who_animal(rng):
+    (animal, other), (deed, other_deed) = rng.sample(ANIMALS, 2), rng.sample(ANIMAL_DEEDS, 2)
+    setting = rng.choice(SETTINGS)
+    context = f"In {setting}, {animal} {deed} while {other} {other_deed}."
+    if rng.random() < 0.5:
+        context = f"{_name(rng)} heard a noise outside. " + context
+    return (context, *_question(f"What {deed} in {setting}?", animal))
+
+
+def what_item(rng):
+    name = _name(rng)
+    past, base = rng.choice(ITEM_VERBS)
+    item, day = rng.choice(ITEMS), rng.choice(DAYS)
+    context = rng.choice([
+        f"On {day}, {name} {past} {item} at {rng.choice(PLACES)}.",
+        f"{name} {past} {item} on {day}. It turned out to be very useful.",
+    ])
+    return (context, *_question(f"What did {name} {base} on {day}?", item))
+
+
+def what_food(rng):
+    name, other = rng.sample(FIRST, 2)
+    food, other_food = rng.sample(FOODS, 2)
+    if rng.random() < 0.5:
+        context = f"At {rng.choice(RESTAURANTS)}, {name} ordered {food} and {other} had {other_food}."
+        return (context, *_question(f"What did {name} order?", food))
+    context = f"{name} made {food} for dinner, and {other} brought {other_food}."
+    return (context, *_question(f"What did {name} make for dinner?", food))
+
+
+def where_place(rng):
+    name, place, day = _name(rng), rng.choice(DESTINATIONS), rng.choice(DAYS)
+    if rng.random() < 0.5:
+        context = f"On {day}, {name} went to {place} to meet a friend."
+        return (context, *_question(f"Where did {name} go on {day}?", place))
+    context = f"{name} spent the afternoon at {place}. The weather was lovely."
+    return (context, *_question(f"Where did {name} spend the afternoon?", place))
+
+
+def where_direction(rng):
+    (thing, other), (pos, other_pos) = rng.sample(THINGS, 2), rng.sample(POSITIONS, 2)
+    if rng.random() < 0.5:
+        name = _name(rng)
+        context = f"{name} left the {thing} {pos} and the {other} {other_pos}."
+        return (context, *_question(f"Where did {name} leave the {thing}?", pos))
+    context = f"The {thing} is {pos}, and the {other} is {other_pos}."
+    return (context, *_question(f"Where is the {thing}?", pos))
+
+
+def when_clock(rng):
+    name = _name(rng)
+    (past, base), (other_past, _) = rng.sample(ROUTINE, 2)
+    time_, other_time = rng.sample(TIMES, 2)
+    context = rng.choice([
+        f"{name} {past} at {time_}.",
+        f"{name} {past} at {time_} and {other_past} at {other_time}.",
+    ])
+    return (context, *_question(f"When did {name} {base}?", time_))
+
+
+def when_date(rng):
+    if rng.random() < 0.5:
+        event, date = rng.choice(EVENTS), _date(rng)
+        context = f"The {event} is scheduled for {date}. Please arrive ten minutes early."
+        return (context, *_question(f"When is the {event}?", date))
+    name, city, year = _name(rng), rng.choice(CITIES), str(rng.randint(1990, 2024))
+    context = f"{name} moved to {city} in {year} and opened a small bookshop there."
+    return (context, *_question(f"What year did {name} move to {city}?", year))
+
+
+def count_objects(rng):
+    if rng.random() < 0.5:
+        name = _name(rng)
+        (items, other), (n, m) = rng.sample(PLURALS, 2), rng.sample(range(2, 40), 2)
+        context = f"{name} bought {n} {items} and {m} {other} at the market."
+        return (context, *_question(f"How many {items} did {name} buy?", str(n)))
+    people, event = rng.choice(CROWDS)
+    n = rng.randint(8, 400)
+    context = f"There were {n} {people} at {event} on {rng.choice(DAYS)}."
+    return (context, *_question(f"How many {people} were at {event}?", str(n)))
+
+
+def measure_amount(rng):
+    name, kind = _name(rng), rng.randrange(5)
+    if kind == 0:
+        amount = f"{rng.randint(2, 42)} km"
+        return (f"{name} ran {amount} this morning.", *_question(f"How far did {name} run this morning?", amount))
+    if kind == 1:
+        amount = f"{rng.randint(1, 30)}.{rng.randint(0, 9)} kg"
+        return (f"The package {name} sent weighs {amount}.",
+                *_question(f"How heavy is the package {name} sent?", amount))
+    if kind == 2:
+        amount = f"{rng.choice([100, 150, 200, 250, 400, 500])} ml"
+        return (f"The recipe needs {amount} of milk and two eggs.",
+                *_question("How much milk does the recipe need?", amount))
+    if kind == 3:
+        amount = _price(rng)
+        return (f"The tickets {name} booked cost {amount} each.",
+                *_question(f"How much did each ticket {name} booked cost?", amount))
+    amount, city = f"{rng.randint(2, 14)} hours", rng.choice(CITIES)
+    return (f"The flight to {city} takes {amount}.", *_question(f"How long does the flight to {city} take?", amount))
+
+
+def color(rng):
+    color_, other = rng.sample(COLORS, 2)
+    if rng.random() < 0.5:
+        name, (garment, other_garment) = _name(rng), rng.sample(GARMENTS, 2)
+        context = (f"{name} wore {article(color_)} {color_} {garment} and {article(other)} {other} {other_garment} "
+                   "to the party.")
+        return (context, *_question(f"What color was {name}'s {garment}?", color_))
+    thing, verb = rng.choice(COLORED)
+    context = f"The {thing} next to the old oak {verb} {color_}."
+    return (context, *_question(f"What color {verb} the {thing} next to the old oak?", color_))
+
+
+def size_shape_temp(rng):
+    ask, subject, verb, descriptors = rng.choice(DESCRIPTORS)
+    value = rng.choice(descriptors)
+    context = f"{_name(rng)} noticed that {subject} {verb} {value}."
+    return (context, *_question(f"{ask} {verb} {subject}?", value))
+
+
+def name_age_city(rng):
+    name, age, city, job = _full_name(rng), rng.randint(18, 85), rng.choice(CITIES), rng.choice(JOBS)
+    context = rng.choice([
+        f"{name} is {age} years old and lives in {city}. {name.split()[0]} works as {article(job)} {job}.",
+        f"Meet {name}, {article(str(age))} {age}-year-old from {city}.",
+        f"{name}, {age}, recently moved to {city} for work.",
+    ])
+    return (context, *_extract({"name": name, "age": age, "city": city}))
+
+
+def name_job_company(rng):
+    name, job, company = _full_name(rng), rng.choice(JOBS), rng.choice(COMPANIES)
+    context = rng.choice([
+        f"{name} works as {article(job)} {job} at {company}.",
+        f"At {company}, {name} has been the {job} for {rng.randint(2, 20)} years.",
+        f"{company} announced that {name} will join the team as {job} next month.",
+    ])
+    return (context, *_extract({"name": name, "job": job, "company": company}))
+
+
+def event_date_location(rng):
+    event, date, venue = rng.choice(NAMED_EVENTS), _date(rng), rng.choice(VENUES)
+    context = rng.choice([
+        f"The {event} will take place on {date} at {venue}.",
+        f"On {date}, {venue} hosted the {event}. Tickets sold out in a day.",
+    ])
+    return (context, *_extract({"event": event, "date": date, "location": venue}))
+
+
+def event_participants_outcome(rng):
+    a, b, c = rng.sample(FIRST, 3)
+    if rng.random() < 0.5:
+        outcome = rng.choice(NEGOTIATIONS)
+        context = f"{a}, {b} and {c} met to discuss the {rng.choice(TOPICS)}. In the end, they {outcome}."
+        return (context, *_extract({"participants": [a, b, c], "outcome": outcome}))
+    outcome = f"{rng.choice([a, b])} won"
+    context = f"In the {rng.choice(COMPETITIONS)}, {a} faced {b}, and {outcome} after a long game."
+    return (context, *_extract({"participants": [a, b], "outcome": outcome}))
+
+
+def product_name_price_brand(rng):
+    product, brand, price = rng.choice(PRODUCTS), rng.choice(BRANDS), _price(rng)
+    context = rng.choice([
+        f"I bought the {product} from {brand} for {price} last week.",
+        f"The {product} by {brand} is on sale for {price} until Sunday.",
+    ])
+    return (context, *_extract({"product": product, "price": price, "brand": brand}))
+
+
+def product_category_rating(rng):
+    category, rating, in_stock = rng.choice(CATEGORIES), rng.choice([3.5, 3.9, 4.0, 4.2, 4.5, 4.8]), rng.random() < 0.6
+    stock = "is in stock" if in_stock else "is currently out of stock"
+    context = f"This {category} has a rating of {rating} out of 5 and {stock}."
+    return (context, *_extract({"category": category, "rating": rating, "in_stock": in_stock}))
+
+
+def amount_sender_recipient(rng):
+    sender, recipient = rng.sample(FIRST, 2)
+    amount = _price(rng)
+    context = rng.choice([
+        f"{sender} sent {amount} to {recipient} for {rng.choice(REASONS)}.",
+        f"Yesterday {recipient} received a transfer of {amount} from {sender}.",
+    ])
+    return (context, *_extract({"amount": amount, "sender": sender, "recipient": recipient}))
+
+
+def date_method_status(rng):
+    date, method, status = _date(rng), rng.choice(METHODS), rng.choice(STATUSES)
+    context = rng.choice([
+        f"On {date}, an order was paid by {method}, and the payment is {status}.",
+        f"The {method} payment made on {date} is marked as {status}.",
+    ])
+    return (context, *_extract({"date": date, "method": method, "status": status}))
+
+
+def who_did_not(rng):
+    a, b, c, d = rng.sample(FIRST, 4)
+    past, base, instead = rng.choice(GROUP_ACTS)
+    context = rng.choice([
+        f"{a}, {b} and {c} {past}, but {d} {instead}.",
+        f"Everyone {past} except {d}.",
+        f"{a} and {b} {past}; {d} did not.",
+    ])
+    return (context, *_question(f"Who did not {base}?", d))
+
+
+def what_was_not(rng):
+    if rng.random() < 0.5:
+        x, y, missing = rng.sample(STOCKED, 3)
+        context = f"The kitchen had {x} and {y}, but there was no {missing}."
+        return (context, *_question("What was not in the kitchen?", missing))
+    x, y, missing = rng.sample(AMENITIES, 3)
+    context = f"The hotel room came with {x} and {y}, but not {missing}."
+    return (context, *_question("What did the hotel room not come with?", missing))
+
+
+def if_then(rng):
+    if rng.random() < 0.5:
+        condition, outcome = rng.choice(CONDITIONS)
+        context = f"If {condition}, {outcome}."
+        return (context, *_question(f"What happens if {condition}?", outcome))
+    name, plan, trigger = _name(rng), rng.choice(PLANS), rng.choice(TRIGGERS)
+    context = f"{name} said they will {plan} if {trigger}."
+    return (context, *_question(f"What will {name} do if {trigger}?", plan))
+
+
+def required_condition(rng):
+    goal, requirement = rng.choice(REQUIREMENTS)
+    context = rng.choice([
+        f"Before you can {goal}, you must {requirement}.",
+        f"To {goal}, visitors need to {requirement}.",
+        f"You cannot {goal} unless you {requirement}.",
+    ])
+    return (context, *_question(f"What is required to {goal}?", requirement))
+
+
+def why_cause(rng):
+    name, (effect, question), cause = _name(rng), rng.choice(EFFECTS), rng.choice(CAUSES)
+    context = rng.choice([
+        f"{name} {effect} because {cause}.",
+        f"Because {cause}, {name} {effect}. It was a frustrating day.",
+    ])
+    return (context, *_question(question.format(name), cause))
+
+
+def what_caused(rng):
+    event, trigger, consequence = rng.choice(CHAINS)
+    context = f"The {event} started after {trigger}. As a result, {consequence}."
+    return (context, *_question(f"What caused the {event}?", trigger))
+
+
+def first_last(rng):
+    name, steps = _name(rng), [past for past, _ in rng.sample(STEPS, rng.randint(3, 5))]
+    context = f"{name} {', then '.join(steps[:-1])}, and finally {steps[-1]}."
+    if rng.random() < 0.5:
+        return (context, *_question(f"What did {name} do first?", steps[0]))
+    return (context, *_question(f"What did {name} do last?", steps[-1]))
+
+
+def before_after(rng):
+    name, steps = _name(rng), rng.sample(STEPS, rng.randint(3, 5))
+    context = f"First, {name} {steps[0][0]}." + "".join(f" After that, {name} {past}." for past, _ in steps[1:])
+    i = rng.randrange(len(steps) - 1)
+    if rng.random() < 0.5:
+        return (context, *_question(f"What did {name} do after {steps[i][1]}?", steps[i + 1][0]))
+    return (context, *_question(f"What did {name} do before {steps[i + 1][1]}?", steps[i][0]))
+
+
+def which_more(rng):
+    entities, (low, high), template, question, larger = rng.choice(MEASURES)
+    a, b = rng.sample(entities, 2)
+    n, m = rng.sample(range(low, high), 2)
+    winner = a if (n > m) == larger else b
+    return (template.format(a=a, b=b, n=n, m=m), *_question(question.format(a=a, b=b), winner))
+
+
+def by_how_much(rng):
+    entities, template, question, unit = rng.choice(DIFFERENCES)
+    a, b = rng.sample(entities, 2)
+    m, n = sorted(rng.sample(range(2, 60), 2))
+    return (template.format(a=a, b=b, n=n, m=m), *_question(question.format(a=a, b=b), f"{n - m} {unit}"))
+
+
+def simple_inference(rng):
+    template, question, answer = rng.choice(INFERENCES)
+    return (template.format(name=rng.choice(WOMEN)), *_question(question, answer))
+
+
+def pronoun_resolution(rng):
+    woman, man = rng.choice(WOMEN), rng.choice(MEN)
+    thing = rng.choice(THINGS)
+    if rng.random() < 0.5:
+        context = f"{woman} called {man} on Sunday. She needed help finding her {thing}."
+        return (context, *_question("Who does 'she' refer to?", woman))
+    context = f"{woman} thanked {man} at the door. He had found her {thing} on the bus."
+    return (context, *_question("Who does 'he' refer to?", man))
+
+
+# "category/subcategory/file" as in JSON_QA -> builder
+BUILDERS = {
+    "simple_facts/who_subject/who_person.corpus": who_person,
+    "simple_facts/who_subject/who_animal.corpus": who_animal,
+    "simple_facts/what_object/what_item.corpus": what_item,
+    "simple_facts/what_object/what_food.corpus": what_food,
+    "simple_facts/where_location/where_place.corpus": where_place,
+    "simple_facts/where_location/where_direction.corpus": where_direction,
+    "simple_facts/when_time/when_clock.corpus": when_clock,
+    "simple_facts/when_time/when_date.corpus": when_date,
+    "simple_facts/how_many/count_objects.corpus": count_objects,
+    "simple_facts/how_many/measure_amount.corpus": measure_amount,
+    "simple_facts/color_attributes/color.corpus": color,
+    "simple_facts/color_attributes/size_shape_temp.corpus": size_shape_temp,
+    "multi_field/person_profile/name_age_city.corpus": name_age_city,
+    "multi_field/person_profile/name_job_company.corpus": name_job_company,
+    "multi_field/event_details/event_date_location.corpus": event_date_location,
+    "multi_field/event_details/event_participants_outcome.corpus": event_participants_outcome,
+    "multi_field/product_info/product_name_price_brand.corpus": product_name_price_brand,
+    "multi_field/product_info/product_category_rating.corpus": product_category_rating,
+    "multi_field/transaction/amount_sender_recipient.corpus": amount_sender_recipient,
+    "multi_field/transaction/date_method_status.corpus": date_method_status,
+    "negation_conditional/did_not/who_did_not.corpus": who_did_not,
+    "negation_conditional/did_not/what_was_not.corpus": what_was_not,
+    "negation_conditional/conditional_outcome/if_then.corpus": if_then,
+    "negation_conditional/conditional_outcome/required_condition.corpus": required_condition,
+    "reading_comprehension/cause_effect/why_cause.corpus": why_cause,
+    "reading_comprehension/cause_effect/what_caused.corpus": what_caused,
+    "reading_comprehension/sequence_events/first_last.corpus": first_last,
+    "reading_comprehension/sequence_events/before_after.corpus": before_after,
+    "reading_comprehension/comparison/which_more.corpus": which_more,
+    "reading_comprehension/comparison/by_how_much.corpus": by_how_much,
+    "reading_comprehension/inference/simple_inference.corpus": simple_inference,
+    "reading_comprehension/inference/pronoun_resolution.corpus": pronoun_resolution,
+}
+
+
+def builders(categories: list[str] | None = None) -> list:
+    """Builder of every JSON_QA angle (in the given categories); fails loudly
+    if scaffold.py gained an angle without one."""
+    keys = [f"{category}/{subcategory}/{filename}"
+            for category, subcategories in JSON_QA.items() if categories is None or category in categories
+            for subcategory, angles in subcategories.items() for filename, _prompt in angles]
+    missing = [key for key in keys if key not in BUILDERS]
+    if missing:
+        raise KeyError(f"no synth_json_qa builder for {', '.join(missing)}")
+    return [BUILDERS[key] for key in keys]
+
+
+def render(context: str, input_: dict, output: dict) -> str:
+    return (f"Context: {context}\nInput: {json.dumps(input_, ensure_ascii=False)}\n"
+            f"Output: {json.dumps(output, ensure_ascii=False)}")
+
+
+# ---------------------------------------------------------------------------
+# Generation
+# ---------------------------------------------------------------------------
+
+def makers(categories: list[str] | None = None) -> list:
+    """One fn(rng) -> rendered example per angle, for synth.generate."""
+    return [lambda rng, build=build: render(*build(rng)) for build in builders(categories)]
+
+
+def generate(count: int, seed: int = 0, workers: int = 1, categories: list[str] | None = None):
+    """Yield count rendered examples (without trailing blank line)."""
+    return synth.generate("json_qa", makers, count, seed, workers, categories)
+
+
+def documents(count: int, seed: int = 0, workers: int = 1) -> list[str]:
+    """Examples grouped EXAMPLES_PER_DOC at a time into .corpus-style documents."""
+    return synth.documents(generate(count, seed, workers))
+
+
+def main():
+    synth.main(generate, "Generate synthetic json_qa examples from templates",
+               "--categories", sorted(JSON_QA), "Only these categories")
+
+
+if __name__ == "__main__":
+    main()
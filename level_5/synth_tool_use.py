@@ -0,0 +1,2145 @@
+#!/usr/bin/env python3
+"""
+Generate tool_use examples locally, without any LLM calls.
+
+Every subdomain in scaffold.TOOL_DOMAINS declares its tools, call schema and
+response schema. An example starts from a question template of its tool
+(QUESTIONS below): the template decides which arguments the call carries, so
+the question states everything the call contains. [Bracketed] parts are
+included half of the time with their fields, {field=value} fixes an argument
+the wording implies without spelling it out:
+
+    "Find flights from {origin} to {destination} on {departure_date}[, returning {return_date}]."
+    "Show all files in {path}, hidden ones included.{flags=\"-la\"}"
+
+Argument and response values come from per-field pools (POOLS, keyed by
+field or by subdomain.field, some depending on the tool or on earlier
+arguments), then enums, then generic rules by field name (ids, timestamps,
+amounts, ...). The response repeats the call's arguments under the same key
+or an ECHO alias (a response's target_temp is the call's temperature), and
+a list answering for one id (pid, product_id, ...) has that one item.
+Cross-field invariants hold in both: an end (end, to_date, check_out,
+arrival, ...) falls shortly after its start, low <= high and min <= avg <=
+max, a count is the length of its list, and FINISH hooks fill in derived
+values such as totals, converted amounts, forecast dates and units.
+
+Output is the exact level 5 format:
+
+    Question: What's the temperature in Lisbon in fahrenheit?
+    Call: {"func_call": "get_temperature", "location": "Lisbon", "unit": "fahrenheit"}
+    Response: {"value": 70.3, "unit": "fahrenheit", "timestamp": "2024-06-02T09:14:51Z"}
+
+Chunking, seeding and the command line are shared with synth_json_qa.py
+(synth.py): the output only depends on --seed and --count, not on the
+number of worker processes.
+
+Usage:
+    python synth_tool_use.py --count 24                 # print 24 examples
+    python synth_tool_use.py --count 2000000 -o /tmp/tool_use.corpus
+    python synth_tool_use.py --count 1000 --domains weather_api bash_terminal
+
+`python assemble.py --synthetic N` streams N of these into level 5 directly.
+"""
+
+import datetime
+import json
+import random
+import re
+
+import synth
+from scaffold import TOOL_DOMAINS
+from synth import article
+from validate import TYPES, parse_schema
+
+SOURCE = "level_5/synth_tool_use.py"
+OPTIONAL_PART_P = 0.5  # chance a [bracketed] part of a question is used
+
+# ---------------------------------------------------------------------------
+# Value pools
+# ---------------------------------------------------------------------------
+
+# city -> (country, timezone, lat, lng)
+CITY_INFO = {
+    "Paris": ("France", "Europe/Paris", 48.8566, 2.3522),
+    "London": ("United Kingdom", "Europe/London", 51.5074, -0.1278),
+    "Tokyo": ("Japan", "Asia/Tokyo", 35.6762, 139.6503),
+    "New York": ("United States", "America/New_York", 40.7128, -74.006),
+    "Berlin": ("Germany", "Europe/Berlin", 52.52, 13.405),
+    "Sydney": ("Australia", "Australia/Sydney", -33.8688, 151.2093),
+    "Toronto": ("Canada", "America/Toronto", 43.6532, -79.3832),
+    "Madrid": ("Spain", "Europe/Madrid", 40.4168, -3.7038),
+    "Rome": ("Italy", "Europe/Rome", 41.9028, 12.4964),
+    "Seoul": ("South Korea", "Asia/Seoul", 37.5665, 126.978),
+    "Mumbai": ("India", "Asia/Kolkata", 19.076, 72.8777),
+    "Cairo": ("Egypt", "Africa/Cairo", 30.0444, 31.2357),
+    "Lisbon": ("Portugal", "Europe/Lisbon", 38.7223, -9.1393),
+    "Oslo": ("Norway", "Europe/Oslo", 59.9139, 10.7522),
+    "Chicago": ("United States", "America/Chicago", 41.8781, -87.6298),
+    "Austin": ("United States", "America/Chicago", 30.2672, -97.7431),
+    "Denver": ("United States", "America/Denver", 39.7392, -104.9903),
+    "Dublin": ("Ireland", "Europe/Dublin", 53.3498, -6.2603),
+    "Prague": ("Czech Republic", "Europe/Prague", 50.0755, 14.4378),
+    "Vienna": ("Austria", "Europe/Vienna", 48.2082, 16.3738),
+    "Nairobi": ("Kenya", "Africa/Nairobi", -1.2921, 36.8219),
+    "Lima": ("Peru", "America/Lima", -12.0464, -77.0428),
+    "Bangkok": ("Thailand", "Asia/Bangkok", 13.7563, 100.5018),
+    "Helsinki": ("Finland", "Europe/Helsinki", 60.1699, 24.9384),
+    "Seattle": ("United States", "America/Los_Angeles", 47.6062, -122.3321),
+    "Boston": ("United States", "America/New_York", 42.3601, -71.0589),
+}
+CITIES = list(CITY_INFO)
+COUNTRIES = sorted({country for country, _tz, _lat, _lng in CITY_INFO.values()})
+STREETS = ["Main St", "Oak Ave", "Elm St", "Market St", "King Rd", "Park Lane", "River Rd", "High St"]
+FIRST = ["Alice", "Bob", "Carlos", "Diana", "Emma", "Farid", "Grace", "Hiro", "Ines", "Jamal",
+         "Kira", "Liam", "Maya", "Noah", "Olga", "Priya", "Quinn", "Rosa", "Sam", "Tariq"]
+LAST = ["Smith", "Garcia", "Chen", "Müller", "Okafor", "Rossi", "Tanaka", "Novak", "Silva", "Kim"]
+DOMAINS = ["example.com", "acme.io", "mail.net", "corp.org", "shop.co"]
+DIRS = ["/home/user", "/var/log", "/etc", "/tmp", "~/projects", "/usr/bin", "/opt", "/var/www",
+        "/srv/data", "/home/dev/src", "/var/backup", "/etc/nginx"]
+FILES = ["app.log", "config.yml", "main.py", "README.md", "data.csv", "notes.txt", "index.html",
+         "backup.tar.gz", "settings.json", "report.pdf", "script.sh", "error.log"]
+WORDS = ["alpha", "primary", "default", "standard", "daily", "main", "summary", "basic", "premium",
+         "archive", "general", "custom", "quick", "annual", "team", "public", "internal"]
+BRANCHES = ["develop", "feature/login", "fix/timeout", "release/2.1", "hotfix/cache", "feature/search"]
+CURRENCIES = ["USD", "EUR", "GBP", "JPY", "CAD", "AUD", "CHF"]
+USD_RATES = {"USD": 1.0, "EUR": 0.92, "GBP": 0.79, "JPY": 151.2, "CAD": 1.36, "AUD": 1.52, "CHF": 0.9}
+PERIODS = ["2024-01", "2024-02", "2024-03", "2024-04", "2024-05", "2024-06", "2024-Q1", "2024-Q2"]
+ROOMS = ["kitchen", "bedroom", "living room", "office", "hallway", "basement", "garage", "greenhouse"]
+PLACES = ["Central Station", "the airport", "Union Square", "City Hall", "the harbor", "Riverside Mall",
+          "Oak Street Park", "the university", "the stadium", "the old town"]
+SNACKS = ["Pretzels", "Granola Bar", "Sparkling Water", "Cola", "Trail Mix", "Chocolate Bar", "Iced Tea",
+          "Potato Chips", "Peanuts", "Orange Juice"]
+DISHES = ["Margherita Pizza", "Pad Thai", "Chicken Burrito", "Caesar Salad", "Ramen", "Veggie Burger",
+          "Butter Chicken", "Sushi Platter", "Falafel Wrap", "Fish Tacos"]
+TRACKS = ["Midnight Drive", "Golden Hour", "Paper Planes", "Ocean Eyes", "Northern Lights", "City of Stars",
+          "Slow Motion", "Wildfire", "Blue Monday", "Summer Rain"]
+ARTISTS = ["Nova Lane", "The Driftwoods", "Kai Moreno", "Luna Park", "Echo Valley", "Miles Ahead",
+           "The Paper Kites", "Sofia Reyes"]
+ALBUMS = ["Night Shift", "Open Roads", "Glass Houses", "Low Tide", "Second Nature", "Long Way Home"]
+PRODUCTS = ["wireless earbuds", "yoga mat", "standing desk", "coffee grinder", "running shoes",
+            "backpack", "desk lamp", "water bottle", "bluetooth speaker", "phone case"]
+MEDICATIONS = {"lisinopril": ["10 mg", "20 mg"], "metformin": ["500 mg", "850 mg"],
+               "atorvastatin": ["20 mg", "40 mg"], "amoxicillin": ["250 mg", "500 mg"],
+               "levothyroxine": ["50 mcg", "100 mcg"], "ibuprofen": ["200 mg", "400 mg"]}
+AIRLINE_CODES = {"Lufthansa": "LH", "British Airways": "BA", "Air France": "AF", "United": "UA", "Delta": "DL",
+                 "KLM": "KL"}
+# test -> (unit, normal low, normal high)
+LAB_TESTS = {"glucose": ("mg/dL", 70, 99), "cholesterol": ("mg/dL", 125, 200), "hemoglobin": ("g/dL", 12, 17),
+             "TSH": ("mIU/L", 0.4, 4.0), "vitamin D": ("ng/mL", 30, 100), "potassium": ("mmol/L", 3.5, 5.1)}
+# table -> (columns, numeric columns, where clauses)
+TABLES = {
+    "users": (["id", "name", "email", "created_at", "country"], ["age", "login_count"],
+              ["country = 'CA'", "created_at > '2024-01-01'", "is_active = true"]),
+    "orders": (["id", "user_id", "status", "total", "created_at"], ["total", "item_count"],
+               ["status = 'shipped'", "total > 100", "created_at > '2024-03-01'"]),
+    "products": (["id", "name", "price", "category", "stock"], ["price", "stock"],
+                 ["category = 'books'", "price < 20", "stock = 0"]),
+    "invoices": (["id", "customer_id", "amount", "due_date", "paid"], ["amount"],
+                 ["paid = false", "due_date < '2024-06-01'", "amount > 500"]),
+}
+
+
+def _person(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+
+
+def _email(rng: random.Random, name: str | None = None) -> str:
+    first, last = name.lower().split()[:2] if name else (rng.choice(FIRST).lower(), rng.choice(LAST).lower())
+    return f"{first}.{last}@{rng.choice(DOMAINS)}"
+
+
+def _date(rng: random.Random) -> str:
+    return f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+
+def _timestamp(rng: random.Random) -> str:
+    return f"{_date(rng)}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}Z"
+
+
+def _when(rng: random.Random) -> str:
+    """A timestamp someone would ask for: working hours, quarter past etc."""
+    return f"{_date(rng)}T{rng.randint(8, 19):02d}:{rng.choice(['00', '15', '30', '45'])}:00Z"
+
+
+def _ident(key: str):
+    """Ids look like ORD-48213 for order_id, USE-10293 for user_id, ..."""
+    prefix = (key.removesuffix("_id").split("_")[-1][:3] or "id").upper()
+    return lambda rng: f"{prefix}-{rng.randint(10000, 99999)}"
+
+
+def _tool(options: dict, default=None):
+    """Pool that depends on the call's tool: options[tool] (or default) is a
+    list to choose from or a function of rng."""
+    def pick(rng, call):
+        pool = options.get(call["func_call"], default)
+        return pool(rng) if callable(pool) else rng.choice(pool)
+    return pick
+
+
+def _temperature(rng, unit: str | None) -> float:
+    celsius = rng.uniform(-5, 34)
+    return round(celsius * 9 / 5 + 32 if unit == "fahrenheit" else celsius, 1)
+
+
+def _file_path(rng, call=None) -> str:
+    return f"{rng.choice(DIRS)}/{rng.choice(FILES)}"
+
+
+def _column(rng, call) -> str:
+    return rng.choice(TABLES[call.get("table", "orders")][1])
+
+
+# Field values: a list to choose from or fn(rng, call so far), by "subdomain.field"
+# first, then by field name (at any depth of a call or response)
+POOLS = {
+    # bash_terminal
+    "list_files.entries": FILES,
+    "find_files.pattern": _tool({"find_by_name": ["config*", "*report*", "README*", "docker-compose*"],
+                                 "find_by_extension": ["*.log", "*.py", "*.json", "*.yml", "*.csv"],
+                                 "find_by_size": ["+100M", "+1G", "-10k", "+500M"],
+                                 "find_by_date": ["-mtime -1", "-mtime -7", "-mtime +30", "-mmin -60"]}),
+    "find_files.matches": lambda rng, call: f"{call.get('path', '.')}/{rng.choice(FILES)}",
+    "search_text.pattern": ["ERROR", "TODO", "timeout", "connection refused", "def main", "WARN", "404",
+                            "deprecated"],
+    "search_text.path": _tool({"grep_file": _file_path, "grep_count": _file_path}, DIRS),
+    "search_text.file": lambda rng, call: (call["path"] if "." in call.get("path", "")[-5:]
+                                           else f"{call.get('path', '.')}/{rng.choice(FILES)}"),
+    "search_text.text": lambda rng, call: rng.choice(["[2024-05-02 10:41:07] {}: worker 3 stopped",
+                                                      "# {}: clean this up", "raise {}(\"request failed\")",
+                                                      "level={} msg=\"retrying\""]).format(
+                                                          call.get("pattern", "ERROR")),
+    "file_operations.source": _file_path,
+    "file_operations.destination": DIRS,
+    "file_operations.message": _tool({"copy_file": ["File copied"], "move_file": ["File moved"],
+                                      "delete_file": ["File deleted"], "create_dir": ["Directory created"]}),
+    "process_management.name": ["nginx", "python3", "postgres", "node", "redis-server", "java", "sshd", "dockerd"],
+    "signal": ["SIGTERM", "SIGKILL", "SIGHUP", "SIGINT"],
+    "network_commands.url": lambda rng, call: f"https://api.{rng.choice(DOMAINS)}/v1/{rng.choice(['status', 'users', 'orders', 'health', 'items'])}",
+    "network_commands.host": lambda rng, call: rng.choice(["db01", "web02", "cache01", "build01"]) + ".internal",
+    "network_commands.options": _tool({"curl_post": ["-d '{\"name\": \"test\"}'", "-d 'id=42'", "--json '{\"ok\": true}'"],
+                                       "ssh_command": ["uptime", "df -h", "systemctl status nginx", "free -m"],
+                                       "wget_download": ["-c", "-q", "--limit-rate=1m"]}, ["-s", "-i", "-L"]),
+    "network_commands.output": _tool({"ping_host": ["4 packets transmitted, 4 received, 0% packet loss",
+                                                    "4 packets transmitted, 3 received, 25% packet loss"],
+                                      "ssh_command": [" 10:14:02 up 12 days,  3:01,  1 user,  load average: 0.21",
+                                                      "Filesystem  Size  Used Avail Use%\n/dev/sda1  50G  31G  19G  62%",
+                                                      "active (running) since Mon 2024-05-06 08:12:44 UTC"],
+                                      "wget_download": ["Saved 'download.tar.gz' [10485760/10485760]"]},
+                                     ["{\"status\": \"ok\"}", "{\"id\": 42, \"created\": true}", "OK"]),
+    "permissions.mode": ["755", "644", "600", "700", "775", "640"],
+    "previous_mode": ["644", "755", "600", "664"],
+    "new_mode": ["644", "755", "600", "664"],
+    "success": [True],
+    "network_commands.status_code": _tool({"curl_post": [201]}, [200]),
+    "permissions.owner": ["www-data", "root", "deploy", "alice", "postgres", "nginx"],
+    # weather_api
+    "current_conditions.value": lambda rng, call: {
+        "get_humidity": lambda: rng.randint(20, 95), "get_wind_speed": lambda: round(rng.uniform(0, 45), 1),
+        "get_uv_index": lambda: rng.randint(0, 11)}.get(call["func_call"], lambda: _temperature(rng, call.get("unit")))(),
+    "current_conditions.unit": _tool({"get_humidity": ["percent"], "get_wind_speed": ["km/h"],
+                                      "get_uv_index": ["index"]}, ["celsius"]),
+    "forecast.unit": ["celsius", "fahrenheit"],
+    "forecast.days": [2, 3, 5, 7],
+    "condition": ["sunny", "partly cloudy", "cloudy", "light rain", "showers", "thunderstorms", "snow", "clear"],
+    "metrics": ["temperature", "humidity", "pressure", "wind speed"],
+    "temperature": lambda rng, call: _temperature(rng, None),
+    "humidity": lambda rng, call: rng.randint(20, 95),
+    "pressure": lambda rng, call: rng.randint(990, 1035),
+    "alerts.severity": ["minor", "moderate", "severe", "extreme"],
+    "alerts.type": _tool({"get_storm_warnings": ["thunderstorm", "tropical storm", "hail"],
+                          "get_air_quality_index": ["air quality"]},
+                         ["heat", "flood", "wind", "frost", "thunderstorm"]),
+    "alerts.message": _tool({"get_air_quality_index": ["Air quality is unhealthy for sensitive groups",
+                                                       "Fine particle levels are elevated"]},
+                            ["Strong winds expected this afternoon", "Heavy rain may cause local flooding",
+                             "Temperatures above 35C expected", "Frost likely overnight",
+                             "Thunderstorms with hail possible after 4pm"]),
+    # cloud_server_api
+    "instance_id": lambda rng, call: f"i-{rng.getrandbits(32):08x}",
+    "instances.id": lambda rng, call: f"i-{rng.getrandbits(32):08x}",
+    "ip": lambda rng, call: f"10.0.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+    "attached_to": lambda rng, call: f"i-{rng.getrandbits(32):08x}",
+    "region": ["us-east-1", "us-west-2", "eu-west-1", "eu-central-1", "ap-southeast-2"],
+    "instance_lifecycle.state": _tool({"start_instance": ["pending"], "stop_instance": ["stopping"],
+                                       "restart_instance": ["rebooting"], "terminate_instance": ["shutting-down"]}),
+    "instance_lifecycle.message": _tool({"start_instance": ["Instance is starting"],
+                                         "stop_instance": ["Instance is stopping"],
+                                         "restart_instance": ["Reboot requested"],
+                                         "terminate_instance": ["Instance will be terminated"]}),
+    "instance_status.filter": ["running", "stopped", "pending"],
+    "instance_status.state": ["running", "stopped", "pending"],
+    "instance_status.type": ["t3.micro", "t3.medium", "m5.large", "c5.xlarge"],
+    "group_id": lambda rng, call: rng.choice(["asg-web", "asg-api", "asg-workers", "asg-batch"]) + f"-{rng.randint(1, 9):02d}",
+    "min_size": [1, 2, 3], "max_size": [4, 6, 8, 10, 12], "desired": [2, 3, 4, 5, 6],
+    "current_capacity": [1, 2, 3, 4, 5, 6],
+    "scaling_operations.status": _tool({"scale_out": ["scaling out"], "scale_in": ["scaling in"]}, ["active"]),
+    "volume_id": lambda rng, call: f"vol-{rng.getrandbits(32):08x}",
+    "size_gb": [8, 20, 50, 100, 250, 500],
+    "storage_volumes.state": _tool({"create_volume": ["creating"], "attach_volume": ["in-use"],
+                                    "detach_volume": ["available"], "snapshot_volume": ["in-use"]},
+                                   ["available", "in-use"]),
+    # smart_home
+    "door_id": ["main", "side", "back"],
+    "delay_seconds": [30, 60, 120, 300, 600],
+    "device_id": ["hallway", "bedroom", "office", "upstairs", "downstairs"],
+    "thermostat.temperature": lambda rng, call: rng.randint(16, 26),
+    "current_temp": lambda rng, call: round(rng.uniform(16, 25), 1),
+    "target_temp": lambda rng, call: rng.randint(16, 26),
+    "thermostat.mode": ["heat", "cool", "auto", "off"],
+    "light_id": ["kitchen", "porch", "desk", "hallway", "bedroom", "patio"],
+    "brightness": lambda rng, call: rng.randrange(10, 101, 5),
+    "color": ["warm white", "cool white", "blue", "red", "green", "purple", "amber"],
+    "smart_lighting.state": _tool({"turn_off_light": ["off"]}, ["on"]),
+    "lock_id": ["front", "back", "garage", "patio"],
+    "code": lambda rng, call: str(rng.randint(1000, 999999)),
+    "door_locks.state": _tool({"lock_door": ["locked"], "unlock_door": ["unlocked"]}, ["locked", "unlocked"]),
+    "last_action_by": lambda rng, call: f"USE-{rng.randint(10000, 99999)}",
+    # coffee_machine
+    "milk": ["whole", "oat", "skim", "almond", "soy"],
+    "brewing.status": ["brewing", "queued"],
+    "estimated_seconds": _tool({"brew_espresso": [25, 30, 35]}, [45, 60, 90, 120]),
+    "settings.value": _tool({"set_temperature": ["90C", "92C", "94C", "96C"],
+                             "set_grind_level": ["fine", "medium", "coarse"],
+                             "set_brew_time": ["25s", "30s", "45s", "4m"]}),
+    "settings.parameter": ["temperature", "grind_level", "brew_time"],
+    "previous_value": lambda rng, call: {"temperature": rng.choice(["88C", "93C"]),
+                                         "grind_level": rng.choice(["medium-fine", "extra fine"]),
+                                         "brew_time": rng.choice(["28s", "3m"])}.get(call.get("parameter"), "default"),
+    "new_value": lambda rng, call: {"temperature": "92C", "grind_level": "medium",
+                                    "brew_time": "30s"}.get(call.get("parameter"), "default"),
+    "machine_id": ["kitchen-1", "lobby-2", "floor3-1", "breakroom"],
+    "maintenance.status": _tool({"clean_machine": ["cleaning"], "descale": ["descaling"],
+                                 "empty_grounds": ["grounds emptied"]}, ["ok", "refill needed"]),
+    "water_level_pct": lambda rng, call: rng.randint(5, 100),
+    "bean_level_pct": lambda rng, call: rng.randint(5, 100),
+    # vending_machine
+    "slot_id": lambda rng, call: f"{rng.choice('ABCDE')}{rng.randint(1, 8)}",
+    "quantity": lambda rng, call: rng.randint(1, 10),
+    "item_name": SNACKS,
+    "inventory.name": SNACKS,
+    "purchase.price": lambda rng, call: rng.choice([1.25, 1.5, 1.75, 2.0, 2.5, 3.0]),
+    "inventory.price": lambda rng, call: rng.choice([1.25, 1.5, 1.75, 2.0, 2.5, 3.0]),
+    "price": lambda rng, call: round(rng.uniform(1, 200), 2),
+    "purchase.status": _tool({"purchase_item": ["dispensed"]}, ["in stock", "sold out"]),
+    "payment.amount": lambda rng, call: rng.choice([1.5, 2.0, 2.75, 3.0, 5.0]),
+    "payment.status": _tool({"refund_transaction": ["refunded"]}, ["approved", "completed"]),
+    "change": lambda rng, call: rng.choice([0.0, 0.25, 0.5, 1.0, 2.25]),
+    "receipt": lambda rng, call: f"RCPT-{rng.randint(100000, 999999)}",
+    # crm
+    "contact_lookup.query": _tool({"get_contact_by_id": lambda rng: f"CON-{rng.randint(10000, 99999)}",
+                                   "find_contacts_by_company": ["Acme Corp", "Globex", "Initech", "Umbrella Health"],
+                                   "find_contacts_by_tag": ["vip", "lead", "partner", "newsletter"]},
+                                  lambda rng: _person(rng)),
+    "company": ["Acme Corp", "Globex", "Initech", "Umbrella Health", "Stark Logistics", "Wayne Foods"],
+    "limit": [5, 10, 20, 25, 50],
+    "email": lambda rng, call: _email(rng, call.get("name")),
+    "phone": lambda rng, call: f"+1-555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+    "contact_management.note": _tool({"add_tag": ["vip", "follow-up", "partner", "churn risk"]},
+                                     ["Asked for a demo next week", "Prefers email over calls",
+                                      "Renewal due in March", "Met at the Berlin trade fair"]),
+    "contact_management.status": _tool({"create_contact": ["created"], "delete_contact": ["deleted"]}, ["updated"]),
+    "stage": ["prospecting", "qualification", "proposal", "negotiation", "closed_won"],
+    "deal_pipeline.name": ["Website redesign", "Annual support plan", "Fleet tracking rollout", "Cloud migration",
+                           "Office furniture order"],
+    "deal_pipeline.value": lambda rng, call: rng.randrange(2000, 150000, 500),
+    "reporting.period": PERIODS,
+    "group_by": ["region", "sales rep", "product", "month"],
+    "filters": ["region=EMEA", "region=APAC", "owner=Maya Chen", "stage=proposal", "product=Pro plan"],
+    "total_value": lambda rng, call: rng.randrange(10000, 900000, 250),
+    "deal_count": lambda rng, call: rng.randint(3, 120),
+    "conversion_rate": lambda rng, call: round(rng.uniform(1, 35), 1),
+    # calendar
+    "create_events.title": ["Team sync", "Quarterly review", "Dentist appointment", "Product demo",
+                            "1:1 with Maya", "Design workshop", "Lunch with Carlos", "Sprint planning"],
+    "create_events.start": _tool({"create_all_day_event": lambda rng: _date(rng)}, _when),
+    "create_events.end": _tool({"create_all_day_event": lambda rng: _date(rng)}, _when),
+    "create_events.location": ["Room 4B", "the main office", "Zoom", "Cafe Milano", "the downtown clinic",
+                               "Conference room A"],
+    "create_events.description": ["Agenda: roadmap and open issues", "Bring the Q2 numbers",
+                                  "Regular cleaning", "Demo for the Globex team", "Weekly check-in"],
+    "calendar": ["work", "personal", "team"],
+    "availability.user_id": lambda rng, call: _email(rng),
+    "availability.date": lambda rng, call: _date(rng),
+    "duration_minutes": [15, 30, 45, 60, 90],
+    "event_id": lambda rng, call: f"EVT-{rng.randint(10000, 99999)}",
+    "reminder_minutes": [5, 10, 15, 30, 60],
+    "invites_reminders.status": _tool({"send_invite": ["invited"], "accept_invite": ["accepted"],
+                                       "decline_invite": ["declined"], "set_reminder": ["reminder set"]}, ["ok"]),
+    "rsvp": ["accepted", "declined", "tentative", "pending"],
+    # ecommerce
+    "product_search.query": PRODUCTS,
+    "category": ["electronics", "books", "home", "sports", "toys", "kitchen"],
+    "min_price": [10, 20, 25, 50], "max_price": [60, 100, 150, 250],
+    "sort_by": ["price", "rating", "newest", "popularity"],
+    "products.name": lambda rng, call: f"{rng.choice(['Pro', 'Lite', 'Classic', 'Ultra'])} {call.get('query', rng.choice(PRODUCTS))}",
+    "coupon_code": ["SAVE10", "WELCOME15", "FREESHIP", "SPRING20"],
+    "items.name": PRODUCTS,
+    "tracking_number": lambda rng, call: f"1Z{rng.getrandbits(40):010X}",
+    "order_tracking.status": _tool({"cancel_order": ["cancelled"], "track_shipment": ["in transit"]},
+                                   ["processing", "shipped", "in transit", "delivered"]),
+    "tracking_events.status": ["label created", "picked up", "in transit", "out for delivery"],
+    "tracking_events.location": CITIES,
+    "reason": ["arrived damaged", "wrong size", "not as described", "no longer needed", "stopped working"],
+    "returns.status": _tool({"initiate_return": ["return requested"], "exchange_item": ["exchange requested"]},
+                            ["approved", "received", "refunded"]),
+    "refund_amount": lambda rng, call: round(rng.uniform(10, 300), 2),
+    # database
+    "table": list(TABLES),
+    "columns": lambda rng, call: rng.choice(TABLES[call.get("table", "orders")][0]),
+    "where": lambda rng, call: rng.choice(TABLES[call.get("table", "orders")][2]),
+    "select_query.count": lambda rng, call: rng.randint(0, 500),
+    "query_ms": lambda rng, call: rng.randint(1, 250),
+    "inserted": _tool({"bulk_insert": lambda rng: rng.randint(2, 500)}, [1]),
+    "database.id": lambda rng, call: rng.randint(1, 99999),
+    "insert_record.id": lambda rng, call: rng.randint(1, 99999),
+    "update_record.id": lambda rng, call: rng.randint(1, 99999),
+    "affected_rows": _tool({"update_batch": lambda rng: rng.randint(2, 300)}, [1]),
+    "insert_record.status": ["inserted"],
+    "update_record.status": _tool({"soft_delete": ["deleted"], "restore_record": ["restored"]}, ["updated"]),
+    "column": _column,
+    "aggregate.group_by": ["country", "status", "category", "month"],
+    "result": lambda rng, call: round(rng.uniform(10, 50000), 2),
+    "groups.key": lambda rng, call: rng.choice({"country": ["CA", "US", "DE", "FR"], "status": ["paid", "shipped", "open"],
+                                                "category": ["books", "home", "toys"],
+                                                "month": ["2024-01", "2024-02", "2024-03"]}.get(
+                                                    call.get("group_by"), ["CA", "US", "DE"])),
+    # music_player
+    "track_id": lambda rng, call: f"trk_{rng.getrandbits(24):06x}",
+    "position_seconds": lambda rng, call: rng.randint(0, 240),
+    "title": TRACKS,
+    "artist": ARTISTS,
+    "playback_control.state": _tool({"pause": ["paused"], "stop": ["stopped"]}, ["playing"]),
+    "level": lambda rng, call: rng.randrange(0, 101, 5),
+    "volume": lambda rng, call: rng.randrange(0, 101, 5),
+    "preset": ["flat", "bass boost", "rock", "jazz", "vocal", "classical"],
+    "equalizer_preset": ["flat", "bass boost", "rock", "jazz", "vocal"],
+    "muted": lambda rng, call: call["func_call"] == "mute",
+    "search_browse.query": _tool({"search_artist": ARTISTS, "search_album": ALBUMS}, TRACKS),
+    "search_browse.results.id": lambda rng, call: f"trk_{rng.getrandbits(24):06x}",
+    "genre": ["jazz", "rock", "pop", "classical", "hip hop", "ambient"],
+    "duration_seconds": lambda rng, call: rng.randint(120, 360),
+    "playlist_management.duration_seconds": lambda rng, call: rng.randint(600, 7200),
+    "playlist_id": lambda rng, call: f"pl_{rng.getrandbits(24):06x}",
+    "playlist_management.name": ["Road Trip", "Focus", "Sunday Morning", "Workout Mix", "Chill Evenings"],
+    "track_count": lambda rng, call: rng.randint(1, 80),
+    # email
+    "subject": ["Meeting moved to Friday", "Q2 report", "Invoice #4821", "Lunch next week?",
+                "Updated contract", "Trip itinerary", "Welcome to the team"],
+    "body": ["Hi, the meeting is now on Friday at 10.", "Please find the report attached.",
+             "Could you confirm the new dates?", "Thanks, see you then.", "Let me know if anything is unclear."],
+    "cc": lambda rng, call: _email(rng),
+    "attachments": ["report.pdf", "invoice.pdf", "slides.pptx", "photo.jpg", "contract.docx"],
+    "folder": ["inbox", "archive", "sent", "work", "receipts"],
+    "message_id": lambda rng, call: f"MSG-{rng.randint(10000, 99999)}",
+    "messages.id": lambda rng, call: f"MSG-{rng.randint(10000, 99999)}",
+    "read_inbox.limit": [5, 10, 20],
+    "search_filter.query": ["invoice", "flight", "contract", "password reset", "meeting notes"],
+    "search_filter.from": lambda rng, call: _email(rng),
+    "after": lambda rng, call: _date(rng),
+    "before": lambda rng, call: _date(rng),
+    "label": ["important", "travel", "receipts", "follow-up", "newsletters"],
+    "action": _tool({"move_to_folder": ["moved"], "create_label": ["label created"], "delete_email": ["deleted"],
+                     "archive_email": ["archived"], "unsubscribe": ["unsubscribed"], "like_post": ["liked"],
+                     "comment_on_post": ["commented"], "share_post": ["shared"], "follow_user": ["followed"],
+                     "unfollow_user": ["unfollowed"], "send_dm": ["message sent"]}, ["done"]),
+    "manage_organize.status": ["ok"],
+    # banking
+    "account_id": lambda rng, call: f"ACC-{rng.randint(10000, 99999)}",
+    "balance": lambda rng, call: round(rng.uniform(50, 25000), 2),
+    "available": lambda rng, call: round(rng.uniform(50, 25000), 2),
+    "from_account": lambda rng, call: f"ACC-{rng.randint(10000, 99999)}",
+    "to_account": lambda rng, call: f"ACC-{rng.randint(10000, 99999)}",
+    "transfers.amount": [50, 100, 250, 500, 1200, 2000],
+    "scheduled_date": lambda rng, call: _date(rng),
+    "transfers.status": _tool({"schedule_transfer": ["scheduled"], "cancel_transfer": ["cancelled"]},
+                              ["completed", "pending"]),
+    "estimated_arrival": lambda rng, call: call.get("scheduled_date") or _date(rng),
+    "transactions.description": ["Grocery Mart", "Coffee House", "Rent payment", "Salary", "Gas station",
+                                 "Online store", "Electric bill", "Restaurant"],
+    "transactions.amount": lambda rng, call: round(rng.uniform(3, 900), 2),
+    "from_currency": CURRENCIES,
+    "to_currency": CURRENCIES,
+    "currency_exchange.amount": [100, 250, 500, 1000, 2000],
+    "currency_exchange.from": CURRENCIES,
+    "currency_exchange.to": CURRENCIES,
+    "currency": CURRENCIES,
+    "fee": [0.0, 1.5, 2.5, 4.99],
+    # food_ordering
+    "cuisine": ["italian", "thai", "mexican", "japanese", "indian", "vegan"],
+    "max_delivery_time": [20, 30, 40, 45, 60],
+    "min_rating": [3.5, 4.0, 4.5],
+    "rating": lambda rng, call: round(rng.uniform(3.0, 5.0), 1),
+    "delivery_time_min": lambda rng, call: rng.randint(15, 60),
+    "restaurants.name": ["Luigi's", "Bangkok Garden", "Taqueria Sol", "Sakura", "Spice Route", "Green Bowl"],
+    "special_instructions": ["no onions", "extra spicy", "leave at the door", "sauce on the side", "no cutlery"],
+    "place_order.items.name": DISHES,
+    "estimated_delivery_min": lambda rng, call: rng.randint(20, 55),
+    "track_order.status": _tool({"rate_order": ["rated"]}, ["preparing", "picked up", "on the way", "delivered"]),
+    "driver_name": lambda rng, call: rng.choice(FIRST),
+    "eta_minutes": lambda rng, call: rng.randint(2, 40),
+    "track_order.location": lambda rng, call: f"{rng.randint(1, 999)} {rng.choice(STREETS)}",
+    # iot_sensors
+    "sensor_id": lambda rng, call: f"SEN-{rng.randint(100, 999)}",
+    "sensor_readings.location": ROOMS,
+    "battery_pct": lambda rng, call: rng.randint(5, 100),
+    "metric": ["temperature", "humidity", "co2"],
+    "threshold": lambda rng, call: {"humidity": rng.choice([30, 60, 70]), "co2": rng.choice([800, 1000, 1500])}.get(
+        call.get("metric"), rng.choice([18, 25, 30])),
+    "alert_configuration.status": _tool({"acknowledge_alert": ["acknowledged"], "disable_alert": ["disabled"]},
+                                        ["active"]),
+    "historical_data.from": lambda rng, call: _when(rng),
+    "historical_data.to": lambda rng, call: _when(rng),
+    "interval": ["5m", "15m", "1h", "1d"],
+    # file_storage
+    "upload_download.path": ["/Documents", "/Photos", "/Projects/site", "/Shared/finance", "/Backups"],
+    "file_name": FILES,
+    "size_bytes": lambda rng, call: rng.randint(1_000, 50_000_000),
+    "content_type": lambda rng, call: {"pdf": "application/pdf", "json": "application/json", "csv": "text/csv",
+                                       "html": "text/html", "gz": "application/gzip", "py": "text/x-python"}.get(
+                                           call.get("file_name", ".txt").rsplit(".", 1)[-1], "text/plain"),
+    "organize_files.path": lambda rng, call: rng.choice(["/Documents", "/Photos", "/Projects", "/Shared"]) + (
+        "" if call["func_call"] in ("create_folder", "list_folder") else f"/{rng.choice(FILES)}"),
+    "organize_files.destination": ["/Archive", "/Documents/old", "/Shared/team", "/Backups"],
+    "new_name": ["final-report.pdf", "notes-2024.txt", "budget.csv", "old-config.yml"],
+    "organize_files.name": FILES,
+    "organize_files.status": _tool({"list_folder": ["ok"], "delete_file": ["deleted"], "create_folder": ["created"],
+                                    "rename_file": ["renamed"], "move_file": ["moved"], "copy_file": ["copied"]}),
+    "shared_link": lambda rng, call: f"https://drive.example.com/s/{rng.getrandbits(40):010x}",
+    "file_id": lambda rng, call: f"FIL-{rng.randint(10000, 99999)}",
+    "user_email": lambda rng, call: _email(rng),
+    "permission": ["view", "comment", "edit"],
+    # notifications
+    "push_notifications.title": ["Your order has shipped", "New message", "Reminder", "Payment received",
+                                 "Flash sale today"],
+    "push_notifications.body": ["Tap to track your package.", "Maya sent you a message.",
+                                "Your appointment is tomorrow at 10:00.", "We received your payment of $42.00.",
+                                "Everything is 20% off until midnight."],
+    "device_token": lambda rng, call: f"tok_{rng.getrandbits(48):012x}",
+    "sms_messaging.to": lambda rng, call: f"+1-555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+    "sms_messaging.from": lambda rng, call: f"+1-555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+    "message": ["Your code is 482913", "Running 10 minutes late", "Your table is ready",
+                "Reminder: dentist tomorrow at 9am", "Package delivered to your front door"],
+    "sms_messaging.status": _tool({"send_sms": ["queued", "sent"]}, ["sent", "delivered"]),
+    "cost": [0.0075, 0.01, 0.0125],
+    "notification_id": lambda rng, call: f"NOT-{rng.randint(10000, 99999)}",
+    "recurrence": ["none", "daily", "weekly", "monthly"],
+    "scheduled_notifications.status": _tool({"cancel_scheduled": ["cancelled"]}, ["scheduled"]),
+    # maps_navigation
+    "origin": PLACES,
+    "routing.destination": PLACES,
+    "instruction": ["Head north on Main St", "Turn left onto Oak Ave", "Continue straight for 2 km",
+                    "Turn right at the roundabout", "Take the second exit", "Your destination is on the left"],
+    "places_search.query": _tool({"get_place_details": ["Blue Bottle Coffee", "City Museum", "Riverside Park"],
+                                  "get_place_reviews": ["Luigi's", "the City Museum", "Blue Bottle Coffee"]},
+                                 ["coffee shops", "pharmacies", "gas stations", "parks", "bookstores"]),
+    "places_search.location": CITIES,
+    "radius_km": [1, 2, 5, 10],
+    "places_search.type": ["cafe", "restaurant", "pharmacy", "gym", "museum"],
+    "places.name": ["Blue Bottle Coffee", "City Museum", "Corner Pharmacy", "Riverside Park", "Iron Gym",
+                    "Luigi's"],
+    "open_now": lambda rng, call: rng.random() < 0.7,
+    "lat": lambda rng, call: CITY_INFO[rng.choice(CITIES)][2],
+    "lng": lambda rng, call: CITY_INFO[rng.choice(CITIES)][3],
+    # social_media
+    "content": ["Just finished my first marathon!", "New blog post is up, link in bio",
+                "Sunset over the harbor tonight", "Big news coming Monday", "Thanks for 10k followers!"],
+    "media_url": lambda rng, call: f"https://cdn.{rng.choice(DOMAINS)}/img/{rng.randint(1000, 9999)}.jpg",
+    "hashtags": ["#travel", "#running", "#photography", "#foodie", "#tech", "#weekend"],
+    "hashtag": ["#travel", "#running", "#photography", "#foodie", "#tech"],
+    "post_creation.status": _tool({"schedule_post": ["scheduled"], "delete_post": ["draft"]}, ["published"]),
+    "post_id": lambda rng, call: f"POS-{rng.randint(10000, 99999)}",
+    "social_interactions.user_id": lambda rng, call: f"@{rng.choice(FIRST).lower()}_{rng.choice(LAST).lower()}",
+    "social_interactions.content": _tool({"send_dm": ["Hey, are you coming tonight?", "Loved your last post!"]},
+                                         ["Great shot!", "Congrats!", "This is so helpful, thanks"]),
+    "social_interactions.status": ["ok"],
+    "search_discover.query": _tool({"search_users": lambda rng: rng.choice(FIRST)},
+                                   ["hiking trails", "vegan recipes", "street photography", "home office setup"]),
+    "search_discover.location": CITIES,
+    "search_discover.results.id": lambda rng, call: f"POS-{rng.randint(10000, 99999)}",
+    "scheduled_at": lambda rng, call: _when(rng),
+    "likes": lambda rng, call: rng.randint(0, 5000),
+    # hr_system
+    "employee_lookup.query": lambda rng, call: _person(rng),
+    "department": ["engineering", "sales", "marketing", "finance", "support", "hr"],
+    "employees.title": ["Software Engineer", "Account Executive", "Marketing Manager", "Accountant",
+                        "Support Specialist", "Recruiter"],
+    "manager": lambda rng, call: _person(rng),
+    "days_requested": lambda rng, call: rng.randint(1, 10),
+    "balance_remaining": lambda rng, call: rng.randint(0, 25),
+    "leave_management.status": _tool({"approve_leave": ["approved"], "reject_leave": ["rejected"]}, ["pending"]),
+    "payroll.period": PERIODS[:6],
+    "gross": lambda rng, call: round(rng.uniform(3000, 9000), 2),
+    "deductions": lambda rng, call: round(rng.uniform(500, 2500), 2),
+    "payroll.currency": ["USD", "EUR", "GBP", "CAD"],
+    # healthcare
+    "specialty": ["cardiology", "dermatology", "pediatrics", "orthopedics", "general practice"],
+    "appointments.date": lambda rng, call: _date(rng),
+    "appointments.reason": ["annual checkup", "knee pain", "follow-up visit", "skin rash", "blood pressure check"],
+    "time": ["08:30", "09:15", "10:00", "11:45", "14:00", "15:30"],
+    "appointments.location": ["Main Street Clinic", "City Hospital, Building B", "Northside Health Center"],
+    "appointments.status": _tool({"cancel_appointment": ["cancelled"], "reschedule_appointment": ["rescheduled"],
+                                  "book_appointment": ["booked"]}, ["scheduled", "available"]),
+    "doctor": lambda rng, call: f"Dr. {rng.choice(LAST)}",
+    "medication": list(MEDICATIONS),
+    "dosage": lambda rng, call: rng.choice(MEDICATIONS.get(call.get("medication"), ["10 mg"])),
+    "refills_remaining": [0, 1, 2, 3, 5],
+    "prescriptions.status": _tool({"request_refill": ["refill requested"]}, ["active", "expired"]),
+    "test_type": list(LAB_TESTS),
+    "reference_range": lambda rng, call: "-",
+    # travel_booking
+    "flight_search.origin": CITIES,
+    "flight_search.destination": CITIES,
+    "departure_date": lambda rng, call: _date(rng),
+    "return_date": lambda rng, call: _date(rng),
+    "passengers": [1, 2, 3, 4],
+    "flight_number": lambda rng, call: f"{rng.choice(['LH', 'BA', 'AF', 'UA', 'DL', 'KL'])}{rng.randint(100, 9999)}",
+    "airline": list(AIRLINE_CODES),
+    "flights.price": lambda rng, call: round(rng.uniform(80, 1400), 2),
+    "flights.duration_minutes": lambda rng, call: rng.randrange(60, 721, 5),
+    "hotel_booking.location": CITIES,
+    "check_in": lambda rng, call: _date(rng),
+    "check_out": lambda rng, call: _date(rng),
+    "guests": [1, 2, 3, 4],
+    "hotels.name": ["Grand Plaza", "Harbor View Inn", "The Linden", "Parkside Suites", "Hotel Central"],
+    "price_per_night": lambda rng, call: round(rng.uniform(60, 450), 2),
+    "amenities": ["wifi", "breakfast", "pool", "gym", "parking", "spa"],
+    "car_rental.location": CITIES,
+    "pickup_date": lambda rng, call: _date(rng),
+    "car": lambda rng, call: {"economy": "Toyota Yaris", "compact": "VW Golf", "suv": "Toyota RAV4",
+                              "luxury": "BMW 5 Series"}.get(call.get("car_type"), "VW Golf"),
+    "daily_rate": lambda rng, call: round(rng.uniform(25, 160), 2),
+    # customer_support
+    "create_ticket.subject": ["Can't log in", "Refund not received", "App crashes on startup",
+                              "Wrong item delivered", "Billing address update"],
+    "create_ticket.description": ["I reset my password twice and still get an error.",
+                                  "The refund was approved two weeks ago.", "It closes right after the splash screen.",
+                                  "I ordered a blue one and got a red one.", "We moved offices last month."],
+    "create_ticket.priority": ["low", "medium", "high"],
+    "create_ticket.category": ["account", "billing", "technical", "shipping"],
+    "assigned_to": lambda rng, call: _person(rng),
+    "reply": ["Thanks, that fixed it.", "I've attached a screenshot.", "Any update on this?",
+              "We've issued the refund; it should arrive in 3-5 days."],
+    "author": lambda rng, call: _person(rng),
+    "replies.message": ["Thanks for reaching out, we're looking into it.", "Could you send a screenshot?",
+                        "We've issued the refund."],
+    "ticket_status.status": _tool({"close_ticket": ["closed"], "reopen_ticket": ["open"], "add_reply": ["open"]},
+                                  ["open", "in_progress", "resolved"]),
+    "escalation.reason": ["customer waiting over 48 hours", "possible data loss", "refund over approval limit",
+                          "repeated outage"],
+    "target_team": ["billing", "engineering", "tier 2 support", "security"],
+    "sla_hours": [4, 8, 24, 48],
+    "escalated_to": ["billing", "engineering", "tier 2 support", "security"],
+    "escalation.status": ["escalated"],
+    # git_api
+    "owner": ["octo-org", "acme", "mayachen", "devtools", "openlab"],
+    "repo": lambda rng, call: f"{rng.choice(WORDS)}-{rng.choice(['api', 'service', 'web', 'cli', 'docs'])}",
+    "repository_ops.description": ["Internal API gateway", "Docs site", "Command line tools", "Shared UI components"],
+    "stars": lambda rng, call: rng.randint(0, 5000),
+    "forks": lambda rng, call: rng.randint(0, 800),
+    "default_branch": ["main"],
+    "branch": BRANCHES,
+    "commits.message": ["Fix null check in parser", "Add retry to uploader", "Update dependencies",
+                        "Refactor auth middleware", "Bump version to 2.1.0"],
+    "pr_number": lambda rng, call: rng.randint(1, 999),
+    "pull_requests.title": ["Add search endpoint", "Fix login timeout", "Update README", "Speed up CI"],
+    "head": BRANCHES,
+    "base": ["main"],
+    "changed_files": lambda rng, call: rng.randint(1, 40),
+    "pull_requests.state": _tool({"merge_pr": ["merged"], "close_pr": ["closed"]}, ["open"]),
+    # docker_api
+    "container_id": lambda rng, call: f"{rng.getrandbits(48):012x}",
+    "container_lifecycle.image": ["nginx:1.25", "redis:7", "postgres:16", "python:3.12", "node:20"],
+    "container_lifecycle.name": ["web", "cache", "db", "worker", "api"],
+    "ports": ["8080:80", "6379:6379", "5432:5432", "3000:3000"],
+    "env": ["DEBUG=1", "PORT=8080", "LOG_LEVEL=info", "POSTGRES_PASSWORD=secret"],
+    "container_lifecycle.state": _tool({"stop_container": ["stopped"], "remove_container": ["exited"]}, ["running"]),
+    "image_management.image": ["acme/api", "acme/web", "nginx", "redis", "postgres"],
+    "tag": ["latest", "1.4.2", "2.0.0", "staging"],
+    "registry": ["docker.io", "ghcr.io", "registry.acme.io"],
+    "dockerfile": ["./Dockerfile", "./docker/Dockerfile.prod", "./api/Dockerfile"],
+    "image_id": lambda rng, call: f"sha256:{rng.getrandbits(48):012x}",
+    "size_mb": lambda rng, call: rng.randint(20, 900),
+    "created": lambda rng, call: _timestamp(rng),
+    "network_volumes.name": ["backend", "frontend", "pgdata", "cache-data", "shared"],
+    "driver": _tool({"create_volume": ["local"], "list_volumes": ["local"], "mount_volume": ["local"]},
+                    ["bridge", "overlay"]),
+    "mount_path": ["/data", "/var/lib/postgresql/data", "/app/uploads", "/cache"],
+    "scope": ["local", "swarm"],
+    "containers": ["web", "api", "db", "worker"],
+    # payment_processing
+    "customer_id": lambda rng, call: f"cus_{rng.getrandbits(32):08x}",
+    "payment_method_id": lambda rng, call: f"pm_{rng.getrandbits(32):08x}",
+    "charge_refund.description": ["Pro plan, March", "Order #4821", "Conference ticket", "Annual membership"],
+    "charge_refund.amount": lambda rng, call: rng.choice([9.99, 19.0, 49.0, 120.0, 249.5]),
+    "charge_refund.status": ["succeeded", "pending"],
+    "plan_id": ["basic", "pro", "team", "enterprise"],
+    "trial_days": [7, 14, 30],
+    "plan": ["basic", "pro", "team", "enterprise"],
+    "current_period_end": lambda rng, call: _date(rng),
+    "subscription.status": _tool({"cancel_subscription": ["canceled"], "pause_subscription": ["paused"]}, ["active"]),
+    "transaction_lookup.amount": lambda rng, call: round(rng.uniform(5, 500), 2),
+    "transaction_lookup.status": ["succeeded", "pending", "refunded"],
+    # inventory_management
+    "sku": lambda rng, call: f"SKU-{rng.randint(10000, 99999)}",
+    "location_id": ["WH-EAST", "WH-WEST", "STORE-12", "STORE-40"],
+    "stock_levels.threshold": [5, 10, 20, 50],
+    "product_name": PRODUCTS,
+    "stock_levels.location": ["WH-EAST", "WH-WEST", "STORE-12", "STORE-40"],
+    "supplier_id": lambda rng, call: f"SUP-{rng.randint(100, 999)}",
+    "supplier": ["Northwind Supply", "Contoso Parts", "Fabrikam Goods"],
+    "expected_delivery": lambda rng, call: _date(rng),
+    "reorder.quantity": [50, 100, 200, 500],
+    "reorder.status": _tool({"cancel_po": ["cancelled"]}, ["submitted", "confirmed"]),
+    "from_location": ["WH-EAST", "WH-WEST", "STORE-12", "STORE-40"],
+    "to_location": ["WH-EAST", "WH-WEST", "STORE-12", "STORE-40"],
+    "warehouse_ops.from": ["WH-EAST", "WH-WEST", "STORE-12", "STORE-40"],
+    "warehouse_ops.to": ["WH-EAST", "WH-WEST", "STORE-12", "STORE-40"],
+    "warehouse_ops.reason": ["damaged stock", "cycle count correction", "returned goods", "rebalancing"],
+    "warehouse_ops.status": ["completed"],
+    # analytics
+    "page_views.url": lambda rng, call: f"https://{rng.choice(DOMAINS)}/{rng.choice(['pricing', 'blog', 'signup', 'docs', ''])}",
+    "from_date": lambda rng, call: _date(rng),
+    "to_date": lambda rng, call: _date(rng),
+    "views": lambda rng, call: rng.randint(200, 90000),
+    "unique_visitors": lambda rng, call: rng.randint(100, 60000),
+    "avg_session_seconds": lambda rng, call: rng.randint(20, 400),
+    "bounce_rate": lambda rng, call: round(rng.uniform(20, 80), 1),
+    "event_name": ["signup", "purchase", "add_to_cart", "newsletter_signup", "trial_start"],
+    "funnel_id": ["checkout", "onboarding", "trial-to-paid"],
+    "total_events": lambda rng, call: rng.randint(100, 50000),
+    "unique_users": lambda rng, call: rng.randint(50, 30000),
+    "funnel_steps.name": ["visit", "sign up", "add to cart", "checkout", "purchase"],
+    "completions": lambda rng, call: rng.randint(10, 5000),
+    "report_id": lambda rng, call: f"REP-{rng.randint(10000, 99999)}",
+    "custom_reports.name": ["Weekly traffic", "Signups by country", "Revenue by channel", "Top pages"],
+    "custom_reports.metrics": ["sessions", "signups", "revenue", "page views"],
+    "dimensions": ["country", "channel", "device", "page"],
+    "total_rows": lambda rng, call: rng.randint(1, 500),
+}
+
+# Generic string values by field name, for fields without a pool:
+# (pattern, factory(field name) -> generator(rng)), first match wins
+STRING_RULES = [
+    (r"email|^(from|to)$", lambda key: _email),
+    (r"sha$", lambda key: lambda rng: "%07x" % rng.getrandbits(28)),
+    (r"(^|_)id$|token|number$|sku|code$", _ident),
+    (r"url|link", lambda key: lambda rng: f"https://{rng.choice(DOMAINS)}/{rng.choice(WORDS)}/{rng.randint(1, 999)}"),
+    (r"period|interval|granularity", lambda key: lambda rng: rng.choice(PERIODS)),
+    (r"_at$|timestamp|time$|created|updated|^start$|^end$|arrival|departure|expires|estimated|generated",
+     lambda key: _timestamp),
+    (r"date|day$|check_in|check_out|^after$|^before$", lambda key: _date),
+    (r"address", lambda key: lambda rng: f"{rng.randint(1, 999)} {rng.choice(STREETS)}, {rng.choice(CITIES)}"),
+    (r"country", lambda key: lambda rng: rng.choice(COUNTRIES)),
+    (r"location|city|origin|destination|region", lambda key: lambda rng: rng.choice(CITIES)),
+    (r"timezone", lambda key: lambda rng: CITY_INFO[rng.choice(CITIES)][1]),
+    (r"file_name|^file$", lambda key: lambda rng: rng.choice(FILES)),
+    (r"path|folder|^source$", lambda key: lambda rng: rng.choice(DIRS)),
+    (r"phone", lambda key: lambda rng: f"+1-555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"),
+    (r"currency", lambda key: lambda rng: rng.choice(CURRENCIES)),
+    (r"name$|author|driver|owner|_by$|manager|escalated", lambda key: _person),
+    (r"status|state", lambda key: lambda rng: rng.choice(["active", "pending", "completed"])),
+]
+
+NUMBER_RULES = [
+    (r"pid", lambda rng: rng.randint(100, 65535)),
+    (r"_pct|percent|probability|bounce|conversion|humidity|cpu|mem$", lambda rng: round(rng.uniform(0, 100), 1)),
+    (r"rating", lambda rng: round(rng.uniform(1, 5), 1)),
+    (r"temp|^value$|^high$|^low$", lambda rng: round(rng.uniform(-5, 34), 1)),
+    (r"price|amount|cost|balance|fee|total_value|gross|net|deductions|rate|refund|^change$",
+     lambda rng: round(rng.uniform(1, 2000), 2)),
+    (r"_ms$|elapsed", lambda rng: rng.randint(5, 5000)),
+    (r"seconds|minutes|hours|days|_min$", lambda rng: rng.randint(1, 120)),
+    (r"_km$", lambda rng: round(rng.uniform(0.2, 40), 1)),
+    (r"size|bytes|_gb|_mb", lambda rng: rng.randint(1, 4096)),
+    (r"status_code", lambda rng: rng.choice([200, 201, 204, 400, 404, 500])),
+    (r"count|total|line|quantity|views|visitors|events|users", lambda rng: rng.randint(1, 500)),
+]
+
+_STRING_RULES = [(re.compile(p), f) for p, f in STRING_RULES]
+_NUMBER_RULES = [(re.compile(p), f) for p, f in NUMBER_RULES]
+
+# ---------------------------------------------------------------------------
+# Question templates: subdomain -> tool -> templates
+# ---------------------------------------------------------------------------
+
+QUESTIONS = {
+    # bash_terminal
+    "list_files": {
+        "ls": ["What files are in {path}?", "List the files in {path}."],
+        "ls_la": ["Show all files in {path}, hidden ones included, with details.{flags=\"-la\"}"],
+        "ls_lh": ["List {path} with human-readable file sizes.{flags=\"-lh\"}"],
+        "ls_R": ["List everything under {path} recursively.{flags=\"-R\"}"],
+    },
+    "find_files": {
+        "find_by_name": ["Find files named {pattern} under {path}.{type=\"f\"}",
+                         "Are there any directories called {pattern} in {path}?{type=\"d\"}"],
+        "find_by_extension": ["Find all {pattern} files in {path}.{type=\"f\"}"],
+        "find_by_size": ["Find files in {path} matching size {pattern}.{type=\"f\"}"],
+        "find_by_date": ["Which files in {path} match {pattern}?{type=\"f\"}"],
+    },
+    "search_text": {
+        "grep_file": ["Search {path} for \"{pattern}\".", "Does {path} mention \"{pattern}\"?"],
+        "grep_recursive": ["Find \"{pattern}\" anywhere under {path}.{flags=\"-rn\"}"],
+        "grep_case_insensitive": ["Look for \"{pattern}\" in {path}, ignoring case.{flags=\"-ri\"}"],
+        "grep_count": ["How many lines in {path} contain \"{pattern}\"?{flags=\"-c\"}"],
+    },
+    "file_operations": {
+        "copy_file": ["Copy {source} to {destination}."],
+        "move_file": ["Move {source} into {destination}."],
+        "delete_file": ["Delete {source}.", "Remove the file {source}."],
+        "create_dir": ["Create a directory at {destination}."],
+    },
+    "process_management": {
+        "list_processes": ["List all running processes.", "Which {name} processes are running?"],
+        "kill_process": ["Kill process {pid}[ with {signal}].", "Stop the {name} process with PID {pid}."],
+        "get_process_info": ["Show me details for PID {pid}."],
+        "top_processes": ["What's using the most CPU right now?"],
+    },
+    "network_commands": {
+        "curl_get": ["Fetch {url}.", "What does {url} return?"],
+        "curl_post": ["Send a POST request to {url} with {options}."],
+        "wget_download": ["Download {url}[ with wget {options}]."],
+        "ssh_command": ["Run `{options}` on {host} over SSH."],
+        "ping_host": ["Ping {host}.", "Is {host} reachable?"],
+    },
+    "permissions": {
+        "chmod": ["Set the permissions of {path} to {mode}.", "chmod {path} to {mode}."],
+        "chown": ["Make {owner} the owner of {path}."],
+        "check_permissions": ["What are the permissions on {path}?"],
+        "add_to_group": ["Add {owner} to the group that owns {path}."],
+    },
+    # weather_api
+    "current_conditions": {
+        "get_temperature": ["What's the temperature in {location}[ in {unit}]?",
+                            "How warm is it in {location} right now[, in {unit}]?"],
+        "get_humidity": ["How humid is it in {location}?", "What's the humidity in {location}?"],
+        "get_wind_speed": ["How windy is it in {location}?", "What's the wind speed in {location}?"],
+        "get_uv_index": ["What's the UV index in {location} today?"],
+    },
+    "multi_metric": {
+        "get_current_weather": ["What's the weather like in {location}?",
+                                "Give me the {metrics} in {location}."],
+        "get_feels_like": ["What does it feel like outside in {location}?"],
+        "get_pressure": ["What's the air pressure in {location}?{metrics=[\"pressure\"]}"],
+        "get_visibility": ["How's the visibility in {location}?"],
+    },
+    "forecast": {
+        "get_forecast_daily": ["What's the forecast for {location} for the next {days} days[ in {unit}]?",
+                               "Will it rain in {location} in the next {days} days?"],
+        "get_forecast_hourly": ["Give me the hourly forecast for {location}[ in {unit}]."],
+        "get_forecast_weekly": ["What's the weather looking like in {location} this week[ in {unit}]?{days=7}"],
+    },
+    "alerts": {
+        "get_weather_alerts": ["Are there any weather alerts for {location}?",
+                               "Show {severity} weather alerts for {location}."],
+        "get_storm_warnings": ["Any storm warnings in {location}?"],
+        "get_air_quality_index": ["What's the air quality in {location}?"],
+    },
+    # cloud_server_api
+    "instance_lifecycle": {
+        "start_instance": ["Start instance {instance_id}[ in {region}]."],
+        "stop_instance": ["Stop instance {instance_id}[ in {region}].", "Shut down {instance_id}."],
+        "restart_instance": ["Reboot instance {instance_id}[ in {region}]."],
+        "terminate_instance": ["Terminate instance {instance_id} in {region}."],
+    },
+    "instance_status": {
+        "get_instance_status": ["What's the status of instance {instance_id}?", "Is {instance_id} running?"],
+        "list_instances": ["List my instances in {region}.", "Which instances in {region} are {filter}?"],
+        "get_instance_metrics": ["Show metrics for instance {instance_id}[ in {region}]."],
+    },
+    "scaling_operations": {
+        "scale_out": ["Scale {group_id} out to {desired} instances."],
+        "scale_in": ["Scale {group_id} in to {desired} instances."],
+        "set_auto_scaling": ["Let {group_id} scale between {min_size} and {max_size} instances[, {desired} desired]."],
+        "get_scaling_policy": ["What's the scaling policy for {group_id}?"],
+    },
+    "storage_volumes": {
+        "create_volume": ["Create a {size_gb} GB volume[ for instance {instance_id}]."],
+        "attach_volume": ["Attach volume {volume_id} to instance {instance_id}."],
+        "detach_volume": ["Detach volume {volume_id}[ from {instance_id}]."],
+        "snapshot_volume": ["Take a snapshot of volume {volume_id}."],
+        "list_volumes": ["List the volumes attached to {instance_id}.", "Show all my volumes."],
+    },
+    # smart_home
+    "garage_door": {
+        "open_garage": ["Open the {door_id} garage door."],
+        "close_garage": ["Close the {door_id} garage door.", "Shut the {door_id} garage."],
+        "get_garage_status": ["Is the {door_id} garage door open?"],
+        "set_garage_timer": ["Close the {door_id} garage door in {delay_seconds} seconds."],
+    },
+    "thermostat": {
+        "set_temperature": ["Set the {device_id} thermostat to {temperature} degrees."],
+        "get_temperature": ["What's the {device_id} thermostat set to?"],
+        "set_mode": ["Switch the {device_id} thermostat to {mode} mode."],
+        "get_schedule": ["What's the heating schedule for the {device_id} thermostat?"],
+    },
+    "smart_lighting": {
+        "turn_on_light": ["Turn on the {light_id} light.", "Switch the {light_id} light on."],
+        "turn_off_light": ["Turn off the {light_id} light."],
+        "set_brightness": ["Set the {light_id} light to {brightness}% brightness."],
+        "set_color": ["Make the {light_id} light {color}."],
+        "get_light_status": ["Is the {light_id} light on?"],
+    },
+    "door_locks": {
+        "lock_door": ["Lock the {lock_id} door."],
+        "unlock_door": ["Unlock the {lock_id} door[ for user {user_id}]."],
+        "get_lock_status": ["Is the {lock_id} door locked?"],
+        "set_access_code": ["Set access code {code} on the {lock_id} door[ for user {user_id}]."],
+    },
+    # coffee_machine
+    "brewing": {
+        "brew_coffee": ["Make me a {size} {strength} coffee.", "Brew a {size} coffee."],
+        "brew_espresso": ["Make me a {strength} espresso."],
+        "brew_latte": ["Brew a {size} latte with {milk} milk."],
+        "brew_cappuccino": ["I'd like a {size} cappuccino[ with {milk} milk]."],
+    },
+    "settings": {
+        "set_temperature": ["Set the brewing temperature to {value}.{parameter=\"temperature\"}"],
+        "set_grind_level": ["Change the grind to {value}.{parameter=\"grind_level\"}"],
+        "set_brew_time": ["Set the brew time to {value}.{parameter=\"brew_time\"}"],
+        "get_current_settings": ["What's the current {parameter} setting?"],
+    },
+    "maintenance": {
+        "clean_machine": ["Run a cleaning cycle on coffee machine {machine_id}."],
+        "descale": ["Descale coffee machine {machine_id}."],
+        "check_water_level": ["How much water is left in coffee machine {machine_id}?"],
+        "check_bean_level": ["Does coffee machine {machine_id} need more beans?"],
+        "empty_grounds": ["Empty the grounds bin of coffee machine {machine_id}."],
+    },
+    # vending_machine
+    "purchase": {
+        "purchase_item": ["Buy {quantity} from slot {slot_id}.", "I want the item in slot {slot_id}.{quantity=1}"],
+        "get_item_info": ["What's in slot {slot_id}?"],
+        "check_availability": ["Is slot {slot_id} in stock?"],
+    },
+    "inventory": {
+        "list_inventory": ["What's in the vending machine right now?"],
+        "restock_item": ["Restock slot {slot_id} with {quantity} items."],
+        "get_low_stock": ["Which slots are running low?"],
+        "update_price": ["Change the price of slot {slot_id} to {price}."],
+    },
+    "payment": {
+        "process_cash": ["Pay {amount} {currency} in cash."],
+        "process_card": ["Pay {amount} {currency} by card."],
+        "process_mobile_pay": ["Pay {amount} {currency} with my phone."],
+        "get_change": ["How much change do I get for transaction {transaction_id}?"],
+        "refund_transaction": ["Refund transaction {transaction_id}."],
+    },
+    # crm
+    "contact_lookup": {
+        "search_contact": ["Search contacts for \"{query}\".", "Find {query} in the CRM."],
+        "get_contact_by_id": ["Pull up contact {query}.{field=\"id\"}"],
+        "find_contacts_by_company": ["Find contacts at {query}[, up to {limit}].{field=\"company\"}"],
+        "find_contacts_by_tag": ["Show contacts tagged {query}[, up to {limit}].{field=\"tag\"}"],
+    },
+    "contact_management": {
+        "create_contact": ["Add {name} from {company} as a new contact[ with email {email}]."],
+        "update_contact": ["Update contact {contact_id}'s email to {email}.",
+                           "Change the company of contact {contact_id} to {company}."],
+        "delete_contact": ["Delete contact {contact_id}."],
+        "add_note": ["Add a note to contact {contact_id}: \"{note}\""],
+        "add_tag": ["Tag contact {contact_id} as {note}."],
+    },
+    "deal_pipeline": {
+        "create_deal": ["Create a deal worth {value} for contact {contact_id}[ in the {stage} stage]."],
+        "update_deal_stage": ["Move deal {deal_id} to {stage}."],
+        "get_deal": ["Show me deal {deal_id}."],
+        "list_deals_by_stage": ["Which deals are in {stage}?"],
+        "close_deal": ["Mark deal {deal_id} as won.{stage=\"closed_won\"}"],
+    },
+    "reporting": {
+        "get_sales_report": ["Give me the sales report for {period}[ grouped by {group_by}]."],
+        "get_conversion_rate": ["What was our conversion rate in {period}[ for {filters}]?"],
+        "get_pipeline_summary": ["Summarize the pipeline for {period}."],
+        "get_activity_report": ["Show the activity report for {period}[ grouped by {group_by}]."],
+    },
+    # calendar
+    "create_events": {
+        "create_event": ["Schedule \"{title}\" from {start} to {end}[ at {location}].",
+                         "Add \"{title}\" to my calendar at {start}[ with the note \"{description}\"]."],
+        "create_recurring_event": ["Create a recurring \"{title}\" starting {start}, ending {end}[ in {location}]."],
+        "create_all_day_event": ["Add an all-day event \"{title}\" on {start}[ at {location}]."],
+    },
+    "availability": {
+        "check_availability": ["Is {user_id} free on {date}?"],
+        "find_free_slot": ["Find a {duration_minutes}-minute slot for {user_id} on {date}."],
+        "get_busy_times": ["When is {user_id} busy on {date}?"],
+        "block_time": ["Block {duration_minutes} minutes for {user_id} on {date}."],
+    },
+    "invites_reminders": {
+        "send_invite": ["Invite {attendee_email} to event {event_id}."],
+        "accept_invite": ["Accept the invite to event {event_id}."],
+        "decline_invite": ["Decline event {event_id}."],
+        "set_reminder": ["Remind me {reminder_minutes} minutes before event {event_id}."],
+        "get_rsvp_status": ["Who has replied to event {event_id}?", "Has {attendee_email} replied to event {event_id}?"],
+    },
+    # ecommerce
+    "product_search": {
+        "search_products": ["Search for {query}[ under {max_price}].", "Find {query}[ sorted by {sort_by}]."],
+        "filter_products": ["Show {category} between {min_price} and {max_price}[, sorted by {sort_by}]."],
+        "get_product_details": ["Tell me more about the {query}."],
+        "get_recommendations": ["Recommend something in {category}."],
+    },
+    "cart_checkout": {
+        "add_to_cart": ["Add {quantity} of product {product_id} to my cart."],
+        "remove_from_cart": ["Remove product {product_id} from my cart."],
+        "update_quantity": ["Change the quantity of {product_id} in my cart to {quantity}."],
+        "get_cart": ["What's in my cart?"],
+        "apply_coupon": ["Apply coupon {coupon_code}."],
+        "checkout": ["Check out[ with coupon {coupon_code}]."],
+    },
+    "order_tracking": {
+        "get_order_status": ["Where's my order {order_id}?", "What's the status of order {order_id}?"],
+        "track_shipment": ["Track package {tracking_number}."],
+        "get_order_history": ["Show the history of order {order_id}."],
+        "cancel_order": ["Cancel order {order_id}."],
+    },
+    "returns": {
+        "initiate_return": ["Return item {item_id} from order {order_id}, reason: {reason}."],
+        "get_return_status": ["What's happening with my return for order {order_id}?"],
+        "exchange_item": ["Exchange item {item_id} from order {order_id}[, reason: {reason}]."],
+        "get_refund_status": ["Has the refund for order {order_id} gone through?"],
+    },
+    # database
+    "select_query": {
+        "select_records": ["Get {columns} from {table}[, limit {limit}]."],
+        "select_with_filter": ["Select {columns} from {table} where {where}."],
+        "select_with_join": ["Show {columns} from {table} joined with their related rows[, limit {limit}]."],
+        "count_records": ["How many rows in {table} match {where}?"],
+    },
+    "insert_record": {
+        "insert_record": ["Insert a new row into {table}."],
+        "bulk_insert": ["Bulk insert rows into {table}."],
+        "insert_and_return": ["Insert a row into {table} and return it."],
+    },
+    "update_record": {
+        "update_record": ["Update row {id} in {table}."],
+        "update_batch": ["Update every row in {table} where {where}."],
+        "soft_delete": ["Soft-delete row {id} from {table}."],
+        "restore_record": ["Restore row {id} in {table}."],
+    },
+    "aggregate": {
+        "sum_column": ["What's the total {column} in {table}[ where {where}]?"],
+        "avg_column": ["What's the average {column} in {table}[ where {where}]?"],
+        "group_by_query": ["Sum {column} in {table} grouped by {group_by}."],
+        "min_max_query": ["What are the lowest and highest {column} in {table}?"],
+    },
+    # music_player
+    "playback_control": {
+        "play": ["Play track {track_id}.", "Resume the music."],
+        "pause": ["Pause the music."],
+        "stop": ["Stop playback."],
+        "skip_next": ["Skip to the next song."],
+        "skip_previous": ["Go back to the previous track."],
+        "seek": ["Jump to {position_seconds} seconds[ in track {track_id}]."],
+    },
+    "volume_settings": {
+        "set_volume": ["Set the volume to {level}."],
+        "get_volume": ["What's the volume at?"],
+        "mute": ["Mute the speaker."],
+        "unmute": ["Unmute the speaker."],
+        "set_equalizer": ["Switch the equalizer to {preset}."],
+    },
+    "search_browse": {
+        "search_tracks": ["Find the song \"{query}\".", "Search for tracks called \"{query}\"[, top {limit}]."],
+        "search_artist": ["Find songs by {query}[, top {limit}]."],
+        "search_album": ["Find the album \"{query}\"."],
+        "get_trending": ["What's trending[ in {genre}]?"],
+        "get_genre_playlist": ["Make me a {genre} playlist[ of {limit} songs]."],
+    },
+    "playlist_management": {
+        "create_playlist": ["Create a playlist called \"{name}\"."],
+        "add_to_playlist": ["Add track {track_id} to playlist {playlist_id}."],
+        "remove_from_playlist": ["Remove track {track_id} from playlist {playlist_id}."],
+        "delete_playlist": ["Delete playlist {playlist_id}."],
+        "list_playlists": ["Show my playlists."],
+    },
+    # email
+    "send_compose": {
+        "send_email": ["Email {to} with the subject \"{subject}\": \"{body}\"",
+                       "Send {to} an email about \"{subject}\"[ and cc {cc}]."],
+        "compose_draft": ["Draft an email to {to} about \"{subject}\"."],
+        "send_reply": ["Reply to {to}: \"{body}\""],
+        "forward_email": ["Forward \"{subject}\" to {to}[ with {attachments} attached]."],
+    },
+    "read_inbox": {
+        "get_inbox": ["Show my {folder}[, latest {limit}]."],
+        "get_email": ["Open message {message_id}."],
+        "mark_as_read": ["Mark message {message_id} as read."],
+        "mark_as_unread": ["Mark message {message_id} as unread."],
+        "get_unread_count": ["How many unread emails are in my {folder}?"],
+    },
+    "search_filter": {
+        "search_emails": ["Search my email for \"{query}\"."],
+        "filter_by_sender": ["Show emails from {from}."],
+        "filter_by_date": ["Find emails between {after} and {before}."],
+        "filter_by_label": ["Show emails labeled {label}."],
+    },
+    "manage_organize": {
+        "move_to_folder": ["Move message {message_id} to {folder}."],
+        "create_label": ["Create a label called \"{label}\"."],
+        "delete_email": ["Delete message {message_id}."],
+        "archive_email": ["Archive message {message_id}."],
+        "unsubscribe": ["Unsubscribe me from the sender of message {message_id}."],
+    },
+    # banking
+    "account_balance": {
+        "get_balance": ["What's the balance of my {account_type} account?",
+                        "What's the balance on account {account_id}?"],
+        "get_account_summary": ["Give me a summary of account {account_id}."],
+        "get_available_credit": ["How much credit do I have left?{account_type=\"credit\"}"],
+        "get_account_details": ["Show the details of my {account_type} account."],
+    },
+    "transfers": {
+        "transfer_funds": ["Transfer {amount} {currency} from {from_account} to {to_account}."],
+        "schedule_transfer": ["Schedule a transfer of {amount} {currency} from {from_account} to "
+                              "{to_account} on {scheduled_date}."],
+        "cancel_transfer": ["Cancel my transfer of {amount} {currency} to {to_account}."],
+        "get_transfer_status": ["Has my {amount} {currency} transfer to {to_account} gone through?"],
+    },
+    "transaction_history": {
+        "get_transactions": ["Show transactions on {account_id} from {from_date} to {to_date}."],
+        "get_transaction_by_id": ["Show the most recent transaction on {account_id}.{limit=1}"],
+        "get_statements": ["Get statements for {account_id} between {from_date} and {to_date}."],
+        "search_transactions": ["Show the last {limit} transactions on {account_id}."],
+    },
+    "currency_exchange": {
+        "get_exchange_rate": ["What's the {from_currency} to {to_currency} exchange rate?"],
+        "convert_currency": ["Convert {amount} {from_currency} to {to_currency}."],
+        "buy_foreign_currency": ["Buy {to_currency} with {amount} {from_currency}."],
+        "get_supported_currencies": ["Which currencies can I exchange {from_currency} for?"],
+    },
+    # food_ordering
+    "restaurant_search": {
+        "search_restaurants": ["Find restaurants in {location}[ that deliver within {max_delivery_time} minutes]."],
+        "filter_by_cuisine": ["Show {cuisine} places in {location}[ rated {min_rating} or higher]."],
+        "get_restaurant_menu": ["Show me menus of {cuisine} restaurants in {location}."],
+        "get_restaurant_details": ["Tell me about {cuisine} restaurants in {location} rated {min_rating} or higher."],
+    },
+    "place_order": {
+        "add_item_to_order": ["Add {quantity} of item {item_id} from restaurant {restaurant_id} to my order"
+                              "[, {special_instructions}]."],
+        "remove_item": ["Remove item {item_id} from my order."],
+        "apply_promo": ["Apply my promo to the order from restaurant {restaurant_id}."],
+        "place_order": ["Place my order from restaurant {restaurant_id}[ with the note \"{special_instructions}\"]."],
+        "get_order_estimate": ["How long will my order from restaurant {restaurant_id} take?"],
+    },
+    "track_order": {
+        "track_delivery": ["Where is my food order {order_id}?"],
+        "get_order_status": ["What's the status of food order {order_id}?"],
+        "contact_driver": ["Get me in touch with the driver for order {order_id}."],
+        "rate_order": ["Rate my order {order_id}."],
+    },
+    # iot_sensors
+    "sensor_readings": {
+        "get_sensor_reading": ["What's the {type} reading on sensor {sensor_id}?"],
+        "get_all_sensors": ["Show all sensors[ in the {location}]."],
+        "get_sensor_by_location": ["What does the {type} sensor in the {location} say?"],
+        "get_sensor_battery": ["How much battery does sensor {sensor_id} have left?"],
+    },
+    "alert_configuration": {
+        "set_alert_threshold": ["Alert me when {metric} on sensor {sensor_id} goes {condition} {threshold}."],
+        "get_alerts": ["Show the alerts for sensor {sensor_id}."],
+        "acknowledge_alert": ["Acknowledge the {metric} alert on sensor {sensor_id}."],
+        "disable_alert": ["Turn off the {metric} alert on sensor {sensor_id}."],
+    },
+    "historical_data": {
+        "get_historical_readings": ["Show readings from sensor {sensor_id} between {from} and {to}[, every {interval}]."],
+        "get_average_reading": ["What was the average reading of sensor {sensor_id} from {from} to {to}?"],
+        "get_min_max": ["What were the lowest and highest readings of sensor {sensor_id} between {from} and {to}?"],
+        "export_sensor_data": ["Export sensor {sensor_id}'s data from {from} to {to}[ at {interval} intervals]."],
+    },
+    # file_storage
+    "upload_download": {
+        "upload_file": ["Upload {file_name} to {path}."],
+        "download_file": ["Download {file_name} from {path}."],
+        "get_upload_url": ["Get me an upload link for {file_name} in {path}."],
+        "get_download_url": ["Give me a download link for {file_name} in {path}."],
+    },
+    "organize_files": {
+        "create_folder": ["Create a folder at {path}."],
+        "move_file": ["Move {path} to {destination}."],
+        "copy_file": ["Copy {path} into {destination}."],
+        "rename_file": ["Rename {path} to {new_name}."],
+        "delete_file": ["Delete {path}."],
+        "list_folder": ["What's in {path}?"],
+    },
+    "sharing_permissions": {
+        "share_file": ["Share file {file_id} with {user_email} with {permission} access[ until {expires_at}]."],
+        "set_permissions": ["Give {user_email} {permission} access to file {file_id}."],
+        "get_shared_link": ["Get a shareable link for file {file_id}[ that expires {expires_at}]."],
+        "revoke_access": ["Remove {user_email}'s access to file {file_id}."],
+        "list_collaborators": ["Who has access to file {file_id}?"],
+    },
+    # notifications
+    "push_notifications": {
+        "send_push": ["Send {user_id} a push notification titled \"{title}\": \"{body}\""],
+        "send_bulk_push": ["Push \"{title}\" to all users: \"{body}\""],
+        "get_push_status": ["Was the push notification to {user_id} delivered?"],
+        "cancel_push": ["Cancel the pending push notification to {user_id}."],
+    },
+    "sms_messaging": {
+        "send_sms": ["Text {to}: \"{message}\"", "Send \"{message}\" to {to}[ from {from}]."],
+        "send_bulk_sms": ["Send \"{message}\" as a bulk text starting with {to}."],
+        "get_sms_status": ["Did my text to {to} go through?"],
+        "get_sms_history": ["Show my text history with {to}."],
+    },
+    "scheduled_notifications": {
+        "schedule_notification": ["Schedule notification {notification_id} by {channel} for {scheduled_at}"
+                                  "[, repeating {recurrence}]."],
+        "cancel_scheduled": ["Cancel scheduled notification {notification_id}."],
+        "list_scheduled": ["What {channel} notifications are scheduled?"],
+        "update_schedule": ["Move notification {notification_id} to {scheduled_at}."],
+    },
+    # maps_navigation
+    "routing": {
+        "get_directions": ["Get {mode} directions from {origin} to {destination}.",
+                           "How do I get from {origin} to {destination}?"],
+        "get_route_alternatives": ["Show other {mode} routes from {origin} to {destination}."],
+        "get_travel_time": ["How long does it take to get from {origin} to {destination}[ by {mode}]?"],
+        "get_traffic_conditions": ["How's the traffic between {origin} and {destination}?{mode=\"driving\"}"],
+    },
+    "places_search": {
+        "search_places": ["Find {query} in {location}.", "Are there any {query} near {location}?"],
+        "get_place_details": ["Tell me about {query} in {location}."],
+        "find_nearby": ["Find a {type} within {radius_km} km of {location}."],
+        "get_place_reviews": ["What do people say about {query} in {location}?"],
+    },
+    "geocoding": {
+        "geocode_address": ["What are the coordinates of {address}?"],
+        "reverse_geocode": ["What's the address at {lat}, {lng}?"],
+        "validate_address": ["Is {address} a valid address?"],
+        "get_timezone": ["What time zone is {address} in?", "What time zone is at {lat}, {lng}?"],
+    },
+    # social_media
+    "post_creation": {
+        "create_post": ["Post \"{content}\"[ with {hashtags}].", "Share \"{content}\" with the photo {media_url}."],
+        "create_story": ["Add {media_url} to my story[ with the caption \"{content}\"]."],
+        "schedule_post": ["Schedule \"{content}\" to go out at {scheduled_at}."],
+        "delete_post": ["Take down my post \"{content}\" and keep it as a draft."],
+    },
+    "social_interactions": {
+        "like_post": ["Like post {post_id}."],
+        "comment_on_post": ["Comment \"{content}\" on post {post_id}."],
+        "share_post": ["Share post {post_id}."],
+        "follow_user": ["Follow {user_id}."],
+        "unfollow_user": ["Unfollow {user_id}."],
+        "send_dm": ["Send {user_id} a message: \"{content}\""],
+    },
+    "search_discover": {
+        "search_posts": ["Search posts about {query}[ near {location}]."],
+        "search_users": ["Find users named {query}[, top {limit}]."],
+        "get_trending_hashtags": ["What's trending[ in {location}]?"],
+        "get_explore_feed": ["Show my explore feed[ for {hashtag}]."],
+    },
+    # hr_system
+    "employee_lookup": {
+        "search_employee": ["Find employee {query}."],
+        "get_employee_by_id": ["Look up employee {employee_id}."],
+        "get_org_chart": ["Show the org chart for {department}."],
+        "list_employees_by_department": ["List everyone in {department}."],
+    },
+    "leave_management": {
+        "request_leave": ["Request {leave_type} leave for {employee_id} from {from_date} to {to_date}."],
+        "get_leave_balance": ["How many leave days does {employee_id} have left?"],
+        "approve_leave": ["Approve {employee_id}'s {leave_type} leave from {from_date} to {to_date}."],
+        "reject_leave": ["Reject {employee_id}'s leave request for {from_date} to {to_date}."],
+        "get_leave_history": ["Show {employee_id}'s leave history."],
+    },
+    "payroll": {
+        "get_payslip": ["Get {employee_id}'s payslip for {period}."],
+        "get_salary_info": ["What is {employee_id} paid?"],
+        "run_payroll": ["Run payroll for {employee_id} for {period}."],
+        "update_tax_info": ["Update the tax details of {employee_id}."],
+        "get_ytd_earnings": ["How much has {employee_id} earned this year?"],
+    },
+    # healthcare
+    "appointments": {
+        "book_appointment": ["Book a {specialty} appointment for patient {patient_id} on {date}[ for {reason}]."],
+        "cancel_appointment": ["Cancel patient {patient_id}'s appointment on {date}."],
+        "reschedule_appointment": ["Move patient {patient_id}'s appointment to {date}."],
+        "get_upcoming_appointments": ["What appointments does patient {patient_id} have coming up?"],
+        "get_available_slots": ["What {specialty} slots are open on {date}?"],
+    },
+    "prescriptions": {
+        "get_prescriptions": ["What prescriptions does patient {patient_id} have?"],
+        "request_refill": ["Request a refill of {medication}[ {dosage}] for patient {patient_id}."],
+        "check_drug_interaction": ["Does {medication} interact with anything patient {patient_id} takes?"],
+        "get_medication_info": ["Tell me about {medication}[ {dosage}]."],
+    },
+    "lab_results": {
+        "get_lab_results": ["Show patient {patient_id}'s {test_type} results[ since {from_date}]."],
+        "get_latest_results": ["What are patient {patient_id}'s latest lab results?"],
+        "get_result_history": ["Show the {test_type} history of patient {patient_id} since {from_date}."],
+        "download_report": ["Download the {test_type} report for patient {patient_id}."],
+    },
+    # travel_booking
+    "flight_search": {
+        "search_flights": ["Find flights from {origin} to {destination} on {departure_date}"
+                           "[, returning {return_date}][ for {passengers} passengers]."],
+        "get_flight_details": ["What flights go from {origin} to {destination} on {departure_date}?"],
+        "filter_flights": ["Show {cabin} class flights from {origin} to {destination} on {departure_date}."],
+        "get_seat_map": ["Show me the {cabin} seats on flights from {origin} to {destination} on {departure_date}."],
+    },
+    "hotel_booking": {
+        "search_hotels": ["Find hotels in {location} from {check_in} to {check_out}[ for {guests} guests]."],
+        "get_hotel_details": ["Tell me about hotels in {location} rated at least {min_rating}."],
+        "book_hotel": ["Book a hotel in {location} from {check_in} to {check_out} for {guests} guests."],
+        "cancel_hotel": ["Cancel my hotel in {location} checking in {check_in}."],
+        "get_amenities": ["What amenities do hotels in {location} have?"],
+    },
+    "car_rental": {
+        "search_cars": ["Find a {car_type} car in {location} from {pickup_date} to {return_date}."],
+        "book_car": ["Book a {car_type} car in {location} from {pickup_date} to {return_date}."],
+        "cancel_rental": ["Cancel my car rental in {location} on {pickup_date}."],
+        "get_rental_details": ["Show my car rental in {location}."],
+        "extend_rental": ["Extend my car rental in {location} from {pickup_date} until {return_date}."],
+    },
+    # customer_support
+    "create_ticket": {
+        "create_ticket": ["Open a ticket for customer {customer_id}: \"{subject}\"[ ({priority} priority)]."],
+        "create_urgent_ticket": ["Open an urgent ticket for customer {customer_id} about \"{subject}\": "
+                                 "{description}{priority=\"urgent\"}"],
+        "attach_file": ["Attach a file to customer {customer_id}'s \"{subject}\" ticket."],
+        "link_order": ["Link an order to customer {customer_id}'s \"{subject}\" ticket[ in {category}]."],
+    },
+    "ticket_status": {
+        "get_ticket_status": ["What's the status of ticket {ticket_id}?"],
+        "list_open_tickets": ["List open tickets for customer {customer_id}."],
+        "add_reply": ["Reply to ticket {ticket_id}: \"{reply}\""],
+        "close_ticket": ["Close ticket {ticket_id}."],
+        "reopen_ticket": ["Reopen ticket {ticket_id}."],
+    },
+    "escalation": {
+        "escalate_ticket": ["Escalate ticket {ticket_id} to {target_team}[ because of {reason}]."],
+        "transfer_to_specialist": ["Hand ticket {ticket_id} to a specialist on the {target_team} team."],
+        "get_escalation_status": ["Has ticket {ticket_id} been escalated?"],
+        "set_sla": ["Set the SLA for ticket {ticket_id}[, reason: {reason}]."],
+    },
+    # git_api
+    "repository_ops": {
+        "create_repo": ["Create a private repo {repo} under {owner}[ described as \"{description}\"].{private=true}",
+                        "Create a public repo {owner}/{repo}.{private=false}"],
+        "delete_repo": ["Delete the repo {owner}/{repo}."],
+        "fork_repo": ["Fork {owner}/{repo}."],
+        "get_repo_info": ["Show info about {owner}/{repo}."],
+        "list_repos": ["List {owner}'s repositories."],
+    },
+    "commits_branches": {
+        "list_commits": ["Show recent commits on {branch} in {owner}/{repo}."],
+        "get_commit": ["Show commit {sha} in {owner}/{repo}."],
+        "create_branch": ["Create a branch {branch} in {owner}/{repo}."],
+        "delete_branch": ["Delete the {branch} branch of {owner}/{repo}."],
+        "list_branches": ["What branches does {owner}/{repo} have?"],
+        "compare_branches": ["Compare {branch} with main in {owner}/{repo}."],
+    },
+    "pull_requests": {
+        "create_pr": ["Open a PR in {owner}/{repo} from {head} into {base} titled \"{title}\"."],
+        "list_prs": ["List open PRs in {owner}/{repo}."],
+        "merge_pr": ["Merge PR #{pr_number} in {owner}/{repo}."],
+        "close_pr": ["Close PR #{pr_number} in {owner}/{repo}."],
+        "add_pr_review": ["Review PR #{pr_number} in {owner}/{repo}."],
+        "get_pr_diff": ["Show the diff of PR #{pr_number} in {owner}/{repo}."],
+    },
+    # docker_api
+    "container_lifecycle": {
+        "run_container": ["Run {image} as {name}[ on ports {ports}][ with {env}]."],
+        "stop_container": ["Stop container {container_id}."],
+        "start_container": ["Start container {container_id}."],
+        "remove_container": ["Remove container {container_id}."],
+        "list_containers": ["List my containers."],
+    },
+    "image_management": {
+        "pull_image": ["Pull {image}:{tag}[ from {registry}]."],
+        "push_image": ["Push {image}:{tag} to {registry}."],
+        "build_image": ["Build {image}:{tag} from {dockerfile}."],
+        "list_images": ["List my local images."],
+        "remove_image": ["Remove the image {image}:{tag}."],
+        "tag_image": ["Tag {image} as {tag}."],
+    },
+    "network_volumes": {
+        "create_network": ["Create a {driver} network called {name}."],
+        "list_networks": ["List my docker networks."],
+        "create_volume": ["Create a volume called {name}."],
+        "list_volumes": ["List my docker volumes."],
+        "mount_volume": ["Mount volume {name} at {mount_path} in container {container_id}."],
+    },
+    # payment_processing
+    "charge_refund": {
+        "charge_card": ["Charge customer {customer_id} {amount} {currency}[ for {description}]."],
+        "partial_refund": ["Refund {amount} {currency} to customer {customer_id}."],
+        "full_refund": ["Fully refund customer {customer_id}'s last payment."],
+        "capture_payment": ["Capture the {amount} {currency} payment from customer {customer_id}."],
+        "void_payment": ["Void the pending payment for customer {customer_id}."],
+    },
+    "subscription": {
+        "create_subscription": ["Subscribe customer {customer_id} to the {plan_id} plan[ with a {trial_days}-day trial]."],
+        "cancel_subscription": ["Cancel customer {customer_id}'s subscription."],
+        "pause_subscription": ["Pause customer {customer_id}'s subscription."],
+        "update_plan": ["Move customer {customer_id} to the {plan_id} plan."],
+        "get_subscription": ["What plan is customer {customer_id} on?"],
+    },
+    "transaction_lookup": {
+        "get_transaction": ["Look up transaction {transaction_id}."],
+        "list_transactions": ["List transactions for customer {customer_id} from {from_date} to {to_date}."],
+        "search_transactions": ["Find customer {customer_id}'s transactions between {from_date} and {to_date}."],
+        "get_balance": ["What's the balance for customer {customer_id}?"],
+    },
+    # inventory_management
+    "stock_levels": {
+        "get_stock_level": ["How many {sku} do we have[ at {location_id}]?"],
+        "check_availability": ["Is {sku} available at {location_id}?"],
+        "get_low_stock_items": ["Which items are below {threshold} units[ at {location_id}]?"],
+        "get_stock_by_location": ["Show stock levels of {sku} at {location_id}."],
+    },
+    "reorder": {
+        "create_purchase_order": ["Order {quantity} units of {sku} from supplier {supplier_id}"
+                                  "[ for delivery by {expected_delivery}]."],
+        "get_po_status": ["What's the status of the purchase order for {sku}?"],
+        "cancel_po": ["Cancel the purchase order for {sku} from supplier {supplier_id}."],
+        "get_reorder_suggestions": ["What should we reorder?", "How much {sku} should we reorder?"],
+    },
+    "warehouse_ops": {
+        "transfer_stock": ["Move {quantity} units of {sku} from {from_location} to {to_location}."],
+        "receive_shipment": ["Receive {quantity} units of {sku} at {to_location}."],
+        "adjust_inventory": ["Adjust {sku} by {quantity} units at {from_location} ({reason})."],
+        "get_receiving_log": ["Show the receiving log for {sku} at {to_location}."],
+    },
+    # analytics
+    "page_views": {
+        "get_page_views": ["How many views did {url} get from {from_date} to {to_date}?"],
+        "get_unique_visitors": ["How many unique visitors did {url} have from {from_date} to {to_date}"
+                                "[, {granularity}]?"],
+        "get_session_duration": ["What's the average session length on {url} from {from_date} to {to_date}?"],
+        "get_bounce_rate": ["What's the bounce rate of {url} between {from_date} and {to_date}?"],
+    },
+    "conversion_events": {
+        "get_conversion_rate": ["What's the {event_name} conversion rate from {from_date} to {to_date}?"],
+        "track_event": ["Track a {event_name} event."],
+        "get_funnel_data": ["Show the {funnel_id} funnel between {from_date} and {to_date}."],
+        "get_goal_completions": ["How many {event_name} goals were completed from {from_date} to {to_date}?"],
+    },
+    "custom_reports": {
+        "create_report": ["Create a report \"{name}\" with {metrics} by {dimensions} from {from_date} to {to_date}."],
+        "get_report": ["Open report {report_id}."],
+        "list_reports": ["List my reports."],
+        "schedule_report": ["Schedule report {report_id} to run weekly."],
+        "export_report": ["Export report {report_id}[ for {from_date} to {to_date}]."],
+    },
+}
+
+# ---------------------------------------------------------------------------
+# Invariants
+# ---------------------------------------------------------------------------
+
+# Response field -> the call argument it repeats, beyond fields of the same name
+ECHO = {
+    "permissions": {"new_mode": "mode"},
+    "thermostat": {"target_temp": "temperature"},
+    "door_locks": {"last_action_by": "user_id"},
+    "instance_status": {"id": "instance_id"},
+    "storage_volumes": {"attached_to": "instance_id"},
+    "settings": {"new_value": "value"},
+    "inventory": {"name": "item_name"},
+    "volume_settings": {"volume": "level", "equalizer_preset": "preset"},
+    "invites_reminders": {"email": "attendee_email"},
+    "read_inbox": {"id": "message_id"},
+    "transaction_lookup": {"id": "transaction_id"},
+    "employee_lookup": {"id": "employee_id"},
+    "conversion_events": {"event": "event_name"},
+    "currency_exchange": {"from": "from_currency", "to": "to_currency"},
+    "sharing_permissions": {"email": "user_email"},
+    "car_rental": {"pickup_location": "location"},
+    "escalation": {"escalated_to": "target_team"},
+    "image_management": {"repository": "image"},
+    "subscription": {"plan": "plan_id"},
+    "stock_levels": {"location": "location_id"},
+    "warehouse_ops": {"from": "from_location", "to": "to_location"},
+    "lab_results": {"test": "test_type"},
+}
+# (start, end, max days apart for dates, max minutes apart for timestamps)
+ORDERED_PAIRS = [
+    ("start", "end", 3, 240), ("from_date", "to_date", 60, 0), ("check_in", "check_out", 10, 0),
+    ("departure_date", "return_date", 21, 0), ("pickup_date", "return_date", 14, 0),
+    ("after", "before", 30, 0), ("from", "to", 7, 2880), ("departure", "arrival", 1, 900),
+    ("scheduled_date", "estimated_arrival", 3, 0),
+]
+ORDERED_NUMBERS = [("low", "high"), ("min", "avg", "max"), ("min_price", "max_price"),
+                   ("min_size", "desired", "max_size")]
+IDENTIFIERS = re.compile(r"(^|_)id$|^pid$|^sku$")  # a list answering for one of these has one item
+_ISO = re.compile(r"^(\d{4}-\d{2}-\d{2})(?:T(\d{2}:\d{2}):\d{2}Z)?$")
+
+
+def _shift(rng, start: str, days: int, minutes: int) -> str | None:
+    """A value shortly after start (same format), or None if start isn't a date."""
+    match = _ISO.match(start)
+    if not match:
+        return None
+    if match[2] is None:
+        end = datetime.date.fromisoformat(start) + datetime.timedelta(days=rng.randint(1, days))
+        return end.isoformat()
+    moment = datetime.datetime.fromisoformat(start.replace("Z", "+00:00"))
+    end = moment + datetime.timedelta(minutes=rng.randrange(15, minutes + 1, 15))
+    return end.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _within(start: str, end: str, days: int, minutes: int) -> bool:
+    """end is after start by at most days (dates) / minutes (timestamps); values
+    that aren't both dates or both timestamps only pass if start isn't one."""
+    a, b = _ISO.match(start), _ISO.match(end)
+    if not a or not b or (a[2] is None) != (b[2] is None):
+        return not a
+    if len(start) == 10:
+        gap = (datetime.date.fromisoformat(end) - datetime.date.fromisoformat(start)).days
+        return 0 < gap <= days
+    gap = (datetime.datetime.fromisoformat(end[:19]) - datetime.datetime.fromisoformat(start[:19])).total_seconds()
+    return 0 < gap <= minutes * 60
+
+
+def enforce(rng, value) -> None:
+    """Fix ordered pairs and counts in a call or response, in place, at any depth."""
+    if isinstance(value, list):
+        for item in value:
+            enforce(rng, item)
+        return
+    if not isinstance(value, dict):
+        return
+    for item in value.values():
+        enforce(rng, item)
+    for start, end, days, minutes in ORDERED_PAIRS:
+        a, b = value.get(start), value.get(end)
+        if isinstance(a, str) and isinstance(b, str) and not _within(a, b, days, minutes):
+            shifted = _shift(rng, a, days, minutes) if minutes or len(a) == 10 else None
+            if shifted is not None:
+                value[end] = shifted
+    for keys in ORDERED_NUMBERS:
+        present = [k for k in keys if isinstance(value.get(k), (int, float)) and not isinstance(value.get(k), bool)]
+        for key, number in zip(present, sorted(value[k] for k in present)):
+            value[key] = number
+    lists = [v for v in value.values() if isinstance(v, list)]
+    if len(lists) == 1:
+        if isinstance(value.get("count"), int):
+            value["count"] = len(lists[0])
+        for key in ("total", "total_count", "total_rows"):
+            if isinstance(value.get(key), int) and value[key] < len(lists[0]):
+                value[key] = len(lists[0]) + value[key]
+
+
+FINISH = {}  # subdomain -> fn(rng, call, response), last word on the response
+
+
+def finish(name: str):
+    def register(fn):
+        FINISH[name] = fn
+        return fn
+    return register
+
+
+@finish("forecast")
+def _forecast(rng, call, response):
+    first = datetime.date.fromisoformat(_date(rng))
+    days = min(call.get("days", 3), 7) if call["func_call"] != "get_forecast_hourly" else 1
+    fahrenheit = call.get("unit") == "fahrenheit"
+    base = rng.uniform(-5, 28)  # one season for the whole forecast, in celsius
+    response["forecast"] = []
+    for i in range(days):
+        low = base + rng.uniform(-3, 3)
+        high = low + rng.uniform(2, 10)
+        conditions = [c for c in POOLS["condition"] if (c == "snow") == (high < 2)] if high < 2 or low > 0 \
+            else POOLS["condition"]
+        if fahrenheit:
+            low, high = low * 9 / 5 + 32, high * 9 / 5 + 32
+        response["forecast"].append({"date": (first + datetime.timedelta(days=i)).isoformat(), "high": round(high, 1),
+                                     "low": round(low, 1), "condition": rng.choice(conditions)})
+
+
+@finish("multi_metric")
+def _multi_metric(rng, call, response):
+    wanted = call.get("metrics")
+    if wanted:
+        response["metrics"] = {k: v for k, v in response["metrics"].items() if k in wanted} or response["metrics"]
+
+
+@finish("alerts")
+def _alerts(rng, call, response):
+    if call["func_call"] == "get_air_quality_index":
+        response["alerts"] = response["alerts"][:1]
+
+
+@finish("instance_status")
+def _instance_status(rng, call, response):
+    if "filter" in call:
+        for instance in response["instances"]:
+            instance["state"] = call["filter"]
+
+
+@finish("scaling_operations")
+def _scaling(rng, call, response):
+    if "desired" in call:
+        response["current_capacity"] = call["desired"]
+
+
+@finish("storage_volumes")
+def _volumes(rng, call, response):
+    if call["func_call"] in ("detach_volume", "create_volume") and "instance_id" not in call:
+        response.pop("attached_to", None)
+    elif call["func_call"] == "detach_volume":
+        response["attached_to"] = None
+    if call["func_call"] == "create_volume":
+        response["state"] = "creating"
+
+
+@finish("settings")
+def _settings(rng, call, response):
+    if call["func_call"] == "get_current_settings":
+        response["new_value"] = response["previous_value"]
+
+
+@finish("payment")
+def _payment(rng, call, response):
+    if call["func_call"] != "process_cash":
+        response["change"] = 0.0
+
+
+@finish("contact_lookup")
+def _contact_lookup(rng, call, response):
+    field, query = call.get("field"), call.get("query")
+    for contact in response["contacts"]:
+        if field == "company":
+            contact["company"] = query
+        elif call["func_call"] == "search_contact" and query:
+            contact["name"] = query
+        contact["email"] = _email(rng, contact["name"])
+    if field == "id":
+        response["contacts"] = response["contacts"][:1]
+        response["contacts"][0]["id"] = query
+    response["total"] = max(response["total"], len(response["contacts"]))
+
+
+@finish("contact_management")
+def _contact_management(rng, call, response):
+    response["updated_fields"] = [k for k in call if k not in ("func_call", "contact_id")]
+
+
+@finish("deal_pipeline")
+def _deal(rng, call, response):
+    response["probability"] = {"prospecting": 10, "qualification": 25, "proposal": 50, "negotiation": 75,
+                               "closed_won": 100}.get(response.get("stage"), 50)
+
+
+@finish("availability")
+def _availability(rng, call, response):
+    day = call.get("date", _date(rng))
+    length = call.get("duration_minutes", 30)
+    slots = []
+    for hour in sorted(rng.sample(range(9, 17), rng.randint(1, 3))):
+        start = datetime.datetime.fromisoformat(f"{day}T{hour:02d}:00:00")
+        slots.append({"start": f"{start:%Y-%m-%dT%H:%M:%S}Z",
+                      "end": f"{start + datetime.timedelta(minutes=length):%Y-%m-%dT%H:%M:%S}Z"})
+    response["free_slots"] = slots
+    response["available"] = bool(slots)
+
+
+@finish("invites_reminders")
+def _invites(rng, call, response):
+    rsvp = {"accept_invite": "accepted", "decline_invite": "declined", "send_invite": "pending"}
+    if call["func_call"] in rsvp:
+        response["attendees"][0]["rsvp"] = rsvp[call["func_call"]]
+
+
+@finish("product_search")
+def _products(rng, call, response):
+    low, high = call.get("min_price", 5), call.get("max_price", 300)
+    for product in response["products"]:
+        product["price"] = round(rng.uniform(low, high), 2)
+
+
+def _items_total(response, items: str) -> None:
+    response["total"] = round(sum(item["quantity"] * item["price"] for item in response[items]), 2)
+
+
+@finish("cart_checkout")
+def _cart(rng, call, response):
+    _items_total(response, "items")
+
+
+@finish("order_tracking")
+def _order_tracking(rng, call, response):
+    events = sorted(response["tracking_events"], key=lambda e: e["date"])
+    response["tracking_events"] = events
+    latest = events[-1]["date"]
+    response["estimated_delivery"] = _shift(rng, latest, 5, 0)
+
+
+@finish("aggregate")
+def _aggregate(rng, call, response):
+    if "group_by" not in call:
+        response["groups"] = []
+
+
+@finish("playback_control")
+def _playback(rng, call, response):
+    if call["func_call"] == "stop":
+        response["position_seconds"] = 0
+
+
+@finish("search_browse")
+def _search_browse(rng, call, response):
+    if call["func_call"] == "search_artist":
+        for result in response["results"]:
+            result["artist"] = call.get("query", result["artist"])
+    if call["func_call"] == "search_tracks" and "query" in call:
+        response["results"][0]["title"] = call["query"]
+    response["results"] = response["results"][:call.get("limit", 3)]
+
+
+@finish("playlist_management")
+def _playlists(rng, call, response):
+    if call["func_call"] == "create_playlist":
+        response["track_count"] = response["duration_seconds"] = 0
+
+
+@finish("send_compose")
+def _send_compose(rng, call, response):
+    response["status"] = "draft" if call["func_call"] == "compose_draft" else "sent"
+
+
+@finish("read_inbox")
+def _read_inbox(rng, call, response):
+    read = {"mark_as_read": True, "mark_as_unread": False}.get(call["func_call"])
+    if read is not None:
+        response["messages"][0]["read"] = read
+    if call["func_call"] == "get_unread_count":
+        response["messages"] = [m for m in response["messages"] if not m["read"]]
+        response["total"] = len(response["messages"])
+
+
+@finish("search_filter")
+def _search_filter(rng, call, response):
+    for message in response["messages"]:
+        if "after" in call:
+            message["date"] = _shift(rng, call["after"], 1, 0) if "before" not in call else call["after"]
+        if "query" in call and call["query"] not in message["subject"].lower():
+            message["subject"] = f"{message['subject']} ({call['query']})"
+
+
+@finish("account_balance")
+def _balance(rng, call, response):
+    if response.get("available", 0) > response.get("balance", 0):
+        response["available"] = response["balance"]
+
+
+@finish("transfers")
+def _transfers(rng, call, response):
+    if "scheduled_date" not in call:
+        response.pop("estimated_arrival", None)
+
+
+@finish("transaction_history")
+def _transaction_history(rng, call, response):
+    if "from_date" in call:
+        for transaction in response["transactions"]:
+            transaction["date"] = call["from_date"]
+    response["transactions"] = response["transactions"][:call.get("limit", 3)]
+
+
+@finish("currency_exchange")
+def _exchange(rng, call, response):
+    source, target = response.get("from", "USD"), response.get("to", "EUR")
+    if source == target:
+        target = response["to"] = next(c for c in CURRENCIES if c != source)
+    response["rate"] = round(USD_RATES[target] / USD_RATES[source], 4)
+    amount = call.get("amount", 100)
+    response["converted_amount"] = round(amount * response["rate"], 2)
+
+
+@finish("restaurant_search")
+def _restaurants(rng, call, response):
+    for restaurant in response["restaurants"]:
+        if "min_rating" in call:
+            restaurant["rating"] = round(rng.uniform(call["min_rating"], 5.0), 1)
+        if "max_delivery_time" in call:
+            restaurant["delivery_time_min"] = rng.randint(10, call["max_delivery_time"])
+
+
+@finish("place_order")
+def _place_order(rng, call, response):
+    for item in response["items"]:
+        item["price"] = round(rng.uniform(6, 24), 2)
+    _items_total(response, "items")
+
+
+@finish("sensor_readings")
+def _sensor_readings(rng, call, response):
+    kind = call.get("type") or response["type"]
+    response["type"] = kind
+    response["unit"], low, high = {"temperature": ("celsius", 15, 30), "humidity": ("percent", 20, 80),
+                                   "co2": ("ppm", 400, 1800), "light": ("lux", 0, 1000),
+                                   "motion": ("events", 0, 20)}.get(kind, ("celsius", 15, 30))
+    response["value"] = round(rng.uniform(low, high), 1)
+
+
+@finish("historical_data")
+def _history(rng, call, response):
+    readings = sorted(response["readings"], key=lambda r: r["timestamp"])
+    if "from" in call:
+        start = datetime.datetime.fromisoformat(call["from"][:19])
+        for i, reading in enumerate(readings):
+            reading["timestamp"] = f"{start + datetime.timedelta(minutes=15 * i):%Y-%m-%dT%H:%M:%S}Z"
+    response["readings"] = readings
+    values = [r["value"] for r in readings]
+    response["min"], response["max"] = min(values), max(values)
+    response["avg"] = round(sum(values) / len(values), 1)
+
+
+@finish("upload_download")
+def _upload(rng, call, response):
+    name = call.get("file_name", "file")
+    response["url"] = f"https://files.{rng.choice(DOMAINS)}{response.get('path', '')}/{name}"
+
+
+@finish("lab_results")
+def _lab(rng, call, response):
+    for result in response["results"]:
+        test = result["test"] if result["test"] in LAB_TESTS else rng.choice(list(LAB_TESTS))
+        unit, low, high = LAB_TESTS[test]
+        value = round(rng.uniform(low * 0.8, high * 1.2), 1)
+        result.update(test=test, value=value, unit=unit, reference_range=f"{low}-{high} {unit}",
+                      status="low" if value < low else "high" if value > high else "normal")
+
+
+@finish("flight_search")
+def _flights(rng, call, response):
+    day = call.get("departure_date", _date(rng))
+    for flight in response["flights"]:
+        flight["flight_number"] = AIRLINE_CODES[flight["airline"]] + flight["flight_number"][2:]
+        depart = datetime.datetime.fromisoformat(f"{day}T{rng.randint(6, 21):02d}:{rng.choice([0, 15, 30, 45]):02d}")
+        arrive = depart + datetime.timedelta(minutes=flight["duration_minutes"])
+        flight["departure"], flight["arrival"] = f"{depart:%Y-%m-%dT%H:%M:%S}Z", f"{arrive:%Y-%m-%dT%H:%M:%S}Z"
+
+
+@finish("hotel_booking")
+def _hotels(rng, call, response):
+    if "min_rating" in call:
+        for hotel in response["hotels"]:
+            hotel["rating"] = round(rng.uniform(call["min_rating"], 5.0), 1)
+
+
+@finish("car_rental")
+def _car(rng, call, response):
+    if "pickup_date" in call and "return_date" in call:
+        days = (datetime.date.fromisoformat(call["return_date"]) - datetime.date.fromisoformat(call["pickup_date"])).days
+        response["total_cost"] = round(response["daily_rate"] * max(days, 1), 2)
+
+
+@finish("leave_management")
+def _leave(rng, call, response):
+    if "from_date" in call and "to_date" in call:
+        response["days_requested"] = (datetime.date.fromisoformat(call["to_date"])
+                                      - datetime.date.fromisoformat(call["from_date"])).days + 1
+
+
+@finish("payroll")
+def _payroll(rng, call, response):
+    response["net"] = round(response["gross"] - response["deductions"], 2)
+
+
+@finish("routing")
+def _routing(rng, call, response):
+    speed = {"walking": 5, "cycling": 15, "transit": 25, "driving": 40}[call.get("mode", "driving")]
+    steps = response["steps"]
+    response["distance_km"] = round(sum(step["distance_km"] for step in steps), 1)
+    response["duration_minutes"] = max(1, round(response["distance_km"] / speed * 60))
+
+
+@finish("places_search")
+def _places(rng, call, response):
+    city = call.get("location")
+    for place in response["places"]:
+        if city:
+            place["address"] = f"{rng.randint(1, 999)} {rng.choice(STREETS)}, {city}"
+        if call["func_call"] in ("get_place_details", "get_place_reviews") and "query" in call:
+            place["name"] = call["query"].removeprefix("the ")
+    if call["func_call"] in ("get_place_details", "get_place_reviews"):
+        response["places"] = response["places"][:1]
+
+
+@finish("geocoding")
+def _geocoding(rng, call, response):
+    city = next((c for c in CITIES if c in call.get("address", "")), None)
+    if city is None:
+        city = min(CITIES, key=lambda c: (CITY_INFO[c][2] - call.get("lat", 0)) ** 2
+                   + (CITY_INFO[c][3] - call.get("lng", 0)) ** 2)
+    country, timezone, lat, lng = CITY_INFO[city]
+    response.update(lat=call.get("lat", lat), lng=call.get("lng", lng), country=country, timezone=timezone,
+                    formatted_address=call.get("address") or f"{rng.randint(1, 999)} {rng.choice(STREETS)}, {city}")
+    response["formatted_address"] += f", {country}"
+
+
+@finish("post_creation")
+def _posts(rng, call, response):
+    response["url"] = f"https://social.example.com/posts/{response['post_id']}"
+
+
+@finish("search_discover")
+def _discover(rng, call, response):
+    kind = "user" if call["func_call"] == "search_users" else "post"
+    for result in response["results"]:
+        result["type"] = kind
+
+
+@finish("employee_lookup")
+def _employees(rng, call, response):
+    for employee in response["employees"]:
+        if "query" in call:
+            employee["name"] = call["query"]
+        employee["email"] = _email(rng, employee["name"])
+
+
+@finish("ticket_status")
+def _tickets(rng, call, response):
+    replies = sorted(response["replies"], key=lambda r: r["timestamp"])
+    if "reply" in call:
+        replies[-1]["message"] = call["reply"]
+    response["replies"] = replies
+
+
+@finish("repository_ops")
+def _repo(rng, call, response):
+    response["url"] = f"https://github.com/{response.get('owner', 'acme')}/{response.get('repo', 'repo')}"
+    if call["func_call"] == "create_repo":
+        response["stars"] = response["forks"] = 0
+
+
+@finish("pull_requests")
+def _pulls(rng, call, response):
+    if call["func_call"] in ("merge_pr", "close_pr") or "head" not in call:
+        return
+    if call["head"] == call.get("base"):
+        call["head"] = "develop"
+
+
+@finish("network_volumes")
+def _networks(rng, call, response):
+    if "container_id" in call:
+        response["containers"] = [call["container_id"]]
+
+
+@finish("subscription")
+def _subscription(rng, call, response):
+    if call.get("trial_days"):
+        response["status"] = "trialing"
+
+
+@finish("transaction_lookup")
+def _transaction_lookup(rng, call, response):
+    if "from_date" in call and "to_date" in call:
+        first = datetime.date.fromisoformat(call["from_date"])
+        days = (datetime.date.fromisoformat(call["to_date"]) - first).days
+        for transaction in response["transactions"]:
+            day = first + datetime.timedelta(days=rng.randint(0, days))
+            transaction["created"] = f"{day}T{rng.randint(8, 20):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}Z"
+        response["transactions"].sort(key=lambda t: t["created"])
+
+
+@finish("stock_levels")
+def _stock(rng, call, response):
+    quantity, threshold = response["quantity"], call.get("threshold", 10)
+    response["status"] = "out_of_stock" if quantity == 0 else "low_stock" if quantity < threshold else "in_stock"
+
+
+@finish("reorder")
+def _reorder(rng, call, response):
+    response["supplier"] = rng.choice(POOLS["supplier"])
+
+
+@finish("warehouse_ops")
+def _warehouse(rng, call, response):
+    if response.get("from") == response.get("to"):
+        response["to"] = next(loc for loc in POOLS["to_location"] if loc != response["from"])
+        if "to_location" in call:
+            call["to_location"] = response["to"]
+
+
+@finish("page_views")
+def _page_views(rng, call, response):
+    response["unique_visitors"] = round(response["views"] * rng.uniform(0.4, 0.9))
+    response["period"] = f"{call.get('from_date', '')}/{call.get('to_date', '')}".strip("/") or "2024-Q1"
+
+
+@finish("conversion_events")
+def _conversions(rng, call, response):
+    response["unique_users"] = round(response["total_events"] * rng.uniform(0.3, 0.9))
+    counts = sorted((step["completions"] for step in response["funnel_steps"]), reverse=True)
+    for step, count in zip(response["funnel_steps"], counts):
+        step["completions"] = count
+
+
+# ---------------------------------------------------------------------------
+# Fillers
+# ---------------------------------------------------------------------------
+
+def _leaf(sub: str, key: str, node: str, parent: str = ""):
+    """Generator for one schema leaf: (rng, call) -> value. parent is the key of
+    the object (or list of objects) holding it."""
+    names = [f"{sub}.{parent}.{key}", f"{sub}.{key}", f"{parent}.{key}"] if parent else [f"{sub}.{key}"]
+    pool = next((POOLS[name] for name in names if name in POOLS), None)
+    if pool is None and node not in TYPES:
+        options = node.split("|")
+        return lambda rng, call: rng.choice(options)
+    pool = pool if pool is not None else POOLS.get(key)
+    if pool is not None:
+        return pool if callable(pool) else (lambda rng, call: rng.choice(pool))
+    if key == "id" and node == "string":
+        gen = _ident(parent or sub)  # a products item's id looks like PRO-48213
+        return lambda rng, call: gen(rng)
+    if node == "boolean":
+        return lambda rng, call: rng.random() < 0.5
+    if node in ("number", "integer"):
+        for pattern, gen in _NUMBER_RULES:
+            if pattern.search(key):
+                return lambda rng, call: gen(rng)
+        return lambda rng, call: rng.randint(0, 500)
+    for pattern, factory in _STRING_RULES:
+        if pattern.search(key):
+            gen = factory(key)
+            return lambda rng, call: gen(rng)
+    return lambda rng, call: rng.choice(WORDS)
+
+
+def compile_filler(node, sub: str, key: str = "", echo: dict | None = None, parent: str = ""):
+    """Filler for a parsed schema node: (rng, call) -> value. With echo (response
+    field -> call argument) a field repeats the call's argument where it has one."""
+    if isinstance(node, dict):
+        fields = [(k, compile_filler(v, sub, k, echo, key)) for k, v in node.items()]
+        return lambda rng, call: {k: fill(rng, call) for k, fill in fields}
+    if isinstance(node, list):
+        if not node:
+            return lambda rng, call: []
+        item = compile_filler(node[0], sub, key, echo, parent)
+        single = echo is not None and isinstance(node[0], dict) and [
+            echo.get(k, k) for k in node[0] if IDENTIFIERS.search(echo.get(k, k))]
+
+        def fill_list(rng, call):
+            items = [item(rng, call) for _ in range(rng.randint(1, 3))]
+            if single and any(k in call for k in single):
+                return items[:1]
+            if items and not isinstance(items[0], (dict, list)):
+                items = list(dict.fromkeys(items))
+            elif echo is not None:  # echoed fields can make items identical
+                items = list({json.dumps(i, sort_keys=True): i for i in items}.values())
+            return items
+        return fill_list
+    gen = _leaf(sub, key, node, parent)
+    if echo is None:
+        return gen
+    source = echo.get(key, key)
+    fits = TYPES[node] if node in TYPES else frozenset(node.split("|")).__contains__
+
+    def fill(rng, call):
+        value = call.get(source)
+        return value if value is not None and fits(value) else gen(rng, call)
+    return fill
+
+
+# {field} or {field=json value} (a or an before it agrees with the value), and [optional parts]
+_PLACEHOLDER = re.compile(r"(?P<article>\b[Aa]n? )?\{(?P<field>\w+)(?:=(?P<fixed>[^}]*))?\}")
+_QUOTED_END = re.compile(r'([.?!])"[.?]$')
+_OPTIONAL = re.compile(r"(?<!=)\[([^\]]*)\]")
+
+
+def _say(value) -> str:
+    """A call value as the question spells it."""
+    if isinstance(value, list):
+        words = [_say(v) for v in value]
+        return " and ".join(words) if len(words) < 3 else ", ".join(words[:-1]) + " and " + words[-1]
+    if isinstance(value, str):
+        match = _ISO.match(value)
+        if match and match[2]:
+            return f"{match[1]} at {match[2]}"
+    return str(value)
+
+
+def _fill_in(match: re.Match, call: dict) -> str:
+    """What a template placeholder reads as: the call's value, with the article before it fixed."""
+    if match["fixed"] is not None:
+        return match["article"] or ""
+    value = _say(call[match["field"]])
+    if match["article"] is None:
+        return value
+    word = article(value)
+    return f"{word.capitalize() if match['article'][0] == 'A' else word} {value}"
+
+
+class Subdomain:
+    """Compiled templates, call and response fillers of one TOOL_DOMAINS entry."""
+
+    def __init__(self, domain: str, name: str, info: dict):
+        self.domain = domain
+        self.name = name
+        self.tools = [t.strip() for t in info["tools"].split("|")]
+        templates = QUESTIONS.get(name, {})
+        missing = [tool for tool in self.tools if not templates.get(tool)]
+        if missing:
+            raise KeyError(f"no synth_tool_use question for {name}: {', '.join(missing)}")
+        self.templates = templates
+        call = parse_schema(info["call_schema"])
+        self.call_fields = [(k, compile_filler(sub, name, k)) for k, sub in call.items() if k != "func_call"]
+        self.response = compile_filler(parse_schema(info["response_schema"]), name, echo=ECHO.get(name, {}))
+        self.finish = FINISH.get(name)
+
+    def example(self, rng: random.Random) -> tuple[str, str, str]:
+        tool = rng.choice(self.tools)
+        template = rng.choice(self.templates[tool])
+        template = _OPTIONAL.sub(lambda m: m[1] if rng.random() < OPTIONAL_PART_P else "", template)
+        fixed = {m["field"]: None if m["fixed"] is None else json.loads(m["fixed"])
+                 for m in _PLACEHOLDER.finditer(template)}
+        call = {"func_call": tool}
+        for key, fill in self.call_fields:
+            if key in fixed:
+                call[key] = fill(rng, call) if fixed[key] is None else fixed[key]
+        enforce(rng, call)
+        response = self.response(rng, call)
+        enforce(rng, response)
+        if self.finish:
+            self.finish(rng, call, response)
+        question = _PLACEHOLDER.sub(lambda m: _fill_in(m, call), template)
+        question = _QUOTED_END.sub(r'\1"', question)  # 'Post "Done!".' -> 'Post "Done!"'
+        return question, json.dumps(call, ensure_ascii=False), json.dumps(response, ensure_ascii=False)
+
+    def render(self, rng: random.Random) -> str:
+        question, call, response = self.example(rng)
+        return f"Question: {question}\nCall: {call}\nResponse: {response}"
+
+
+def subdomains(domains: list[str] | None = None) -> list[Subdomain]:
+    return [Subdomain(d, s, info) for d, subs in TOOL_DOMAINS.items() if domains is None or d in domains
+            for s, info in subs.items()]
+
+
+# ---------------------------------------------------------------------------
+# Generation
+# ---------------------------------------------------------------------------
+
+def makers(domains: list[str] | None = None) -> list:
+    """One fn(rng) -> rendered example per subdomain, for synth.generate."""
+    return [sub.render for sub in subdomains(domains)]
+
+
+def generate(count: int, seed: int = 0, workers: int = 1, domains: list[str] | None = None):
+    """Yield count rendered examples (without trailing blank line)."""
+    return synth.generate("tool_use", makers, count, seed, workers, domains)
+
+
+def documents(count: int, seed: int = 0, workers: int = 1) -> list[str]:
+    """Examples grouped EXAMPLES_PER_DOC at a time into .corpus-style documents."""
+    return synth.documents(generate(count, seed, workers))
+
+
+def main():
+    synth.main(generate, "Generate synthetic tool_use examples from the schemas",
+               "--domains", sorted(TOOL_DOMAINS), "Only these domains")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Check generated tool_use examples against their subdomain's call/response schemas.
+
+Every subdomain in scaffold.py declares pseudo-JSON schemas such as
+
+    { "func_call": "string", "location": "string", "unit": "celsius|fahrenheit" }
+    { "matches": [{ "file": "string", "line": number }], "count": number }
+
+Each schema string is compiled once (per process) into a validator: "string",
+number and boolean check the JSON type, "a|b|c" is an enum, [T] a list of T
+and nested objects recurse. Keys not in the schema are errors; keys left out
+are allowed (optional parameters) unless --strict. func_call must also be one
+of the subdomain's listed tools.
+
+Every tool_use/**/*.corpus file is split into Question/Call/Response examples
+in a process pool. Files whose pass rate falls below --min-pass go to
+quarantine.txt (repo-relative paths), which assemble.py skips.
+
+Usage:
+    python validate.py                  # validate all of corpus/tool_use
+    python validate.py --min-pass 1.0   # quarantine any file with a bad example
+    python validate.py --strict -v      # require every schema key, print errors
+
+Writes validation_report.json (per-file pass rate + first errors) and quarantine.txt.
+"""
+
+import argparse
+import functools
+import json
+import os
+import re
+import time
+from multiprocessing import Pool
+
+from scaffold import TOOL_DOMAINS
+
+LEVEL_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(LEVEL_DIR)
+TOOL_USE_DIR = os.path.join(LEVEL_DIR, "corpus", "tool_use")
+REPORT_FILE = os.path.join(LEVEL_DIR, "validation_report.json")
+QUARANTINE_FILE = os.path.join(LEVEL_DIR, "quarantine.txt")
+
+LABELS = ("Question", "Call", "Response")
+MAX_ERRORS = 5  # per file in the report
+
+TYPES = {
+    "string": lambda v: isinstance(v, str),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+}
+
+# A JSON string literal, or a bare type name (number, boolean) to quote
+_BARE_TYPE = re.compile(r'"(?:[^"\\]|\\.)*"|\b(number|boolean|integer)\b')
+
+
+# ---------------------------------------------------------------------------
+# Schema compilation
+# ---------------------------------------------------------------------------
+
+def parse_schema(schema: str):
+    """Pseudo-schema string -> nested dicts/lists with type-name strings as leaves."""
+    quoted = _BARE_TYPE.sub(lambda m: m.group(0) if m.group(1) is None else f'"{m.group(1)}"', schema)
+    return json.loads(quoted)
+
+
+def _compile(node, strict: bool):
+    """Validator for one schema node: value, path -> list of error strings."""
+    if isinstance(node, dict):
+        fields = {key: _compile(sub, strict) for key, sub in node.items()}
+
+        def check_object(value, path):
+            if not isinstance(value, dict):
+                return [f"{path}: expected object, got {type(value).__name__}"]
+            errors = [f"{path}.{key}: not in schema" for key in value if key not in fields]
+            for key, check in fields.items():
+                if key in value:
+                    if value[key] is not None:
+                        errors += check(value[key], f"{path}.{key}")
+                elif strict:
+                    errors.append(f"{path}.{key}: missing")
+            return errors
+        return check_object
+
+    if isinstance(node, list):
+        item = _compile(node[0], strict) if node else (lambda value, path: [])
+
+        def check_list(value, path):
+            if not isinstance(value, list):
+                return [f"{path}: expected list, got {type(value).__name__}"]
+            return [e for i, v in enumerate(value) for e in item(v, f"{path}[{i}]")]
+        return check_list
+
+    if node in TYPES:
+        is_type = TYPES[node]
+        return lambda value, path: [] if is_type(value) else [
+            f"{path}: expected {node}, got {json.dumps(value)[:40]}"]
+
+    allowed = frozenset(node.split("|"))
+    return lambda value, path: [] if value in allowed else [
+        f"{path}: {json.dumps(value)[:40]} not one of {node}"]
+
+
+@functools.lru_cache(maxsize=None)
+def compile_schema(schema: str, strict: bool = False):
+    return _compile(parse_schema(schema), strict)
+
+
+# ---------------------------------------------------------------------------
+# Corpus parsing and validation
+# ---------------------------------------------------------------------------
+
+def parse_examples(text: str, labels: tuple[str, ...] = LABELS) -> list[dict[str, str]]:
+    """Split a .corpus file into {label: raw text} examples. labels[0] (or a
+    repeated label) starts a new example; a label's value runs until the next
+    label or blank line, so multi-line JSON is kept together."""
+    pattern = re.compile(rf"^({'|'.join(labels)}):\s?(.*)$")
+    examples: list[dict[str, str]] = []
+    current: dict[str, str] | None = None
+    label = None
+    for line in text.splitlines():
+        match = pattern.match(line.strip())
+        if match:
+            label, value = match.groups()
+            if label == labels[0] or current is None or label in current:
+                current = {}
+                examples.append(current)
+            current[label] = value
+        elif not line.strip():
+            label = None
+        elif label is not None:
+            current[label] += "\n" + line
+    return examples
+
+
+def validate_example(example: dict[str, str], tools: frozenset[str], call_check, response_check) -> list[str]:
+    errors = [f"missing {label}" for label in LABELS if label not in example]
+    for label, check in (("Call", call_check), ("Response", response_check)):
+        if label not in example:
+            continue
+        try:
+            value = json.loads(example[label])
+        except json.JSONDecodeError as e:
+            errors.append(f"{label}: invalid JSON ({e.msg})")
+            continue
+        errors += check(value, label)
+        if label == "Call" and isinstance(value, dict) and value.get("func_call") not in tools:
+            errors.append(f"Call.func_call: {json.dumps(value.get('func_call'))[:40]} is not a listed tool")
+    return errors
+
+
+def validate_file(job: tuple[str, str, str, str, bool]) -> dict:
+    path, tools, call_schema, response_schema, strict = job
+    call_check = compile_schema(call_schema, strict)
+    response_check = compile_schema(response_schema, strict)
+    tool_names = frozenset(t.strip() for t in tools.split("|"))
+    with open(path, encoding="utf-8") as f:
+        examples = parse_examples(f.read())
+
+    valid = 0
+    errors = []
+    for n, example in enumerate(examples, 1):
+        problems = validate_example(example, tool_names, call_check, response_check)
+        if problems:
+            errors += [f"example {n}: {p}" for p in problems]
+        else:
+            valid += 1
+    return {
+        "path": os.path.relpath(path, REPO_DIR),
+        "examples": len(examples),
+        "valid": valid,
+        "pass_rate": valid / len(examples) if examples else 0.0,
+        "errors": errors[:MAX_ERRORS],
+    }
+
+
+def find_jobs(strict: bool) -> list[tuple[str, str, str, str, bool]]:
+    """(path, tools, call_schema, response_schema, strict) for every generated file."""
+    jobs = []
+    for domain, subdomains in TOOL_DOMAINS.items():
+        for subdomain, info in subdomains.items():
+            dirpath = os.path.join(TOOL_USE_DIR, domain, subdomain)
+            if not os.path.isdir(dirpath):
+                continue
+            for fname in sorted(os.listdir(dirpath)):
+                if fname.endswith(".corpus"):
+                    jobs.append((os.path.join(dirpath, fname), info["tools"],
+                                 info["call_schema"], info["response_schema"], strict))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate tool_use examples against their schemas")
+    parser.add_argument(
+        "--min-pass", type=float, default=0.8,
+        help="Quarantine files whose share of valid examples is below this (default: 0.8)",
+    )
+    parser.add_argument("--strict", action="store_true", help="Require every schema key to be present")
+    parser.add_argument(
+        "-p", "--workers", type=int, default=os.cpu_count() or 1,
+        help="Worker processes (default: all cores)",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print the errors of quarantined files")
+    args = parser.parse_args()
+
+    start = time.time()
+    jobs = find_jobs(args.strict)
+    if not jobs:
+        print("No tool_use .corpus files found — run generate.py first.")
+        return
+
+    with Pool(args.workers) as pool:
+        results = sorted(pool.imap_unordered(validate_file, jobs, chunksize=8), key=lambda r: r["path"])
+
+    quarantined = [r for r in results if r["pass_rate"] < args.min_pass]
+    with open(REPORT_FILE, "w") as f:
+        json.dump({"min_pass": args.min_pass, "strict": args.strict, "files": results}, f, indent=1)
+    with open(QUARANTINE_FILE, "w") as f:
+        f.write(f"# tool_use files below {args.min_pass:.0%} schema pass rate (validate.py)\n")
+        f.writelines(r["path"] + "\n" for r in quarantined)
+
+    examples = sum(r["examples"] for r in results)
+    valid = sum(r["valid"] for r in results)
+    print(f"{len(results)} files, {examples} examples, {valid} valid "
+          f"({valid / examples if examples else 0:.1%}) in {time.time() - start:.1f}s")
+    print(f"{len(quarantined)} files quarantined -> {os.path.relpath(QUARANTINE_FILE, REPO_DIR)}")
+    for r in quarantined:
+        print(f"  {r['pass_rate']:6.1%}  {r['path']}")
+        if args.verbose:
+            for error in r["errors"]:
+                print(f"            {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Check that json_qa answers are copied verbatim from their contexts.
+
+The JSON_QA prompts in scaffold.py ask for "Answers must be copied verbatim
+from the context". This parses every json_qa/**/*.corpus file into
+Context/Input/Output examples and checks that each Output value (the single
+"answer", or every value of a multi-field extraction, list items included)
+occurs in that example's Context.
+
+Examples are checked in batches: the batch's distinct answer values are
+compiled into one Aho-Corasick automaton and all of its contexts are scanned
+in a single pass, so the cost grows with the text size rather than with
+examples x answers. Batches are spread over worker processes.
+
+Usage:
+    python verify_qa.py                 # check all of corpus/json_qa
+    python verify_qa.py --ignore-case   # case-insensitive matching
+    python verify_qa.py --all           # also check the angles that ask for inferred answers
+
+Writes verbatim_report.json (violation rates per category and file) and two
+JSONL record streams: json_qa_verified.jsonl (passing examples) and
+json_qa_violations.jsonl (failing ones, with the missing values).
+"""
+
+import argparse
+import bisect
+import json
+import os
+import time
+from collections import deque
+from multiprocessing import Pool
+
+from validate import parse_examples
+
+LEVEL_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(LEVEL_DIR)
+JSON_QA_DIR = os.path.join(LEVEL_DIR, "corpus", "json_qa")
+REPORT_FILE = os.path.join(LEVEL_DIR, "verbatim_report.json")
+VERIFIED_FILE = os.path.join(LEVEL_DIR, "json_qa_verified.jsonl")
+VIOLATIONS_FILE = os.path.join(LEVEL_DIR, "json_qa_violations.jsonl")
+
+LABELS = ("Context", "Input", "Output")
+BATCH_EXAMPLES = 2048
+
+# Angles whose prompts ask for inferred or computed answers, not copied ones
+NOT_VERBATIM = {
+    "reading_comprehension/inference/simple_inference.corpus",
+    "reading_comprehension/comparison/by_how_much.corpus",
+}
+
+_SEPARATOR = "\x00"  # between contexts, so no match spans two examples
+
+
+class AhoCorasick:
+    """Multi-pattern string matcher: one pass over a text finds every
+    occurrence of every pattern."""
+
+    def __init__(self, patterns: list[str]):
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail = [0]
+        self.out: list[list[int]] = [[]]
+        for pid, pattern in enumerate(patterns):
+            node = 0
+            for ch in pattern:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = self.goto[node][ch] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                node = nxt
+            self.out[node].append(pid)
+
+        # Breadth-first: a node's failure link points at its longest proper
+        # suffix in the trie, and it inherits that node's outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                if node:
+                    f = self.fail[node]
+                    while f and ch not in self.goto[f]:
+                        f = self.fail[f]
+                    self.fail[child] = self.goto[f].get(ch, 0)
+                self.out[child] += self.out[self.fail[child]]
+
+    def finditer(self, text: str):
+        """Yield (end index, pattern id) for every match."""
+        goto, fail, out = self.goto, self.fail, self.out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pid in out[node]:
+                yield i, pid
+
+
+def answer_values(output) -> list[str]:
+    """Strings and numbers in an Output object, list items included."""
+    if isinstance(output, dict):
+        return [v for value in output.values() for v in answer_values(value)]
+    if isinstance(output, list):
+        return [v for value in output for v in answer_values(value)]
+    if isinstance(output, bool) or output is None:
+        return []  # e.g. in_stock: true can't be quoted from the text
+    if isinstance(output, float) and output.is_integer():
+        return [str(int(output))]  # 1200.0 is quoted as "1200"
+    if isinstance(output, (int, float)):
+        return [str(output)]
+    return [output] if output.strip() else []
+
+
+def check_batch(job: tuple[list[dict], bool]) -> list[dict]:
+    """Fill in "missing" (values not found verbatim) for a batch of example records."""
+    records, ignore_case = job
+    fold = str.lower if ignore_case else str
+    pattern_ids: dict[str, int] = {}
+    needed: list[set[int]] = []
+    contexts = []
+    for record in records:
+        wanted = set()
+        for value in record.pop("values"):
+            wanted.add(pattern_ids.setdefault(fold(value), len(pattern_ids)))
+        needed.append(wanted)
+        contexts.append(fold(record["context"]))
+
+    starts = []
+    pos = 0
+    for context in contexts:
+        starts.append(pos)
+        pos += len(context) + 1
+    patterns = list(pattern_ids)
+    for end, pid in AhoCorasick(patterns).finditer(_SEPARATOR.join(contexts)):
+        needed[bisect.bisect_right(starts, end) - 1].discard(pid)
+
+    for record, missing in zip(records, needed):
+        record["missing"] = record.get("missing", []) + sorted(patterns[pid] for pid in missing)
+    return records
+
+
+def load_records(include_all: bool) -> list[dict]:
+    """One record per json_qa example; malformed ones already carry "missing"."""
+    records = []
+    for root, _dirs, files in os.walk(JSON_QA_DIR):
+        for fname in sorted(files):
+            if not fname.endswith(".corpus"):
+                continue
+            path = os.path.join(root, fname)
+            rel = os.path.relpath(path, JSON_QA_DIR)
+            if rel in NOT_VERBATIM and not include_all:
+                continue
+            with open(path, encoding="utf-8") as f:
+                examples = parse_examples(f.read(), LABELS)
+            for example in examples:
+                record = {
+                    "path": os.path.relpath(path, REPO_DIR),
+                    "category": os.path.dirname(rel),
+                    "context": example.get("Context", ""),
+                    "input": example.get("Input", ""),
+                    "output": example.get("Output", ""),
+                    "values": [],
+                }
+                problems = [f"<no {label}>" for label in LABELS if label not in example]
+                try:
+                    record["values"] = answer_values(json.loads(record["output"]))
+                except json.JSONDecodeError:
+                    problems.append("<invalid Output JSON>")
+                if problems:
+                    record["missing"] = problems
+                records.append(record)
+    return records
+
+
+def summarize(records: list[dict], key: str) -> dict[str, dict]:
+    summary: dict[str, dict] = {}
+    for record in records:
+        entry = summary.setdefault(record[key], {"examples": 0, "violations": 0})
+        entry["examples"] += 1
+        entry["violations"] += bool(record["missing"])
+    for entry in summary.values():
+        entry["violation_rate"] = entry["violations"] / entry["examples"]
+    return dict(sorted(summary.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check json_qa answers occur verbatim in their contexts")
+    parser.add_argument("--ignore-case", action="store_true", help="Match case-insensitively")
+    parser.add_argument("--all", action="store_true", help="Also check angles that ask for inferred answers")
+    parser.add_argument(
+        "-p", "--workers", type=int, default=os.cpu_count() or 1,
+        help="Worker processes (default: all cores)",
+    )
+    args = parser.parse_args()
+
+    start = time.time()
+    records = load_records(args.all)
+    if not records:
+        print("No json_qa .corpus files found — run generate.py first.")
+        return
+
+    batches = [(records[i:i + BATCH_EXAMPLES], args.ignore_case)
+               for i in range(0, len(records), BATCH_EXAMPLES)]
+    if args.workers <= 1 or len(batches) <= 1:
+        checked = [r for batch in map(check_batch, batches) for r in batch]
+    else:
+        with Pool(args.workers) as pool:
+            checked = [r for batch in pool.imap(check_batch, batches) for r in batch]
+
+    with open(VERIFIED_FILE, "w", encoding="utf-8") as ok, \
+            open(VIOLATIONS_FILE, "w", encoding="utf-8") as bad:
+        for record in checked:
+            out = bad if record["missing"] else ok
+            if not record["missing"]:
+                record = {k: v for k, v in record.items() if k != "missing"}
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    by_category = summarize(checked, "category")
+    with open(REPORT_FILE, "w") as f:
+        json.dump({"ignore_case": args.ignore_case, "categories": by_category,
+                   "files": summarize(checked, "path")}, f, indent=1)
+
+    violations = sum(bool(r["missing"]) for r in checked)
+    print(f"{len(checked)} examples, {violations} violations ({violations / len(checked):.1%}) "
+          f"in {time.time() - start:.1f}s")
+    for category, entry in by_category.items():
+        print(f"  {category:45s} {entry['examples']:6d} examples {entry['violation_rate']:7.1%} violations")
+
+
+if __name__ == "__main__":
+    main()
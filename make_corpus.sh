@@ -1,62 +1,6 @@
 #!/bin/bash
+# Rebuild every level_*/corpus.corpus. See assemble.py for the options
+# (e.g. ./make_corpus.sh --dedup --keep-upsampling).
 
-for dir in ./level_*/; do
-    # reset level corpus
-    > $dir/corpus.corpus
-    for file in $dir/*.txt; do
-        echo "Processing $file"
-        cat $file >> $dir/corpus.corpus
-    done
-done
-
-pushd .
-cd level_1/
-shuf -r corpus.txt | head -n 120 > corpus.corpus
-popd
-
-pushd .
-cd level_2/
-shuf -r corpus.txt | head -n 500 > corpus.corpus
-popd
-
-pushd .
-cd level_3/
-shuf ../level_2/corpus.txt > corpus.1.corpus
-shuf ../level_2/corpus.txt >> corpus.1.corpus
-shuf ../level_2/corpus.txt >> corpus.1.corpus
-shuf corpus.txt >> corpus.1.corpus
-./auto_corpus.sh >> corpus.1.corpus
-# Include LLM-expanded rewrites if they exist
-if [ -f llm_expanded_corpus.txt ]; then
-    cat llm_expanded_corpus.txt >> corpus.1.corpus
-fi
-shuf corpus.1.corpus > corpus.corpus
-shuf corpus.1.corpus >> corpus.corpus
-shuf corpus.1.corpus >> corpus.corpus
-
-du -h corpus.corpus
-popd
-
-pushd .
-cd level_4/
-# Start with previous levels
-cat ../level_3/corpus.corpus > corpus.corpus
-# Add all generated level_4 .corpus files with stop tokens
-for f in $(find corpus/ -name '*.corpus' -type f | sort); do
-    cat "$f" >> corpus.corpus
-    echo '<stop>' >> corpus.corpus
-done
-du -h corpus.corpus
-popd
-
-pushd .
-cd level_5/
-# Start with previous levels
-cat ../level_4/corpus.corpus > corpus.corpus
-# Add all generated level_5 .corpus files with stop tokens
-for f in $(find corpus/ -name '*.corpus' -type f | sort); do
-    cat "$f" >> corpus.corpus
-    echo '<stop>' >> corpus.corpus
-done
-du -h corpus.corpus
-popd
+cd "$(dirname "$0")"
+exec python3 assemble.py "$@"
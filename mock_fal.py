@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the fal.ai queue API the generators call, for trying
+concurrency settings, polling and failure handling offline.
+
+Serves, under any path prefix (e.g. /openrouter/router):
+
+    POST {prefix}                          submit -> {"request_id", "status_url", "response_url", ...}
+    GET  {prefix}/requests/{id}/status     {"status": "IN_QUEUE" | "IN_PROGRESS" | "COMPLETED" | "FAILED", ...}
+    GET  {prefix}/requests/{id}            {"output", "usage", "error"} once completed
+    GET  /_stats                           request / injected error / completion counters
+
+Timing: a submitted request waits a --queue delay, then for one of --capacity
+slots, then runs for a duration drawn from the --latency bucket of its
+max_tokens (the first bucket whose bound is >= max_tokens). Status answers are
+derived from the clock, so the server keeps no per-request threads.
+Distributions are written "const:S", "uniform:LO:HI", "exp:MEAN" or
+"lognormal:MEDIAN:SIGMA", in seconds; --time-scale 0.1 makes everything 10x
+faster.
+
+Every call can be answered with a 429 (--rate-limit P, with Retry-After) or a
+500/502/503 (--server-errors P), and a request can end FAILED (--fail P).
+Outputs are synthetic words (about --fill x max_tokens tokens) or, with
+--canned DIR, the text of a .corpus/.txt file under DIR picked by prompt hash.
+
+Usage:
+    python mock_fal.py                                # http://127.0.0.1:8765
+    python mock_fal.py --capacity 20 --latency 512:lognormal:3:0.4 --latency inf:lognormal:40:0.5
+    python mock_fal.py --rate-limit 0.05 --server-errors 0.02 --fail 0.01 --seed 1
+    python mock_fal.py --canned level_5/corpus --time-scale 0.05
+
+    FAL_KEY=test FAL_QUEUE_URL=http://127.0.0.1:8765/openrouter/router python level_5/generate.py -n 50
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_LATENCY = ["512:lognormal:4:0.4", "2048:lognormal:15:0.5", "inf:lognormal:45:0.5"]
+DEFAULT_QUEUE = "exp:0.5"
+
+WORDS = ("the a of and to in is was it for on with as at by from that this be are or an "
+         "water light house river small green city people time long day story open field "
+         "cat dog bird tree stone road north market bright cold quiet fast old new").split()
+
+_REQUEST_PATH = re.compile(r"^(?P<prefix>.*)/requests/(?P<id>[0-9a-f-]{36})(?P<status>/status)?$")
+
+
+# ---------------------------------------------------------------------------
+# Configuration parsing
+# ---------------------------------------------------------------------------
+
+def parse_dist(spec: str):
+    """"lognormal:4:0.5" -> rng -> seconds."""
+    kind, *params = spec.split(":")
+    p = [float(x) for x in params]
+    if kind == "const" and len(p) == 1:
+        return lambda rng: p[0]
+    if kind == "uniform" and len(p) == 2:
+        return lambda rng: rng.uniform(p[0], p[1])
+    if kind == "exp" and len(p) == 1:
+        return lambda rng: rng.expovariate(1 / p[0]) if p[0] > 0 else 0.0
+    if kind == "lognormal" and len(p) == 2:
+        return lambda rng: rng.lognormvariate(math.log(p[0]), p[1])
+    raise argparse.ArgumentTypeError(f"bad distribution {spec!r} (const:S, uniform:LO:HI, exp:MEAN, lognormal:MEDIAN:SIGMA)")
+
+
+def parse_latency(spec: str) -> tuple[float, object]:
+    """"2048:lognormal:15:0.5" -> (2048, distribution)."""
+    bound, dist = spec.split(":", 1)
+    return float(bound), parse_dist(dist)
+
+
+def load_canned(root: str) -> list[str]:
+    texts = []
+    for dirpath, _dirs, files in os.walk(root):
+        for name in sorted(files):
+            if name.endswith((".corpus", ".txt")) and name != "prompts.txt":
+                with open(os.path.join(dirpath, name), encoding="utf-8") as f:
+                    texts.append(f.read().strip())
+    if not texts:
+        raise SystemExit(f"ERROR: no .corpus/.txt files under {root}")
+    return texts
+
+
+# ---------------------------------------------------------------------------
+# Simulated queue
+# ---------------------------------------------------------------------------
+
+class Job:
+    __slots__ = ("id", "submitted", "start", "end", "failed", "output", "usage")
+
+
+class MockQueue:
+    """The simulated fal queue; thread-safe, times from time.monotonic()."""
+
+    def __init__(self, latency: list[str] = DEFAULT_LATENCY, queue: str = DEFAULT_QUEUE, capacity: int = 10,
+                 rate_limit: float = 0.0, server_errors: float = 0.0, fail: float = 0.0, fill: float = 0.5,
+                 canned: list[str] | None = None, time_scale: float = 1.0, seed: int | None = None):
+        self.latency = sorted((parse_latency(s) for s in latency), key=lambda b: b[0])
+        self.queue_delay = parse_dist(queue)
+        self.capacity = capacity
+        self.rate_limit = rate_limit
+        self.server_errors = server_errors
+        self.fail = fail
+        self.fill = fill
+        self.canned = canned
+        self.time_scale = time_scale
+        self.rng = random.Random(seed)
+        self.jobs: dict[str, Job] = {}
+        self._slots: list[float] = []  # end times of the requests holding a slot
+        self.stats = Counter()
+        self.lock = threading.Lock()
+
+    def injected_error(self) -> int | None:
+        """HTTP status to answer this call with instead, if any."""
+        with self.lock:
+            x = self.rng.random()
+            if x < self.rate_limit:
+                self.stats["429"] += 1
+                return 429
+            if x < self.rate_limit + self.server_errors:
+                code = self.rng.choice((500, 502, 503))
+                self.stats[str(code)] += 1
+                return code
+        return None
+
+    def submit(self, body: dict) -> Job:
+        max_tokens = int(body.get("max_tokens") or 4096)
+        prompt = f"{body.get('system_prompt', '')}\n{body.get('prompt', '')}"
+        with self.lock:
+            now = time.monotonic()
+            job = Job()
+            job.id = str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+            job.submitted = now
+            ready = now + self.queue_delay(self.rng) * self.time_scale
+            if len(self._slots) < self.capacity:
+                job.start = ready
+            else:
+                job.start = max(ready, heapq.heappop(self._slots))
+            run = next((dist for bound, dist in self.latency if max_tokens <= bound), self.latency[-1][1])
+            job.end = job.start + run(self.rng) * self.time_scale
+            heapq.heappush(self._slots, job.end)
+            job.failed = self.rng.random() < self.fail
+            job.output = self._output(prompt, max_tokens)
+            prompt_tokens = len(prompt) // 4
+            completion_tokens = len(job.output) // 4
+            job.usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                         "total_tokens": prompt_tokens + completion_tokens}
+            self.jobs[job.id] = job
+            self.stats["submitted"] += 1
+        return job
+
+    def _output(self, prompt: str, max_tokens: int) -> str:
+        if self.canned:
+            digest = hashlib.blake2b(prompt.encode(), digest_size=8).digest()
+            return self.canned[int.from_bytes(digest, "little") % len(self.canned)]
+        words = max(1, int(max_tokens * self.fill * self.rng.uniform(0.6, 1.0) * 0.75))
+        return " ".join(self.rng.choice(WORDS) for _ in range(words))
+
+    def status(self, job: Job) -> dict:
+        now = time.monotonic()
+        if now < job.start:
+            with self.lock:
+                ahead = sum(1 for j in self.jobs.values() if now < j.start < job.start)
+            return {"status": "IN_QUEUE", "queue_position": ahead}
+        if now < job.end:
+            return {"status": "IN_PROGRESS"}
+        if job.failed:
+            return {"status": "FAILED", "error": "Simulated model failure"}
+        return {"status": "COMPLETED"}
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "mock-fal/1"
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real endpoint
+    queue: MockQueue = None  # set by make_server
+    verbose = False
+
+    def _send(self, code: int, body: dict, headers: dict | None = None) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _checked(self) -> bool:
+        """Auth and error injection; False if the call was already answered."""
+        if not self.headers.get("Authorization", "").startswith("Key "):
+            self._send(401, {"detail": "Missing or malformed Authorization header"})
+            return False
+        code = self.queue.injected_error()
+        if code == 429:
+            self._send(429, {"detail": "Rate limit exceeded"}, {"Retry-After": "1"})
+            return False
+        if code:
+            self._send(code, {"detail": "Simulated server error"})
+            return False
+        return True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send(422, {"detail": "Body is not JSON"})
+            return
+        if not self._checked():
+            return
+        job = self.queue.submit(body)
+        base = f"http://{self.headers.get('Host', '127.0.0.1')}{self.path.rstrip('/')}/requests/{job.id}"
+        self._send(200, {"request_id": job.id, "status": "IN_QUEUE", "response_url": base,
+                         "status_url": f"{base}/status", "cancel_url": f"{base}/cancel"})
+
+    def do_GET(self):
+        if self.path == "/_stats":
+            with self.queue.lock:
+                self._send(200, dict(self.queue.stats, jobs=len(self.queue.jobs)))
+            return
+        match = _REQUEST_PATH.match(self.path)
+        if not match:
+            self._send(404, {"detail": "Not found"})
+            return
+        if not self._checked():
+            return
+        job = self.queue.jobs.get(match["id"])
+        if job is None:
+            self._send(404, {"detail": "Request not found"})
+            return
+        status = self.queue.status(job)
+        if match["status"]:
+            self._send(200, status)
+        elif status["status"] == "COMPLETED":
+            with self.queue.lock:
+                self.queue.stats["completed"] += 1
+            self._send(200, {"output": job.output, "usage": job.usage, "error": None, "partial": False})
+        elif status["status"] == "FAILED":
+            self._send(200, {"output": "", "error": status["error"]})
+        else:
+            self._send(400, {"detail": "Request is still in progress"})
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(queue: MockQueue, host: str = "127.0.0.1", port: int = 8765,
+                verbose: bool = False) -> ThreadingHTTPServer:
+    """A server for queue; port 0 picks a free one (see server.server_address).
+    Run it with serve_forever(), e.g. in a daemon thread."""
+    handler = type("BoundHandler", (Handler,), {"queue": queue, "verbose": verbose})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the fal.ai queue API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--latency", action="append", metavar="MAX_TOKENS:DIST",
+        help=f"Run time for requests up to MAX_TOKENS (repeatable, 'inf' for the rest; "
+             f"default: {' '.join(DEFAULT_LATENCY)})",
+    )
+    parser.add_argument("--queue", default=DEFAULT_QUEUE, metavar="DIST",
+                        help=f"Delay before a request can start (default: {DEFAULT_QUEUE})")
+    parser.add_argument("--capacity", type=int, default=10, help="Requests running at once (default: 10)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, metavar="P", help="Share of calls answered 429")
+    parser.add_argument("--server-errors", type=float, default=0.0, metavar="P",
+                        help="Share of calls answered 500/502/503")
+    parser.add_argument("--fail", type=float, default=0.0, metavar="P", help="Share of requests that end FAILED")
+    parser.add_argument("--fill", type=float, default=0.5,
+                        help="Synthetic output length as a share of max_tokens (default: 0.5)")
+    parser.add_argument("--canned", metavar="DIR", help="Answer with .corpus/.txt files from DIR instead")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Multiply every delay (default: 1)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for delays, errors and outputs")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    queue = MockQueue(args.latency or DEFAULT_LATENCY, args.queue, args.capacity, args.rate_limit,
+                      args.server_errors, args.fail, args.fill, load_canned(args.canned) if args.canned else None,
+                      args.time_scale, args.seed)
+    server = make_server(queue, args.host, args.port, args.verbose)
+    host, port = server.server_address[:2]
+    print(f"Mock fal queue on http://{host}:{port}/openrouter/router (capacity {args.capacity}, "
+          f"time scale {args.time_scale})")
+    print(f"  FAL_KEY=test FAL_QUEUE_URL=http://{host}:{port}/openrouter/router python level_5/generate.py")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(dict(queue.stats)))
+
+
+if __name__ == "__main__":
+    main()
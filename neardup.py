@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Find near-duplicate generated documents (levels 4 and 5) with MinHash-LSH.
+
+Each document is split into word 5-gram shingles, MinHash signatures are
+computed in NumPy batches across worker processes, and LSH banding proposes
+candidate pairs whose estimated Jaccard similarity is then checked against
+--threshold. Connected candidates form clusters; the first document of each
+cluster (in sorted path order) is kept and the rest are written to the
+exclusion list that assemble.py skips.
+
+Usage:
+    python neardup.py                       # scan levels 4 and 5
+    python neardup.py --threshold 0.7       # looser matching
+    python neardup.py --levels 4 -p 8       # level 4 only, 8 worker processes
+
+Writes neardup_clusters.json (report) and neardup_exclude.txt (one path per line).
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+import zlib
+from multiprocessing import Pool
+
+import numpy as np
+
+from assemble import DOCUMENT_LEVELS, SCRIPT_DIR, document_paths
+
+REPORT_FILE = os.path.join(SCRIPT_DIR, "neardup_clusters.json")
+EXCLUDE_FILE = os.path.join(SCRIPT_DIR, "neardup_exclude.txt")
+
+SHINGLE_WORDS = 5
+NUM_PERM = 128
+BANDS = 16
+BATCH_DOCS = 16
+CHUNK_CELLS = 1 << 24  # signature slots compared at once in a candidate bucket
+
+# Set in each worker by _init_worker
+_HASH_A = None
+_HASH_B = None
+
+
+def hash_params(num_perm: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    """Multiply-shift hash functions h(x) = ((a*x + b) mod 2^64) >> 32, a odd."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def shingles(text: str) -> np.ndarray:
+    """uint64 hashes of every word SHINGLE_WORDS-gram in text."""
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        words = [""]
+    word_hashes = np.fromiter((zlib.crc32(w.encode()) for w in words),
+                              dtype=np.uint64, count=len(words))
+    k = min(SHINGLE_WORDS, len(word_hashes))
+    n = len(word_hashes) - k + 1
+    # Polynomial rolling combination of k consecutive word hashes
+    combined = np.zeros(n, dtype=np.uint64)
+    for j in range(k):
+        combined = combined * np.uint64(1000003) + word_hashes[j:j + n]
+    return np.unique(combined)
+
+
+def minhash_batch(texts: list[str]) -> np.ndarray:
+    """MinHash signatures (len(texts) x NUM_PERM, uint32) for a batch of documents."""
+    parts = [shingles(t) for t in texts]
+    offsets = np.cumsum([0] + [len(p) for p in parts[:-1]])
+    x = np.concatenate(parts)
+    with np.errstate(over="ignore"):
+        hashed = (_HASH_A[:, None] * x[None, :] + _HASH_B[:, None]) >> np.uint64(32)
+    return np.minimum.reduceat(hashed, offsets, axis=1).T.astype(np.uint32)
+
+
+def _init_worker(a: np.ndarray, b: np.ndarray) -> None:
+    global _HASH_A, _HASH_B
+    _HASH_A, _HASH_B = a, b
+
+
+def _signature_worker(paths: list[str]) -> np.ndarray:
+    texts = []
+    for path in paths:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            texts.append(f.read())
+    return minhash_batch(texts)
+
+
+def compute_signatures(paths: list[str], workers: int, seed: int) -> np.ndarray:
+    a, b = hash_params(NUM_PERM, seed)
+    batches = [paths[i:i + BATCH_DOCS] for i in range(0, len(paths), BATCH_DOCS)]
+    if workers <= 1:
+        _init_worker(a, b)
+        parts = [_signature_worker(batch) for batch in batches]
+    else:
+        with Pool(workers, initializer=_init_worker, initargs=(a, b)) as pool:
+            parts = pool.map(_signature_worker, batches)
+    if not parts:
+        return np.zeros((0, NUM_PERM), dtype=np.uint32)
+    return np.concatenate(parts)
+
+
+def candidate_buckets(signatures: np.ndarray, bands: int) -> list[np.ndarray]:
+    """Groups of document indices that share at least one LSH band."""
+    rows = signatures.shape[1] // bands
+    buckets = []
+    for band in range(bands):
+        block = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        keys = block.view(np.dtype((np.void, block.dtype.itemsize * rows))).ravel()
+        _uniq, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        # Group document indices by bucket without a per-bucket scan
+        order = np.argsort(inverse, kind="stable")
+        groups = np.split(order, np.cumsum(counts)[:-1])
+        buckets.extend(g for g in groups if len(g) > 1)
+    return buckets
+
+
+def find_clusters(signatures: np.ndarray, bands: int, threshold: float) -> list[list[tuple[int, float]]]:
+    """Union-find over candidate pairs whose estimated Jaccard is >= threshold.
+
+    Returns clusters as lists of (document index, best similarity to another member).
+    """
+    parent = list(range(len(signatures)))
+    best = {}
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(a: int, b: int, sim: float) -> None:
+        best[a] = max(best.get(a, 0.0), sim)
+        best[b] = max(best.get(b, 0.0), sim)
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+
+    # Identical signatures (e.g. a batch of exact duplicate outputs) join their
+    # first copy at similarity 1.0; only the distinct ones are compared pairwise
+    keys = np.ascontiguousarray(signatures).view(
+        np.dtype((np.void, signatures.dtype.itemsize * signatures.shape[1]))).ravel()
+    _uniq, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    for i, rep in enumerate(first[inverse.ravel()].tolist()):
+        if i != rep:
+            union(rep, i, 1.0)
+    distinct = signatures[first]
+
+    for members in candidate_buckets(distinct, bands):
+        sig = distinct[members]
+        # Compare CHUNK_CELLS booleans at a time rather than all len^2 x NUM_PERM at once
+        step = max(1, CHUNK_CELLS // (len(members) * sig.shape[1]))
+        for start in range(0, len(members), step):
+            sims = (sig[start:start + step, None, :] == sig[None, :, :]).mean(axis=2)
+            for i, j in zip(*np.nonzero(sims >= threshold)):
+                if j > start + i:
+                    union(int(first[members[start + i]]), int(first[members[j]]), float(sims[i, j]))
+
+    groups: dict[int, list[tuple[int, float]]] = {}
+    for i in best:
+        groups.setdefault(find(i), []).append((i, best[i]))
+    return [sorted(group) for _root, group in sorted(groups.items())]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MinHash-LSH near-duplicate detection for generated documents")
+    parser.add_argument(
+        "--levels", type=int, nargs="+", default=sorted(DOCUMENT_LEVELS), choices=sorted(DOCUMENT_LEVELS),
+        help="Document levels to scan (default: 4 5)",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.8,
+        help="Estimated Jaccard similarity that counts as a near-duplicate (default: 0.8)",
+    )
+    parser.add_argument(
+        "--bands", type=int, default=BANDS,
+        help=f"LSH bands; must divide {NUM_PERM} (default: {BANDS})",
+    )
+    parser.add_argument(
+        "-p", "--workers", type=int, default=os.cpu_count() or 1,
+        help="Worker processes for signature computation (default: all cores)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="Seed for the MinHash permutations (default: 0)",
+    )
+    args = parser.parse_args()
+
+    if NUM_PERM % args.bands:
+        parser.error(f"--bands must divide {NUM_PERM}")
+
+    paths = [p for level in sorted(args.levels) for p in document_paths(level)]
+    print(f"Hashing {len(paths)} documents ({args.workers} workers)...", flush=True)
+    start = time.time()
+    signatures = compute_signatures(paths, args.workers, args.seed)
+    print(f"  signatures in {time.time() - start:.1f}s")
+
+    clusters = find_clusters(signatures, args.bands, args.threshold)
+    rel = [os.path.relpath(p, SCRIPT_DIR) for p in paths]
+
+    report = {
+        "documents": len(paths),
+        "threshold": args.threshold,
+        "num_perm": NUM_PERM,
+        "bands": args.bands,
+        "clusters": [
+            {
+                "keep": rel[group[0][0]],
+                "drop": [rel[i] for i, _sim in group[1:]],
+                "similarity": {rel[i]: round(sim, 3) for i, sim in group},
+            }
+            for group in clusters
+        ],
+    }
+    excluded = [path for cluster in report["clusters"] for path in cluster["drop"]]
+
+    with open(REPORT_FILE, "w") as f:
+        json.dump(report, f, indent=2)
+    with open(EXCLUDE_FILE, "w") as f:
+        f.write("".join(path + "\n" for path in excluded))
+
+    print(f"  {len(clusters)} clusters, {len(excluded)} documents excluded "
+          f"({time.time() - start:.1f}s total)")
+    print(f"Wrote {os.path.relpath(REPORT_FILE, SCRIPT_DIR)} and {os.path.relpath(EXCLUDE_FILE, SCRIPT_DIR)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Run all four generators at once through one client, one limiter and one budget.
+
+Each generator is loaded as a work source whose jobs() hook lists its jobs:
+the prompt id for the event log, the argument its own generate_one() takes
+and how to write the output, exactly as the script itself would:
+
+    level_3      level_3/expand.py              batches of corpus.txt sentences
+    level_4      level_4/generate.py            missing files, longest expected first
+    dictionary   level_4/generate_dictionary.py most frequent words without an entry
+    level_5      level_5/generate.py            missing files, longest expected first
+
+and then drained concurrently with everything shared:
+
+  * one HTTP client, a fal_client.FalClient installed as fal_client.request:
+    keep-alive connections pooled per host instead of a new one per call
+  * one rate limiter: a token bucket of --rate calls/s over submits and polls
+    of all sources, bursting up to --burst
+  * one concurrency budget: -p worker threads. A free worker takes the next job
+    of the source with the fewest dispatched jobs per unit of its --weight, so
+    busy sources split the slots by weight and a drained one leaves its share
+    to the others
+  * one event log, progress display and --budget ledger (see fal_events.py,
+    fal_progress.py and fal_costs.py)
+
+Usage:
+    python orchestrate.py -p 20                              # up to 10 jobs of every source
+    python orchestrate.py --sources level_4 level_5 -n 100 --weight level_5=3
+    python orchestrate.py -p 30 --rate 20 --budget 10 --model dictionary=qwen/qwen3.5-plus-02-15
+"""
+
+import argparse
+import collections
+import os
+import threading
+
+import fal_client
+from fal_client import FalClient, add_arguments, load_script, open_events, setup
+from fal_costs import Ledger
+from fal_events import EventLog
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# name -> (script, event log level, default model)
+SOURCES = {
+    "level_3": ("level_3/expand.py", "level_3", "qwen/qwen-2.5-72b-instruct"),
+    "level_4": ("level_4/generate.py", "level_4", "qwen/qwen3.5-plus-02-15"),
+    "dictionary": ("level_4/generate_dictionary.py", "level_4", "qwen/qwen3-235b-a22b"),
+    "level_5": ("level_5/generate.py", "level_5", "qwen/qwen3.5-plus-02-15"),
+}
+
+
+# ---------------------------------------------------------------------------
+# Work sources — a job is (prompt id, generate_one's prompt argument, input
+# chars, write(content) -> output chars), as each script's jobs() lists them
+# ---------------------------------------------------------------------------
+
+class Source:
+    """A generator loaded as a work source, with the jobs it has left."""
+
+    def __init__(self, name: str, level: str, module, model: str, weight: float, jobs: list[tuple]):
+        self.name = name
+        self.level = level
+        self.module = module
+        self.model = model
+        self.weight = weight
+        self.jobs = collections.deque(jobs)
+        self.lock = threading.Lock()  # writes (expand shares its output and progress files) and counts
+        self.counts = collections.Counter()
+
+
+# ---------------------------------------------------------------------------
+# Dispatch
+# ---------------------------------------------------------------------------
+
+class Dispatcher:
+    """Hands out jobs, weighted fair across the sources that still have some."""
+
+    def __init__(self, sources: list[Source]):
+        self.sources = sources
+        self.lock = threading.Lock()
+
+    def next_job(self) -> tuple[Source, tuple] | None:
+        with self.lock:
+            ready = [s for s in self.sources if s.jobs]
+            if not ready:
+                return None
+            source = min(ready, key=lambda s: (s.counts["dispatched"] + 1) / s.weight)
+            source.counts["dispatched"] += 1
+            return source, source.jobs.popleft()
+
+
+def worker(dispatcher: Dispatcher, api_key: str, base_url: str, poll_interval: float, events: EventLog,
+           ledger: Ledger) -> None:
+    while (picked := dispatcher.next_job()) is not None:
+        source, (prompt_id, prompt, input_chars, write) = picked
+        on_event = events.request(prompt_id, source.model, source.level)
+        if not ledger.admit(source.model, input_chars, source.module.MAX_TOKENS, on_event, poll_interval):
+            outcome = "skipped"
+        else:
+            try:
+                content = source.module.generate_one(api_key, prompt, source.model, base_url, poll_interval,
+                                                     on_event)
+                with source.lock:
+                    output_chars = write(content)
+                on_event("written", output_chars=output_chars)
+                outcome = "written"
+            except Exception as e:
+                on_event("failed", error=str(e))
+                outcome = "failed"
+        with source.lock:
+            source.counts[outcome] += 1
+
+
+def _pairs(values: list[str], convert) -> dict:
+    pairs = {}
+    for value in values:
+        name, _, setting = value.partition("=")
+        if name not in SOURCES or not setting:
+            raise SystemExit(f"ERROR: expected SOURCE=VALUE with SOURCE one of {', '.join(SOURCES)}, got {value!r}")
+        pairs[name] = convert(setting)
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the generators together with shared limits")
+    parser.add_argument("--sources", nargs="+", choices=list(SOURCES), default=list(SOURCES),
+                        help="Work sources to drain (default: all)")
+    parser.add_argument("-n", type=int, default=10, help="Max jobs per source (default: 10)")
+    parser.add_argument("-p", "--concurrency", type=int, default=10,
+                        help="Requests in flight across all sources (default: 10)")
+    parser.add_argument("--weight", action="append", default=[], metavar="SOURCE=W",
+                        help="Share of the slots while sources compete (default: 1 each); repeatable")
+    parser.add_argument("--model", action="append", default=[], metavar="SOURCE=MODEL",
+                        help="Model for a source (default: the script's own); repeatable")
+    parser.add_argument("--rate", type=float, help="Max API calls per second across all sources (default: no limit)")
+    parser.add_argument("--burst", type=int, default=10, help="Calls allowed at once above --rate (default: 10)")
+    parser.add_argument("--batch-size", type=int, default=10, help="Sentences per level_3 batch (default: 10)")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    weights = _pairs(args.weight, float)
+    models = _pairs(args.model, str)
+    sources = []
+    for name in args.sources:
+        script, level, model = SOURCES[name]
+        module = load_script(f"{name}_source", os.path.join(SCRIPT_DIR, script))
+        model = models.get(name, model)
+        jobs = module.jobs(args.n, model, args.events, **({"batch_size": args.batch_size} if name == "level_3" else {}))
+        sources.append(Source(name, level, module, model, weights.get(name, 1.0), jobs))
+        print(f"{name:10s} {len(jobs):5d} jobs  weight {weights.get(name, 1.0):g}  model {model}")
+    total = sum(len(s.jobs) for s in sources)
+    if not total:
+        print("Nothing to generate.")
+        return
+
+    client = FalClient(args.rate, args.burst)
+    fal_client.request = client
+    api_key = setup(args)
+
+    print(f"\nGenerating {total} jobs from {len(sources)} sources (concurrency {args.concurrency})...\n")
+    events, ledger = open_events(args.events, "all", total, args.concurrency, args.budget)
+    dispatcher = Dispatcher(sources)
+    threads = [threading.Thread(target=worker, name=f"worker-{i}",
+                                args=(dispatcher, api_key, args.base_url, args.poll_interval, events, ledger))
+               for i in range(min(args.concurrency, total))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    events.close()
+
+    print(ledger.summary())
+    for source in sources:
+        c = source.counts
+        print(f"  {source.name:10s} {c['written']:5d} written  {c['failed']:4d} failed  {c['skipped']:4d} skipped")
+    print(f"{client.calls} API calls over {client.connections} connections, "
+          f"{client.throttled:.1f}s spent waiting for the rate limit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Pack a level's token stream into fixed-length training windows.
+
+Reads the corpus.tokens.* files written by `assemble.py --tokens` and bins the
+records (lines for levels 0-3, <stop>-terminated documents for 4-5) into
+windows of --context tokens, so short records don't each waste a padded
+window. Records are packed a buffer at a time, longest first, either into the
+first window they fit (ffd, first-fit decreasing) or into the fullest window
+they fit (bestfit, best-fit decreasing); memory is bounded by --buffer.
+Records longer than a window are cut into window-sized pieces first.
+
+Writes, next to the token stream:
+
+    corpus.packed.bin       windows x context token ids, padded with pad_id
+    corpus.packed.segments  uint32 end position of every segment inside its window
+    corpus.packed.idx       uint64 offsets into .segments per window (windows + 1)
+    corpus.packed.json      header: context, dtype, pad_id, counts and efficiency
+
+Usage:
+    python pack.py level_4 --context 1024
+    python pack.py level_3 --context 256 --strategy ffd
+"""
+
+import argparse
+import bisect
+import json
+
+import numpy as np
+
+from dataset import SPLITS, corpus_prefix
+from tokens import load_tokens, memmap
+
+STRATEGIES = ("bestfit", "ffd")
+
+
+def _first_fit(lengths: list[int], context: int) -> list[list[int]]:
+    """First-fit over items already sorted longest first.
+
+    A max segment tree over the windows' free space finds the first window
+    with room in O(log n).
+    """
+    size = 1
+    while size < len(lengths):
+        size *= 2
+    tree = [0] * (2 * size)
+    bins: list[list[int]] = []
+    for item, length in enumerate(lengths):
+        if tree[1] >= length:
+            node = 1
+            while node < size:
+                node = 2 * node if tree[2 * node] >= length else 2 * node + 1
+            b = node - size
+        else:
+            b = len(bins)
+            bins.append([])
+            node = size + b
+            tree[node] = context
+        bins[b].append(item)
+        node = size + b
+        tree[node] -= length
+        node //= 2
+        while node:
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+            node //= 2
+    return bins
+
+
+def _best_fit(lengths: list[int], context: int) -> list[list[int]]:
+    """Best-fit over items already sorted longest first, via a sorted free-space list."""
+    free: list[tuple[int, int]] = []  # (remaining space, bin id), ascending
+    bins: list[list[int]] = []
+    for item, length in enumerate(lengths):
+        pos = bisect.bisect_left(free, (length, -1))
+        if pos < len(free):
+            remaining, b = free.pop(pos)
+        else:
+            remaining, b = context, len(bins)
+            bins.append([])
+        bins[b].append(item)
+        if remaining - length > 0:
+            bisect.insort(free, (remaining - length, b))
+    return bins
+
+
+def pack_buffer(pieces: list[tuple[int, int]], context: int, strategy: str) -> list[list[tuple[int, int]]]:
+    """Group (start, end) token ranges, each at most context long, into windows."""
+    pieces = sorted(pieces, key=lambda p: p[0] - p[1])  # longest first
+    lengths = [end - start for start, end in pieces]
+    packer = _first_fit if strategy == "ffd" else _best_fit
+    return [[pieces[i] for i in items] for items in packer(lengths, context)]
+
+
+def pack(level_dir: str, context: int, strategy: str = "bestfit", buffer: int = 65536,
+         split: str = "train") -> dict:
+    """Pack level_dir/corpus.tokens.* into corpus.packed.*. Returns the header."""
+    tokens, offsets, header = load_tokens(level_dir, split)
+    dtype = np.dtype(header["dtype"])
+    # A fresh id for padding when the dtype has room, else reuse <stop>
+    pad_id = header["vocab_size"] if header["vocab_size"] <= np.iinfo(dtype).max else header["stop_id"]
+    prefix = corpus_prefix(level_dir, split)
+
+    windows = 0
+    used = 0
+    segment_counts = []
+    window = np.empty(context, dtype=dtype)
+
+    with open(prefix + ".packed.bin", "wb") as out, open(prefix + ".packed.segments", "wb") as seg_out:
+        def flush(bins: list[list[tuple[int, int]]]) -> None:
+            nonlocal windows, used
+            for pieces in bins:
+                window.fill(pad_id)
+                ends = []
+                pos = 0
+                for start, end in pieces:
+                    window[pos:pos + end - start] = tokens[start:end]
+                    pos += end - start
+                    ends.append(pos)
+                out.write(window.tobytes())
+                np.asarray(ends, dtype=np.uint32).tofile(seg_out)
+                segment_counts.append(len(ends))
+                windows += 1
+                used += pos
+
+        pending: list[tuple[int, int]] = []
+        for i in range(len(offsets) - 1):
+            start, end = int(offsets[i]), int(offsets[i + 1])
+            # Records longer than a window: full windows go out as-is
+            while end - start >= context:
+                flush([[(start, start + context)]])
+                start += context
+            if end > start:
+                pending.append((start, end))
+            if len(pending) >= buffer:
+                flush(pack_buffer(pending, context, strategy))
+                pending = []
+        if pending:
+            flush(pack_buffer(pending, context, strategy))
+
+    idx = np.zeros(len(segment_counts) + 1, dtype=np.uint64)
+    np.cumsum(segment_counts, out=idx[1:])
+    idx.tofile(prefix + ".packed.idx")
+
+    packed = {
+        "format": 1,
+        "context": context,
+        "strategy": strategy,
+        "dtype": dtype.name,
+        "pad_id": pad_id,
+        "stop_id": header["stop_id"],
+        "windows": windows,
+        "tokens": used,
+        "efficiency": used / (windows * context) if windows else 0.0,
+    }
+    with open(prefix + ".packed.json", "w") as f:
+        json.dump(packed, f, indent=1)
+    return packed
+
+
+def load_packed(level_dir: str, split: str = "train") -> tuple[np.memmap, np.memmap, np.memmap, dict]:
+    """Memory-map packed windows (windows x context), segment ends and their offsets."""
+    prefix = corpus_prefix(level_dir, split)
+    with open(prefix + ".packed.json") as f:
+        header = json.load(f)
+    windows = memmap(prefix + ".packed.bin", header["dtype"], (header["windows"], header["context"]))
+    segments = memmap(prefix + ".packed.segments", np.uint32)
+    idx = memmap(prefix + ".packed.idx", np.uint64)
+    return windows, segments, idx, header
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack a level's token stream into fixed-length windows")
+    parser.add_argument("level_dir", help="Level directory with corpus.tokens.*, e.g. level_4")
+    parser.add_argument("--context", type=int, default=1024, help="Window length in tokens (default: 1024)")
+    parser.add_argument(
+        "--strategy", choices=STRATEGIES, default="bestfit",
+        help="bestfit (best-fit decreasing, default) or ffd (first-fit decreasing)",
+    )
+    parser.add_argument(
+        "--buffer", type=int, default=65536,
+        help="Records packed together at a time; bounds memory (default: 65536)",
+    )
+    parser.add_argument("--split", choices=SPLITS, default="train", help="Split to pack (default: train)")
+    args = parser.parse_args()
+
+    header = pack(args.level_dir, args.context, args.strategy, args.buffer, args.split)
+    print(f"{header['windows']} windows of {header['context']} tokens, "
+          f"{header['tokens']} real tokens, efficiency {header['efficiency']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
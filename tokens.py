@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Pre-tokenized corpus output: a flat token stream training loaders can memory-map.
+
+For a level this writes, next to corpus.corpus:
+
+    corpus.tokens.bin    every record's token ids back to back (uint8 or uint16)
+    corpus.tokens.idx    uint64 record start offsets into the stream (records + 1 entries)
+    corpus.tokens.json   header: dtype, vocabulary, <stop> id and counts
+
+The default char-level tokenizer maps every distinct character of the corpus
+to an id and gives <stop> its own id (0). With a trained BPE tokenizer
+(bpe.json from bpe.py) the ids come from that instead, <stop> included. The
+stream is uint8 when the vocabulary fits in 256 ids and uint16 up to 65536.
+
+Usage (normally via `python assemble.py --tokens`):
+    python tokens.py level_3            # tokenize level_3/corpus.corpus, records as in its index
+    python tokens.py level_5 --tokenizer bpe.json
+
+Loading:
+    tokens, offsets, header = load_tokens("level_3")      # split="val" for held-out data
+    first_record = tokens[offsets[0]:offsets[1]]
+"""
+
+import argparse
+import json
+import os
+import sys
+from multiprocessing import Pool
+
+import numpy as np
+
+from dataset import SPLITS, CorpusDataset, corpus_prefix
+
+STOP = "<stop>"
+STOP_ID = 0
+CHUNK_RECORDS = 8192
+
+# Private-use character standing in for <stop> while encoding
+_STOP_CHAR = "\ue000"
+
+# Set in each worker by _init_worker
+_CODEPOINTS = None
+_IDS = None
+_BPE = None
+_DTYPE = None
+
+
+def char_vocab(records: list[str]) -> list[str]:
+    """Sorted distinct characters of the corpus; id = position + 1 (0 is <stop>)."""
+    chars = set()
+    for i in range(0, len(records), CHUNK_RECORDS):
+        chars.update("".join(records[i:i + CHUNK_RECORDS]).replace(STOP, ""))
+    return sorted(chars)
+
+
+def token_dtype(vocab_size: int) -> np.dtype:
+    if vocab_size <= 256:
+        return np.dtype(np.uint8)
+    if vocab_size <= 65536:
+        return np.dtype(np.uint16)
+    raise ValueError(f"vocabulary of {vocab_size} does not fit in uint16")
+
+
+def _init_worker(vocab: list[str] | None, tokenizer_path: str | None, dtype: np.dtype) -> None:
+    global _CODEPOINTS, _IDS, _BPE, _DTYPE
+    _DTYPE = dtype
+    if tokenizer_path:
+        from bpe import BPETokenizer
+        _BPE = BPETokenizer.load(tokenizer_path)
+        return
+    lookup = sorted((ord(c), i + 1) for i, c in enumerate(vocab))
+    lookup.append((ord(_STOP_CHAR), STOP_ID))
+    lookup.sort()
+    _CODEPOINTS = np.array([cp for cp, _id in lookup], dtype=np.uint32)
+    _IDS = np.array([i for _cp, i in lookup], dtype=dtype)
+
+
+def _encode_chunk(records: list[str]) -> tuple[bytes, np.ndarray]:
+    """Encode a chunk of records; return the token bytes and per-record lengths."""
+    if _BPE is not None:
+        encoded = [_BPE.encode(r) for r in records]
+        lengths = np.fromiter((len(ids) for ids in encoded), dtype=np.uint64, count=len(records))
+        flat = np.fromiter((i for ids in encoded for i in ids), dtype=_DTYPE, count=int(lengths.sum()))
+        return flat.tobytes(), lengths
+    text = "".join(records).replace(STOP, _STOP_CHAR)
+    codepoints = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    ids = _IDS[np.searchsorted(_CODEPOINTS, codepoints)]
+    lengths = np.fromiter((len(r) - (len(STOP) - 1) * r.count(STOP) for r in records),
+                          dtype=np.uint64, count=len(records))
+    return ids.tobytes(), lengths
+
+
+def write_tokens(prefix: str, records: list[str], workers: int = 0,
+                 tokenizer_path: str | None = None, vocab: list[str] | None = None) -> dict:
+    """Tokenize records and write <prefix>.tokens.{bin,idx,json}. Returns the header.
+
+    Pass the char vocabulary of the whole level when tokenizing several splits
+    so they share token ids.
+    """
+    if tokenizer_path:
+        from bpe import BPETokenizer
+        bpe = BPETokenizer.load(tokenizer_path)
+        vocab = None
+        dtype = token_dtype(bpe.vocab_size)
+        header = {"tokenizer": "bpe", "tokenizer_file": os.path.abspath(tokenizer_path),
+                  "vocab_size": bpe.vocab_size, "stop_id": bpe.stop_id}
+    else:
+        vocab = vocab or char_vocab(records)
+        dtype = token_dtype(len(vocab) + 1)
+        header = {"tokenizer": "char", "vocab_size": len(vocab) + 1, "vocab": [STOP] + vocab,
+                  "stop_id": STOP_ID}
+    chunks = [records[i:i + CHUNK_RECORDS] for i in range(0, len(records), CHUNK_RECORDS)]
+    workers = workers or os.cpu_count() or 1
+
+    offsets = [np.zeros(1, dtype=np.uint64)]
+    total = 0
+    with open(prefix + ".tokens.bin", "wb") as f:
+        if workers <= 1 or len(chunks) <= 1:
+            _init_worker(vocab, tokenizer_path, dtype)
+            results = map(_encode_chunk, chunks)
+            pool = None
+        else:
+            pool = Pool(workers, initializer=_init_worker, initargs=(vocab, tokenizer_path, dtype))
+            results = pool.imap(_encode_chunk, chunks)
+        try:
+            for data, lengths in results:
+                f.write(data)
+                offsets.append(np.cumsum(lengths) + np.uint64(total))
+                total += len(data) // dtype.itemsize
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+    np.concatenate(offsets).tofile(prefix + ".tokens.idx")
+
+    header = {"format": 1, "dtype": dtype.name, **header, "tokens": total, "records": len(records)}
+    with open(prefix + ".tokens.json", "w") as f:
+        json.dump(header, f, ensure_ascii=False)
+    return header
+
+
+def load_tokens(level_dir: str, split: str = "train") -> tuple[np.memmap, np.memmap, dict]:
+    """Memory-map a level's token stream and record offsets."""
+    prefix = corpus_prefix(level_dir, split)
+    with open(prefix + ".tokens.json") as f:
+        header = json.load(f)
+    tokens = memmap(prefix + ".tokens.bin", header["dtype"])
+    offsets = memmap(prefix + ".tokens.idx", np.uint64)
+    return tokens, offsets, header
+
+
+def memmap(path: str, dtype, shape: tuple[int, ...] | None = None) -> np.ndarray:
+    """Read-only np.memmap that also copes with empty files (e.g. a tiny held-out split)."""
+    if os.path.getsize(path) == 0:
+        return np.zeros(shape or 0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tokenize an assembled level_N/corpus.corpus")
+    parser.add_argument("level_dir", help="Level directory, e.g. level_3")
+    parser.add_argument(
+        "-p", "--workers", type=int, default=os.cpu_count() or 1,
+        help="Encoding processes (default: all cores)",
+    )
+    parser.add_argument(
+        "--tokenizer", metavar="FILE",
+        help="BPE tokenizer from bpe.py (default: char-level)",
+    )
+    parser.add_argument("--split", choices=SPLITS, default="train", help="Split to tokenize (default: train)")
+    args = parser.parse_args()
+
+    prefix = corpus_prefix(args.level_dir, args.split)
+    if not os.path.exists(prefix + ".index.json"):
+        print(f"ERROR: {prefix}.index.json not found — run assemble.py first", file=sys.stderr)
+        sys.exit(1)
+    # Records as the index splits them (level 4-5 documents span many lines)
+    records = list(CorpusDataset(args.level_dir, args.split))
+    vocab = None
+    if not args.tokenizer:
+        # One char vocabulary for all splits, as assemble.py --tokens does
+        splits = [split for split in SPLITS if os.path.exists(corpus_prefix(args.level_dir, split) + ".index.json")]
+        vocab = char_vocab([text for split in splits for text in CorpusDataset(args.level_dir, split)])
+
+    header = write_tokens(prefix, records, args.workers, args.tokenizer, vocab)
+    print(f"{header['tokens']} tokens, {header['records']} records, "
+          f"vocab {header['vocab_size']} ({header['dtype']})")
+
+
+if __name__ == "__main__":
+    main()